@@ -0,0 +1 @@
+# Este archivo puede permanecer vacío.
\ No newline at end of file
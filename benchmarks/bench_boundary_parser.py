@@ -0,0 +1,139 @@
+# benchmarks/bench_boundary_parser.py
+
+"""
+Benchmark del parser de 'boundary': tokenizador en streaming
+(core.boundary_parser.read_boundary_table) frente a la implementación
+anterior basada en readlines() + startswith(), sobre archivos sintéticos
+de 10k y 100k patches como los que genera snappyHexMesh.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_boundary_parser
+"""
+
+import os
+import time
+import tempfile
+import tracemalloc
+
+from core.boundary_parser import read_boundary_table, parse_openfoam_boundary
+
+PATCH_COUNTS = (10_000, 100_000)
+REPEATS = 3
+
+
+def legacy_parse_openfoam_boundary(boundary_file_path):
+    """Implementación anterior (readlines + startswith), conservada para comparar."""
+    boundaries = []
+    with open(boundary_file_path, 'r') as f:
+        lines = f.readlines()
+
+    lines = [line.strip() for line in lines if line.strip()]
+
+    num_boundaries = None
+    start_index = None
+    for i, line in enumerate(lines):
+        if line.isdigit():
+            if i+1 < len(lines) and lines[i+1] == '(':
+                num_boundaries = int(line)
+                start_index = i+2
+                break
+
+    if num_boundaries is None or start_index is None:
+        raise ValueError("No se pudo encontrar el número de patches y el '(' en el archivo boundary.")
+
+    i = start_index
+    patches_leidos = 0
+    while i < len(lines) and patches_leidos < num_boundaries:
+        boundary_name = lines[i].strip()
+        i += 1
+        if i >= len(lines) or lines[i] != '{':
+            raise ValueError(f"Se esperaba '{{' después del nombre de la frontera {boundary_name}")
+        i += 1
+
+        boundary_type = None
+        nFaces = None
+        startFace = None
+        while i < len(lines) and lines[i] != '}':
+            line = lines[i]
+            if line.startswith('type'):
+                boundary_type = line.replace('type', '').replace(';', '').strip()
+            elif line.startswith('nFaces'):
+                nFaces = int(line.replace('nFaces', '').replace(';', '').strip())
+            elif line.startswith('startFace'):
+                startFace = int(line.replace('startFace', '').replace(';', '').strip())
+            i += 1
+
+        if i >= len(lines) or lines[i] != '}':
+            raise ValueError(f"No se encontró '}}' al final del bloque de la frontera {boundary_name}")
+        i += 1
+
+        boundaries.append({
+            "name": boundary_name,
+            "type": boundary_type,
+            "nFaces": nFaces,
+            "startFace": startFace
+        })
+        patches_leidos += 1
+
+    return boundaries
+
+
+def write_synthetic_boundary(path, n_patches):
+    """Escribe un 'boundary' con n_patches en el formato multilínea de OpenFOAM."""
+    with open(path, "w") as f:
+        f.write("FoamFile\n{\n    version     2.0;\n    format      ascii;\n"
+                "    class       polyBoundaryMesh;\n    object      boundary;\n}\n"
+                "// * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * //\n\n")
+        f.write(f"{n_patches}\n(\n")
+        start = 1_000_000
+        for i in range(n_patches):
+            n_faces = 50 + i % 200
+            f.write(f"    motorBike_part{i}\n    {{\n"
+                    f"        type            wall;\n"
+                    f"        inGroups        List<word> 1(wall);\n"
+                    f"        nFaces          {n_faces};\n"
+                    f"        startFace       {start};\n    }}\n")
+            start += n_faces
+        f.write(")\n\n// ************************************************************************* //\n")
+
+
+def measure(func, path):
+    """Mejor tiempo de REPEATS ejecuciones y pico de memoria de una de ellas."""
+    best = float("inf")
+    for _ in range(REPEATS):
+        t0 = time.perf_counter()
+        func(path)
+        best = min(best, time.perf_counter() - t0)
+    tracemalloc.start()
+    result = func(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, result
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'patches':>8} {'parser':<28} {'tiempo (s)':>10} {'pico (MB)':>10}")
+        for n in PATCH_COUNTS:
+            path = os.path.join(tmp, f"boundary_{n}")
+            write_synthetic_boundary(path, n)
+
+            rows = [
+                ("legacy (readlines)", legacy_parse_openfoam_boundary),
+                ("read_boundary_table", read_boundary_table),
+                ("parse_openfoam_boundary", parse_openfoam_boundary),
+            ]
+            results = {}
+            for label, func in rows:
+                elapsed, peak, results[label] = measure(func, path)
+                print(f"{n:>8} {label:<28} {elapsed:>10.3f} {peak / 1e6:>10.1f}")
+
+            legacy = results["legacy (readlines)"]
+            table = results["read_boundary_table"]
+            assert len(legacy) == len(table) == n
+            assert all(b["startFace"] == s for b, s in zip(legacy, table["startFace"]))
+            print(f"{'':>8} tabla estructurada: {table.nbytes / 1e6:.1f} MB ({table.dtype})")
+
+
+if __name__ == "__main__":
+    main()
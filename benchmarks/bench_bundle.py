@@ -0,0 +1,105 @@
+# benchmarks/bench_bundle.py
+
+"""
+Benchmark del formato de proyecto .ofgui (core/bundle.py) con un proyecto
+sintético: secciones grandes (miles de inyecciones y de contornos) y
+N_DESIGN_POINTS carpetas DPn con campos generados, la mayoría idénticos
+entre puntos de diseño.
+
+Se compara el tamaño del bundle con el de los archivos sueltos, y el tiempo
+de abrir el bundle leyendo sólo el manifiesto y la sección de la primera
+página frente a restaurar el proyecto completo.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_bundle
+"""
+
+import io
+import os
+import time
+import random
+import tempfile
+import contextlib
+
+from core.json_manager import JSONManager
+from core.bundle import Bundle, save_bundle
+
+N_INJECTIONS = 5000
+N_PATCHES = 2000
+N_DESIGN_POINTS = 20
+N_FIELD_VALUES = 20000
+FIELDS = ("U", "p", "T", "k", "epsilon", "alphat", "nut", "p_rgh")
+
+
+def make_project(data_dir):
+    jm = JSONManager(data_dir)
+    jm.save_sections({
+        "Disperse_fase": {"injectors": [
+            {"name": f"inj{i}", "position": [i, 0.0, 0.0], "direction": [0, 0, 1],
+             "massTotal": 1e-3, "diameters": list(range(10))} for i in range(N_INJECTIONS)]},
+        "boundary_conditions": {"boundary_conditions": {
+            f"patch{i}": {"type": "Wall", "wallTemperature": 300.0 + i % 7} for i in range(N_PATCHES)}},
+        "constant": {"especiesActive": True, "species": [f"S{i}" for i in range(50)]},
+    }, validate=False)
+    rng = random.Random(0)
+    uniform = {f: "internalField uniform 0;\n" + "".join(f"{rng.uniform(0, 400):.6g}\n"
+                                                          for _ in range(N_FIELD_VALUES))
+               for f in FIELDS}
+    for dp in range(N_DESIGN_POINTS):
+        zero = os.path.join(data_dir, f"DP{dp}", "0")
+        os.makedirs(zero)
+        for field, text in uniform.items():
+            # Sólo T cambia entre puntos de diseño
+            if field == "T":
+                text = text.replace("internalField uniform 0", f"internalField uniform {300 + dp}")
+            with open(os.path.join(zero, field), "w") as f:
+                f.write(text)
+
+
+def dir_size(path):
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, names in os.walk(path) for name in names)
+
+
+def timed(func, *args):
+    t0 = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - t0, result
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        data_dir = os.path.join(tmp, "temp")
+        make_project(data_dir)
+        raw = dir_size(data_dir)
+        bundle_path = os.path.join(tmp, "project.ofgui")
+        save_time, manifest = timed(save_bundle, bundle_path, data_dir, None, "")
+        packed = os.path.getsize(bundle_path)
+
+        def lazy_open():
+            with Bundle(bundle_path) as bundle:
+                bundle.load_section("constant")
+                return bundle.members_read
+
+        def full_restore():
+            target = os.path.join(tmp, f"restore_{time.perf_counter_ns()}")
+            with Bundle(bundle_path) as bundle:
+                bundle.materialize(JSONManager(target))
+                return bundle.members_read
+
+        lazy_time, lazy_members = timed(lazy_open)
+        full_time, full_members = timed(full_restore)
+
+    files = manifest["files"]
+    print(f"Proyecto: {len(manifest['sections'])} secciones, {len(files)} archivos generados "
+          f"en {N_DESIGN_POINTS} puntos de diseño")
+    print(f"  archivos sueltos:      {raw / 1e6:8.2f} MB")
+    print(f"  bundle .ofgui:         {packed / 1e6:8.2f} MB ({raw / packed:.0f}x menor, "
+          f"{len({e['blob'] for e in files.values()})} blobs distintos)")
+    print(f"  guardar bundle:        {save_time:8.3f} s")
+    print(f"  abrir (manifiesto + primera página): {lazy_time * 1e3:8.1f} ms, {lazy_members} miembros leídos")
+    print(f"  restaurar completo:                  {full_time * 1e3:8.1f} ms, {full_members} miembros leídos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# benchmarks/bench_case_context.py
+
+"""
+Benchmark de la carga de secciones para los generadores de la carpeta 0.
+
+Un caso con N_PATCHES fronteras se genera de dos formas:
+- antes: cada generador (U, T, p, p_rgh, k, epsilon, omega, nut, alphat)
+  pide su copia de boundary_conditions al estado del proyecto, como hacían
+  los generadores antes de core/case_context.py;
+- ahora: CaseContext.load() lee, valida y congela las secciones una vez y
+  todos los generadores leen del mismo contexto.
+
+Se mide el tiempo de preparar los datos (copias de secciones frente a un
+único contexto) y el total con el renderizado de los archivos.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_case_context
+"""
+
+import io
+import time
+import tempfile
+import contextlib
+
+from core.case_context import CaseContext
+from core.project_state import project_state
+from ui.conf.bc.conf_U import render_u
+from ui.conf.bc.conf_T import render_t
+from ui.conf.bc.conf_P import render_p
+from ui.conf.bc.conf_p_rgh import render_p_rgh
+from ui.conf.bc.conf_k import render_k
+from ui.conf.bc.conf_epsilon import render_epsilon
+from ui.conf.bc.conf_omega import render_omega
+from ui.conf.bc.conf_nut import render_nut
+from ui.conf.bc.conf_alphat import render_alphat
+
+N_PATCHES = 2000
+REPEAT = 5
+RENDERERS = [render_u, render_t, render_p, render_p_rgh, render_k,
+             render_epsilon, render_omega, render_nut, render_alphat]
+
+
+def make_boundary_conditions():
+    bcs = {}
+    for i in range(N_PATCHES):
+        kind = ("inlet", "outlet", "wall")[i % 3]
+        bc = {"type": kind, "temperature": 300.0 + i % 7, "kType": "fixedValue", "kValue": 0.1,
+              "epsilonType": "fixedValue", "epsilonValue": 10.0, "omegaType": "fixedValue", "omegaValue": 1.0}
+        if kind == "inlet":
+            bc.update(velocityType="fixedValue", velocityValue=1.0, velocityInit=1.0)
+        elif kind == "outlet":
+            bc.update(pressureValue=1e5)
+        else:
+            bc.update(noFriction=False, alphaType="alphatWallFunction", alphaValue=0.85)
+        bcs[f"patch{i}"] = bc
+    return {"ambientPressure": 1e5, "ambientTemperature": 300.0, "boundaryConditions": bcs,
+            "chemistryActive": False, "chosen_species": [], "Turbulence_model": "kEpsilon"}
+
+
+def run():
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        state = project_state(tmp)
+        state.replace("boundary_conditions", make_boundary_conditions(), persist=False)
+        state.replace("case_config", {"solverSettings": {"calculationType": "Compresible"}}, persist=False)
+
+        # antes: una copia de la sección por generador
+        t0 = time.perf_counter()
+        for _ in range(REPEAT):
+            for _renderer in RENDERERS:
+                state.section("boundary_conditions")
+                state.section("case_config")
+        before_load = (time.perf_counter() - t0) / REPEAT
+
+        # ahora: un contexto compartido
+        t0 = time.perf_counter()
+        for _ in range(REPEAT):
+            ctx = CaseContext.load(tmp, data_dir=tmp, validate=False)
+        after_load = (time.perf_counter() - t0) / REPEAT
+
+        t0 = time.perf_counter()
+        for _ in range(REPEAT):
+            for renderer in RENDERERS:
+                renderer(ctx)
+        render = (time.perf_counter() - t0) / REPEAT
+    return before_load, after_load, render
+
+
+def main():
+    print(f"{N_PATCHES} fronteras, {len(RENDERERS)} generadores de la carpeta 0\n")
+    before_load, after_load, render = run()
+    print(f"{'':<28} {'carga (ms)':>11} {'total (ms)':>11}")
+    print(f"{'copia por generador':<28} {before_load * 1e3:>11.1f} {(before_load + render) * 1e3:>11.1f}")
+    print(f"{'CaseContext compartido':<28} {after_load * 1e3:>11.1f} {(after_load + render) * 1e3:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# benchmarks/bench_generation.py
+
+"""
+Benchmark del ejecutor de generación (core/generation.py).
+
+Se genera la carpeta 0 de un caso con N_PATCHES fronteras, kEpsilon y
+todas las especies de la librería activas, renderizando los archivos en
+serie y en un pool de procesos. Con varios núcleos el tiempo del pool baja
+aproximadamente en proporción a su número (el primer uso incluye el
+arranque de los procesos). Por último se mide una regeneración incremental
+sin cambios en el caso, en la que no se renderiza ni se escribe nada, y la
+vista previa (render_tree + diff, sin escribir) tras cambiar la presión de
+una salida.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_generation [procesos]
+"""
+
+import io
+import os
+import sys
+import time
+import logging
+import tempfile
+import contextlib
+
+from core.case_context import CaseContext, thaw
+from core.generation import render_tree, run_targets
+from core.species_library import get_species_library
+from ui.conf.bc.conf_especies import parse_species_library
+from ui.conf.targets import boundary_targets
+
+N_PATCHES = 5000
+REPEAT = 3
+
+
+def make_context(data_dir):
+    species = parse_species_library(get_species_library())
+    bcs = {}
+    for i in range(N_PATCHES):
+        kind = ("inlet", "outlet", "wall")[i % 3]
+        bc = {"type": kind, "temperature": 300.0 + i % 7, "kType": "fixedValue", "kValue": 0.1,
+              "epsilonType": "fixedValue", "epsilonValue": 10.0}
+        if kind == "inlet":
+            bc.update(velocityType="fixedValue", velocityValue=1.0, velocityInit=1.0)
+            bc.update({f"{s}_chemValue": 0.1 for s in species})
+        elif kind == "outlet":
+            bc.update(pressureValue=1e5)
+        else:
+            bc.update(noFriction=False, alphaType="alphatWallFunction", alphaValue=0.85)
+        bcs[f"patch{i}"] = bc
+    boundary_conditions = {"ambientPressure": 1e5, "ambientTemperature": 300.0, "boundaryConditions": bcs,
+                           "chemistryActive": True, "chosen_species": species, "Turbulence_model": "kEpsilon"}
+    return CaseContext.from_sections({"boundary_conditions": boundary_conditions}, data_dir=data_dir)
+
+
+def measure(ctx, targets, executor, workers, force=True):
+    best = float("inf")
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        report = run_targets(ctx, targets, workers=workers, executor=executor, force=force)
+        best = min(best, time.perf_counter() - t0)
+        assert report.ok, report.format_errors()
+    return best, report
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 1)
+    logging.disable(logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        ctx = make_context(tmp)
+        targets = boundary_targets(ctx)
+        serial, _ = measure(ctx, targets, "serial", 1)
+        parallel, parallel_report = measure(ctx, targets, "process", workers)
+        incremental, _ = measure(ctx, targets, "serial", 1, force=False)
+
+        sections = {name: thaw(data) for name, data in ctx.sections.items()}
+        sections["boundary_conditions"]["boundaryConditions"]["patch1"]["pressureValue"] = 2e5
+        changed = CaseContext.from_sections(sections, data_dir=tmp)
+        t0 = time.perf_counter()
+        tree = render_tree(changed, boundary_targets(changed), executor="serial")
+        diff = tree.diff()
+        preview = time.perf_counter() - t0
+        assert diff and len(tree.changes) == 1
+
+    print(f"{N_PATCHES} fronteras, {len(targets)} archivos, {os.cpu_count()} núcleos\n")
+    print(f"{'serie':<24} {serial * 1e3:>9.1f} ms")
+    print(f"{f'procesos ({parallel_report.workers})':<24} {parallel * 1e3:>9.1f} ms   x{serial / parallel:.2f}")
+    print(f"{'incremental sin cambios':<24} {incremental * 1e3:>9.1f} ms   x{serial / incremental:.2f}")
+    print(f"{'vista previa (1 cambio)':<24} {preview * 1e3:>9.1f} ms   x{serial / preview:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# benchmarks/bench_history.py
+
+"""
+Benchmark del historial deshacer/rehacer (core/history.py) con un case_config
+grande: miles de inyecciones y de condiciones de contorno.
+
+Se aplican STEPS ediciones pequeñas (un campo de una inyección, una
+condición de contorno, añadir o quitar una inyección) registrando cada una
+con CaseHistory.commit, y se compara la memoria retenida por el historial
+con la de guardar una copia profunda de case_config por paso. También se
+mide el coste de undo/redo según el tamaño de case_config.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_history
+"""
+
+import copy
+import time
+import random
+import tracemalloc
+
+from core.history import CaseHistory
+
+N_INJECTIONS = 5000
+N_PATCHES = 2000
+STEPS = 5000
+
+
+def make_case_config(n_injections=N_INJECTIONS, n_patches=N_PATCHES):
+    return {
+        "ambientPressure": 101325.0,
+        "boundaryConditions": {f"patch{i}": {"type": "Wall", "value": "", "T": 300.0}
+                               for i in range(n_patches)},
+        "injections": [{"name": f"inj{i}", "position": [float(i), 0.0, 0.0], "direction": [0, 0, 1],
+                        "massTotal": 1e-3, "diameters": [1e-5, 2e-5, 5e-5]}
+                       for i in range(n_injections)],
+    }
+
+
+def edit(case_config, rng, i):
+    """Aplica una edición y devuelve el camino tocado (como lo sabría la GUI)."""
+    injections = case_config["injections"]
+    r = rng.random()
+    if r < 0.7:
+        row = rng.randrange(len(injections))
+        injections[row]["massTotal"] = rng.random()
+        return ("injections", row)
+    if r < 0.98:
+        name = f"patch{rng.randrange(N_PATCHES)}"
+        case_config["boundaryConditions"][name]["T"] = 300.0 + i
+        return ("boundaryConditions", name)
+    if r < 0.99:
+        injections.append(dict(injections[-1], name=f"new{i}"))
+    else:
+        injections.pop(rng.randrange(len(injections)))
+    return ("injections",)
+
+
+def measure_memory():
+    rng = random.Random(0)
+    case_config = make_case_config()
+
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    full_copy = copy.deepcopy(case_config)
+    deep_copy_bytes = tracemalloc.get_traced_memory()[0] - base
+    del full_copy
+
+    base = tracemalloc.get_traced_memory()[0]
+    history = CaseHistory(case_config)
+    snapshot_bytes = tracemalloc.get_traced_memory()[0] - base
+    for i in range(STEPS):
+        path = edit(case_config, rng, i)
+        history.commit(case_config, f"edición {i}", paths=[path])
+    history_bytes = tracemalloc.get_traced_memory()[0] - base - snapshot_bytes
+    tracemalloc.stop()
+
+    # Coste del commit (sin tracemalloc): con camino y comparando todo case_config
+    timings = {}
+    for label, with_path in (("con camino", True), ("completo", False)):
+        n = 1000 if with_path else 20
+        t0 = time.perf_counter()
+        for i in range(n):
+            path = edit(case_config, rng, i)
+            history.commit(case_config, paths=[path] if with_path else None)
+        timings[label] = (time.perf_counter() - t0) / n
+
+    print(f"case_config: {N_INJECTIONS} inyecciones, {N_PATCHES} condiciones de contorno")
+    print(f"  copia profunda por paso:     {deep_copy_bytes / 1e6:8.2f} MB "
+          f"-> {STEPS} pasos ~ {deep_copy_bytes * STEPS / 1e9:.1f} GB")
+    print(f"  versión inicial congelada:   {snapshot_bytes / 1e6:8.2f} MB")
+    print(f"  {STEPS} pasos del historial:   {history_bytes / 1e6:8.2f} MB "
+          f"({history_bytes / STEPS / 1e3:.2f} kB/paso)")
+    for label, seconds in timings.items():
+        print(f"  commit {label + ':':<21} {seconds * 1e3:8.2f} ms/paso")
+    return history, case_config
+
+
+def measure_undo_redo():
+    print("\nundo + redo de un cambio de campo (µs), según el tamaño de case_config:")
+    for scale in (100, 1000, 10000):
+        case_config = make_case_config(scale, scale)
+        history = CaseHistory(case_config)
+        rng = random.Random(1)
+        for i in range(200):
+            row = rng.randrange(scale)
+            case_config["injections"][row]["massTotal"] = rng.random()
+            history.commit(case_config, paths=[("injections", row)])
+        t0 = time.perf_counter()
+        for _ in range(200):
+            history.undo(case_config)
+        for _ in range(200):
+            history.redo(case_config)
+        per_step = (time.perf_counter() - t0) / 400 * 1e6
+        print(f"  {scale:>6} inyecciones/contornos: {per_step:8.1f}")
+
+
+def main():
+    measure_memory()
+    measure_undo_redo()
+
+
+if __name__ == "__main__":
+    main()
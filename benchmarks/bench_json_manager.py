@@ -0,0 +1,78 @@
+# benchmarks/bench_json_manager.py
+
+"""
+Benchmark del coste de validación por guardado en JSONManager: ruta anterior
+(load_schema + jsonschema.validate en cada llamada, que relee el esquema y
+reconstruye y comprueba el validador) frente al validador compilado en
+caché (JSONManager.get_validator).
+
+Se mide sólo la validación y el save_section completo, en un directorio
+temporal y con los esquemas reales de schema/.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_json_manager
+"""
+
+import io
+import json
+import time
+import tempfile
+import contextlib
+
+from jsonschema import validate
+
+from core.json_manager import JSONManager
+
+SECTIONS = ("controlDict", "fvSolution")
+ITERATIONS = 500
+
+
+def legacy_validate(jm, section_name, data):
+    """Validación anterior: esquema leído y validador creado en cada llamada."""
+    schema = jm.load_schema(section_name)
+    if schema:
+        validate(instance=data, schema=schema)
+
+
+def cached_validate(jm, section_name, data):
+    return jm.validate_section(section_name, data)
+
+
+def legacy_save(jm, section_name, data):
+    legacy_validate(jm, section_name, data)
+    with open(jm.get_file_path(section_name), "w") as f:
+        json.dump(data, f, indent=4)
+
+
+def cached_save(jm, section_name, data):
+    jm.save_section(section_name, data)
+
+
+def per_call(func, jm, section_name, data):
+    """Tiempo medio por llamada (µs), silenciando los print de JSONManager."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        func(jm, section_name, data)   # calentamiento (compila el validador)
+        t0 = time.perf_counter()
+        for _ in range(ITERATIONS):
+            func(jm, section_name, data)
+        return (time.perf_counter() - t0) / ITERATIONS * 1e6
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        with contextlib.redirect_stdout(io.StringIO()):
+            jm = JSONManager(tmp)
+            samples = {s: JSONManager().load_section(s) for s in SECTIONS}
+        assert not jm.validate_many(samples), "Los datos de ejemplo no cumplen el esquema"
+
+        print(f"{'sección':<12} {'operación':<12} {'anterior (µs)':>14} {'caché (µs)':>11} {'x':>6}")
+        for section_name, data in samples.items():
+            for label, legacy, cached in (("validación", legacy_validate, cached_validate),
+                                          ("save", legacy_save, cached_save)):
+                before = per_call(legacy, jm, section_name, data)
+                after = per_call(cached, jm, section_name, data)
+                print(f"{section_name:<12} {label:<12} {before:>14.1f} {after:>11.1f} {before / after:>6.1f}")
+
+
+if __name__ == "__main__":
+    main()
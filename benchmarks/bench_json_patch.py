@@ -0,0 +1,88 @@
+# benchmarks/bench_json_patch.py
+
+"""
+Benchmark del guardado incremental con parches JSON (core/json_patch.py,
+JSONManager.patch_section) frente a reescribir la sección completa.
+
+Una sección Disperse_fase con N_INJECTIONS inyecciones recibe EDITS
+ediciones de un campo de una inyección. Para cada backend se mide el tiempo
+por guardado y los bytes escritos (tamaño del archivo o parche), y el coste
+de cargar la sección con el registro de parches pendiente.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_json_patch
+"""
+
+import io
+import copy
+import json
+import time
+import random
+import tempfile
+import contextlib
+
+from core.json_manager import JSONManager
+from core.json_patch import make_patch
+
+N_INJECTIONS = 5000
+EDITS = 200
+
+
+def make_section():
+    return {"discrete_phase_active": True, "injections": [
+        {"name": f"inj{i}", "type": "patchInjection", "massTotal": 1e-3, "SOI": 0.0,
+         "position": [float(i), 0.0, 0.0], "direction": [0.0, 0.0, 1.0],
+         "sizeDistribution": {"type": "RosinRammler", "minValue": 1e-6, "maxValue": 1e-4}}
+        for i in range(N_INJECTIONS)]}
+
+
+def run(backend):
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        jm = JSONManager(tmp, backend=backend)
+        data = make_section()
+        jm.save_section("Disperse_fase", data)
+        full_bytes = len(json.dumps(data, indent=4))
+
+        edits = []
+        for i in range(EDITS):
+            new = copy.deepcopy(data) if i == 0 else edits[-1]
+            new = copy.copy(new)
+            new["injections"] = list(new["injections"])
+            row = rng.randrange(N_INJECTIONS)
+            new["injections"][row] = dict(new["injections"][row], massTotal=rng.random())
+            edits.append(new)
+
+        t0 = time.perf_counter()
+        for new in edits:
+            jm.save_section("Disperse_fase", new)
+        full_time = (time.perf_counter() - t0) / EDITS
+
+        jm.save_section("Disperse_fase", data)
+        previous, patch_bytes = data, 0
+        t0 = time.perf_counter()
+        for new in edits:
+            ops = make_patch(previous, new)
+            patch_bytes += len(json.dumps(ops, separators=(",", ":")))
+            jm.patch_section("Disperse_fase", ops, new)
+            previous = new
+        patch_time = (time.perf_counter() - t0) / EDITS
+
+        t0 = time.perf_counter()
+        loaded = jm.load_section("Disperse_fase")
+        load_time = time.perf_counter() - t0
+        assert loaded == edits[-1]
+    return full_time, full_bytes, patch_time, patch_bytes / EDITS, load_time
+
+
+def main():
+    print(f"Disperse_fase con {N_INJECTIONS} inyecciones, {EDITS} ediciones de un campo\n")
+    print(f"{'backend':<8} {'completo (ms / kB)':>20} {'parche (ms / B)':>18} {'cargar (ms)':>12}")
+    for backend in ("json", "sqlite"):
+        full_time, full_bytes, patch_time, patch_bytes, load_time = run(backend)
+        print(f"{backend:<8} {full_time * 1e3:>9.2f} / {full_bytes / 1e3:>7.0f} "
+              f"{patch_time * 1e3:>8.2f} / {patch_bytes:>6.0f} {load_time * 1e3:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
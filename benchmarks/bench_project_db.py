@@ -0,0 +1,87 @@
+# benchmarks/bench_project_db.py
+
+"""
+Benchmark de los backends de JSONManager ("json": un archivo por sección,
+"sqlite": core/sqlite_store.py) con un proyecto sintético grande: muchas
+secciones (puntos de diseño) y una sección Disperse_fase con miles de
+inyecciones.
+
+Se mide el tiempo de leer y guardar una sección, y el tiempo y el pico de
+memoria (tracemalloc) de export_all frente a la exportación anterior, que
+cargaba todas las secciones en un único dict.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_project_db
+"""
+
+import io
+import os
+import json
+import time
+import tempfile
+import contextlib
+import tracemalloc
+
+from core.json_manager import JSONManager
+
+N_SECTIONS = 2000       # secciones del proyecto (p.ej. puntos de diseño)
+N_INJECTIONS = 5000     # inyecciones en Disperse_fase
+ITERATIONS = 200
+
+
+def make_sections():
+    sections = {f"design_point_{i:04d}": {"endTime": i, "deltaT": 1e-4, "writeInterval": 100,
+                                          "patches": {f"patch{j}": {"value": j} for j in range(20)}}
+                for i in range(N_SECTIONS)}
+    sections["Disperse_fase"] = {"injectors": [
+        {"name": f"inj{i}", "position": [i, 0.0, 0.0], "direction": [0, 0, 1],
+         "massTotal": 1e-3, "diameters": list(range(10))} for i in range(N_INJECTIONS)]}
+    return sections
+
+
+def legacy_export(jm, export_path):
+    """Exportación anterior: todas las secciones a un dict y un json.dump."""
+    all_data = {name: jm.load_section(name) for name in jm.section_names()}
+    with open(export_path, "w") as f:
+        json.dump(all_data, f, indent=4)
+
+
+def measure(func, *args):
+    """(segundos, pico de memoria en MB) de una llamada."""
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def per_call(func, *args):
+    t0 = time.perf_counter()
+    for _ in range(ITERATIONS):
+        func(*args)
+    return (time.perf_counter() - t0) / ITERATIONS * 1e6
+
+
+def main():
+    sections = make_sections()
+    print(f"{N_SECTIONS} secciones + Disperse_fase con {N_INJECTIONS} inyecciones\n")
+    print(f"{'backend':<8} {'leer (µs)':>10} {'guardar (µs)':>13} "
+          f"{'export ant. (s/MB)':>19} {'export (s/MB)':>14}")
+    for backend in ("json", "sqlite"):
+        with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+            # Las exportaciones van fuera de data_dir (el backend json las tomaría por secciones)
+            jm = JSONManager(os.path.join(tmp, "data"), backend=backend)
+            jm.save_sections(sections)
+            sample = sections["design_point_0001"]
+            read = per_call(jm.load_section, "design_point_1000")
+            save = per_call(lambda: jm.save_section("design_point_0001", dict(sample, endTime=time.time())))
+            legacy = measure(legacy_export, jm, os.path.join(tmp, "legacy.json"))
+            stream = measure(jm.export_all, os.path.join(tmp, "export.json"))
+        print(f"{backend:<8} {read:>10.1f} {save:>13.1f} "
+              f"{legacy[0]:>10.2f} / {legacy[1]:>5.1f} {stream[0]:>6.2f} / {stream[1]:>5.1f}")
+
+
+if __name__ == "__main__":
+    main()
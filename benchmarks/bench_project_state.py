@@ -0,0 +1,80 @@
+# benchmarks/bench_project_state.py
+
+"""
+Cuenta las lecturas de archivos de datos del proyecto (temp/*.json y
+config.json) durante el arranque de la GUI (construcción de MainWindow) y
+durante "Inicializar Caso" (RunCalculation._on_initialize).
+
+Se ejecuta sobre una copia del repositorio en un directorio temporal, para
+no tocar temp/ ni DP0 del árbol de trabajo, con Qt en modo 'offscreen'.
+Las lecturas se cuentan interceptando builtins.open en modo lectura.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_project_state
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+IGNORE = shutil.ignore_patterns(".git", ".venv", "__pycache__", "*.pyc", "DP0")
+
+MEASURE = r'''
+import os, sys, json, builtins, collections
+sys.path.insert(0, os.getcwd())
+reads = collections.Counter()
+_open = builtins.open
+
+def counting_open(file, mode="r", *args, **kwargs):
+    path = os.path.abspath(str(file)) if isinstance(file, (str, bytes, os.PathLike)) else ""
+    if "r" in mode and "+" not in mode and path.startswith(os.getcwd()) \
+            and (path.endswith(".json") and os.sep + "temp" + os.sep in path
+                 or path.endswith("config.json")):
+        reads[os.path.relpath(path)] += 1
+    return _open(file, mode, *args, **kwargs)
+
+builtins.open = counting_open
+
+from PyQt5.QtWidgets import QApplication, QMessageBox
+app = QApplication([])
+QMessageBox.information = QMessageBox.critical = QMessageBox.warning = staticmethod(lambda *a, **k: 0)
+
+from ui.main_window import MainWindow
+window = MainWindow()
+startup = dict(reads)
+reads.clear()
+window.page_run_calc._on_initialize()
+init = dict(reads)
+print(json.dumps({"startup": startup, "initialize": init}))
+'''
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        copy = os.path.join(tmp, "project")
+        shutil.copytree(ROOT, copy, ignore=IGNORE)
+        with open(os.path.join(copy, "config.json"), "w") as f:
+            json.dump({"working_directory": os.path.join(tmp, "case")}, f)
+
+        env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+        out = subprocess.run([sys.executable, "-c", MEASURE], cwd=copy, env=env,
+                             capture_output=True, text=True)
+        lines = [l for l in out.stdout.splitlines() if l.startswith("{")]
+        if out.returncode != 0 or not lines:
+            print(out.stderr[-2000:])
+            sys.exit(1)
+        result = json.loads(lines[-1])
+
+    for phase, label in (("startup", "Arranque"), ("initialize", "Inicializar Caso")):
+        counts = result[phase]
+        print(f"{label}: {sum(counts.values())} lecturas")
+        for path, n in sorted(counts.items(), key=lambda kv: -kv[1]):
+            print(f"    {n:>3}  {path}")
+
+
+if __name__ == "__main__":
+    main()
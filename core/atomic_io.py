@@ -0,0 +1,190 @@
+# core/atomic_io.py
+
+"""
+Escritura atómica de archivos y bloqueo del directorio del proyecto.
+
+- atomic_write_bytes / atomic_write_json: se escribe un temporal en el mismo
+  directorio, se hace fsync y se sustituye el destino con os.replace. Un
+  lector (u otro proceso) ve siempre el archivo anterior completo o el
+  nuevo completo, nunca uno truncado. atomic_open hace lo mismo para
+  escrituras por partes. atomic_write_many escribe un lote de archivos:
+  primero todos los temporales y después todos los os.replace.
+- project_lock: bloqueo consultivo (fcntl.flock) sobre '<dir>/.lock' para
+  que la GUI y scripts por lotes no mezclen escrituras en el mismo
+  proyecto. Es reentrante dentro del proceso y serializa también los hilos.
+  En sistemas sin fcntl (Windows) sólo se serializan los hilos.
+- Diario (journal): archivo JSON Lines de sólo-añadir para guardados de
+  varias secciones; ver JSONManager.save_sections / recover.
+"""
+
+import os
+import json
+import threading
+import contextlib
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+LOCK_FILE = ".lock"
+TMP_SUFFIX = ".tmp"
+
+# {directorio: [RLock, profundidad, descriptor]}
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def _fsync_dir(directory):
+    """fsync del directorio para que el os.replace sobreviva a un corte."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@contextlib.contextmanager
+def atomic_open(path, mode="wb", encoding=None):
+    """
+    Abre un temporal para escribir 'path' por partes (p.ej. una exportación
+    en streaming); al salir del bloque sin error sustituye el destino. Si hay
+    una excepción el destino no se toca.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp = os.path.join(directory, f".{os.path.basename(path)}.{os.getpid()}.{threading.get_ident()}{TMP_SUFFIX}")
+    try:
+        with open(tmp, mode, encoding=encoding) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+        raise
+    _fsync_dir(directory)
+
+
+def atomic_write_bytes(path, data):
+    """Escribe 'data' en 'path' de forma atómica (temporal + fsync + os.replace)."""
+    with atomic_open(path, "wb") as f:
+        f.write(data)
+
+
+def atomic_write_text(path, text, encoding="utf-8"):
+    atomic_write_bytes(path, text.encode(encoding))
+
+
+def atomic_write_many(files):
+    """
+    Escribe un lote {ruta: bytes}. Se preparan (y fsync) todos los
+    temporales antes de sustituir ningún destino, así que si falla uno no se
+    toca ninguno; después se sustituyen todos y se hace un único fsync por
+    directorio.
+    """
+    staged = []
+    try:
+        for path, data in files.items():
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            tmp = os.path.join(directory, f".{os.path.basename(path)}.{os.getpid()}.{threading.get_ident()}{TMP_SUFFIX}")
+            staged.append((tmp, path))
+            with open(tmp, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+        while staged:
+            tmp, path = staged[-1]
+            os.replace(tmp, path)
+            staged.pop()
+    except BaseException:
+        for tmp, _ in staged:
+            with contextlib.suppress(OSError):
+                os.remove(tmp)
+        raise
+    for directory in {os.path.dirname(os.path.abspath(path)) for path in files}:
+        _fsync_dir(directory)
+
+
+def atomic_write_json(path, data, indent=4, ensure_ascii=True):
+    """json.dump atómico; la serialización se hace antes de tocar el disco."""
+    atomic_write_text(path, json.dumps(data, indent=indent, ensure_ascii=ensure_ascii))
+
+
+def remove_stale_temporaries(directory):
+    """Borra temporales de escrituras interrumpidas ('.<nombre>.<pid>.<hilo>.tmp')."""
+    removed = []
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return removed
+    for name in names:
+        if name.startswith(".") and name.endswith(TMP_SUFFIX):
+            with contextlib.suppress(OSError):
+                os.remove(os.path.join(directory, name))
+                removed.append(name)
+    return removed
+
+
+@contextlib.contextmanager
+def project_lock(directory):
+    """
+    Bloqueo exclusivo del directorio del proyecto. Reentrante: el mismo hilo
+    puede anidarlo (p.ej. update_section -> save_section) sin bloquearse.
+    """
+    key = os.path.abspath(directory)
+    with _locks_guard:
+        entry = _locks.setdefault(key, [threading.RLock(), 0, None])
+    entry[0].acquire()
+    try:
+        if entry[1] == 0 and fcntl is not None:
+            os.makedirs(key, exist_ok=True)
+            fd = os.open(os.path.join(key, LOCK_FILE), os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            except BaseException:
+                os.close(fd)
+                raise
+            entry[2] = fd
+        entry[1] += 1
+        try:
+            yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and entry[2] is not None:
+                fd, entry[2] = entry[2], None
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
+    finally:
+        entry[0].release()
+
+
+def append_journal(path, record):
+    """Añade un registro JSON al diario y lo lleva a disco antes de volver."""
+    line = json.dumps(record, separators=(",", ":")) + "\n"
+    with open(path, "ab") as f:
+        f.write(line.encode("utf-8"))
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def read_journal(path):
+    """
+    Registros del diario. Una última línea incompleta (corte durante el
+    append) se descarta.
+    """
+    records = []
+    try:
+        with open(path, "rb") as f:
+            for raw in f:
+                try:
+                    records.append(json.loads(raw))
+                except ValueError:
+                    break
+    except FileNotFoundError:
+        pass
+    return records
@@ -0,0 +1,189 @@
+# core/autosave.py
+
+"""
+Servicio de auto-guardado en segundo plano.
+
+Las secciones de la GUI llaman a schedule(sección, datos) en cada cambio de
+un widget; el servicio hace una copia de los datos y un hilo escritor los
+guarda con JSONManager cuando la sección lleva 'window' segundos sin cambios.
+Una ráfaga de cambios (p.ej. mantener pulsada la flecha de un spinbox) se
+agrupa en una sola escritura con los datos más recientes, y cada sección se
+escribe como mucho una vez por ventana. Si los cambios no cesan, la sección
+se escribe igualmente tras 'max_delay' segundos.
+
+Si el servicio conoce la versión guardada de la sección (la última que
+escribió, o la que le pasa ProjectState con remember() al leerla) y sigue
+siendo la del disco, sólo escribe la diferencia como parche JSON
+(JSONManager.patch_section): editar una inyección de una lista de miles
+escribe unos bytes en lugar de la sección entera.
+
+Los errores se notifican con el callback on_error(sección, mensaje), que se
+invoca desde el hilo escritor; la GUI debe reenviarlo a su hilo (p.ej. con
+una señal de Qt).
+"""
+
+import os
+import copy
+import time
+import atexit
+import logging
+import threading
+
+from core.json_manager import JSONManager, default_data_dir
+from core.json_patch import make_patch
+
+AUTOSAVE_WINDOW = 0.5      # s sin cambios antes de escribir una sección
+AUTOSAVE_MAX_DELAY = 3.0   # s máximos que un cambio puede esperar
+
+# {data_dir: AutosaveService}
+_services = {}
+_service_lock = threading.Lock()
+
+
+class AutosaveService:
+    def __init__(self, json_manager=None, window=AUTOSAVE_WINDOW, max_delay=AUTOSAVE_MAX_DELAY,
+                 on_error=None, on_saved=None):
+        self.json_manager = json_manager or JSONManager()
+        self.window = window
+        self.max_delay = max(max_delay, window)
+        self.on_error = on_error
+        self.on_saved = on_saved
+
+        # {sección: [datos, primer cambio pendiente, último cambio]}
+        self._pending = {}
+        self._last_write = {}
+        self._writing = set()
+        # {sección: (section_token, datos)} de la última versión guardada
+        self._persisted = {}
+        self._cond = threading.Condition()
+        self._stopped = False
+        self.writes = 0
+        self.coalesced = 0
+        self.patched = 0
+
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+    def schedule(self, section_name, data):
+        """Encola los datos de una sección; sustituye a los pendientes."""
+        snapshot = copy.deepcopy(data)
+        now = time.monotonic()
+        with self._cond:
+            entry = self._pending.get(section_name)
+            if entry:
+                entry[0] = snapshot
+                entry[2] = now
+                self.coalesced += 1
+            else:
+                self._pending[section_name] = [snapshot, now, now]
+            self._cond.notify()
+
+    def remember(self, section_name, data, token):
+        """
+        Registra 'data' como la versión guardada de la sección con el
+        identificador 'token' (JSONManager.section_token), para que el
+        próximo guardado pueda ser un parche.
+        """
+        self._persisted[section_name] = (token, copy.deepcopy(data))
+
+    def _due_time(self, section_name, entry):
+        _, first, last = entry
+        due = min(last + self.window, first + self.max_delay)
+        return max(due, self._last_write.get(section_name, float("-inf")) + self.window)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopped and not self._pending:
+                        return
+                    now = time.monotonic()
+                    due = {s: self._due_time(s, e) for s, e in self._pending.items()}
+                    ready = [s for s, t in due.items() if t <= now or self._stopped]
+                    if ready:
+                        break
+                    self._cond.wait(min(due.values()) - now if due else None)
+                batch = [(s, self._pending.pop(s)[0]) for s in ready]
+                self._writing.update(ready)
+
+            for section_name, data in batch:
+                self._write(section_name, data)
+
+            with self._cond:
+                now = time.monotonic()
+                for section_name, _ in batch:
+                    self._last_write[section_name] = now
+                self._writing.difference_update(ready)
+                self._cond.notify_all()
+
+    def _write(self, section_name, data):
+        jm = self.json_manager
+        known = self._persisted.pop(section_name, None)
+        try:
+            # Con el bloqueo, el token que se guarda es el de lo que se acaba de escribir
+            with jm.lock():
+                if known is not None and known[0] is not None and known[0] == jm.section_token(section_name):
+                    # patch_section vuelve a comprobar el token con el bloqueo del proyecto
+                    ok, msg = jm.patch_section(section_name, make_patch(known[1], data), data, known[0])
+                    self.patched += 1
+                else:
+                    ok, msg = jm.save_section(section_name, data)
+                if ok:
+                    self._persisted[section_name] = (jm.section_token(section_name), data)
+        except Exception as e:
+            ok, msg = False, f"Error al guardar '{section_name}': {e}"
+        self.writes += 1
+        if not ok:
+            # El handler de logging de la GUI no es seguro desde este hilo:
+            # si hay callback, es la GUI quien registra el error
+            if self.on_error:
+                self.on_error(section_name, msg)
+            else:
+                logging.error(f"[autosave] {msg}")
+        elif self.on_saved:
+            self.on_saved(section_name)
+
+    def flush(self, timeout=None):
+        """
+        Escribe ya todo lo pendiente y espera a que termine. Se debe llamar
+        antes de leer las secciones desde disco (generación de archivos,
+        cierre de la aplicación).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            for section_name in self._pending:
+                self._last_write.pop(section_name, None)
+                entry = self._pending[section_name]
+                entry[1] = entry[2] = float("-inf")
+            self._cond.notify_all()
+            while self._pending or self._writing:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def pending_sections(self):
+        with self._cond:
+            return sorted(set(self._pending) | self._writing)
+
+    def stop(self):
+        """Escribe lo pendiente y detiene el hilo escritor."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        self._thread.join()
+
+
+def autosave_service(data_dir=None):
+    """
+    Servicio compartido para la carpeta de datos 'data_dir' (por defecto
+    temp/ del proyecto); se crea al primer uso.
+    """
+    key = os.path.abspath(data_dir or default_data_dir())
+    with _service_lock:
+        service = _services.get(key)
+        if service is None:
+            service = _services[key] = AutosaveService(JSONManager(key))
+            atexit.register(service.stop)
+        return service
@@ -1,81 +1,203 @@
-def parse_openfoam_boundary(boundary_file_path):
+# core/boundary_parser.py
+
+import numpy as np
+
+from core.foam_tokenizer import (
+    DEFAULT_CHUNK_SIZE, tokenize_foam_chunks, find_closing, list_words
+)
+
+# Separador de los grupos (inGroups) dentro de la columna 'groups'
+GROUP_SEPARATOR = ","
+
+
+def read_boundary_table(boundary_file_path, chunk_size=DEFAULT_CHUNK_SIZE):
     """
-    Parsea el archivo 'boundary' de un caso de OpenFOAM y extrae 
-    la información sobre las fronteras.
+    Lee el archivo 'boundary' de un caso de OpenFOAM con un tokenizador que
+    recorre el archivo una sola vez, por bloques, y devuelve la tabla de patches.
+
+    Acepta comentarios en línea, entradas en una sola línea
+    ('inlet { type patch; nFaces 10; startFace 0; }') y listas como
+    'inGroups List<word> 1(wall);'.
 
     Parámetros
     ----------
     boundary_file_path : str
         Ruta completa al archivo 'boundary' dentro de constant/polyMesh/
+    chunk_size : int
+        Tamaño de los bloques de lectura (caracteres).
 
     Retorna
     -------
-    list of dict
-        Una lista de diccionarios, cada uno representando una frontera con las llaves:
-        {
-          "name": str,
-          "type": str,
-          "nFaces": int,
-          "startFace": int
-        }
+    numpy.ndarray
+        Array estructurado con un registro por patch y los campos
+        name, type, nFaces, startFace (-1 si faltan) y groups (los inGroups
+        unidos por GROUP_SEPARATOR).
     """
-    boundaries = []
-    with open(boundary_file_path, 'r') as f:
-        lines = f.readlines()
-
-    # Eliminamos espacios vacíos y líneas en blanco
-    lines = [line.strip() for line in lines if line.strip()]
-
-    # Buscar número de patches
+    columns = ([], [], [], [], [])
     num_boundaries = None
-    start_index = None
-    for i, line in enumerate(lines):
-        if line.isdigit():
-            # Encontramos una línea con un dígito, comprobar la siguiente línea para '('
-            if i+1 < len(lines) and lines[i+1] == '(':
-                num_boundaries = int(line)
-                start_index = i+2
-                break
+    finished = False
 
-    if num_boundaries is None or start_index is None:
+    buf, pos = [], 0
+    for chunk in tokenize_foam_chunks(boundary_file_path, chunk_size):
+        buf = buf[pos:] + chunk if pos < len(buf) else chunk
+        pos = 0
+        if num_boundaries is None:
+            pos, num_boundaries = _find_patch_list(buf)
+            if pos < 0:
+                pos, num_boundaries = 0, None
+                continue
+        pos, finished = _read_patches(buf, pos, columns)
+        if finished:
+            break
+
+    if num_boundaries is None:
         raise ValueError("No se pudo encontrar el número de patches y el '(' en el archivo boundary.")
+    if not finished:
+        raise ValueError("No se encontró ')' al final de la lista de fronteras.")
+
+    names, types, n_faces, start_faces, groups = columns
+    if num_boundaries >= 0 and len(names) != num_boundaries:
+        raise ValueError(
+            f"El archivo boundary declara {num_boundaries} patches pero contiene {len(names)}."
+        )
+
+    table = np.empty(len(names), dtype=boundary_dtype(names, types, groups))
+    table["name"] = names
+    table["type"] = types
+    table["nFaces"] = n_faces
+    table["startFace"] = start_faces
+    table["groups"] = groups
+    return table
+
 
-    i = start_index
-    patches_leidos = 0
-    while i < len(lines) and patches_leidos < num_boundaries:
-        boundary_name = lines[i].strip()
+def _find_patch_list(tokens):
+    """
+    Salta la cabecera FoamFile y devuelve (índice tras '(', nº de patches).
+    El nº es -1 si el archivo no lo declara; el índice es -1 si aún faltan
+    tokens por leer.
+    """
+    i = 0
+    if tokens and tokens[0] == "FoamFile":
+        end = find_closing(tokens, 1) if len(tokens) > 1 else -1
+        if end < 0:
+            return -1, None
+        i = end + 1
+    if i >= len(tokens):
+        return -1, None
+    count = -1
+    if tokens[i].isdigit():
+        count = int(tokens[i])
         i += 1
+        if i >= len(tokens):
+            return -1, None
+    if tokens[i] != "(":
+        raise ValueError("No se pudo encontrar el número de patches y el '(' en el archivo boundary.")
+    return i + 1, count
+
 
-        if i >= len(lines) or lines[i] != '{':
+def _read_patches(tokens, pos, columns):
+    """
+    Lee entradas 'nombre { clave valor; ... }' desde 'pos' y las añade a
+    'columns'. Devuelve (posición del primer patch incompleto, fin de lista).
+    """
+    names, types, n_faces, start_faces, groups = columns
+    n = len(tokens)
+    while pos < n:
+        boundary_name = tokens[pos]
+        if boundary_name == ")":
+            return pos + 1, True
+        if pos + 1 >= n:
+            break
+        if tokens[pos + 1] != "{":
             raise ValueError(f"Se esperaba '{{' después del nombre de la frontera {boundary_name}")
-        i += 1
+        try:
+            end = tokens.index("}", pos + 2)
+        except ValueError:
+            break
+        body = tokens[pos + 2:end]
+        if "{" in body:
+            # Subdiccionario dentro del patch (poco habitual)
+            end = find_closing(tokens, pos + 1)
+            if end < 0:
+                break
+            body = tokens[pos + 2:end]
+
+        btype, nf, sf, grp = "", -1, -1, ""
+        j, m = 0, len(body)
+        while j < m:
+            key = body[j]
+            if j + 1 < m and body[j + 1] == "{":
+                j = find_closing(body, j + 1) + 1
+                continue
+            try:
+                k = body.index(";", j)
+            except ValueError:
+                raise ValueError(f"Falta ';' en la entrada '{key}' de la frontera {boundary_name}")
+            if key == "type":
+                btype = body[j + 1]
+            elif key == "nFaces":
+                nf = int(body[j + 1])
+            elif key == "startFace":
+                sf = int(body[j + 1])
+            elif key == "inGroups":
+                grp = GROUP_SEPARATOR.join(list_words(body[j + 1:k]))
+            j = k + 1
+
+        names.append(boundary_name)
+        types.append(btype)
+        n_faces.append(nf)
+        start_faces.append(sf)
+        groups.append(grp)
+        pos = end + 1
+    return pos, False
 
-        boundary_type = None
-        nFaces = None
-        startFace = None
-
-        while i < len(lines) and lines[i] != '}':
-            line = lines[i]
-            if line.startswith('type'):
-                boundary_type = line.replace('type', '').replace(';', '').strip()
-            elif line.startswith('nFaces'):
-                nFaces_str = line.replace('nFaces', '').replace(';', '').strip()
-                nFaces = int(nFaces_str)
-            elif line.startswith('startFace'):
-                startFace_str = line.replace('startFace', '').replace(';', '').strip()
-                startFace = int(startFace_str)
-            i += 1
-
-        if i >= len(lines) or lines[i] != '}':
-            raise ValueError(f"No se encontró '}}' al final del bloque de la frontera {boundary_name}")
-        i += 1
 
+def boundary_dtype(names=(), types=(), groups=()):
+    """dtype compacto: cada columna de texto sólo ocupa su longitud máxima."""
+    width = lambda values: max(map(len, values), default=0) or 1
+    return np.dtype([
+        ("name", f"U{width(names)}"),
+        ("type", f"U{width(types)}"),
+        ("nFaces", np.int64),
+        ("startFace", np.int64),
+        ("groups", f"U{width(groups)}"),
+    ])
+
+
+def boundary_table_to_list(table):
+    """Convierte la tabla estructurada en la lista de dicts de parse_openfoam_boundary."""
+    boundaries = []
+    for name, btype, n_faces, start_face, groups in table.tolist():
         boundaries.append({
-            "name": boundary_name,
-            "type": boundary_type,
-            "nFaces": nFaces,
-            "startFace": startFace
+            "name": name,
+            "type": btype or None,
+            "nFaces": n_faces if n_faces >= 0 else None,
+            "startFace": start_face if start_face >= 0 else None,
+            "inGroups": groups.split(GROUP_SEPARATOR) if groups else []
         })
-        patches_leidos += 1
-
     return boundaries
+
+
+def parse_openfoam_boundary(boundary_file_path):
+    """
+    Parsea el archivo 'boundary' de un caso de OpenFOAM y extrae 
+    la información sobre las fronteras.
+
+    Parámetros
+    ----------
+    boundary_file_path : str
+        Ruta completa al archivo 'boundary' dentro de constant/polyMesh/
+
+    Retorna
+    -------
+    list of dict
+        Una lista de diccionarios, cada uno representando una frontera con las llaves:
+        {
+          "name": str,
+          "type": str,
+          "nFaces": int,
+          "startFace": int,
+          "inGroups": list of str
+        }
+    """
+    return boundary_table_to_list(read_boundary_table(boundary_file_path))
@@ -0,0 +1,343 @@
+# core/bundle.py
+
+"""
+Proyecto en un único archivo '.ofgui'.
+
+Un bundle es un zip con:
+- manifest.json: formato y versión, config.json del proyecto, índice de
+  secciones y de archivos generados. Se escribe el último, pero el zip
+  permite leerlo directamente sin recorrer el resto.
+- sections/<sección>.json: cada sección del proyecto, comprimida (deflate/zlib).
+- blobs/<sha256>: contenido de los archivos generados (temp/DP0/...). Los
+  archivos idénticos (p.ej. los mismos campos en varios puntos de diseño)
+  se guardan una sola vez.
+
+Abrir un bundle sólo lee el índice del zip y el manifiesto; cada sección se
+descomprime la primera vez que alguien la pide (Bundle.load_section), de
+modo que la GUI arranca cargando sólo lo que muestran sus páginas. El resto
+(secciones no consultadas y archivos generados) se escribe en el proyecto al
+llamar a ProjectState.flush().
+
+Uso desde la línea de comandos (desde la raíz del repositorio):
+    python -m core.bundle save proyecto.ofgui [temp]
+    python -m core.bundle open proyecto.ofgui [temp]
+    python -m core.bundle info proyecto.ofgui
+"""
+
+import os
+import sys
+import json
+import time
+import stat
+import hashlib
+import zipfile
+import argparse
+
+from core.atomic_io import atomic_open, atomic_write_bytes, atomic_write_json
+from core.json_manager import JSONManager, default_data_dir
+from core import workspace
+
+BUNDLE_EXT = ".ofgui"
+BUNDLE_FORMAT = "ofgui"
+BUNDLE_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+SECTIONS_DIR = "sections"
+BLOBS_DIR = "blobs"
+COMPRESS_LEVEL = 6
+CHUNK_SIZE = 1 << 20
+
+
+def _check_relative(rel, what):
+    """ValueError si 'rel' (ruta con '/') es absoluta o sale de su directorio ('..')."""
+    parts = rel.split("/") if isinstance(rel, str) else [""]
+    if (not rel or "\\" in rel or os.path.isabs(rel) or os.path.splitdrive(rel)[0]
+            or any(part in ("", ".", "..") for part in parts)):
+        raise ValueError(f"Bundle no válido: {what} '{rel}' no es una ruta relativa segura")
+
+
+def _inside(base, path, what):
+    """'path' si, resueltos los enlaces, queda dentro de 'base'; si no, ValueError."""
+    root = os.path.realpath(base)
+    if os.path.commonpath([root, os.path.realpath(path)]) != root:
+        raise ValueError(f"Bundle no válido: {what} '{path}' queda fuera de {base}")
+    return path
+
+
+def _generated_files(data_dir):
+    """Rutas relativas (con '/') de los archivos de los subdirectorios de data_dir (DP0, ...)."""
+    files = []
+    for entry in sorted(os.listdir(data_dir)):
+        top = os.path.join(data_dir, entry)
+        if entry.startswith((".", "__")) or not os.path.isdir(top):
+            continue
+        for root, dirs, names in os.walk(top):
+            dirs.sort()
+            for name in sorted(names):
+                path = os.path.join(root, name)
+                files.append(os.path.relpath(path, data_dir).replace(os.sep, "/"))
+    return files
+
+
+def _file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def save_bundle(bundle_path, data_dir=None, json_manager=None, config_path=None):
+    """
+    Guarda el proyecto de 'data_dir' (secciones y archivos generados) y
+    config.json ('config_path', por defecto el del proyecto activo; "" para
+    no incluirlo) en 'bundle_path'. El bundle se escribe en un temporal que
+    sustituye al destino al terminar. Antes de llamar, vacíe el
+    auto-guardado (project_state().flush()) para incluir los últimos cambios.
+    Devuelve el manifiesto.
+    """
+    data_dir = os.path.abspath(data_dir or default_data_dir())
+    jm = json_manager or JSONManager(data_dir)
+    if config_path is None:
+        config_path = workspace.config_path()
+    manifest = {
+        "format": BUNDLE_FORMAT,
+        "version": BUNDLE_VERSION,
+        "created": time.time(),
+        "config": None,
+        "sections": {},
+        "files": {},
+    }
+    if config_path and os.path.exists(config_path):
+        with open(config_path, "r") as f:
+            manifest["config"] = json.load(f)
+
+    with atomic_open(bundle_path, "wb") as raw:
+        with zipfile.ZipFile(raw, "w", zipfile.ZIP_DEFLATED, compresslevel=COMPRESS_LEVEL) as zf:
+            for section_name, data in jm.iter_sections():
+                payload = json.dumps(data, separators=(",", ":")).encode("utf-8")
+                member = f"{SECTIONS_DIR}/{section_name}.json"
+                zf.writestr(member, payload)
+                manifest["sections"][section_name] = {"member": member, "size": len(payload)}
+
+            for rel in _generated_files(data_dir):
+                path = os.path.join(data_dir, *rel.split("/"))
+                digest = _file_digest(path)
+                blob = f"{BLOBS_DIR}/{digest}"
+                if blob not in zf.NameToInfo:
+                    zf.write(path, blob)
+                manifest["files"][rel] = {
+                    "blob": blob,
+                    "size": os.path.getsize(path),
+                    "mode": stat.S_IMODE(os.stat(path).st_mode),
+                }
+
+            zf.writestr(MANIFEST_NAME, json.dumps(manifest, indent=1))
+    print(f"[bundle] Proyecto guardado en {bundle_path}: {len(manifest['sections'])} secciones, "
+          f"{len(manifest['files'])} archivos generados "
+          f"({len({e['blob'] for e in manifest['files'].values()})} distintos)")
+    return manifest
+
+
+class Bundle:
+    """
+    Bundle abierto para lectura. Sólo se lee el manifiesto al abrir; las
+    secciones y archivos se descomprimen al pedirlos.
+
+        with Bundle("proyecto.ofgui") as b:
+            b.load_section("constant")
+    """
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self._zip = zipfile.ZipFile(self.path, "r")
+        try:
+            self.manifest = json.loads(self._zip.read(MANIFEST_NAME))
+        except KeyError:
+            self._zip.close()
+            raise ValueError(f"'{path}' no es un proyecto {BUNDLE_EXT} (falta {MANIFEST_NAME})")
+        if self.manifest.get("format") != BUNDLE_FORMAT or self.manifest.get("version", 0) > BUNDLE_VERSION:
+            self._zip.close()
+            raise ValueError(f"Formato de bundle no soportado en '{path}': "
+                             f"{self.manifest.get('format')} v{self.manifest.get('version')}")
+        # Un bundle viene de otra máquina: sus rutas no pueden salir del proyecto
+        try:
+            for section_name in self.manifest["sections"]:
+                _check_relative(section_name, "sección")
+                if "/" in section_name:
+                    raise ValueError(f"Bundle no válido: nombre de sección '{section_name}'")
+            for rel in self.manifest["files"]:
+                _check_relative(rel, "archivo")
+        except ValueError:
+            self._zip.close()
+            raise
+        self._sections = {}
+        self.members_read = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._zip.close()
+
+    @property
+    def config(self):
+        return self.manifest.get("config")
+
+    def section_names(self):
+        return sorted(self.manifest["sections"])
+
+    def has_section(self, section_name):
+        return section_name in self.manifest["sections"]
+
+    def load_section(self, section_name):
+        """Datos de la sección (descomprimida la primera vez), o {} si no está."""
+        if section_name not in self._sections:
+            entry = self.manifest["sections"].get(section_name)
+            if entry is None:
+                return {}
+            self._sections[section_name] = json.loads(self._zip.read(entry["member"]))
+            self.members_read += 1
+        return self._sections[section_name]
+
+    def files(self):
+        """{ruta relativa: {"blob", "size", "mode"}} de los archivos generados."""
+        return self.manifest["files"]
+
+    def read_file(self, rel):
+        self.members_read += 1
+        return self._zip.read(self.manifest["files"][rel]["blob"])
+
+    def extract_files(self, data_dir):
+        """
+        Escribe los archivos generados en data_dir. Cada blob se descomprime
+        una sola vez aunque lo compartan varios archivos.
+        """
+        by_blob = {}
+        for rel, entry in self.manifest["files"].items():
+            _check_relative(rel, "archivo")
+            _inside(data_dir, os.path.join(data_dir, *rel.split("/")), "archivo")
+            by_blob.setdefault(entry["blob"], []).append((rel, entry))
+        for blob, targets in by_blob.items():
+            data = self._zip.read(blob)
+            self.members_read += 1
+            for rel, entry in targets:
+                path = os.path.join(data_dir, *rel.split("/"))
+                atomic_write_bytes(path, data)
+                # Sólo bits de permiso (sin setuid/setgid/sticky)
+                os.chmod(path, entry.get("mode", 0o644) & 0o777)
+        return len(self.manifest["files"])
+
+    def materialize(self, json_manager, skip=(), replace=False):
+        """
+        Vuelca el bundle en el proyecto de 'json_manager': las secciones (menos
+        las de 'skip', que ya gestiona el estado en memoria) se escriben tal
+        cual en una sola operación y se extraen los archivos generados. Las
+        secciones del proyecto que no son del bundle sólo se borran si se
+        pide expresamente (replace=True).
+        """
+        skip = set(skip)
+        sections = {name: self.load_section(name) for name in self.section_names() if name not in skip}
+        for name in sections:
+            _check_relative(name, "sección")
+            _inside(json_manager.data_dir, json_manager.get_file_path(name), "sección")
+        if sections:
+            ok, msg = json_manager.save_sections(sections, validate=False)
+            if not ok:
+                raise OSError(msg)
+        if replace:
+            for name in json_manager.section_names():
+                if name not in self.manifest["sections"] and name not in skip:
+                    json_manager.delete_section(name)
+        self.extract_files(json_manager.data_dir)
+
+
+def bundle_project_dir(bundle_path):
+    """
+    Directorio nuevo en el que abrir 'bundle_path': junto al bundle y con su
+    nombre (proyecto.ofgui -> proyecto/, o proyecto_1/, ... si ya existe).
+    """
+    base = os.path.splitext(os.path.abspath(bundle_path))[0]
+    root, n = base, 0
+    while os.path.exists(root):
+        n += 1
+        root = f"{base}_{n}"
+    return root
+
+
+def _local_config(bundle_config, config_path):
+    """
+    config.json del bundle con el working_directory del proyecto local: el
+    del autor es una ruta de su máquina y sólo se usa si el proyecto no
+    tiene uno y la ruta existe aquí.
+    """
+    config = dict(bundle_config)
+    try:
+        with open(config_path, "r") as f:
+            local = json.load(f)
+    except (OSError, ValueError):
+        local = {}
+    working_directory = local.get("working_directory") or ""
+    if not working_directory and os.path.isdir(config.get("working_directory") or ""):
+        working_directory = config["working_directory"]
+    config["working_directory"] = working_directory
+    return config
+
+
+def open_bundle(bundle_path, data_dir=None, config_path=None):
+    """
+    Abre 'bundle_path' como proyecto actual de data_dir: restaura config.json
+    (conservando el working_directory local) y hace que el estado del
+    proyecto (core/project_state.py) lea las secciones del bundle bajo
+    demanda. Devuelve el Bundle.
+    """
+    from core.project_state import project_state
+
+    bundle = Bundle(bundle_path)
+    if config_path is None:
+        config_path = workspace.config_path()
+    if bundle.config is not None and config_path:
+        atomic_write_json(config_path, _local_config(bundle.config, config_path), indent=4)
+    project_state(data_dir).attach_source(bundle)
+    print(f"[bundle] Proyecto abierto desde {bundle_path}")
+    return bundle
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m core.bundle",
+                                     description=f"Guardar/abrir proyectos {BUNDLE_EXT}")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_save = sub.add_parser("save", help="guardar data_dir en un bundle")
+    p_save.add_argument("bundle")
+    p_save.add_argument("data_dir", nargs="?", default=default_data_dir())
+    p_open = sub.add_parser("open", help="restaurar un bundle en data_dir")
+    p_open.add_argument("bundle")
+    p_open.add_argument("data_dir", nargs="?", default=default_data_dir())
+    p_open.add_argument("--replace", action="store_true",
+                        help="borrar las secciones del proyecto que no están en el bundle")
+    p_info = sub.add_parser("info", help="mostrar el manifiesto")
+    p_info.add_argument("bundle")
+    args = parser.parse_args(argv)
+
+    if args.command == "save":
+        save_bundle(args.bundle, args.data_dir)
+    elif args.command == "open":
+        with Bundle(args.bundle) as bundle:
+            # config.json del proyecto de data_dir (<proyecto>/temp)
+            config_path = workspace.config_path(os.path.dirname(os.path.abspath(args.data_dir)))
+            if bundle.config is not None:
+                atomic_write_json(config_path, _local_config(bundle.config, config_path), indent=4)
+            bundle.materialize(JSONManager(args.data_dir), replace=args.replace)
+    else:
+        with Bundle(args.bundle) as bundle:
+            files = bundle.files()
+            print(f"{args.bundle}: {BUNDLE_FORMAT} v{bundle.manifest['version']}")
+            print(f"  secciones: {', '.join(bundle.section_names())}")
+            print(f"  archivos generados: {len(files)} ({len({e['blob'] for e in files.values()})} distintos, "
+                  f"{sum(e['size'] for e in files.values())} bytes)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,478 @@
+# core/case_context.py
+
+"""
+Contexto inmutable del caso para los generadores de ui/conf.
+
+CaseContext.load() lee una sola vez, del estado del proyecto
+(core/project_state.py), todas las secciones que usan los generadores
+(boundary_conditions, constant, Disperse_fase, case_config, ...), las valida
+contra sus esquemas y las congela. Los generadores de ui/conf/bc y
+ui/conf/constant reciben el contexto y sólo leen de él: ninguno vuelve a
+abrir boundary_conditions.json ni consulta project_state, así que el mismo
+contexto produce siempre los mismos archivos.
+
+    ctx = CaseContext.load(case_config=self.case_config)
+    generate_boundary_conditions(ctx)
+    generate_constant_files(ctx)
+
+Las secciones congeladas son dict/list de sólo lectura (FrozenDict,
+FrozenList): se leen igual que los originales (get, items, índices,
+json.dumps), pero cualquier modificación lanza TypeError. copy.deepcopy()
+devuelve una copia normal y editable.
+
+Dependencias: ctx.project(deps) devuelve un contexto que sólo contiene las
+entradas declaradas en 'deps', con la sintaxis "<origen>[:<ruta>]":
+- origen: una sección ("boundary_conditions", "Disperse_fase", ...),
+  "case_config", "config" o "mesh" (áreas de los patches);
+- ruta: claves separadas por '.', con comodines fnmatch en cada nivel
+  ("boundaryConditions.*.temperature"). Sin ruta se toma el origen entero.
+  Un '.' o un comodín que forma parte de la clave se escribe entre
+  corchetes ("OH[*]_chemValue", "C2H5[.]OH"): la clave se busca literal.
+Los generadores se ejecutan sobre esa proyección (core/generation.py), así
+que su huella cubre exactamente lo que pueden leer.
+"""
+
+import os
+import re
+import json
+import hashlib
+import logging
+from fnmatch import fnmatchcase
+from dataclasses import dataclass, field
+from functools import cached_property
+
+from core.json_manager import JSONManager
+from core.mesh_index import load_mesh_index, patch_lookup
+from core import workspace
+
+# Secciones que se cargan en el contexto
+CASE_SECTIONS = (
+    "boundary_conditions", "constant", "Disperse_fase", "case_config",
+    "solver_settings", "materials", "controlDict", "fvSchemes", "fvSolution",
+)
+
+# Entradas de las dependencias que no son secciones: case_config del
+# contexto (con constant aplicado), config.json y áreas de la malla
+CONTEXT_SOURCES = ("case_config", "config", "mesh")
+
+
+# ----------------------------------------------------------------------
+# dict / list de sólo lectura
+# ----------------------------------------------------------------------
+def _readonly(self, *args, **kwargs):
+    raise TypeError(f"{type(self).__name__} es de sólo lectura (CaseContext es inmutable)")
+
+
+class FrozenDict(dict):
+    """dict de sólo lectura; copy.copy/deepcopy devuelven un dict normal."""
+    __slots__ = ()
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+class FrozenList(list):
+    """list de sólo lectura; copy.copy/deepcopy devuelven una list normal."""
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = clear = extend = insert = pop = remove = reverse = sort = _readonly
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+
+def freeze(obj):
+    """Copia profunda de obj con FrozenDict/FrozenList en lugar de dict/list."""
+    if isinstance(obj, dict):
+        return FrozenDict((k, freeze(v)) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return FrozenList(freeze(x) for x in obj)
+    return obj
+
+
+def select(data, paths):
+    """
+    Proyección congelada de 'data' con sólo las rutas 'paths' (listas de
+    claves con comodines fnmatch). Los niveles con comodines conservan el
+    orden de 'data' (p.ej. el de las fronteras); las claves literales siguen
+    el orden de 'paths'. Una ruta vacía, o un valor que no es dict, se toma
+    entero.
+    """
+    return _select(data, _compile_paths(paths))
+
+
+_ESCAPED_LITERAL = re.compile(r"(?:[^*?\[]|\[[^\]]\])*")
+
+
+def split_path(path):
+    """Claves de una ruta separada por '.', sin partir los '.' entre corchetes."""
+    keys, current, depth = [], "", 0
+    for char in path:
+        if char == "." and not depth:
+            keys.append(current)
+            current = ""
+            continue
+        if char == "[" and not depth:
+            depth = 1
+        elif char == "]" and depth:
+            depth = 0
+        current += char
+    keys.append(current)
+    return keys
+
+
+def _literal_key(key):
+    """Clave sin comodines ("OH[*]" -> "OH*"), o None si tiene comodines."""
+    if not any(c in key for c in "*?["):
+        return key
+    if _ESCAPED_LITERAL.fullmatch(key):
+        return re.sub(r"\[(.)\]", r"\1", key)
+    return None
+
+
+def _compile_paths(paths):
+    """
+    Árbol de las rutas: None (tomar entero) o ({clave literal: (colas,
+    subárbol)}, [(comodín, colas, subárbol)], hojas). 'hojas' es la tupla de
+    claves cuando el nivel sólo tiene claves literales que se toman enteras
+    (p.ej. "type" y "temperature" de cada frontera). Se construye una vez
+    por proyección, no por frontera.
+    """
+    if any(not p for p in paths):
+        return None
+    by_head = {}
+    for p in paths:
+        by_head.setdefault(p[0], []).append(p[1:])
+    literal, patterns = {}, []
+    for head, tails in by_head.items():
+        key = _literal_key(head)
+        if key is not None:
+            literal[key] = (tails, _compile_paths(tails))
+        else:
+            patterns.append((head, tails, _compile_paths(tails)))
+    leaves = None
+    if not patterns and all(sub is None for _tails, sub in literal.values()):
+        leaves = tuple(literal)
+    return literal, patterns, leaves
+
+
+def _select(data, node):
+    if node is None or not isinstance(data, dict):
+        return data
+    literal, patterns, leaves = node
+    if leaves is not None:
+        return FrozenDict([(key, data[key]) for key in leaves if key in data])
+    if not patterns:
+        return FrozenDict([(key, _select(data[key], sub)) for key, (_tails, sub) in literal.items() if key in data])
+    if not literal and len(patterns) == 1 and patterns[0][0] == "*":
+        # Todas las claves (p.ej. las fronteras de boundaryConditions)
+        sub = patterns[0][2]
+        if sub is not None and sub[2] is not None:
+            keys = sub[2]
+            return FrozenDict([(name, FrozenDict([(key, value[key]) for key in keys if key in value])
+                                if isinstance(value, dict) else value) for name, value in data.items()])
+        return FrozenDict([(name, _select(value, sub)) for name, value in data.items()])
+    items = []
+    for key, value in data.items():
+        skey = str(key)
+        matches = [literal[skey]] if skey in literal else []
+        matches += [(tails, sub) for head, tails, sub in patterns if head == "*" or fnmatchcase(skey, head)]
+        if len(matches) == 1:
+            items.append((key, _select(value, matches[0][1])))
+        elif matches:
+            # La clave cumple varias rutas: se unen sus subárboles
+            items.append((key, _select(value, _compile_paths([t for tails, _sub in matches for t in tails]))))
+    return FrozenDict(items)
+
+
+def parse_deps(deps):
+    """{origen: [ruta como lista de claves]} de las dependencias (se ignoran las '@target')."""
+    by_source = {}
+    for spec in deps:
+        if spec.startswith("@"):
+            continue
+        source, _, path = spec.partition(":")
+        by_source.setdefault(source, []).append(split_path(path) if path else [])
+    return by_source
+
+
+def thaw(obj):
+    """Copia profunda editable (dict/list) de una estructura congelada."""
+    if isinstance(obj, dict):
+        return {k: thaw(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [thaw(x) for x in obj]
+    return obj
+
+
+# ----------------------------------------------------------------------
+# Contexto
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class CaseContext:
+    """
+    Secciones del caso leídas y validadas una vez.
+
+    - sections: {nombre: datos congelados} de las secciones existentes.
+    - case_config: configuración de la GUI (o la sección case_config) con la
+      sección constant aplicada encima, como la usan los generadores.
+    - config: config.json del proyecto (working_directory, solver, ...).
+    - errors: {sección: [mensajes]} de las secciones que no cumplen su esquema.
+    """
+    project_dir: str
+    data_dir: str
+    sections: FrozenDict = field(default_factory=FrozenDict)
+    case_config: FrozenDict = field(default_factory=FrozenDict)
+    config: FrozenDict = field(default_factory=FrozenDict)
+    errors: FrozenDict = field(default_factory=FrozenDict)
+
+    @classmethod
+    def load(cls, project_dir=None, data_dir=None, case_config=None, validate=True):
+        """
+        Carga el contexto del proyecto 'project_dir' (por defecto el activo).
+        'data_dir' sustituye a <proyecto>/temp; 'case_config' es el dict vivo
+        de la GUI (si no se da, se usa la sección case_config).
+        """
+        from core.project_state import project_state
+
+        if project_dir is None:
+            project_dir = os.path.dirname(os.path.abspath(data_dir)) if data_dir else workspace.project_dir()
+        project_dir = os.path.abspath(project_dir)
+        data_dir = os.path.abspath(data_dir or workspace.data_dir(project_dir))
+
+        state = project_state(data_dir)
+        sections = {name: state.section(name) for name in CASE_SECTIONS if state.has_section(name)}
+        errors = state.json_manager.validate_many(sections) if validate else {}
+        for name, messages in errors.items():
+            logging.warning(f"[CaseContext] La sección '{name}' no cumple su esquema: {messages[0]}")
+
+        return cls.from_sections(sections, case_config=case_config, project_dir=project_dir,
+                                 data_dir=data_dir, config=workspace.read_config(project_dir),
+                                 errors=errors)
+
+    @classmethod
+    def from_sections(cls, sections, case_config=None, project_dir="", data_dir="", config=None, errors=None):
+        """Contexto a partir de secciones ya en memoria ({nombre: dict})."""
+        if case_config is None:
+            case_config = sections.get("case_config", {})
+        merged = dict(case_config)
+        merged.update(sections.get("constant") or {})
+        return cls(
+            project_dir=project_dir,
+            data_dir=data_dir,
+            sections=freeze({name: data for name, data in sections.items() if data}),
+            case_config=freeze(merged),
+            config=freeze(config or {}),
+            errors=freeze(errors or {}),
+        )
+
+    # ------------------------------------------------------------------
+    # Secciones
+    # ------------------------------------------------------------------
+    def section(self, name):
+        """Sección congelada (FrozenDict vacío si no existe)."""
+        return self.sections.get(name, _EMPTY)
+
+    def has_section(self, name):
+        return name in self.sections
+
+    @property
+    def boundary_conditions(self):
+        """Sección boundary_conditions completa."""
+        return self.section("boundary_conditions")
+
+    @property
+    def boundaries(self):
+        """{nombre del patch: condición} de boundary_conditions."""
+        return self.boundary_conditions.get("boundaryConditions", _EMPTY)
+
+    @property
+    def turbulence_model(self):
+        """'kEpsilon', 'kOmega' o False (laminar)."""
+        return self.boundary_conditions.get("Turbulence_model", False)
+
+    @property
+    def chemistry_active(self):
+        return bool(self.boundary_conditions.get("chemistryActive", False))
+
+    @property
+    def chosen_species(self):
+        return self.boundary_conditions.get("chosen_species", _EMPTY_LIST)
+
+    @property
+    def disperse_phase(self):
+        return self.section("Disperse_fase")
+
+    @property
+    def calculation_type(self):
+        """'Compresible' o 'Incompresible' (boundary_conditions, GUI o solver_settings)."""
+        return (self.boundary_conditions.get("calculationType")
+                or self.case_config.get("solverSettings", _EMPTY).get("calculationType")
+                or self.section("solver_settings").get("calculationType")
+                or "Compresible")
+
+    @property
+    def working_directory(self):
+        """Directorio del caso OpenFOAM (config.json), o None."""
+        return self.config.get("working_directory") or None
+
+    # ------------------------------------------------------------------
+    # Rutas de salida
+    # ------------------------------------------------------------------
+    @property
+    def dp0_dir(self):
+        return os.path.join(self.data_dir, "DP0")
+
+    def path(self, *parts):
+        """Ruta dentro de DP0, p.ej. ctx.path("0", "U")."""
+        return os.path.join(self.dp0_dir, *parts)
+
+    # ------------------------------------------------------------------
+    # Malla
+    # ------------------------------------------------------------------
+    @cached_property
+    def patch_areas(self):
+        """{patch: área en m²} del índice de malla (se carga la primera vez)."""
+        if not self.working_directory:
+            return _EMPTY
+        try:
+            index = load_mesh_index(self.working_directory, JSONManager(self.data_dir))
+        except Exception as e:
+            logging.warning(f"[CaseContext] No se pudo cargar el índice de malla: {e}")
+            return _EMPTY
+        return freeze({name: float(patch["area"]) for name, patch in patch_lookup(index).items()
+                       if patch.get("area") is not None})
+
+    def patch_area(self, name):
+        """Área (m²) del patch, o None si la malla o el patch no están disponibles."""
+        return self.patch_areas.get(name)
+
+    # ------------------------------------------------------------------
+    # Dependencias
+    # ------------------------------------------------------------------
+    @cached_property
+    def _dep_cache(self):
+        return {}
+
+    def project(self, deps):
+        """
+        Contexto con sólo las entradas declaradas en 'deps' (ver el
+        docstring del módulo); sin dependencias devuelve el propio contexto.
+        Las proyecciones se guardan para no repetirlas.
+        """
+        deps = tuple(deps)
+        if not deps:
+            return self
+        projected = self._dep_cache.get(deps)
+        if projected is None:
+            by_source = parse_deps(deps)
+            sections = FrozenDict((name, select(data, by_source[name])) for name, data in self.sections.items()
+                                  if name in by_source and name not in CONTEXT_SOURCES)
+            projected = CaseContext(
+                project_dir=self.project_dir,
+                data_dir=self.data_dir,
+                sections=sections,
+                case_config=select(self.case_config, by_source.get("case_config", [])),
+                config=select(self.config, by_source.get("config", [])),
+            )
+            # Áreas de la malla ya cargadas (cached_property: se guardan en __dict__)
+            object.__setattr__(projected, "patch_areas", self.patch_areas if "mesh" in by_source else _EMPTY)
+            self._dep_cache[deps] = projected
+        return projected
+
+    def deps_fingerprint(self, deps):
+        """
+        Huella de las entradas declaradas en 'deps' (sin dependencias, la del
+        caso completo). Se combina la huella de cada dependencia, que se
+        calcula una vez por contexto y comparten todos los Target (p.ej.
+        "boundaryConditions.*.type").
+        """
+        deps = tuple(deps)
+        if not deps:
+            return self.fingerprint
+        cache = self._dep_cache
+        parts = []
+        for spec in sorted({d for d in deps if not d.startswith("@")}):
+            key = ("fingerprint", spec)
+            if key not in cache:
+                cache[key] = self._column_fingerprint(spec) or self.project((spec,)).fingerprint
+                cache.pop((spec,), None)
+            parts.append(cache[key])
+        return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+    def _column_fingerprint(self, spec):
+        """
+        Huella de una dependencia "<sección>:<tabla>.*.<clave>" (una clave de
+        cada fila, p.ej. la temperatura de cada frontera) a partir de la
+        columna de esa clave. Las columnas de la tabla se extraen en una sola
+        pasada y las comparten todas sus claves; con cientos de especies no
+        se recorre la tabla una vez por especie. None si 'spec' no tiene esa
+        forma.
+        """
+        source, _, path = spec.partition(":")
+        keys = [_literal_key(k) if k != "*" else k for k in split_path(path)] if path else []
+        if source in CONTEXT_SOURCES or len(keys) < 2 or keys[-2] != "*" or None in keys or "*" in keys[:-2] \
+                or keys[-1] == "*":
+            return None
+        prefix = tuple(keys[:-2])
+        columns = self._dep_cache.get(("columns", source, prefix))
+        if columns is None:
+            table = self.section(source)
+            for key in prefix:
+                table = table.get(key, _EMPTY) if isinstance(table, dict) else _EMPTY
+            rows, by_key = [], {}
+            if isinstance(table, dict):
+                for name, row in table.items():
+                    if isinstance(row, dict):
+                        rows.append(name)
+                        for key, value in row.items():
+                            by_key.setdefault(key, []).append((name, value))
+                    else:
+                        rows.append((name, row))
+            else:
+                rows.append(table)
+            base = json.dumps(rows, sort_keys=True, separators=(",", ":"), default=str)
+            columns = self._dep_cache[("columns", source, prefix)] = (base, by_key)
+        base, by_key = columns
+        data = json.dumps([base, keys[-1], by_key.get(keys[-1], [])], sort_keys=True,
+                          separators=(",", ":"), default=str)
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def __getstate__(self):
+        # Las proyecciones se rehacen en cada proceso; no se envían al pool
+        state = dict(self.__dict__)
+        state.pop("_dep_cache", None)
+        return state
+
+    # ------------------------------------------------------------------
+    # Huella
+    # ------------------------------------------------------------------
+    @cached_property
+    def fingerprint(self):
+        """
+        Hash SHA-256 de todo lo que pueden leer los generadores (secciones,
+        case_config, config.json y áreas de los patches). Dos contextos con
+        la misma huella producen los mismos archivos.
+        """
+        payload = {"sections": self.sections, "case_config": self.case_config,
+                   "config": self.config, "patch_areas": self.patch_areas}
+        data = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+_EMPTY = FrozenDict()
+_EMPTY_LIST = FrozenList()
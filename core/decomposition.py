@@ -0,0 +1,230 @@
+# core/decomposition.py
+
+"""
+Planificador de descomposición (decomposePar) para los métodos simple y
+hierarchical.
+
+1) Se factoriza el número de procesadores en todos los vectores n = (nx, ny, nz)
+   posibles y se ordenan según lo bien que dejan subdominios "cúbicos" para
+   la bounding box de la malla (extensión L_i / n_i parecida en las tres
+   direcciones).
+2) Los mejores candidatos se evalúan sobre los centros de celda reales,
+   reproduciendo el reparto de OpenFOAM:
+     - simple: cada dirección se divide por separado en n_i tramos con el
+       mismo número de celdas (simpleGeomDecomp).
+     - hierarchical: divisiones anidadas en el orden indicado (xyz): cada
+       tramo de la primera dirección se divide en la segunda, etc.
+3) Para cada candidato se calculan las celdas por procesador, el
+   desequilibrio (máx/medio) y el número de caras de frontera entre
+   procesadores; se elige el de menos caras de procesador con un
+   desequilibrio aceptable.
+"""
+
+import os
+import logging
+
+import numpy as np
+
+from core.polymesh_reader import polymesh_dir, read_polymesh
+from core.mesh_geometry import face_areas_and_centres, cell_centres_and_volumes
+
+PLANNED_METHODS = ("simple", "hierarchical")
+
+# Nº de factorizaciones (las más "cúbicas") que se evalúan sobre la malla
+MAX_CANDIDATES = 6
+
+# Desequilibrio máximo admitido antes de primar el reparto de caras
+MAX_IMBALANCE = 1.05
+
+_CENTRES_CACHE = {}
+
+
+def factorizations(n_procs):
+    """Todos los vectores (nx, ny, nz) de enteros positivos con nx*ny*nz = n_procs."""
+    divisors = [d for d in range(1, n_procs + 1) if n_procs % d == 0]
+    return [(nx, ny, n_procs // (nx * ny))
+            for nx in divisors for ny in divisors
+            if (n_procs // nx) % ny == 0]
+
+
+def aspect_mismatch(n, extents):
+    """
+    Relación máx/mín de la extensión de los subdominios (L_i / n_i). Las
+    direcciones de extensión nula (mallas 2D) sólo admiten n_i = 1.
+    """
+    sizes = []
+    for n_i, length in zip(n, extents):
+        if length <= 0.0:
+            if n_i > 1:
+                return float("inf")
+            continue
+        sizes.append(length / n_i)
+    if not sizes:
+        return float("inf")
+    return max(sizes) / min(sizes)
+
+
+def rank_factorizations(n_procs, extents, limit=MAX_CANDIDATES):
+    """Factorizaciones ordenadas por parecido a la bounding box."""
+    candidates = sorted(factorizations(n_procs), key=lambda n: (aspect_mismatch(n, extents), n))
+    return [n for n in candidates if np.isfinite(aspect_mismatch(n, extents))][:limit]
+
+
+def _split_sorted(keys, parts):
+    """Tramo (0..parts-1) de cada elemento al repartir 'keys' ordenadas en partes iguales."""
+    order = np.argsort(keys, kind="stable")
+    slot = np.empty(len(keys), dtype=np.int64)
+    slot[order] = np.arange(len(keys)) * parts // max(len(keys), 1)
+    return slot
+
+
+def simple_assignment(centres, n):
+    """Procesador de cada celda con el método simple."""
+    proc = np.zeros(len(centres), dtype=np.int64)
+    stride = 1
+    for d in range(3):
+        if n[d] > 1:
+            proc += stride * _split_sorted(centres[:, d], n[d])
+        stride *= n[d]
+    return proc
+
+
+def hierarchical_assignment(centres, n, order="xyz"):
+    """Procesador de cada celda con el método hierarchical."""
+    n_cells = len(centres)
+    group = np.zeros(n_cells, dtype=np.int64)
+    n_groups = 1
+    dims = ["xyz".index(c) for c in order]
+    slots = {}
+    for d in dims:
+        parts = n[d]
+        # Rango de cada celda dentro de su grupo al ordenar por la dirección d
+        idx = np.lexsort((centres[:, d], group))
+        counts = np.bincount(group, minlength=n_groups)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        rank = np.empty(n_cells, dtype=np.int64)
+        rank[idx] = np.arange(n_cells) - starts[group[idx]]
+        slot = rank * parts // np.maximum(counts[group], 1)
+        slots[d] = slot
+        group = group * parts + slot
+        n_groups *= parts
+    nx, ny, _ = n
+    return slots[0] + nx * (slots[1] + ny * slots[2])
+
+
+def evaluate_assignment(proc, owner, neighbour, n_procs):
+    """Celdas por procesador, desequilibrio y caras de procesador."""
+    cells = np.bincount(proc, minlength=n_procs)
+    n_int = len(neighbour)
+    proc_faces = int(np.count_nonzero(proc[owner[:n_int]] != proc[neighbour]))
+    mean = cells.mean() if n_procs else 0.0
+    return {
+        "cellsPerRank": {"min": int(cells.min()), "max": int(cells.max()), "mean": float(mean)},
+        "imbalance": float(cells.max() / mean) if mean > 0 else float("inf"),
+        "processorFaces": proc_faces,
+    }
+
+
+def load_cell_centres(case_dir):
+    """
+    Centros de celda (y owner/neighbour) de la malla, con caché por archivos.
+    'case_dir' es el directorio del caso o la propia carpeta polyMesh (p.ej.
+    constant/<región>/polyMesh), como en core/polymesh_reader.py.
+    """
+    poly = key = os.path.abspath(polymesh_dir(case_dir))
+    stamp = tuple(sorted(
+        (name, os.stat(os.path.join(poly, name)).st_mtime_ns)
+        for name in os.listdir(poly) if os.path.isfile(os.path.join(poly, name))
+    ))
+    cached = _CENTRES_CACHE.get(key)
+    if cached and cached[0] == stamp:
+        return cached[1]
+
+    mesh = read_polymesh(poly, mmap=True)
+    sf, cf = face_areas_and_centres(mesh.points, mesh.face_offsets, mesh.face_indices)
+    owner = np.asarray(mesh.owner, dtype=np.int64)
+    neighbour = np.asarray(mesh.neighbour, dtype=np.int64)
+    centres, _ = cell_centres_and_volumes(sf, cf, owner, neighbour, mesh.n_cells)
+    data = {"centres": centres, "owner": owner, "neighbour": neighbour}
+    _CENTRES_CACHE.clear()
+    _CENTRES_CACHE[key] = (stamp, data)
+    return data
+
+
+def plan_decomposition(case_dir, n_procs, method="hierarchical", order="xyz",
+                       max_candidates=MAX_CANDIDATES):
+    """
+    Elige los coeficientes n de simple/hierarchical para 'n_procs'.
+    'case_dir' es el directorio del caso o su carpeta polyMesh.
+
+    Retorna
+    -------
+    dict
+        {"method", "numberOfSubdomains", "n", "order", "nCells",
+         "cellsPerRank", "imbalance", "processorFaces", "candidates": [...]}
+        'candidates' contiene la evaluación de cada factorización probada,
+        ordenada de mejor a peor.
+    """
+    if method not in PLANNED_METHODS:
+        raise ValueError(f"El planificador sólo admite {PLANNED_METHODS}, no '{method}'.")
+    data = load_cell_centres(case_dir)
+    centres = data["centres"]
+    if len(centres) < n_procs:
+        raise ValueError(f"La malla tiene {len(centres)} celdas, menos que {n_procs} procesadores.")
+
+    extents = (centres.max(axis=0) - centres.min(axis=0)).tolist()
+    candidates = []
+    for n in rank_factorizations(n_procs, extents, max_candidates):
+        if method == "simple":
+            proc = simple_assignment(centres, n)
+        else:
+            proc = hierarchical_assignment(centres, n, order)
+        result = evaluate_assignment(proc, data["owner"], data["neighbour"], n_procs)
+        result["n"] = list(n)
+        result["aspectMismatch"] = aspect_mismatch(n, extents)
+        candidates.append(result)
+
+    # Primero los repartos equilibrados; entre ellos, menos caras de procesador
+    candidates.sort(key=lambda c: (c["imbalance"] > MAX_IMBALANCE, c["processorFaces"], c["imbalance"]))
+    best = candidates[0]
+    logging.info(f"[decomposition] {method} n={best['n']}: desequilibrio {best['imbalance']:.3f}, "
+                 f"{best['processorFaces']} caras de procesador")
+    return {
+        "method": method,
+        "numberOfSubdomains": n_procs,
+        "n": best["n"],
+        "order": order,
+        "nCells": len(centres),
+        "cellsPerRank": best["cellsPerRank"],
+        "imbalance": best["imbalance"],
+        "processorFaces": best["processorFaces"],
+        "candidates": candidates,
+    }
+
+
+def decompose_par_dict(n_procs, method, plan=None, data_file="decompositionManualDict"):
+    """
+    Texto de system/decomposeParDict. Para simple/hierarchical los
+    coeficientes salen del plan; sin plan se usa la mejor factorización
+    para un dominio cúbico.
+    """
+    lines = [
+        "FoamFile", "{", "  version 2.0;", "  format ascii;",
+        "  class dictionary;", "  object decomposeParDict;", "}",
+        f"numberOfSubdomains {n_procs};",
+        f"method          {method};"
+    ]
+    if method in PLANNED_METHODS:
+        if plan and plan.get("numberOfSubdomains") == n_procs:
+            n, order = plan["n"], plan.get("order", "xyz")
+        else:
+            n, order = rank_factorizations(n_procs, (1.0, 1.0, 1.0), 1)[0], "xyz"
+        lines += [f"{method}Coeffs", "{", f"  n ({n[0]} {n[1]} {n[2]});"]
+        if method == "simple":
+            lines += ["  delta 0.001;"]
+        else:
+            lines += [f"  order {order};"]
+        lines += ["}"]
+    elif method == "manual":
+        lines += ["manualCoeffs", "{", f"  dataFile \"{data_file}\";", "}"]
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,106 @@
+# core/foam_tokenizer.py
+
+"""
+Tokenizador de archivos de diccionario de OpenFOAM (formato ascii).
+
+Recorre el archivo una sola vez, por bloques, y produce tokens de texto:
+palabras/números, cadenas entre comillas y los símbolos { } ( ) [ ] ;
+Los comentarios '//' y '/* ... */' se descartan.
+
+Cada bloque se tokeniza de golpe con operaciones de cadena (replace + split),
+que corren en C; sólo los bloques con cadenas entre comillas pasan por la
+expresión regular completa, más lenta.
+"""
+
+import re
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+PUNCTUATION = "{}()[];"
+
+_COMMENT_RE = re.compile(r"//[^\n]*|/\*.*?\*/", re.S)
+
+_TOKEN_RE = re.compile(r"""
+      //[^\n]*
+    | /\*.*?\*/
+    | ("(?:[^"\\]|\\.)*"
+    | [{}()\[\];]
+    | [^\s{}()\[\];"]+)
+""", re.S | re.X)
+
+
+def tokenize_text(text):
+    """Devuelve la lista de tokens de un texto completo."""
+    if '"' in text:
+        return [tok for tok in _TOKEN_RE.findall(text) if tok]
+    if "/" in text:
+        text = _COMMENT_RE.sub(" ", text)
+    for c in PUNCTUATION:
+        if c in text:
+            text = text.replace(c, f" {c} ")
+    return text.split()
+
+
+def tokenize_foam_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Genera, para cada bloque leído de 'path', la lista de sus tokens.
+
+    Los bloques se cortan en un salto de línea. Si un bloque deja abierto un
+    comentario '/* ... */', la línea donde empieza pasa al bloque siguiente.
+    """
+    rest = ""
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        while True:
+            data = f.read(chunk_size)
+            buf = rest + data
+            if not data:
+                if buf:
+                    yield tokenize_text(buf)
+                return
+
+            cut = buf.rfind("\n") + 1
+            start = buf.rfind("/*", 0, cut)
+            if start != -1 and buf.find("*/", start + 2, cut) == -1:
+                cut = buf.rfind("\n", 0, start) + 1
+            if cut == 0:
+                rest = buf
+                continue
+            rest = buf[cut:]
+            yield tokenize_text(buf[:cut])
+
+
+def tokenize_foam_file(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Genera los tokens de 'path' uno a uno."""
+    for tokens in tokenize_foam_chunks(path, chunk_size):
+        yield from tokens
+
+
+def find_closing(tokens, start):
+    """
+    Dado el índice de un '{' o '(' en 'tokens', devuelve el índice del
+    símbolo que lo cierra, o -1 si no está en la lista.
+    """
+    opening = tokens[start]
+    closing = "}" if opening == "{" else ")"
+    depth = 0
+    for i in range(start, len(tokens)):
+        tok = tokens[i]
+        if tok == opening:
+            depth += 1
+        elif tok == closing:
+            depth -= 1
+            if depth == 0:
+                return i
+    return -1
+
+
+def list_words(value):
+    """
+    Extrae las palabras de un valor de tipo lista, p.ej.
+    ['List<word>', '1', '(', 'wall', ')'] -> ['wall'].
+    """
+    if "(" not in value:
+        return []
+    start = value.index("(") + 1
+    end = value.index(")", start) if ")" in value else len(value)
+    return value[start:end]
@@ -0,0 +1,582 @@
+# core/generation.py
+
+"""
+Ejecutor de la generación de archivos del caso.
+
+Un plan de generación es una lista de Target: archivo de salida y función
+render(ctx, *args) -> str que produce su contenido a partir del contexto
+inmutable del caso (core/case_context.py). Un Target sin render indica que
+el archivo debe eliminarse (p.ej. 'epsilon' con kOmega). Los planes de la
+carpeta 0 y de constant están en ui/conf/targets.py.
+
+Como en make, cada Target declara sus dependencias ('deps'): claves de las
+secciones ("boundary_conditions:boundaryConditions.*.temperature", ver
+CaseContext.project) y otros Target del plan ("@0/T"). Forman un grafo
+acíclico; el generador se ejecuta sobre la proyección del contexto con sólo
+esas claves, y un Target se regenera cuando cambia alguna de ellas o alguno
+de los Target de los que depende. Sin 'deps' depende del caso completo.
+
+run_targets() renderiza todos los Target de forma independiente:
+- en paralelo en un pool de procesos cuando el caso es grande (el contexto
+  se envía una sola vez a cada proceso), o en el propio proceso si es
+  pequeño y el arranque del pool no compensa;
+- un error en un archivo no detiene al resto: todos se recogen, en el orden
+  del plan, en un único GenerationReport;
+- cada archivo se escribe de forma atómica (core/atomic_io.py): un archivo
+  que falla conserva su versión anterior completa, nunca queda a medias.
+
+Regeneración incremental: el manifiesto temp/.generation_state guarda, por
+archivo, el hash de sus entradas (huella del contexto, generador y su
+código, o sólo sus dependencias declaradas) y el tamaño, mtime y hash de
+los bytes escritos.
+- Si las entradas no han cambiado y el archivo sigue siendo el escrito, el
+  generador no se ejecuta (estado "unchanged").
+- Si se regenera y el contenido es idéntico al del disco, el archivo no se
+  reescribe (estado "identical"): conserva su mtime y rsync no lo reenvía.
+force=True regenera y reescribe todo.
+
+Árbol virtual: render_tree() renderiza el plan en memoria (CaseTree) sin
+escribir nada. tree.diff() da el diff unificado frente al caso del disco
+(dry-run: sólo lectura) y tree.commit() escribe todos los cambios en un
+único lote atómico. run_targets() es render_tree() + commit().
+
+    report = run_targets(ctx, boundary_targets(ctx))
+    if not report.ok:
+        print(report.format_errors())
+
+    tree = render_tree(ctx, initialization_targets(ctx))
+    print(tree.diff())
+    tree.commit()
+"""
+
+import os
+import sys
+import json
+import time
+import difflib
+import pickle
+import hashlib
+import logging
+import traceback
+import multiprocessing
+from types import ModuleType
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from core.atomic_io import atomic_write_json, atomic_write_many
+
+# Modos de ejecución de run_targets
+EXECUTORS = ("auto", "process", "thread", "serial")
+# Trabajo estimado (fronteras x archivos) a partir del cual "auto" usa procesos:
+# por debajo, el arranque del pool (~1 s con 'spawn') cuesta más que renderizar
+PARALLEL_MIN_WORK = 500000
+
+# Manifiesto de la regeneración incremental (en la carpeta temp del proyecto;
+# sin extensión .json para que JSONManager no lo tome por una sección)
+MANIFEST_FILE = ".generation_state"
+MANIFEST_VERSION = 1
+
+STATUS_WRITTEN = "written"
+STATUS_UNCHANGED = "unchanged"
+STATUS_IDENTICAL = "identical"
+STATUS_REMOVED = "removed"
+STATUS_SKIPPED = "skipped"
+STATUS_ERROR = "error"
+
+
+@dataclass(frozen=True)
+class Target:
+    """
+    Archivo generado.
+    - name: nombre para mensajes ('U', 'constant/g', ...)
+    - path: ruta absoluta de salida
+    - render: función render(ctx, *args) -> str (None si no hay nada que
+      escribir); render=None elimina el archivo si existe
+    - args: argumentos adicionales de render (p.ej. la especie)
+    - deps: dependencias ("<sección>[:<ruta>]", "case_config:...", "mesh",
+      "@<nombre de otro Target>"); vacío = el caso completo
+    """
+    name: str
+    path: str
+    render: object = None
+    args: tuple = ()
+    deps: tuple = ()
+
+
+@dataclass
+class TargetResult:
+    name: str
+    path: str
+    status: str
+    error: str = ""
+
+
+@dataclass
+class GenerationReport:
+    """Resultado de un plan, en el orden de sus Target."""
+    results: list = field(default_factory=list)
+    elapsed: float = 0.0
+    executor: str = "serial"
+    workers: int = 1
+
+    @property
+    def errors(self):
+        return [r for r in self.results if r.status == STATUS_ERROR]
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def names(self, status):
+        return [r.name for r in self.results if r.status == status]
+
+    def summary(self):
+        """Resumen de una línea: archivos reescritos, sin cambios, eliminados y con error."""
+        text = f"{len(self.names(STATUS_WRITTEN))} archivos reescritos"
+        unchanged, identical = len(self.names(STATUS_UNCHANGED)), len(self.names(STATUS_IDENTICAL))
+        if unchanged or identical:
+            text += (f", {unchanged + identical} sin cambios ({unchanged} sin regenerar, "
+                     f"{identical} con el mismo contenido)")
+        removed = self.names(STATUS_REMOVED)
+        if removed:
+            text += f", {len(removed)} eliminados ({', '.join(removed)})"
+        if self.errors:
+            text += f", {len(self.errors)} con error"
+        return text + f" en {self.elapsed:.2f} s"
+
+    def format_errors(self):
+        """Un error por línea: 'nombre: mensaje'."""
+        return "\n".join(f"{r.name}: {r.error}" for r in self.errors)
+
+    def merge(self, other):
+        """Añade al informe los resultados de otro plan."""
+        self.results.extend(other.results)
+        self.elapsed += other.elapsed
+        return self
+
+
+# ----------------------------------------------------------------------
+# Renderizado (en el proceso principal o en los del pool)
+# ----------------------------------------------------------------------
+_worker_ctx = None
+
+
+def _init_worker(ctx):
+    global _worker_ctx
+    _worker_ctx = ctx
+
+
+def _render(ctx, target):
+    """(contenido, None) o (None, mensaje de error) del Target."""
+    try:
+        return target.render(ctx.project(target.deps), *target.args), None
+    except Exception as e:
+        logging.debug(traceback.format_exc())
+        return None, f"{type(e).__name__}: {e}"
+
+
+def _render_in_worker(target):
+    return _render(_worker_ctx, target)
+
+
+def _choose_executor(ctx, n_targets, executor, workers):
+    if executor not in EXECUTORS:
+        raise ValueError(f"Ejecutor desconocido '{executor}' (use uno de {', '.join(EXECUTORS)})")
+    if workers <= 1 or n_targets <= 1:
+        return "serial"
+    if executor == "auto":
+        work = max(len(ctx.boundaries), 1) * n_targets
+        return "process" if work >= PARALLEL_MIN_WORK else "serial"
+    return executor
+
+
+def render_targets(ctx, targets, workers=None, executor="auto"):
+    """
+    Renderiza los Target (todos con render) y devuelve ([(contenido, error)]
+    en el orden de 'targets', ejecutor usado, nº de workers). No escribe nada.
+    """
+    jobs = list(targets)
+    workers = min(workers or os.cpu_count() or 1, max(len(jobs), 1))
+    mode = _choose_executor(ctx, len(jobs), executor, workers)
+
+    if mode == "process":
+        try:
+            # 'spawn': los procesos no heredan los hilos de la GUI ni del auto-guardado
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                     initializer=_init_worker, initargs=(ctx,)) as pool:
+                rendered = list(pool.map(_render_in_worker, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+        except (BrokenProcessPool, OSError, pickle.PicklingError) as e:
+            logging.warning(f"[generation] No se pudo usar el pool de procesos ({e}); se genera en serie")
+            mode = "serial"
+    elif mode == "thread":
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            rendered = list(pool.map(lambda t: _render(ctx, t), jobs))
+    if mode == "serial":
+        workers = 1
+        rendered = [_render(ctx, t) for t in jobs]
+    return rendered, mode, workers
+
+
+# ----------------------------------------------------------------------
+# Manifiesto de la regeneración incremental
+# ----------------------------------------------------------------------
+_source_hashes = {}
+
+# Raíz del código de la aplicación: sólo sus módulos entran en el hash del código
+_SOURCE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _project_file(module):
+    """Archivo fuente del módulo si es de la aplicación (no de la biblioteca estándar ni de site-packages)."""
+    path = getattr(module, "__file__", None)
+    if not path:
+        return None
+    path = os.path.abspath(path)
+    if not path.startswith(_SOURCE_ROOT + os.sep) or "site-packages" in path:
+        return None
+    return path
+
+
+def _code_modules(module_name):
+    """
+    Módulo del generador y, transitivamente, los módulos de la aplicación
+    que importa (p.ej. conf_U -> core.inlet_flow -> core.mesh_index).
+    """
+    seen = set()
+    stack = [module_name]
+    while stack:
+        name = stack.pop()
+        module = sys.modules.get(name)
+        if name in seen or module is None or _project_file(module) is None:
+            continue
+        seen.add(name)
+        for value in vars(module).values():
+            if isinstance(value, ModuleType):
+                stack.append(value.__name__)
+            else:
+                owner = getattr(value, "__module__", None)
+                if isinstance(owner, str):
+                    stack.append(owner)
+    return sorted(seen)
+
+
+def _source_hash(module_name):
+    """
+    Hash del código fuente del generador y de los módulos auxiliares que
+    usa: cambiar cualquiera de ellos (no sólo el módulo de render) invalida
+    sus archivos.
+    """
+    if module_name not in _source_hashes:
+        h = hashlib.sha256()
+        for name in _code_modules(module_name):
+            h.update(name.encode("utf-8"))
+            try:
+                with open(_project_file(sys.modules[name]), "rb") as f:
+                    h.update(hashlib.sha256(f.read()).digest())
+            except OSError:
+                pass
+        _source_hashes[module_name] = h.hexdigest()
+    return _source_hashes[module_name]
+
+
+def plan_order(targets):
+    """
+    Target del plan en orden topológico según sus dependencias '@nombre'.
+    ValueError si una dependencia no está en el plan o hay un ciclo.
+    """
+    by_name = {t.name: t for t in targets}
+    order, state = [], {}
+
+    def visit(target, chain):
+        if state.get(target.name) == "done":
+            return
+        if state.get(target.name) == "visiting":
+            raise ValueError(f"Ciclo de dependencias: {' -> '.join(chain + [target.name])}")
+        state[target.name] = "visiting"
+        for dep in target.deps:
+            if dep.startswith("@"):
+                if dep[1:] not in by_name:
+                    raise ValueError(f"'{target.name}' depende de '{dep[1:]}', que no está en el plan")
+                visit(by_name[dep[1:]], chain + [target.name])
+        state[target.name] = "done"
+        order.append(target)
+
+    for target in targets:
+        visit(target, [])
+    return order
+
+
+def input_hashes(ctx, targets):
+    """
+    {Target: hash de sus entradas} de los Target con render: huella de sus
+    dependencias (o del caso completo), generador, argumentos, código (el
+    del generador y el de los módulos de la aplicación que importa) y
+    hashes de los Target de los que depende.
+    """
+    hashes = {}
+    by_name = {}
+    for target in plan_order(targets):
+        if target.render is None:
+            continue
+        render = target.render
+        upstream = [by_name.get(dep[1:], "") for dep in target.deps if dep.startswith("@")]
+        key = json.dumps([ctx.deps_fingerprint(target.deps), render.__module__, render.__qualname__,
+                          list(target.args), _source_hash(render.__module__), upstream], default=str)
+        hashes[target] = by_name[target.name] = hashlib.sha256(key.encode("utf-8")).hexdigest()
+    return hashes
+
+
+def _manifest_path(ctx):
+    return os.path.join(ctx.data_dir, MANIFEST_FILE)
+
+
+def load_manifest(ctx):
+    """{ruta relativa a temp: {"inputs", "output", "size", "mtime"}} de la última generación."""
+    try:
+        with open(_manifest_path(ctx), "r") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest.get("files", {}) if manifest.get("version") == MANIFEST_VERSION else {}
+
+
+def _save_manifest(ctx, files):
+    try:
+        atomic_write_json(_manifest_path(ctx), {"version": MANIFEST_VERSION, "files": files}, indent=1)
+    except OSError as e:
+        logging.warning(f"[generation] No se pudo guardar el manifiesto de generación: {e}")
+
+
+def _bytes_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _on_disk(path, entry):
+    """True si el archivo sigue siendo el que registra 'entry' (tamaño y mtime, o su hash)."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    if st.st_size != entry.get("size"):
+        return False
+    if st.st_mtime_ns == entry.get("mtime"):
+        return True
+    with open(path, "rb") as f:
+        return _bytes_hash(f.read()) == entry.get("output")
+
+
+def _file_entry(path, inputs, output):
+    st = os.stat(path)
+    return {"inputs": inputs, "output": output, "size": st.st_size, "mtime": st.st_mtime_ns}
+
+
+# ----------------------------------------------------------------------
+# Árbol virtual del caso
+# ----------------------------------------------------------------------
+@dataclass
+class VirtualFile:
+    """
+    Archivo del árbol virtual: estado previsto (written, unchanged,
+    identical, removed, skipped, error), bytes renderizados y, para los que
+    se reescriben, el contenido actual del disco (None si no existe).
+    """
+    target: Target
+    key: str
+    status: str
+    data: bytes = None
+    old: bytes = None
+    digest: str = ""
+    error: str = ""
+
+
+@dataclass
+class CaseTree:
+    """
+    Resultado de renderizar un plan en memoria, sin escribir nada.
+    - diff(): diff unificado frente a los archivos del disco (dry-run).
+    - commit(): escribe todos los cambios en un solo lote y actualiza el
+      manifiesto; devuelve el GenerationReport.
+    """
+    ctx: object
+    files: list
+    inputs: dict
+    manifest: dict
+    executor: str = "serial"
+    workers: int = 1
+    elapsed: float = 0.0
+    committed: bool = False
+
+    @property
+    def changes(self):
+        """Archivos que commit() reescribiría o eliminaría."""
+        return [f for f in self.files if f.status in (STATUS_WRITTEN, STATUS_REMOVED)]
+
+    def report(self):
+        """GenerationReport con los estados previstos (o los finales tras commit)."""
+        report = GenerationReport(executor=self.executor, workers=self.workers, elapsed=self.elapsed)
+        report.results = [TargetResult(f.target.name, f.target.path, f.status, f.error) for f in self.files]
+        return report
+
+    def diff(self, context=3):
+        """Diff unificado (texto) de los cambios frente al disco; sólo lee."""
+        chunks = []
+        for f in self.changes:
+            old = f.old
+            if f.status == STATUS_REMOVED:
+                try:
+                    with open(f.target.path, "rb") as fh:
+                        old = fh.read()
+                except OSError:
+                    old = b""
+            label = f.key or f.target.path
+            before = old.decode("utf-8", "replace").splitlines(keepends=True) if old is not None else []
+            after = f.data.decode("utf-8").splitlines(keepends=True) if f.data is not None else []
+            lines = difflib.unified_diff(before, after,
+                                         fromfile=f"a/{label}" if old is not None else "/dev/null",
+                                         tofile=f"b/{label}" if f.data is not None else "/dev/null",
+                                         n=context)
+            for line in lines:
+                chunks.append(line if line.endswith("\n") else line + "\n\\ No newline at end of file\n")
+        return "".join(chunks)
+
+    def commit(self):
+        """
+        Escribe el árbol en el disco: todos los archivos que cambian en un
+        solo lote atómico (si falla la preparación de uno no se sustituye
+        ninguno), después las eliminaciones y una sola vez el manifiesto.
+        """
+        if self.committed:
+            raise RuntimeError("El árbol del caso ya se ha escrito")
+        start = time.perf_counter()
+        ctx = self.ctx
+        incremental = bool(ctx.data_dir)
+        new_manifest = dict(self.manifest)
+
+        writes = [f for f in self.files if f.status == STATUS_WRITTEN]
+        try:
+            atomic_write_many({f.target.path: f.data for f in writes})
+        except OSError as e:
+            for f in writes:
+                f.status, f.error = STATUS_ERROR, f"{type(e).__name__}: {e}"
+
+        for f in self.files:
+            try:
+                if f.status == STATUS_REMOVED:
+                    os.remove(f.target.path)
+                elif f.status in (STATUS_WRITTEN, STATUS_IDENTICAL) and incremental:
+                    new_manifest[f.key] = _file_entry(f.target.path, self.inputs[f.target], f.digest)
+            except OSError as e:
+                f.status, f.error = STATUS_ERROR, f"{type(e).__name__}: {e}"
+            if f.status in (STATUS_REMOVED, STATUS_SKIPPED, STATUS_ERROR):
+                new_manifest.pop(f.key, None)
+            if f.status == STATUS_ERROR:
+                logging.error(f"Error al generar '{f.target.name}': {f.error}")
+
+        if incremental and new_manifest != self.manifest:
+            _save_manifest(ctx, new_manifest)
+        self.committed = True
+        self.elapsed += time.perf_counter() - start
+        report = self.report()
+        logging.info(f"[generation] {report.summary()} ({self.executor}, {self.workers} workers)")
+        return report
+
+
+def _disk_status(path, data, entry):
+    """(estado, hash, contenido actual) de escribir 'data' en 'path': identical o written."""
+    digest = _bytes_hash(data)
+    if entry and entry.get("output") == digest and _on_disk(path, entry):
+        return STATUS_IDENTICAL, digest, None
+    try:
+        with open(path, "rb") as f:
+            old = f.read()
+    except OSError:
+        return STATUS_WRITTEN, digest, None
+    return (STATUS_IDENTICAL if old == data else STATUS_WRITTEN), digest, old
+
+
+# ----------------------------------------------------------------------
+# Ejecución de un plan
+# ----------------------------------------------------------------------
+def render_tree(ctx, targets, workers=None, executor="auto", force=False):
+    """
+    Renderiza el plan 'targets' en un CaseTree en memoria. Sólo se
+    renderizan los Target cuyas entradas han cambiado desde la última
+    generación (todos con force=True), en paralelo si procede; del disco
+    sólo se lee, para saber qué archivos cambian de contenido.
+    """
+    start = time.perf_counter()
+    incremental = bool(ctx.data_dir)
+    manifest = load_manifest(ctx) if incremental else {}
+
+    def rel(target):
+        return os.path.relpath(target.path, ctx.data_dir).replace(os.sep, "/") if incremental else ""
+
+    # 1) Qué hay que renderizar
+    unchanged = set()
+    inputs = input_hashes(ctx, targets)
+    todo = []
+    for target in targets:
+        if target.render is None:
+            continue
+        entry = manifest.get(rel(target))
+        if not force and entry and entry.get("inputs") == inputs[target] and _on_disk(target.path, entry):
+            unchanged.add(target)
+        else:
+            todo.append(target)
+
+    # 2) Renderizado (en paralelo si procede)
+    rendered, mode, workers = render_targets(ctx, todo, workers, executor)
+    rendered = dict(zip(todo, rendered))
+
+    # 3) Estado previsto de cada archivo, en el orden del plan
+    files = []
+    for target in targets:
+        f = VirtualFile(target, rel(target), STATUS_SKIPPED)
+        if target in unchanged:
+            f.status = STATUS_UNCHANGED
+        elif target.render is None:
+            if os.path.isfile(target.path):
+                f.status = STATUS_REMOVED
+        else:
+            content, error = rendered[target]
+            if error is not None:
+                f.status, f.error = STATUS_ERROR, error
+                logging.error(f"Error al generar '{target.name}': {error}")
+            elif content is not None:
+                f.data = content.encode("utf-8")
+                f.status, f.digest, f.old = _disk_status(target.path, f.data, manifest.get(f.key))
+        files.append(f)
+
+    return CaseTree(ctx, files, inputs, manifest, executor=mode, workers=workers,
+                    elapsed=time.perf_counter() - start)
+
+
+def run_targets(ctx, targets, workers=None, executor="auto", force=False):
+    """
+    Genera los archivos del plan 'targets' y devuelve un GenerationReport:
+    render_tree() en memoria y commit() en un solo lote, de forma que sólo
+    se reescriben los archivos que cambian de contenido y se eliminan los
+    que ya no corresponden.
+    """
+    return render_tree(ctx, targets, workers, executor, force).commit()
+
+
+def stale_targets(ctx, targets):
+    """
+    Nombres de los Target del plan que "Inicializar Caso" regeneraría: sus
+    entradas han cambiado, falta el archivo o se ha modificado a mano, o es
+    un archivo que debe eliminarse y todavía existe. No renderiza nada.
+    """
+    manifest = load_manifest(ctx) if ctx.data_dir else {}
+    inputs = input_hashes(ctx, targets)
+    stale = []
+    for target in targets:
+        if target.render is None:
+            if os.path.isfile(target.path):
+                stale.append(target.name)
+            continue
+        entry = manifest.get(os.path.relpath(target.path, ctx.data_dir).replace(os.sep, "/")) if manifest else None
+        if not (entry and entry.get("inputs") == inputs[target] and _on_disk(target.path, entry)):
+            stale.append(target.name)
+    return stale
@@ -0,0 +1,225 @@
+# core/graph_partition.py
+
+"""
+Particionador de la malla para el método 'manual' de decomposePar.
+
+Sólo usa NumPy (sin SciPy, scotch ni metis):
+
+1) Grafo de celdas: dos celdas son vecinas si comparten una cara interna
+   (owner/neighbour), en formato CSR (xadj, adjncy).
+2) Bisección recursiva de los centros de celda. En cada paso el conjunto
+   se corta perpendicular a su eje principal de inercia ('inertial') o a
+   su mayor extensión ('coordinate'), en la proporción k1/k de las partes
+   que recibe cada mitad, de modo que admite cualquier nº de procesadores.
+3) Refinamiento: varias pasadas tipo Fiduccia-Mattheyses en las que las
+   celdas de frontera pasan a la parte vecina con la que comparten más
+   caras, siempre que no se rompa el equilibrio de carga.
+
+El resultado se escribe como labelList (binario por defecto) en
+constant/decompositionManualDict, que es el 'dataFile' de manualCoeffs.
+"""
+
+import os
+import logging
+
+import numpy as np
+
+from core.decomposition import evaluate_assignment, load_cell_centres
+
+MANUAL_DATA_FILE = "decompositionManualDict"
+PARTITION_METHODS = ("inertial", "coordinate")
+
+# Exceso de celdas admitido por parte durante el refinamiento
+BALANCE_TOLERANCE = 0.03
+REFINE_PASSES = 8
+
+
+def cell_adjacency(owner, neighbour, n_cells):
+    """
+    Grafo de celdas en CSR a partir de las caras internas.
+
+    Retorna
+    -------
+    (numpy.ndarray, numpy.ndarray)
+        xadj (nCells + 1) y adjncy: los vecinos de la celda i son
+        adjncy[xadj[i]:xadj[i + 1]].
+    """
+    n_int = len(neighbour)
+    src = np.concatenate((owner[:n_int], neighbour))
+    dst = np.concatenate((neighbour, owner[:n_int]))
+    order = np.argsort(src, kind="stable")
+    xadj = np.zeros(n_cells + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n_cells), out=xadj[1:])
+    return xadj, dst[order]
+
+
+def _split_axis(points, method):
+    if method == "coordinate" or len(points) < 3:
+        return np.eye(3)[int(np.ptp(points, axis=0).argmax())]
+    centred = points - points.mean(axis=0)
+    _, vectors = np.linalg.eigh(centred.T @ centred)
+    return vectors[:, -1]
+
+
+def recursive_bisection(centres, n_parts, method="inertial"):
+    """
+    Parte de cada celda (0..n_parts-1) por bisección recursiva de 'centres'.
+    """
+    if method not in PARTITION_METHODS:
+        raise ValueError(f"Método de bisección desconocido: '{method}'")
+    part = np.zeros(len(centres), dtype=np.int64)
+    stack = [(np.arange(len(centres)), 0, n_parts)]
+    while stack:
+        cells, first, k = stack.pop()
+        if k == 1 or len(cells) == 0:
+            part[cells] = first
+            continue
+        k1 = k // 2
+        pts = centres[cells]
+        proj = pts @ _split_axis(pts, method)
+        cut = int(round(len(cells) * k1 / k))
+        order = np.argpartition(proj, cut) if 0 < cut < len(cells) else np.argsort(proj)
+        stack.append((cells[order[:cut]], first, k1))
+        stack.append((cells[order[cut:]], first + k1, k - k1))
+    return part
+
+
+def _boundary_moves(part, src, dst, n_parts):
+    """
+    Para cada celda de frontera, la parte vecina con más caras compartidas y
+    la ganancia (caras cortadas que desaparecen) de moverla allí.
+    """
+    key = src * n_parts + part[dst]
+    keys, counts = np.unique(key, return_counts=True)
+    cell = keys // n_parts
+    target = keys % n_parts
+    n_cells = len(part)
+
+    internal = np.zeros(n_cells, dtype=np.int64)
+    own = target == part[cell]
+    internal[cell[own]] = counts[own]
+
+    ext = ~own
+    cell, target, counts = cell[ext], target[ext], counts[ext]
+    gain = counts - internal[cell]
+    # La mejor parte destino por celda: mayor ganancia
+    order = np.lexsort((-gain, cell))
+    cell, target, gain = cell[order], target[order], gain[order]
+    first = np.ones(len(cell), dtype=bool)
+    first[1:] = cell[1:] != cell[:-1]
+    return cell[first], target[first], gain[first]
+
+
+def _rank_within(groups, scores):
+    """Posición de cada elemento dentro de su grupo, de mayor a menor 'scores'."""
+    order = np.lexsort((-scores, groups))
+    g = groups[order]
+    starts = np.flatnonzero(np.r_[True, g[1:] != g[:-1]])
+    rank_sorted = np.arange(len(g)) - np.repeat(starts, np.diff(np.r_[starts, len(g)]))
+    rank = np.empty(len(g), dtype=np.int64)
+    rank[order] = rank_sorted
+    return rank
+
+
+def refine_partition(part, xadj, adjncy, n_parts, tolerance=BALANCE_TOLERANCE,
+                     passes=REFINE_PASSES):
+    """
+    Reduce las caras de procesador moviendo celdas de frontera con ganancia
+    positiva, sin superar (1 + tolerance) veces el tamaño medio por parte.
+
+    En cada pasada sólo se permite mover en un sentido entre cada par de
+    partes (a -> b con a < b en las pasadas pares, a > b en las impares), de
+    forma que dos celdas vecinas nunca se intercambian a la vez.
+    """
+    part = part.copy()
+    src = np.repeat(np.arange(len(part)), np.diff(xadj))
+    dst = adjncy
+    mean = len(part) / n_parts
+    cap = int(np.floor(mean * (1.0 + tolerance)))
+    floor = int(np.ceil(mean * (1.0 - tolerance)))
+
+    for p in range(passes):
+        cell, target, gain = _boundary_moves(part, src, dst, n_parts)
+        source = part[cell]
+        ok = (gain > 0) & ((source < target) if p % 2 == 0 else (source > target))
+        cell, target, gain, source = cell[ok], target[ok], gain[ok], source[ok]
+        if not len(cell):
+            if p % 2:
+                break
+            continue
+
+        sizes = np.bincount(part, minlength=n_parts)
+        keep = (_rank_within(target, gain) < (cap - sizes)[target]) & \
+               (_rank_within(source, gain) < (sizes - floor)[source])
+        if not keep.any():
+            continue
+        part[cell[keep]] = target[keep]
+    return part
+
+
+def partition_mesh(centres, owner, neighbour, n_parts, method="inertial", refine=True):
+    """Bisección recursiva + refinamiento; devuelve la parte de cada celda."""
+    part = recursive_bisection(centres, n_parts, method)
+    if refine and n_parts > 1:
+        xadj, adjncy = cell_adjacency(owner, neighbour, len(centres))
+        part = refine_partition(part, xadj, adjncy, n_parts)
+    return part
+
+
+def plan_manual_decomposition(case_dir, n_procs, method="inertial", refine=True):
+    """
+    Particiona la malla de 'case_dir' (directorio del caso o su carpeta
+    polyMesh) en 'n_procs' partes.
+
+    Retorna
+    -------
+    dict
+        Mismo resumen que core.decomposition.plan_decomposition (celdas por
+        procesador, desequilibrio, caras de procesador) más 'cellToProc'.
+    """
+    data = load_cell_centres(case_dir)
+    centres = data["centres"]
+    if len(centres) < n_procs:
+        raise ValueError(f"La malla tiene {len(centres)} celdas, menos que {n_procs} procesadores.")
+    part = partition_mesh(centres, data["owner"], data["neighbour"], n_procs, method, refine)
+    plan = evaluate_assignment(part, data["owner"], data["neighbour"], n_procs)
+    plan.update({
+        "method": "manual",
+        "partitioner": method,
+        "numberOfSubdomains": n_procs,
+        "nCells": len(centres),
+        "cellToProc": part,
+    })
+    logging.info(f"[graph_partition] {n_procs} partes ({method}): desequilibrio "
+                 f"{plan['imbalance']:.3f}, {plan['processorFaces']} caras de procesador")
+    return plan
+
+
+def write_manual_decomposition(path, cell_to_proc, binary=True):
+    """
+    Escribe la lista celda -> procesador como labelList de OpenFOAM
+    (dataFile de manualCoeffs). En binario se usan labels de 32 bits.
+    """
+    labels = np.ascontiguousarray(cell_to_proc, dtype="<i4")
+    header = (
+        "FoamFile\n{\n"
+        "    version     2.0;\n"
+        f"    format      {'binary' if binary else 'ascii'};\n"
+        '    arch        "LSB;label=32;scalar=64";\n'
+        "    class       labelList;\n"
+        '    location    "constant";\n'
+        f"    object      {os.path.basename(path)};\n"
+        "}\n\n"
+    )
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(header.encode())
+        f.write(f"{len(labels)}\n(".encode())
+        if binary:
+            f.write(labels.tobytes())
+        else:
+            f.write(b"\n")
+            f.write("\n".join(map(str, labels.tolist())).encode())
+            f.write(b"\n")
+        f.write(b")\n")
+    logging.info(f"[graph_partition] {path} escrito ({len(labels)} celdas).")
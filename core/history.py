@@ -0,0 +1,563 @@
+# core/history.py
+
+"""
+Historial deshacer/rehacer de case_config con estructuras persistentes.
+
+Cada versión de case_config se guarda congelada (freeze) en estructuras
+inmutables que comparten todo lo que no cambia con la versión anterior:
+
+- PMap: diccionario persistente (hash array mapped trie de 32 ramas). Cambiar
+  una clave copia sólo los ~log32(n) nodos del camino, no el dict entero.
+- PVector: lista persistente en bloques de 32 elementos. Cambiar un elemento
+  copia un bloque por nivel; añadir o quitar reaprovecha los bloques previos
+  al cambio.
+
+CaseHistory.commit(case_config) compara el dict vivo con la última versión y
+anota sólo los caminos modificados (p.ej. ("injections", 12, "massTotal")).
+undo()/redo() cambian de versión y reescriben en el dict vivo exclusivamente
+esos caminos, así que su coste es proporcional a la profundidad del cambio y
+no al tamaño de case_config; las páginas de la GUI siguen compartiendo el
+mismo dict.
+
+    history = CaseHistory(case_config)
+    case_config["ambientPressure"] = 2e5
+    history.commit(case_config, "Presión ambiente")
+    history.undo(case_config)      # vuelve a la presión anterior
+"""
+
+import collections
+
+BITS = 5
+WIDTH = 1 << BITS
+MASK = WIDTH - 1
+HASH_BITS = 64
+
+MAX_UNDO_STEPS = 5000
+
+_MISSING = object()
+
+
+# ----------------------------------------------------------------------
+# PMap: hash array mapped trie
+# ----------------------------------------------------------------------
+class _Leaf:
+    __slots__ = ("key", "hash", "value", "seq")
+
+    def __init__(self, key, h, value, seq):
+        self.key = key
+        self.hash = h
+        self.value = value
+        self.seq = seq      # orden de inserción, para thaw()
+
+
+class _Collision:
+    """Claves distintas con el mismo hash de 64 bits."""
+    __slots__ = ("hash", "leaves")
+
+    def __init__(self, h, leaves):
+        self.hash = h
+        self.leaves = leaves
+
+
+class _Node:
+    __slots__ = ("bitmap", "entries")
+
+    def __init__(self, bitmap, entries):
+        self.bitmap = bitmap
+        self.entries = entries
+
+
+def _hash(key):
+    return hash(key) & ((1 << HASH_BITS) - 1)
+
+
+def _index(bitmap, bit):
+    return bin(bitmap & (bit - 1)).count("1")
+
+
+def _pair(a, b, shift):
+    """Nodo que contiene dos entradas (hoja o colisión) de hashes distintos."""
+    if shift >= HASH_BITS:
+        return _Collision(a.hash, (a, b))
+    ia = (a.hash >> shift) & MASK
+    ib = (b.hash >> shift) & MASK
+    if ia == ib:
+        return _Node(1 << ia, (_pair(a, b, shift + BITS),))
+    entries = (a, b) if ia < ib else (b, a)
+    return _Node((1 << ia) | (1 << ib), entries)
+
+
+def _find(node, h, key):
+    shift = 0
+    while node is not None:
+        if isinstance(node, _Collision):
+            for leaf in node.leaves:
+                if leaf.key == key:
+                    return leaf
+            return None
+        bit = 1 << ((h >> shift) & MASK)
+        if not node.bitmap & bit:
+            return None
+        entry = node.entries[_index(node.bitmap, bit)]
+        if isinstance(entry, _Leaf):
+            return entry if entry.hash == h and entry.key == key else None
+        node = entry
+        shift += BITS
+    return None
+
+
+def _assoc(node, shift, leaf):
+    """Nodo con 'leaf' insertada o sustituida (se copia sólo el camino)."""
+    if node is None:
+        return _Node(1 << ((leaf.hash >> shift) & MASK), (leaf,))
+    if isinstance(node, _Collision):
+        if node.hash != leaf.hash:
+            return _pair(node, leaf, shift)
+        leaves = tuple(l for l in node.leaves if l.key != leaf.key) + (leaf,)
+        return _Collision(node.hash, leaves)
+
+    bit = 1 << ((leaf.hash >> shift) & MASK)
+    idx = _index(node.bitmap, bit)
+    entries = node.entries
+    if not node.bitmap & bit:
+        return _Node(node.bitmap | bit, entries[:idx] + (leaf,) + entries[idx:])
+    entry = entries[idx]
+    if isinstance(entry, _Leaf):
+        if entry.hash == leaf.hash and entry.key == leaf.key:
+            new = leaf
+        elif entry.hash == leaf.hash:
+            new = _Collision(leaf.hash, (entry, leaf))
+        else:
+            new = _pair(entry, leaf, shift + BITS)
+    else:
+        new = _assoc(entry, shift + BITS, leaf)
+    return _Node(node.bitmap, entries[:idx] + (new,) + entries[idx + 1:])
+
+
+def _dissoc(node, shift, h, key):
+    """Nodo sin 'key' (el mismo objeto si no estaba, None si queda vacío)."""
+    if node is None:
+        return None
+    if isinstance(node, _Collision):
+        leaves = tuple(l for l in node.leaves if l.key != key)
+        if len(leaves) == len(node.leaves):
+            return node
+        return leaves[0] if len(leaves) == 1 else _Collision(node.hash, leaves)
+
+    bit = 1 << ((h >> shift) & MASK)
+    if not node.bitmap & bit:
+        return node
+    idx = _index(node.bitmap, bit)
+    entry = node.entries[idx]
+    if isinstance(entry, _Leaf):
+        if entry.hash != h or entry.key != key:
+            return node
+        new = None
+    else:
+        new = _dissoc(entry, shift + BITS, h, key)
+        if new is entry:
+            return node
+    if new is None:
+        if node.bitmap == bit:
+            return None
+        return _Node(node.bitmap & ~bit, node.entries[:idx] + node.entries[idx + 1:])
+    return _Node(node.bitmap, node.entries[:idx] + (new,) + node.entries[idx + 1:])
+
+
+def _leaves(node):
+    if node is None:
+        return
+    if isinstance(node, _Leaf):
+        yield node
+    elif isinstance(node, _Collision):
+        yield from node.leaves
+    else:
+        for entry in node.entries:
+            yield from _leaves(entry)
+
+
+class PMap:
+    """Diccionario inmutable; set()/delete() devuelven un PMap nuevo."""
+    __slots__ = ("_root", "_count", "_seq")
+
+    def __init__(self, root=None, count=0, seq=0):
+        self._root = root
+        self._count = count
+        self._seq = seq
+
+    @classmethod
+    def from_dict(cls, d):
+        m = cls()
+        for key, value in d.items():
+            m = m.set(key, value)
+        return m
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, key):
+        return _find(self._root, _hash(key), key) is not None
+
+    def get(self, key, default=None):
+        leaf = _find(self._root, _hash(key), key)
+        return default if leaf is None else leaf.value
+
+    def set(self, key, value):
+        h = _hash(key)
+        old = _find(self._root, h, key)
+        if old is not None and old.value is value:
+            return self
+        seq = old.seq if old is not None else self._seq
+        root = _assoc(self._root, 0, _Leaf(key, h, value, seq))
+        if old is not None:
+            return PMap(root, self._count, self._seq)
+        return PMap(root, self._count + 1, self._seq + 1)
+
+    def delete(self, key):
+        root = _dissoc(self._root, 0, _hash(key), key)
+        if root is self._root:
+            return self
+        return PMap(root, self._count - 1, self._seq)
+
+    def items(self):
+        """Pares (clave, valor) en orden de inserción."""
+        return [(l.key, l.value) for l in sorted(_leaves(self._root), key=lambda l: l.seq)]
+
+    def keys(self):
+        return (l.key for l in _leaves(self._root))
+
+
+# ----------------------------------------------------------------------
+# PVector: trie de bloques de 32 elementos
+# ----------------------------------------------------------------------
+class PVector:
+    """Lista inmutable; set()/splice() devuelven un PVector nuevo."""
+    __slots__ = ("_root", "_count", "_shift")
+
+    def __init__(self, leaves=()):
+        # 'leaves': bloques (tuplas) de WIDTH elementos, el último puede ser menor
+        self._count = sum(len(b) for b in leaves)
+        self._shift = 0
+        level = list(leaves)
+        while len(level) > 1:
+            level = [tuple(level[i:i + WIDTH]) for i in range(0, len(level), WIDTH)]
+            self._shift += BITS
+        self._root = level[0] if level else ()
+
+    @classmethod
+    def from_list(cls, items):
+        items = tuple(items)
+        return cls([items[i:i + WIDTH] for i in range(0, len(items), WIDTH)])
+
+    def __len__(self):
+        return self._count
+
+    def get(self, i):
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        node = self._root
+        for level in range(self._shift, 0, -BITS):
+            node = node[(i >> level) & MASK]
+        return node[i & MASK]
+
+    def __iter__(self):
+        for block in self.blocks():
+            yield from block
+
+    def blocks(self):
+        """Bloques hoja, compartidos con las versiones anteriores."""
+        def walk(node, level):
+            if level == 0:
+                yield node
+            else:
+                for child in node:
+                    yield from walk(child, level - BITS)
+        if self._count:
+            yield from walk(self._root, self._shift)
+
+    def set(self, i, value):
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+
+        def assoc(node, level):
+            j = (i >> level) & MASK
+            child = value if level == 0 else assoc(node[j], level - BITS)
+            return node[:j] + (child,) + node[j + 1:]
+
+        new = PVector.__new__(PVector)
+        new._root = assoc(self._root, self._shift)
+        new._count = self._count
+        new._shift = self._shift
+        return new
+
+    def splice(self, start, delete_count, items):
+        """
+        Sustituye [start:start+delete_count] por 'items'. Los bloques hoja
+        anteriores a 'start' se reutilizan tal cual.
+        """
+        keep = start // WIDTH
+        blocks = list(self.blocks())
+        head = blocks[:keep]
+        rest = [x for block in blocks[keep:] for x in block]
+        offset = start - keep * WIDTH
+        rest[offset:offset + delete_count] = list(items)
+        return PVector(head + [tuple(rest[i:i + WIDTH]) for i in range(0, len(rest), WIDTH)])
+
+
+# ----------------------------------------------------------------------
+# Conversión dict/list <-> estructuras persistentes
+# ----------------------------------------------------------------------
+def freeze(obj):
+    if isinstance(obj, dict):
+        return PMap.from_dict({k: freeze(v) for k, v in obj.items()})
+    if isinstance(obj, (list, tuple)):
+        return PVector.from_list(freeze(x) for x in obj)
+    return obj
+
+
+def thaw(obj):
+    if isinstance(obj, PMap):
+        return {k: thaw(v) for k, v in obj.items()}
+    if isinstance(obj, PVector):
+        return [thaw(x) for x in obj]
+    return obj
+
+
+def equal(frozen, live):
+    """Igualdad profunda versión congelada / viva (1, 1.0 y True son distintos)."""
+    if type(frozen) is PMap:
+        if type(live) is not dict or len(frozen) != len(live):
+            return False
+        for key, value in live.items():
+            if not equal(frozen.get(key, _MISSING), value):
+                return False
+        return True
+    if type(frozen) is PVector:
+        if type(live) is not list or len(frozen) != len(live):
+            return False
+        for f, value in zip(frozen, live):
+            if not equal(f, value):
+                return False
+        return True
+    return type(frozen) is type(live) and frozen == live
+
+
+def _insert_key(target, key, value, source):
+    """
+    Añade 'key' al dict vivo en la posición que tiene en 'source' (PMap de
+    la versión restaurada) y no al final: deshacer el borrado de una clave
+    debe devolver el mismo orden (el de los bloques que se escriben en los
+    archivos generados).
+    """
+    order = {k: i for i, (k, _) in enumerate(source.items())}
+    rank = order[key]
+    items = list(target.items())
+    pos = next((i for i, (k, _) in enumerate(items) if order.get(k, -1) > rank), len(items))
+    if pos == len(items):
+        target[key] = value
+        return
+    # Se reordena en sitio: las páginas de la GUI comparten este dict
+    target.clear()
+    target.update(items[:pos])
+    target[key] = value
+    target.update(items[pos:])
+
+
+# ----------------------------------------------------------------------
+# Historial
+# ----------------------------------------------------------------------
+Step = collections.namedtuple("Step", "label before after ops")
+
+
+class CaseHistory:
+    def __init__(self, case_config, max_steps=MAX_UNDO_STEPS):
+        self._root = freeze(case_config)
+        self._undo = collections.deque(maxlen=max_steps)
+        self._redo = []
+
+    @property
+    def can_undo(self):
+        return bool(self._undo)
+
+    @property
+    def can_redo(self):
+        return bool(self._redo)
+
+    def undo_label(self):
+        return self._undo[-1].label if self._undo else None
+
+    def redo_label(self):
+        return self._redo[-1].label if self._redo else None
+
+    def snapshot(self):
+        """Versión actual congelada (se puede guardar y comparar sin copiar)."""
+        return self._root
+
+    # ------------------------------------------------------------------
+    # Registro de cambios
+    # ------------------------------------------------------------------
+    def commit(self, case_config, label="", paths=None):
+        """
+        Registra los cambios hechos en case_config desde la última versión.
+        Sin 'paths' se compara todo case_config (coste proporcional a su
+        tamaño); si quien edita sabe qué ha tocado, puede pasar los caminos,
+        p.ej. [("injections", 3)], y sólo se comparan esos subárboles.
+        Devuelve la lista de caminos modificados ([] si no hay cambios, y
+        entonces no se crea paso de deshacer).
+        """
+        ops = []
+        if paths is None:
+            root = self._sync_map(self._root, case_config, (), ops)
+        else:
+            root = self._root
+            for path in paths:
+                root, _ = self._sync_at(root, case_config, tuple(path), (), ops)
+        if not ops:
+            return []
+        self._undo.append(Step(label, self._root, root, ops))
+        self._redo.clear()
+        self._root = root
+        return self.changed_paths(self._undo[-1])
+
+    def _sync_at(self, old, live, path, prefix, ops):
+        """Como _sync, pero bajando sólo por 'path' (relativo a 'prefix')."""
+        if not path:
+            return self._sync(old, live, prefix, ops)
+        key, rest = path[0], path[1:]
+        if isinstance(old, PMap) and isinstance(live, dict):
+            current = old.get(key, _MISSING)
+            if key not in live:
+                if current is _MISSING:
+                    return old, False
+                ops.append(("key", prefix, key))
+                return old.delete(key), False
+            if current is _MISSING:
+                ops.append(("key", prefix, key))
+                return old.set(key, freeze(live[key])), False
+            value_new, replaced = self._sync_at(current, live[key], rest, prefix + (key,), ops)
+            if replaced:
+                ops.append(("key", prefix, key))
+            return old.set(key, value_new), False
+        if (isinstance(old, PVector) and isinstance(live, list) and isinstance(key, int)
+                and len(old) == len(live) and 0 <= key < len(live)):
+            current = old.get(key)
+            value_new, replaced = self._sync_at(current, live[key], rest, prefix + (key,), ops)
+            if replaced:
+                ops.append(("index", prefix, key))
+            return (old if value_new is current else old.set(key, value_new)), False
+        # La estructura del camino ha cambiado: se compara el subárbol completo
+        return self._sync(old, live, prefix, ops)
+
+    def _sync(self, old, live, path, ops):
+        """(versión nueva, sustituida): sustituida=True si el llamador debe anotar el cambio."""
+        if isinstance(old, PMap) and isinstance(live, dict):
+            return self._sync_map(old, live, path, ops), False
+        if isinstance(old, PVector) and isinstance(live, list):
+            return self._sync_vector(old, live, path, ops), False
+        if equal(old, live):
+            return old, False
+        return freeze(live), True
+
+    def _sync_map(self, old, live, path, ops):
+        new = old
+        added = False
+        for key, value in live.items():
+            current = old.get(key, _MISSING)
+            if current is _MISSING:
+                new = new.set(key, freeze(value))
+                ops.append(("key", path, key))
+                added = True
+                continue
+            value_new, replaced = self._sync(current, value, path + (key,), ops)
+            if value_new is not current:
+                new = new.set(key, value_new)
+            if replaced:
+                ops.append(("key", path, key))
+        # Claves borradas (imposible si no se añadió nada y el tamaño coincide)
+        if added or len(old) != len(live):
+            for key in list(old.keys()):
+                if key not in live:
+                    new = new.delete(key)
+                    ops.append(("key", path, key))
+        return new
+
+    def _sync_vector(self, old, live, path, ops):
+        n_old, n_new = len(old), len(live)
+        if n_old == n_new:
+            new = old
+            for i, value in enumerate(live):
+                current = old.get(i)
+                value_new, replaced = self._sync(current, value, path + (i,), ops)
+                if value_new is not current:
+                    new = new.set(i, value_new)
+                if replaced:
+                    ops.append(("index", path, i))
+            return new
+        # Cambio de longitud: prefijo y sufijo comunes, se sustituye el tramo central
+        limit = min(n_old, n_new)
+        start = 0
+        while start < limit and equal(old.get(start), live[start]):
+            start += 1
+        end = 0
+        while end < limit - start and equal(old.get(n_old - 1 - end), live[n_new - 1 - end]):
+            end += 1
+        removed, inserted = n_old - start - end, n_new - start - end
+        ops.append(("splice", path, start, removed, inserted))
+        return old.splice(start, removed, [freeze(x) for x in live[start:start + inserted]])
+
+    # ------------------------------------------------------------------
+    # Deshacer / rehacer
+    # ------------------------------------------------------------------
+    def undo(self, case_config):
+        """
+        Devuelve case_config (modificado en sitio) a la versión anterior.
+        Devuelve el paso deshecho, o None si no hay nada que deshacer.
+        """
+        if not self._undo:
+            return None
+        step = self._undo.pop()
+        for op in reversed(step.ops):
+            self._apply(case_config, op, step.before, undo=True)
+        self._root = step.before
+        self._redo.append(step)
+        return step
+
+    def redo(self, case_config):
+        if not self._redo:
+            return None
+        step = self._redo.pop()
+        for op in step.ops:
+            self._apply(case_config, op, step.after, undo=False)
+        self._root = step.after
+        self._undo.append(step)
+        return step
+
+    @staticmethod
+    def _apply(case_config, op, source, undo):
+        kind, path = op[0], op[1]
+        target = case_config
+        for part in path:
+            target = target[part]
+            source = source.get(part)
+        if kind == "key":
+            value = source.get(op[2], _MISSING)
+            if value is _MISSING:
+                target.pop(op[2], None)
+            elif op[2] in target:
+                target[op[2]] = thaw(value)
+            else:
+                _insert_key(target, op[2], thaw(value), source)
+        elif kind == "index":
+            target[op[2]] = thaw(source.get(op[2]))
+        else:
+            start, removed, inserted = op[2:]
+            current, restored = (inserted, removed) if undo else (removed, inserted)
+            target[start:start + current] = [thaw(source.get(i)) for i in range(start, start + restored)]
+
+    @staticmethod
+    def changed_paths(step):
+        """
+        Caminos de case_config que cambia un paso: ("injections", 3) si
+        cambió ese elemento, ("injections",) si se añadieron o quitaron.
+        """
+        return [op[1] + (op[2],) if op[0] in ("key", "index") else op[1] for op in step.ops]
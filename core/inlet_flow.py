@@ -0,0 +1,184 @@
+# core/inlet_flow.py
+
+"""
+Conversión entre velocidad, caudal volumétrico y caudal másico en los inlets.
+
+El área del patch se toma del índice de malla (core/mesh_index.py), que la
+calcula sobre las caras reales de polyMesh, y la densidad de entrada de la
+configuración del caso:
+
+- Gas perfecto (energía activa y equationOfState perfectGas):
+  rho = p * W / (R * T), con la presión ambiente, la temperatura del inlet y
+  el peso molecular de la mezcla definida por sus fracciones molares.
+- En otro caso, la densidad constante del primer material fluido.
+"""
+
+import re
+import json
+import logging
+
+from core.mesh_index import load_mesh_index, patch_lookup
+from core import workspace
+
+R_UNIVERSAL = 8314.462618      # J/(kmol·K)
+AIR_MOLAR_MASS = 28.9647       # kg/kmol
+DEFAULT_DENSITY = 1.225        # kg/m³ (aire a 15 °C)
+DEFAULT_PRESSURE = 101325.0    # Pa
+
+# Magnitud que introduce el usuario en el inlet
+FLOW_SPECS = ("velocity", "volumetricFlowRate", "massFlowRate")
+FLOW_SPEC_UNITS = {"velocity": "m/s", "volumetricFlowRate": "m³/s", "massFlowRate": "kg/s"}
+
+ATOMIC_MASSES = {
+    "H": 1.008, "He": 4.0026, "C": 12.011, "N": 14.007, "O": 15.999,
+    "F": 18.998, "Ne": 20.180, "Si": 28.085, "P": 30.974, "S": 32.06,
+    "Cl": 35.45, "Ar": 39.948, "Ti": 47.867, "Br": 79.904, "Kr": 83.798,
+    "I": 126.90, "Xe": 131.29,
+}
+
+_FORMULA_RE = re.compile(r"([A-Z][a-z]?)(\d*)")
+
+
+def species_molar_mass(name):
+    """
+    Peso molecular (kg/kmol) a partir de la fórmula de la especie, p.ej.
+    'CH4' -> 16.04. Devuelve None si el nombre no es una fórmula química
+    reconocible ('JetA', 'soot', ...).
+    """
+    formula = name.rstrip("*")
+    if formula.upper() in ("AR", "HE", "NE", "KR", "XE"):
+        # Gases nobles escritos en mayúsculas en CHEMKIN ('AR', 'HE')
+        return ATOMIC_MASSES[formula.capitalize()]
+    pos = 0
+    total = 0.0
+    for m in _FORMULA_RE.finditer(formula):
+        if m.start() != pos or m.group(1) not in ATOMIC_MASSES:
+            return None
+        total += ATOMIC_MASSES[m.group(1)] * int(m.group(2) or 1)
+        pos = m.end()
+    if pos != len(formula) or total == 0.0:
+        return None
+    return total
+
+
+def mixture_molar_mass(mole_fractions):
+    """
+    Peso molecular medio de una mezcla {especie: fracción molar}. Las
+    especies desconocidas se ignoran; si no queda ninguna, se usa aire.
+    """
+    total_x = 0.0
+    total_w = 0.0
+    for sp, x in mole_fractions.items():
+        w = species_molar_mass(sp)
+        if w is None or not x:
+            continue
+        total_x += x
+        total_w += x * w
+    if total_x <= 0.0:
+        return AIR_MOLAR_MASS
+    return total_w / total_x
+
+
+def _inlet_mole_fractions(bc, case_config):
+    species = case_config.get("especies_options", {}).get("activeSpecies", [])
+    if not case_config.get("especiesActive", False):
+        return {}
+    return {sp: float(bc.get(f"{sp}_chemValue") or 0.0) for sp in species}
+
+
+def _material_density(case_config):
+    for mat in case_config.get("materials", []):
+        if mat.get("type", "fluid") != "fluid":
+            continue
+        value = mat.get("properties", {}).get("densityValue")
+        if value:
+            return float(value), f"material '{mat.get('name', '')}'"
+    return DEFAULT_DENSITY, "valor por defecto"
+
+
+def is_ideal_gas(case_config):
+    """True si la densidad del caso sigue la ecuación de gas perfecto."""
+    thermo = case_config.get("thermophysicalProperties", {})
+    return bool(case_config.get("energy_active", False)) and \
+        thermo.get("equationOfState", "perfectGas") == "perfectGas"
+
+
+def inlet_density(bc, case_config):
+    """
+    Densidad (kg/m³) en el inlet 'bc' según la configuración del caso.
+
+    Retorna
+    -------
+    (float, str)
+        Densidad y una descripción corta de su origen, para mostrarla en la GUI.
+    """
+    if is_ideal_gas(case_config):
+        temperature = float(bc.get("temperature") or case_config.get("ambientTemperature", 300.0))
+        pressure = float(case_config.get("ambientPressure", DEFAULT_PRESSURE))
+        w = mixture_molar_mass(_inlet_mole_fractions(bc, case_config))
+        if temperature > 0.0:
+            rho = pressure * w / (R_UNIVERSAL * temperature)
+            return rho, f"gas perfecto (p={pressure:g} Pa, T={temperature:g} K, W={w:.3f} kg/kmol)"
+    return _material_density(case_config)
+
+
+def convert_flow(value, spec, area, rho):
+    """
+    Dada una magnitud de entrada ('velocity', 'volumetricFlowRate' o
+    'massFlowRate') devuelve las tres equivalentes.
+
+    Retorna
+    -------
+    dict
+        {"velocity": m/s, "volumetricFlowRate": m³/s, "massFlowRate": kg/s}
+
+    Lanza ValueError si el área o la densidad necesarias no son positivas.
+    """
+    if spec not in FLOW_SPECS:
+        raise ValueError(f"Magnitud de caudal desconocida: '{spec}'")
+    if not area or area <= 0.0:
+        raise ValueError("El área del patch no es positiva.")
+    if not rho or rho <= 0.0:
+        raise ValueError("La densidad de entrada no es positiva.")
+
+    value = float(value)
+    if spec == "velocity":
+        volumetric = value * area
+    elif spec == "volumetricFlowRate":
+        volumetric = value
+    else:
+        volumetric = value / rho
+    return {
+        "velocity": volumetric / area,
+        "volumetricFlowRate": volumetric,
+        "massFlowRate": volumetric * rho,
+    }
+
+
+def read_working_directory(config_path=None):
+    """Directorio del caso según config.json (o None si no está definido)."""
+    config_path = config_path or workspace.config_path()
+    try:
+        with open(config_path, "r") as f:
+            return json.load(f).get("working_directory") or None
+    except (OSError, ValueError):
+        return None
+
+
+def patch_area(patch_name, working_directory=None, json_manager=None):
+    """
+    Área (m²) del patch según el índice de malla del caso, o None si la malla
+    o el patch no están disponibles.
+    """
+    working_directory = working_directory or read_working_directory()
+    if not working_directory:
+        return None
+    try:
+        index = load_mesh_index(working_directory, json_manager)
+    except Exception as e:
+        logging.warning(f"[inlet_flow] No se pudo cargar el índice de malla: {e}")
+        return None
+    patch = patch_lookup(index).get(patch_name)
+    if not patch or patch.get("area") is None:
+        return None
+    return float(patch["area"])
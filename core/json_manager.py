@@ -2,25 +2,112 @@
 
 import os
 import json
-from jsonschema import validate, ValidationError
+import uuid
+from jsonschema import Draft202012Validator
+from jsonschema.exceptions import best_match
+
+from core.atomic_io import (
+    atomic_open, atomic_write_json, project_lock, append_journal, read_journal, remove_stale_temporaries
+)
+from core.sqlite_store import SQLiteStore, DB_FILE, encode, migrate_json_dir
+from core.json_patch import apply_patch, JSONPatchError
+
+# Diario de guardados de varias secciones, dentro de data_dir
+JOURNAL_FILE = ".journal"
+
+# Registro de parches JSON (RFC 6902) de una sección: <sección>.patches junto
+# a <sección>.json. Se compacta (se reescribe la sección completa) cuando
+# ocupa más de PATCH_LOG_COMPACT_RATIO veces la sección y al menos
+# PATCH_LOG_MIN_BYTES.
+PATCH_LOG_EXT = ".patches"
+PATCH_LOG_COMPACT_RATIO = 0.5
+PATCH_LOG_MIN_BYTES = 4096
+
+# Carpeta de datos por defecto: temp junto a la raíz del proyecto
+DEFAULT_DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'temp'))
+
+# Carpeta de datos del proyecto activo (core/workspace.py); None: DEFAULT_DATA_DIR
+_default_data_dir = None
+
+
+def default_data_dir():
+    """Carpeta de datos que se usa cuando no se indica ninguna."""
+    return _default_data_dir or DEFAULT_DATA_DIR
+
+
+def set_default_data_dir(data_dir):
+    global _default_data_dir
+    _default_data_dir = os.path.abspath(data_dir) if data_dir else None
+
+# Almacenamiento de las secciones:
+# - "json": un archivo <sección>.json por sección en data_dir
+# - "sqlite": una fila por sección en <data_dir>/project.db (core/sqlite_store.py)
+BACKENDS = ("json", "sqlite")
 
 class JSONManager:
-    def __init__(self, data_dir=None):
+    # Validadores compilados, compartidos por todas las instancias:
+    # {ruta_esquema: (mtime_ns, tamaño, validador)}
+    _validator_cache = {}
+
+    def __init__(self, data_dir=None, backend=None):
         # Por defecto, carpeta temp junto al módulo
         if data_dir is None:
-            base = os.path.dirname(__file__)
-            data_dir = os.path.abspath(os.path.join(base, '..', 'temp'))
+            data_dir = default_data_dir()
         self.data_dir = data_dir
         os.makedirs(self.data_dir, exist_ok=True)
-        print(f"[JSONManager] Inicializado con data_dir: {self.data_dir}")
+
+        # Sin backend explícito se usa SQLite si el proyecto ya tiene project.db
+        db_path = os.path.join(self.data_dir, DB_FILE)
+        if backend is None:
+            backend = "sqlite" if os.path.exists(db_path) else "json"
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend desconocido '{backend}', use uno de {BACKENDS}")
+        self.backend = backend
+        print(f"[JSONManager] Inicializado con data_dir: {self.data_dir} (backend {self.backend})")
 
         # Carpeta de esquemas
         base = os.path.dirname(__file__)
         self.schema_dir = os.path.abspath(os.path.join(base, '..', 'schema'))
 
+        # Completar guardados interrumpidos de una sesión anterior
+        self.recover()
+
+        self.store = None
+        if self.backend == "sqlite":
+            is_new = not os.path.exists(db_path)
+            if is_new:
+                # Los <sección>.json se importan con sus parches aplicados
+                self.compact_patch_logs()
+            self.store = SQLiteStore(db_path)
+            if is_new:
+                # Primera apertura: se importan los <sección>.json existentes
+                migrate_json_dir(self.data_dir, self.store)
+
     def get_file_path(self, section_name):
         return os.path.join(self.data_dir, f"{section_name}.json")
 
+    def get_patch_log_path(self, section_name):
+        return os.path.join(self.data_dir, f"{section_name}{PATCH_LOG_EXT}")
+
+    def get_location(self, section_name):
+        """Dónde se guarda la sección (para los mensajes)."""
+        if self.store is not None:
+            return f"{self.store.path}:{section_name}"
+        return self.get_file_path(section_name)
+
+    def get_journal_path(self):
+        return os.path.join(self.data_dir, JOURNAL_FILE)
+
+    def lock(self):
+        """
+        Bloqueo exclusivo del proyecto (entre procesos con fcntl). Úselo para
+        leer-modificar-escribir varias secciones de forma consistente:
+
+            with jm.lock():
+                data = jm.load_section("x"); ...; jm.save_section("x", data)
+        """
+        return project_lock(self.data_dir)
+
     def get_schema_path(self, section_name):
         return os.path.join(self.schema_dir, f"{section_name}.schema.json")
 
@@ -34,75 +121,428 @@ class JSONManager:
                 print(f"[JSONManager] Error leyendo esquema {schema_path}: {e}")
         return None
 
+    def get_validator(self, section_name):
+        """
+        Validador Draft 2020-12 de la sección (o None si no tiene esquema).
+        Se compila una sola vez y se reutiliza mientras el archivo de esquema
+        no cambie (mtime y tamaño).
+        """
+        schema_path = self.get_schema_path(section_name)
+        try:
+            st = os.stat(schema_path)
+        except OSError:
+            self._validator_cache.pop(schema_path, None)
+            return None
+
+        cached = self._validator_cache.get(schema_path)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+
+        schema = self.load_schema(section_name)
+        validator = None
+        if schema:
+            try:
+                Draft202012Validator.check_schema(schema)
+                validator = Draft202012Validator(schema)
+            except Exception as e:
+                print(f"[JSONManager] Esquema inválido {schema_path}: {e}")
+        self._validator_cache[schema_path] = (st.st_mtime_ns, st.st_size, validator)
+        return validator
+
+    def validate_section(self, section_name, data):
+        """
+        Valida 'data' contra el esquema de la sección.
+        Devuelve None si es válido (o no hay esquema) o el mensaje del error.
+        """
+        validator = self.get_validator(section_name)
+        if validator is None:
+            return None
+        error = best_match(validator.iter_errors(data))
+        return error.message if error is not None else None
+
+    def validate_many(self, sections):
+        """
+        Valida varias secciones de una vez, {nombre: datos}.
+        Devuelve {nombre: [mensajes de error]} sólo con las secciones inválidas.
+        """
+        errors = {}
+        for section_name, data in sections.items():
+            validator = self.get_validator(section_name)
+            if validator is None:
+                continue
+            messages = [e.message for e in validator.iter_errors(data)]
+            if messages:
+                errors[section_name] = messages
+        return errors
+
     def save_section(self, section_name, data):
         """
         Valida (si hay esquema) y guarda la sección en JSON.
         Devuelve (True, mensaje) o (False, mensaje_error).
         """
         # 1) validación
-        schema = self.load_schema(section_name)
-        if schema:
-            try:
-                validate(instance=data, schema=schema)
-                print(f"[JSONManager] Validación exitosa para sección '{section_name}'.")
-            except ValidationError as e:
-                msg = f"Validación fallida en '{section_name}': {e.message}"
+        if self.get_validator(section_name) is not None:
+            error = self.validate_section(section_name, data)
+            if error is not None:
+                msg = f"Validación fallida en '{section_name}': {error}"
                 print(f"[JSONManager] {msg}")
                 return False, msg
+            print(f"[JSONManager] Validación exitosa para sección '{section_name}'.")
 
-        # 2) guardado
-        file_path = self.get_file_path(section_name)
+        # 2) guardado atómico (temporal + fsync + os.replace, o transacción SQLite)
+        location = self.get_location(section_name)
         try:
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            with open(file_path, 'w') as json_file:
-                json.dump(data, json_file, indent=4)
-            print(f"[JSONManager] Sección '{section_name}' guardada en {file_path}")
+            if self.store is not None:
+                self.store.put_many({section_name: encode(data)})
+            else:
+                with self.lock():
+                    atomic_write_json(self.get_file_path(section_name), data, indent=4)
+                    self._discard_patch_log(section_name)
+            print(f"[JSONManager] Sección '{section_name}' guardada en {location}")
             return True, "Guardado exitoso."
         except Exception as e:
             msg = f"Error al guardar '{section_name}.json': {e}"
             print(f"[JSONManager] {msg}")
             return False, msg
 
+    def save_sections(self, sections, validate=True):
+        """
+        Guarda varias secciones {nombre: datos} como una unidad. Se validan
+        todas antes de escribir ninguna (salvo validate=False, p.ej. al
+        restaurar tal cual un proyecto guardado). Con el backend JSON las escrituras
+        se anotan primero en el diario, de modo que si el proceso muere a
+        mitad, recover() las completa en el siguiente arranque; con SQLite
+        se escriben en una sola transacción.
+        Devuelve (True, mensaje) o (False, mensaje_error).
+        """
+        for section_name, data in sections.items():
+            error = self.validate_section(section_name, data) if validate else None
+            if error is not None:
+                msg = f"Validación fallida en '{section_name}': {error}"
+                print(f"[JSONManager] {msg}")
+                return False, msg
+
+        txn = uuid.uuid4().hex
+        journal = self.get_journal_path()
+        try:
+            if self.store is not None:
+                self.store.put_many({name: encode(data) for name, data in sections.items()})
+                print(f"[JSONManager] Secciones guardadas: {', '.join(sections)}")
+                return True, "Guardado exitoso."
+            with self.lock():
+                append_journal(journal, {"txn": txn, "sections": sections})
+                for section_name, data in sections.items():
+                    atomic_write_json(self.get_file_path(section_name), data, indent=4)
+                    self._discard_patch_log(section_name)
+                append_journal(journal, {"txn": txn, "done": True})
+                os.remove(journal)
+            print(f"[JSONManager] Secciones guardadas: {', '.join(sections)}")
+            return True, "Guardado exitoso."
+        except Exception as e:
+            msg = f"Error al guardar {', '.join(sections)}: {e}"
+            print(f"[JSONManager] {msg}")
+            return False, msg
+
+    def recover(self):
+        """
+        Rehace los guardados de varias secciones que quedaron sin completar en
+        el diario y borra temporales huérfanos. Devuelve las secciones
+        reescritas.
+        """
+        journal = self.get_journal_path()
+        if not os.path.exists(journal):
+            return []
+        replayed = []
+        with self.lock():
+            if not os.path.exists(journal):
+                return []
+            records = read_journal(journal)
+            done = {r["txn"] for r in records if r.get("done")}
+            for r in records:
+                if "sections" not in r or r["txn"] in done:
+                    continue
+                for section_name, data in r["sections"].items():
+                    atomic_write_json(self.get_file_path(section_name), data, indent=4)
+                    self._discard_patch_log(section_name)
+                    replayed.append(section_name)
+            os.remove(journal)
+            remove_stale_temporaries(self.data_dir)
+        if replayed:
+            print(f"[JSONManager] Diario recuperado: {', '.join(replayed)}")
+        return replayed
+
+    def update_section(self, section_name, updater):
+        """
+        Lee-modifica-escribe una sección bajo el bloqueo del proyecto, para
+        que otro proceso no pise los cambios entre la lectura y la escritura.
+        'updater' recibe el dict cargado y devuelve el nuevo (o lo modifica
+        en sitio y devuelve None).
+        """
+        with self.lock():
+            try:
+                data = self._read_section(section_name) if self.has_section(section_name) else {}
+            except Exception as e:
+                # Con {} se sobrescribiría la sección (y sus parches) con lo que devuelva updater
+                msg = f"Error leyendo '{section_name}': {e}"
+                print(f"[JSONManager] {msg}")
+                return False, msg
+            new_data = updater(data)
+            return self.save_section(section_name, data if new_data is None else new_data)
+
     def load_section(self, section_name):
         """
         Carga la sección desde JSON, valida (si hay esquema) y devuelve el dict.
         """
-        file_path = self.get_file_path(section_name)
-        if not os.path.exists(file_path):
-            print(f"[JSONManager] '{section_name}.json' no existe, devolviendo {{}}")
+        if not self.has_section(section_name):
+            print(f"[JSONManager] '{section_name}' no existe, devolviendo {{}}")
             return {}
 
         try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-            print(f"[JSONManager] Sección '{section_name}' cargada desde {file_path}")
+            data = self._read_section(section_name)
+            print(f"[JSONManager] Sección '{section_name}' cargada desde {self.get_location(section_name)}")
         except Exception as e:
-            print(f"[JSONManager] Error leyendo '{section_name}.json': {e}")
+            print(f"[JSONManager] Error leyendo '{section_name}': {e}")
             return {}
 
         # validación post‐carga
-        schema = self.load_schema(section_name)
-        if schema:
-            try:
-                validate(instance=data, schema=schema)
+        if self.get_validator(section_name) is not None:
+            error = self.validate_section(section_name, data)
+            if error is None:
                 print(f"[JSONManager] Validación post-carga exitosa para '{section_name}'.")
-            except ValidationError as e:
-                print(f"[JSONManager] Datos inválidos en '{section_name}': {e.message}")
+            else:
+                print(f"[JSONManager] Datos inválidos en '{section_name}': {error}")
         return data
 
+    def _read_section(self, section_name):
+        """Datos de la sección con su registro de parches aplicado (lanza la excepción si falla)."""
+        if self.store is not None:
+            text = self.store.get(section_name)
+            data = json.loads(text) if text is not None else {}
+        else:
+            with open(self.get_file_path(section_name), 'r') as f:
+                data = json.load(f)
+        return self._apply_patch_log(section_name, data)
+
+    def delete_section(self, section_name):
+        """Elimina la sección (archivo JSON o fila SQLite) si existe."""
+        if self.store is not None:
+            self.store.delete(section_name)
+            return
+        with self.lock():
+            if os.path.exists(self.get_file_path(section_name)):
+                os.remove(self.get_file_path(section_name))
+            self._discard_patch_log(section_name)
+
+    # ------------------------------------------------------------------
+    # Guardado incremental con parches JSON (RFC 6902)
+    # ------------------------------------------------------------------
+    def patch_section(self, section_name, ops, data=None, expected_token=None):
+        """
+        Guarda un cambio de la sección como operaciones JSON Patch
+        (core/json_patch.py) añadidas a su registro, sin reescribirla entera.
+        'data' es la sección ya parcheada, si el llamador la tiene: se valida
+        con el esquema y se usa al compactar sin releer. El registro se
+        compacta solo cuando crece demasiado.
+        'expected_token' (section_token) es la versión sobre la que se
+        calcularon las operaciones: si, ya con el bloqueo, la del disco es
+        otra (otro proceso la guardó entretanto), se guarda 'data' completa.
+        Devuelve (True, mensaje) o (False, mensaje_error).
+        """
+        if data is not None:
+            error = self.validate_section(section_name, data)
+            if error is not None:
+                msg = f"Validación fallida en '{section_name}': {error}"
+                print(f"[JSONManager] {msg}")
+                return False, msg
+        if not ops:
+            return True, "Sin cambios."
+        if not self.has_section(section_name):
+            if data is None:
+                return False, f"No se puede parchear '{section_name}': la sección no existe"
+            return self.save_section(section_name, data)
+
+        ops_text = json.dumps(ops, separators=(",", ":"))
+        try:
+            with self.lock():
+                if self.store is not None:
+                    sizes = self.store.append_patch(section_name, ops_text, expected_token)
+                elif expected_token is not None and self.section_token(section_name) != tuple(expected_token):
+                    sizes = None
+                else:
+                    log_path = self.get_patch_log_path(section_name)
+                    base = os.stat(self.get_file_path(section_name))
+                    if not self._patch_log_matches(section_name, base):
+                        # Registro nuevo (o de una versión anterior de la sección)
+                        self._discard_patch_log(section_name)
+                        append_journal(log_path, {"base": self._base_id(base)})
+                    append_journal(log_path, {"ops": ops})
+                    sizes = os.path.getsize(log_path), base.st_size
+                if sizes is None:
+                    # Las operaciones son de una versión anterior: no se pueden añadir al registro
+                    if data is None:
+                        return False, f"No se puede parchear '{section_name}': la sección ha cambiado en disco"
+                    print(f"[JSONManager] '{section_name}' ha cambiado en disco; se guarda completa")
+                    return self.save_section(section_name, data)
+                log_bytes, base_bytes = sizes
+                if log_bytes > max(PATCH_LOG_MIN_BYTES, base_bytes * PATCH_LOG_COMPACT_RATIO):
+                    return self.compact_section(section_name, data)
+        except Exception as e:
+            msg = f"Error al guardar el parche de '{section_name}': {e}"
+            print(f"[JSONManager] {msg}")
+            return False, msg
+        print(f"[JSONManager] Parche de '{section_name}' guardado ({len(ops)} operaciones, {len(ops_text)} bytes)")
+        return True, "Guardado exitoso."
+
+    def compact_section(self, section_name, data=None):
+        """Reescribe la sección completa y vacía su registro de parches."""
+        with self.lock():
+            if data is None:
+                # Si el registro no se puede aplicar se lanza la excepción y no se compacta
+                data = self._read_section(section_name)
+            ok, msg = self.save_section(section_name, data)
+        if ok:
+            print(f"[JSONManager] Registro de parches de '{section_name}' compactado")
+        return ok, msg
+
+    def section_token(self, section_name):
+        """
+        Identificador de la versión guardada de la sección (cambia con cada
+        escritura, completa o parche), o None si no existe. Permite saber si
+        la versión que uno conoce sigue siendo la del disco antes de enviar
+        sólo la diferencia.
+        """
+        if self.store is not None:
+            return self.store.token(section_name)
+        try:
+            base = os.stat(self.get_file_path(section_name))
+        except OSError:
+            return None
+        try:
+            log_size = os.path.getsize(self.get_patch_log_path(section_name))
+        except OSError:
+            log_size = 0
+        return self._base_id(base) + (log_size,)
+
+    @staticmethod
+    def _base_id(st):
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _read_patch_log(self, section_name):
+        """
+        Listas de operaciones del registro, o None si no hay registro o es de
+        otra versión de la sección (la escritura completa que lo sustituyó se
+        cortó antes de borrarlo).
+        """
+        records = read_journal(self.get_patch_log_path(section_name))
+        if not records:
+            return None
+        try:
+            base = os.stat(self.get_file_path(section_name))
+        except OSError:
+            return None
+        if records[0].get("base") != list(self._base_id(base)):
+            return None
+        return [r["ops"] for r in records[1:]]
+
+    def _patch_log_matches(self, section_name, base):
+        """True si el registro existe y es de la versión 'base' (os.stat) de la sección."""
+        try:
+            with open(self.get_patch_log_path(section_name), "rb") as f:
+                header = json.loads(f.readline())
+        except (OSError, ValueError):
+            return False
+        return header.get("base") == list(self._base_id(base))
+
+    def compact_patch_logs(self):
+        """Compacta todos los registros de parches del backend JSON. Devuelve las secciones."""
+        compacted = []
+        for fn in sorted(os.listdir(self.data_dir)):
+            section_name = fn[:-len(PATCH_LOG_EXT)]
+            if fn.endswith(PATCH_LOG_EXT) and os.path.exists(self.get_file_path(section_name)):
+                with self.lock():
+                    try:
+                        with open(self.get_file_path(section_name), 'r') as f:
+                            data = self._apply_patch_log(section_name, json.load(f))
+                    except JSONPatchError as e:
+                        # Se conserva el registro: compactar sin él perdería los cambios
+                        print(f"[JSONManager] {e}")
+                        continue
+                    atomic_write_json(self.get_file_path(section_name), data, indent=4)
+                    self._discard_patch_log(section_name)
+                compacted.append(section_name)
+        return compacted
+
+    def _apply_patch_log(self, section_name, data):
+        if self.store is not None:
+            patches = [json.loads(text) for text in self.store.patches(section_name)]
+        else:
+            patches = self._read_patch_log(section_name) or []
+        try:
+            for ops in patches:
+                data = apply_patch(data, ops)
+        except JSONPatchError as e:
+            # Devolver la base sin los parches perdería los cambios en silencio
+            raise JSONPatchError(f"Registro de parches de '{section_name}' no aplicable: {e}") from e
+        return data
+
+    def _discard_patch_log(self, section_name):
+        try:
+            os.remove(self.get_patch_log_path(section_name))
+        except FileNotFoundError:
+            pass
+
+    def has_section(self, section_name):
+        if self.store is not None:
+            return self.store.revision(section_name) > 0
+        return os.path.exists(self.get_file_path(section_name))
+
+    def section_names(self):
+        if self.store is not None:
+            return self.store.names()
+        return sorted(fn[:-5] for fn in os.listdir(self.data_dir) if fn.endswith('.json'))
+
+    def history(self, section_name):
+        """
+        Revisiones guardadas de la sección, [(revisión, fecha epoch)] de la
+        más reciente a la más antigua. Sólo el backend SQLite guarda historial.
+        """
+        return self.store.history(section_name) if self.store is not None else []
+
+    def load_revision(self, section_name, revision):
+        """Datos de una revisión anterior de la sección, o None si no existe."""
+        if self.store is None:
+            return None
+        text = self.store.get_revision(section_name, revision)
+        return json.loads(text) if text is not None else None
+
+    def iter_sections(self):
+        """Genera (nombre, datos) sección a sección, sin cargarlas todas a la vez."""
+        if self.store is not None:
+            for section_name, text in self.store.iter_sections():
+                yield section_name, self._apply_patch_log(section_name, json.loads(text))
+            return
+        for section_name in self.section_names():
+            with open(self.get_file_path(section_name), 'r') as f:
+                yield section_name, self._apply_patch_log(section_name, json.load(f))
+
     def export_all(self, export_path):
         """
-        Junta todas las secciones JSON y las vuelca en un único archivo.
+        Vuelca todas las secciones en un único archivo JSON {sección: datos}.
+        Se escribe sección a sección (en memoria sólo hay una cada vez) en un
+        temporal que sustituye al destino al terminar.
         """
-        all_data = {}
         try:
-            for fn in os.listdir(self.data_dir):
-                if fn.endswith('.json'):
-                    sec = fn[:-5]
-                    with open(os.path.join(self.data_dir, fn), 'r') as f:
-                        all_data[sec] = json.load(f)
-            with open(export_path, 'w') as f:
-                json.dump(all_data, f, indent=4)
+            encoder = json.JSONEncoder(indent=4)
+            with atomic_open(export_path, "w", encoding="utf-8") as f:
+                f.write("{")
+                separator = "\n"
+                for section_name, data in self.iter_sections():
+                    f.write(f"{separator}    {json.dumps(section_name)}: ")
+                    # Por trozos: ni siquiera una sección grande se serializa entera en memoria
+                    for chunk in encoder.iterencode(data):
+                        f.write(chunk.replace("\n", "\n    "))
+                    separator = ",\n"
+                f.write("\n}" if separator != "\n" else "}")
             print(f"[JSONManager] Todas las secciones exportadas a {export_path}")
             return True, "Exportación exitosa."
         except Exception as e:
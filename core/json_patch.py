@@ -0,0 +1,207 @@
+# core/json_patch.py
+
+"""
+JSON Patch (RFC 6902) y JSON Pointer (RFC 6901).
+
+make_patch(antes, después) genera la lista de operaciones que transforma un
+documento en otro, de forma que cambiar una inyección de una lista de miles
+produce una sola operación "replace" sobre '/injectors/1234/massTotal'.
+apply_patch(documento, operaciones) las aplica (add, remove, replace, move,
+copy y test).
+
+    ops = make_patch({"a": [1, 2]}, {"a": [1, 3]})
+    # [{"op": "replace", "path": "/a/1", "value": 3}]
+"""
+
+import copy
+
+
+class JSONPatchError(ValueError):
+    """Operación o puntero no aplicable al documento."""
+
+
+def escape(token):
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def unescape(token):
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def pointer(parts):
+    """Puntero JSON ('/a/0/b') a partir de la lista de claves e índices."""
+    return "".join("/" + escape(p) for p in parts)
+
+
+def parse_pointer(ptr):
+    if ptr == "":
+        return []
+    if not ptr.startswith("/"):
+        raise JSONPatchError(f"Puntero JSON inválido: '{ptr}'")
+    return [unescape(t) for t in ptr[1:].split("/")]
+
+
+def _same(a, b):
+    """
+    Igualdad para el diff: 1, 1.0 y True no son el mismo valor. Dentro de
+    listas y dicts se usa '==' (rápido, en C), que sí los iguala: un 1 que
+    pasa a 1.0 dentro de una inyección sin otros cambios no genera parche.
+    """
+    return type(a) is type(b) and a == b
+
+
+# ----------------------------------------------------------------------
+# Generación
+# ----------------------------------------------------------------------
+def make_patch(src, dst):
+    """Operaciones RFC 6902 que convierten 'src' en 'dst' (lista vacía si son iguales)."""
+    ops = []
+    _diff(src, dst, [], ops)
+    return ops
+
+
+def _diff(src, dst, path, ops):
+    if type(src) is not type(dst):
+        ops.append({"op": "replace", "path": pointer(path), "value": copy.deepcopy(dst)})
+    elif isinstance(src, dict):
+        for key in src:
+            if key not in dst:
+                ops.append({"op": "remove", "path": pointer(path + [key])})
+        for key, value in dst.items():
+            if key not in src:
+                ops.append({"op": "add", "path": pointer(path + [key]), "value": copy.deepcopy(value)})
+            elif not _same(src[key], value):
+                _diff(src[key], value, path + [key], ops)
+    elif isinstance(src, list):
+        _diff_list(src, dst, path, ops)
+    elif not _same(src, dst):
+        ops.append({"op": "replace", "path": pointer(path), "value": copy.deepcopy(dst)})
+
+
+def _diff_list(src, dst, path, ops):
+    # Prefijo y sufijo comunes: una inserción o un borrado en medio de la
+    # lista es una sola operación
+    n, m = len(src), len(dst)
+    start = 0
+    while start < n and start < m and _same(src[start], dst[start]):
+        start += 1
+    end_src, end_dst = n, m
+    while end_src > start and end_dst > start and _same(src[end_src - 1], dst[end_dst - 1]):
+        end_src -= 1
+        end_dst -= 1
+
+    common = min(end_src, end_dst) - start
+    for i in range(start, start + common):
+        _diff(src[i], dst[i], path + [i], ops)
+    # Sobrantes de src, del final hacia el principio para no mover índices
+    for i in range(end_src - 1, start + common - 1, -1):
+        ops.append({"op": "remove", "path": pointer(path + [i])})
+    for i in range(start + common, end_dst):
+        ops.append({"op": "add", "path": pointer(path + [i]), "value": copy.deepcopy(dst[i])})
+
+
+# ----------------------------------------------------------------------
+# Aplicación
+# ----------------------------------------------------------------------
+def _index(container, token, ptr, allow_end=False):
+    if token == "-" and allow_end:
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token[0] == "0"):
+        raise JSONPatchError(f"Índice de lista inválido en '{ptr}'")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise JSONPatchError(f"Índice fuera de rango en '{ptr}'")
+    return index
+
+
+def _resolve(doc, parts, ptr):
+    target = doc
+    for token in parts:
+        if isinstance(target, dict):
+            if token not in target:
+                raise JSONPatchError(f"No existe '{ptr}'")
+            target = target[token]
+        elif isinstance(target, list):
+            target = target[_index(target, token, ptr)]
+        else:
+            raise JSONPatchError(f"No existe '{ptr}'")
+    return target
+
+
+def _get(doc, ptr):
+    return _resolve(doc, parse_pointer(ptr), ptr)
+
+
+def _add(doc, ptr, value):
+    parts = parse_pointer(ptr)
+    if not parts:
+        return value
+    parent = _resolve(doc, parts[:-1], ptr)
+    token = parts[-1]
+    if isinstance(parent, dict):
+        parent[token] = value
+    elif isinstance(parent, list):
+        parent.insert(_index(parent, token, ptr, allow_end=True), value)
+    else:
+        raise JSONPatchError(f"No existe el padre de '{ptr}'")
+    return doc
+
+
+def _remove(doc, ptr):
+    parts = parse_pointer(ptr)
+    if not parts:
+        raise JSONPatchError("No se puede eliminar la raíz del documento")
+    parent = _resolve(doc, parts[:-1], ptr)
+    token = parts[-1]
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise JSONPatchError(f"No existe '{ptr}'")
+        return parent.pop(token)
+    if isinstance(parent, list):
+        return parent.pop(_index(parent, token, ptr))
+    raise JSONPatchError(f"No existe '{ptr}'")
+
+
+def apply_patch(doc, ops):
+    """
+    Aplica las operaciones sobre 'doc' (lo modifica en sitio) y devuelve el
+    documento resultante, que es otro objeto si se sustituye la raíz.
+    Lanza JSONPatchError si alguna no es aplicable.
+    """
+    for op in ops:
+        try:
+            kind, path = op["op"], op["path"]
+        except (KeyError, TypeError):
+            raise JSONPatchError(f"Operación inválida: {op!r}")
+        if kind == "add":
+            doc = _add(doc, path, copy.deepcopy(op["value"]))
+        elif kind == "remove":
+            _remove(doc, path)
+        elif kind == "replace":
+            if not parse_pointer(path):
+                doc = copy.deepcopy(op["value"])
+                continue
+            _remove(doc, path)
+            doc = _add(doc, path, copy.deepcopy(op["value"]))
+        elif kind == "move":
+            if path.startswith(op["from"] + "/"):
+                raise JSONPatchError(f"No se puede mover '{op['from']}' dentro de sí mismo")
+            doc = _add(doc, path, _remove(doc, op["from"]))
+        elif kind == "copy":
+            doc = _add(doc, path, copy.deepcopy(_get(doc, op["from"])))
+        elif kind == "test":
+            if not _equal(_get(doc, path), op["value"]):
+                raise JSONPatchError(f"Prueba fallida en '{path}'")
+        else:
+            raise JSONPatchError(f"Operación desconocida '{kind}'")
+    return doc
+
+
+def _equal(a, b):
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(_equal(a[k], b[k]) for k in a)
+    if isinstance(a, list):
+        return len(a) == len(b) and all(_equal(x, y) for x, y in zip(a, b))
+    return a == b
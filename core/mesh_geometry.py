@@ -0,0 +1,223 @@
+# core/mesh_geometry.py
+
+"""
+Geometría de caras de la malla, totalmente vectorizada con NumPy.
+
+A partir de points y de las caras en formato CSR (face_offsets, face_indices)
+calcula el vector área (Sf), el centroide (Cf) y la normal unitaria de cada
+cara, y los totales por patch (área, vector área, centroide).
+
+Las caras se agrupan por número de vértices: dentro de cada grupo los
+vértices forman un array (m, k, 3) y todo se resuelve con operaciones de
+array, de modo que no hay ningún bucle de Python por cara. Para acotar la
+memoria temporal, las caras se procesan en bloques de BLOCK_FACES.
+
+Se sigue el mismo esquema que OpenFOAM (primitiveMesh::makeFaceCentresAndAreas):
+cada cara se descompone en triángulos con vértice en el centro geométrico
+estimado; Sf es la suma de los vectores área de los triángulos y Cf la media
+de sus centroides ponderada por área.
+"""
+
+import numpy as np
+
+BLOCK_FACES = 256 * 1024
+
+# Por debajo de este área relativa se toma el centro geométrico como centroide
+_SMALL = 1e-300
+
+
+def _face_range(face_offsets, faces):
+    """Normaliza 'faces' (None, slice o (inicio, fin)) a (inicio, fin)."""
+    n_faces = len(face_offsets) - 1
+    if faces is None:
+        return 0, n_faces
+    if isinstance(faces, slice):
+        start, stop, _ = faces.indices(n_faces)
+        return start, stop
+    return int(faces[0]), int(faces[1])
+
+
+def _cross(ax, ay, az, bx, by, bz):
+    """Producto vectorial por componentes (más rápido que np.cross en arrays grandes)."""
+    return ay * bz - az * by, az * bx - ax * bz, ax * by - ay * bx
+
+
+def _group_geometry(pts):
+    """
+    Sf y Cf de m caras con k vértices cada una; pts tiene forma (m, k, 3).
+
+    Se trabaja con las componentes traspuestas a (3, k, m): cada vértice i
+    de todas las caras es un vector contiguo de longitud m, y el bucle sobre
+    los k vértices (k pequeño) evita reducciones sobre ejes cortos.
+    """
+    k = pts.shape[1]
+    x, y, z = np.ascontiguousarray(pts.transpose(2, 1, 0))
+    if k == 3:
+        nx, ny, nz = _cross(x[1] - x[0], y[1] - y[0], z[1] - z[0],
+                            x[2] - x[0], y[2] - y[0], z[2] - z[0])
+        sf = 0.5 * np.stack((nx, ny, nz), axis=1)
+        cf = np.stack((x.sum(axis=0), y.sum(axis=0), z.sum(axis=0)), axis=1) / 3.0
+        return sf, cf
+
+    cx, cy, cz = x.sum(axis=0) / k, y.sum(axis=0) / k, z.sum(axis=0) / k
+    m = pts.shape[0]
+    sum_n = np.zeros((3, m))
+    sum_ac = np.zeros((3, m))
+    sum_a = np.zeros(m)
+    for i in range(k):
+        j = (i + 1) % k
+        nx, ny, nz = _cross(x[j] - x[i], y[j] - y[i], z[j] - z[i],
+                            cx - x[i], cy - y[i], cz - z[i])
+        a = np.sqrt(nx * nx + ny * ny + nz * nz)
+        sum_n[0] += nx
+        sum_n[1] += ny
+        sum_n[2] += nz
+        sum_a += a
+        # Centroide del triángulo = (p_i + p_i+1 + centro) / 3; el centro se suma al final
+        sum_ac[0] += a * (x[i] + x[j])
+        sum_ac[1] += a * (y[i] + y[j])
+        sum_ac[2] += a * (z[i] + z[j])
+
+    sf = 0.5 * sum_n.T
+    centre = np.stack((cx, cy, cz))
+    ok = sum_a > _SMALL
+    cf = centre.copy()
+    cf[:, ok] = (sum_ac[:, ok] + sum_a[ok] * centre[:, ok]) / (3.0 * sum_a[ok])
+    return sf, cf.T
+
+
+def face_areas_and_centres(points, face_offsets, face_indices, faces=None,
+                           block_faces=BLOCK_FACES):
+    """
+    Calcula Sf (vector área) y Cf (centroide) de un rango contiguo de caras.
+
+    Parámetros
+    ----------
+    points : (nPoints, 3) array
+    face_offsets, face_indices : caras en formato CSR
+    faces : None, slice o (inicio, fin)
+        Rango de caras; por defecto todas.
+    block_faces : int
+        Nº de caras por bloque (limita la memoria temporal).
+
+    Retorna
+    -------
+    (numpy.ndarray, numpy.ndarray)
+        Sf y Cf, ambos de forma (nCaras, 3) y dtype float64.
+    """
+    start, stop = _face_range(face_offsets, faces)
+    n = stop - start
+    sf = np.empty((n, 3), dtype=np.float64)
+    cf = np.empty((n, 3), dtype=np.float64)
+
+    for b0 in range(start, stop, block_faces):
+        b1 = min(b0 + block_faces, stop)
+        offs = np.asarray(face_offsets[b0:b1 + 1], dtype=np.int64)
+        lo, hi = int(offs[0]), int(offs[-1])
+        local = offs - lo
+        idx = np.asarray(face_indices[lo:hi])
+        sizes = np.diff(local)
+
+        for k in np.unique(sizes):
+            sel = np.flatnonzero(sizes == k)
+            vert = local[sel, None] + np.arange(k)
+            pts = np.asarray(points[idx[vert]], dtype=np.float64)
+            sf_k, cf_k = _group_geometry(pts)
+            sf[b0 - start + sel] = sf_k
+            cf[b0 - start + sel] = cf_k
+    return sf, cf
+
+
+def row_dot(a, b):
+    """Producto escalar fila a fila de dos arrays (n, 3)."""
+    return np.einsum("ij,ij->i", a, b)
+
+
+def face_normals(sf):
+    """Normales unitarias a partir de Sf (0 en caras degeneradas)."""
+    mag = np.linalg.norm(sf, axis=1)
+    out = np.zeros_like(sf)
+    ok = mag > _SMALL
+    out[ok] = sf[ok] / mag[ok, None]
+    return out
+
+
+def patch_geometry(points, face_offsets, face_indices, boundary,
+                   block_faces=BLOCK_FACES):
+    """
+    Totales por patch.
+
+    Parámetros
+    ----------
+    boundary : list of dict
+        Patches con 'name', 'startFace' y 'nFaces' (p.ej. parse_openfoam_boundary).
+
+    Retorna
+    -------
+    dict
+        {nombre: {"area": float, "areaVector": [x, y, z],
+                  "centroid": [x, y, z], "normal": [x, y, z]}}
+        'area' es la suma de |Sf|; 'normal' es la media ponderada por área
+        de las normales (unitaria; 0 si el patch es cerrado).
+    """
+    result = {}
+    for b in boundary:
+        start = b.get("startFace") or 0
+        n_faces = b.get("nFaces") or 0
+        if n_faces <= 0:
+            result[b["name"]] = {"area": 0.0, "areaVector": [0.0, 0.0, 0.0],
+                                 "centroid": [0.0, 0.0, 0.0], "normal": [0.0, 0.0, 0.0]}
+            continue
+        sf, cf = face_areas_and_centres(points, face_offsets, face_indices,
+                                        (start, start + n_faces), block_faces)
+        mag = np.linalg.norm(sf, axis=1)
+        area = float(mag.sum())
+        area_vector = sf.sum(axis=0)
+        centroid = (cf * mag[:, None]).sum(axis=0) / area if area > _SMALL else cf.mean(axis=0)
+        # Patch cerrado o con caras opuestas (p.ej. frontBack): sin normal media
+        if np.linalg.norm(area_vector) > 1e-12 * area:
+            normal = face_normals(area_vector[None, :])[0]
+        else:
+            normal = np.zeros(3)
+        result[b["name"]] = {
+            "area": area,
+            "areaVector": area_vector.tolist(),
+            "centroid": centroid.tolist(),
+            "normal": normal.tolist(),
+        }
+    return result
+
+
+def cell_centres_and_volumes(sf, cf, owner, neighbour, n_cells):
+    """
+    Centros y volúmenes de celda a partir de Sf/Cf de todas las caras
+    (primitiveMesh::makeCellCentresAndVols).
+
+    Cada celda se descompone en pirámides con base en sus caras y vértice en
+    el centro estimado (media de los centros de cara); el centro es la media
+    de los centroides de las pirámides ponderada por volumen.
+
+    Retorna
+    -------
+    (numpy.ndarray, numpy.ndarray)
+        Centros (nCells, 3) y volúmenes (nCells,).
+    """
+    n_int = len(neighbour)
+    cf_int = cf[:n_int]
+    n_faces = np.bincount(owner, minlength=n_cells) + np.bincount(neighbour, minlength=n_cells)
+    c_est = np.empty((n_cells, 3))
+    for d in range(3):
+        c_est[:, d] = (np.bincount(owner, cf[:, d], n_cells)
+                       + np.bincount(neighbour, cf_int[:, d], n_cells)) / np.maximum(n_faces, 1)
+
+    pyr_own = row_dot(sf, cf - c_est[owner])
+    pyr_nei = row_dot(sf[:n_int], c_est[neighbour] - cf_int)
+    vol3 = np.bincount(owner, pyr_own, n_cells) + np.bincount(neighbour, pyr_nei, n_cells)
+
+    centres = c_est.copy()
+    ok = np.abs(vol3) > _SMALL
+    for d in range(3):
+        weighted = (np.bincount(owner, pyr_own * (0.75 * cf[:, d] + 0.25 * c_est[owner, d]), n_cells)
+                    + np.bincount(neighbour, pyr_nei * (0.75 * cf_int[:, d] + 0.25 * c_est[neighbour, d]), n_cells))
+        centres[ok, d] = weighted[ok] / vol3[ok]
+    return centres, vol3 / 3.0
@@ -0,0 +1,269 @@
+# core/mesh_index.py
+
+"""
+Índice persistente con los metadatos de la malla (constant/polyMesh).
+
+Guarda en el proyecto (temp/mesh_index.json, vía JSONManager) la tabla de
+patches, el número de celdas/caras/puntos, el área, el centroide y la normal
+media de cada patch (core/mesh_geometry.py), la bounding box y las zonas. El índice va asociado a la huella (tamaño, mtime y hash) de
+los archivos de polyMesh y sólo se reconstruye cuando la malla cambia; el
+resto de la aplicación debe leer de aquí en lugar de volver a parsear la
+malla.
+
+Además se mantiene una caché en memoria por caso: una vez cargado, validar
+el índice cuesta un os.stat por archivo, independientemente del tamaño de
+la malla.
+"""
+
+import os
+import re
+import copy
+import hashlib
+import logging
+
+from core.json_manager import JSONManager
+from core.boundary_parser import parse_openfoam_boundary
+from core.mesh_geometry import patch_geometry
+from core.polymesh_reader import (
+    polymesh_dir, find_polymesh_file, open_foam_file, read_foam_header,
+    seek_list_start, skip_ascii_list, read_polymesh
+)
+
+MESH_INDEX_SECTION = "mesh_index"
+MESH_INDEX_VERSION = 2
+
+POLYMESH_FILES = ("boundary", "points", "faces", "owner", "neighbour")
+ZONE_FILES = ("cellZones", "faceZones", "pointZones")
+
+# Los archivos se leen por bloques de este tamaño al calcular su hash
+HASH_CHUNK_SIZE = 1024 * 1024
+
+_INDEX_CACHE = {}
+
+
+def _mesh_files(poly_dir):
+    """Devuelve {nombre: ruta} de los archivos de polyMesh presentes."""
+    files = {}
+    for name in POLYMESH_FILES + ZONE_FILES:
+        try:
+            files[name] = find_polymesh_file(poly_dir, name)
+        except FileNotFoundError:
+            continue
+    return files
+
+
+def _file_stats(files):
+    stats = {}
+    for name, path in files.items():
+        st = os.stat(path)
+        stats[name] = {"path": os.path.basename(path), "size": st.st_size, "mtime": st.st_mtime_ns}
+    return stats
+
+
+def file_hash(path):
+    """
+    Hash SHA-1 de todo el contenido del archivo, leído por bloques. Sólo se
+    calcula cuando cambian el tamaño o el mtime; una muestra (p.ej. el
+    principio y el final) no vería un moveMesh que reescribe el interior de
+    'points' con el mismo tamaño.
+    """
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def mesh_fingerprint(case_dir):
+    """Huella de la malla: {archivo: {path, size, mtime, hash}}."""
+    files = _mesh_files(polymesh_dir(case_dir))
+    fingerprint = _file_stats(files)
+    for name, path in files.items():
+        fingerprint[name]["hash"] = file_hash(path)
+    return fingerprint
+
+
+def _same_stats(fingerprint, stats):
+    if set(fingerprint) != set(stats):
+        return False
+    return all(
+        fingerprint[n].get(k) == stats[n][k]
+        for n in stats for k in ("path", "size", "mtime")
+    )
+
+
+def _same_hashes(old, new):
+    return set(old) == set(new) and all(old[n].get("hash") == new[n]["hash"] for n in new)
+
+
+_ZONE_LIST_RE = re.compile(rb"^\s*(\w+)\s+List<(\w+)>\s+(\d+)\s*(\(?)")
+
+
+def read_zone_summary(path):
+    """
+    Devuelve [{name, type, size}] de un archivo cellZones/faceZones/pointZones
+    sin cargar las listas de índices (se saltan por bloques o por tamaño en
+    binario).
+    """
+    zones = []
+    with open_foam_file(path) as f:
+        header = read_foam_header(f)
+        binary = header["format"] == "binary"
+        elem_bytes = {"label": header["label_bytes"], "bool": 1, "scalar": header["scalar_bytes"]}
+        count = seek_list_start(f)
+
+        current = None
+        while len(zones) < count:
+            line_start = f.tell()
+            raw = f.readline()
+            if not raw:
+                raise ValueError(f"Fin de archivo leyendo zonas en {path}")
+            line = raw.strip()
+            if not line or line in (b"{", b")", b";", b");") or line.startswith(b"//"):
+                continue
+            if line == b"}":
+                zones.append(current)
+                current = None
+                continue
+            if current is None:
+                current = {"name": line.decode(), "type": "", "size": 0}
+                continue
+            if line.startswith(b"type"):
+                current["type"] = line[4:].strip(b" \t;").decode()
+                continue
+
+            m = _ZONE_LIST_RE.match(raw)
+            if not m:
+                continue
+            n = int(m.group(3))
+            if m.group(1).endswith(b"Labels"):
+                current["size"] = n
+            _skip_list_payload(f, raw, line_start, m, binary,
+                               elem_bytes.get(m.group(2).decode(), header["label_bytes"]))
+    return zones
+
+
+def _skip_list_payload(f, raw, line_start, match, binary, elem_bytes):
+    """Salta el contenido de 'clave List<T> N (...)' sin parsearlo."""
+    n = int(match.group(3))
+    inline = bool(match.group(4))
+    if inline:
+        f.seek(line_start + match.end())
+    else:
+        while True:
+            c = f.read(1)
+            if not c:
+                raise ValueError("Fin de archivo antes de '('.")
+            if c == b"(":
+                break
+            if not c.isspace():
+                raise ValueError(f"Se esperaba '(' y se encontró {c!r}")
+
+    if binary:
+        f.seek(n * elem_bytes, os.SEEK_CUR)
+    elif inline and b")" in raw[match.end():]:
+        # Lista corta en la misma línea: '4(0 1 2 3);'
+        f.seek(line_start + len(raw))
+    else:
+        skip_ascii_list(f)
+
+
+def build_mesh_index(case_dir, fingerprint=None):
+    """
+    Construye el índice de la malla leyendo polyMesh (con memmap si es binaria).
+    Si sólo existe el archivo 'boundary', el índice contiene únicamente los
+    patches.
+    """
+    poly_dir = polymesh_dir(case_dir)
+    boundary = parse_openfoam_boundary(os.path.join(poly_dir, "boundary"))
+
+    index = {
+        "version": MESH_INDEX_VERSION,
+        "caseDir": os.path.abspath(case_dir),
+        "fingerprint": fingerprint or mesh_fingerprint(case_dir),
+        "counts": {},
+        "boundingBox": None,
+        "patches": boundary,
+        "zones": {},
+    }
+
+    try:
+        mesh = read_polymesh(case_dir, mmap=True)
+    except FileNotFoundError as e:
+        logging.warning(f"[mesh_index] Malla incompleta, sólo se indexa boundary: {e}")
+        mesh = None
+
+    if mesh is not None:
+        index["counts"] = {
+            "nPoints": mesh.n_points,
+            "nFaces": mesh.n_faces,
+            "nInternalFaces": mesh.n_internal_faces,
+            "nCells": mesh.n_cells,
+        }
+        if mesh.n_points:
+            lo, hi = mesh.bounding_box()
+            index["boundingBox"] = {"min": lo.tolist(), "max": hi.tolist()}
+        geometry = patch_geometry(mesh.points, mesh.face_offsets, mesh.face_indices, mesh.boundary)
+        for patch in index["patches"]:
+            patch.update(geometry.get(patch["name"], {"area": 0.0}))
+
+    for name in ZONE_FILES:
+        try:
+            path = find_polymesh_file(poly_dir, name)
+        except FileNotFoundError:
+            continue
+        try:
+            index["zones"][name] = read_zone_summary(path)
+        except Exception as e:
+            logging.warning(f"[mesh_index] No se pudo leer {name}: {e}")
+    return index
+
+
+def load_mesh_index(case_dir, json_manager=None, rebuild=False):
+    """
+    Devuelve el índice de la malla de 'case_dir', reconstruyéndolo sólo si
+    los archivos de polyMesh han cambiado.
+
+    Devuelve una copia: quien la modifique no altera la caché.
+
+    1) Caché en memoria: válida si tamaño y mtime coinciden.
+    2) temp/mesh_index.json: ídem; si sólo cambia el mtime pero el hash es
+       el mismo, se actualiza la huella sin reconstruir.
+    3) En otro caso se reconstruye y se guarda.
+    """
+    key = os.path.abspath(case_dir)
+    files = _mesh_files(polymesh_dir(case_dir))
+    if "boundary" not in files:
+        raise FileNotFoundError(f"No se encontró el archivo boundary en {polymesh_dir(case_dir)}")
+    stats = _file_stats(files)
+
+    cached = _INDEX_CACHE.get(key)
+    if not rebuild and cached and _same_stats(cached["fingerprint"], stats):
+        return copy.deepcopy(cached)
+
+    jm = json_manager or JSONManager()
+    stored = None if rebuild else jm.load_section(MESH_INDEX_SECTION)
+    if stored and (stored.get("version") != MESH_INDEX_VERSION or stored.get("caseDir") != key):
+        stored = None
+
+    if stored and _same_stats(stored["fingerprint"], stats):
+        _INDEX_CACHE[key] = stored
+        return copy.deepcopy(stored)
+
+    fingerprint = mesh_fingerprint(case_dir)
+    if stored and _same_hashes(stored["fingerprint"], fingerprint):
+        logging.info("[mesh_index] Malla sin cambios (mismo hash); se actualiza la huella.")
+        stored["fingerprint"] = fingerprint
+        index = stored
+    else:
+        logging.info(f"[mesh_index] Reconstruyendo índice de malla para {key}")
+        index = build_mesh_index(case_dir, fingerprint)
+
+    jm.save_section(MESH_INDEX_SECTION, index)
+    _INDEX_CACHE[key] = index
+    return copy.deepcopy(index)
+
+
+def patch_lookup(index):
+    """Devuelve {nombre: patch} a partir del índice."""
+    return {p["name"]: p for p in index.get("patches", [])}
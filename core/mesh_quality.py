@@ -0,0 +1,316 @@
+# core/mesh_quality.py
+
+"""
+Calidad de malla al estilo de checkMesh, con NumPy y un pool de procesos.
+
+Métricas (mismas definiciones que primitiveMeshTools de OpenFOAM):
+
+- No ortogonalidad: ángulo entre el vector centro-centro y Sf (caras internas).
+- Skewness: distancia del centro de cara al punto de corte de la recta
+  centro-centro, normalizada con el tamaño de la cara.
+- Aspect ratio y celdas abiertas: a partir de la suma de Sf por celda.
+- Volúmenes de las pirámides cara-centro de celda (owner y neighbour) y de
+  las celdas.
+
+El cálculo por cara (Sf/Cf y las métricas de cada cara) se reparte en
+bloques de caras entre los procesos del pool; las reducciones por celda se
+hacen en el proceso principal con np.bincount. El resultado se guarda en el
+proyecto (temp/mesh_quality.json) asociado a la huella de la malla, igual
+que el índice de malla.
+"""
+
+import os
+import time
+import logging
+import multiprocessing
+
+import numpy as np
+
+from core.json_manager import JSONManager
+from core.polymesh_reader import read_polymesh
+from core.mesh_geometry import (
+    BLOCK_FACES, face_areas_and_centres, cell_centres_and_volumes, row_dot
+)
+from core.mesh_index import load_mesh_index
+
+MESH_QUALITY_SECTION = "mesh_quality"
+MESH_QUALITY_VERSION = 1
+
+# Umbrales por defecto de checkMesh
+MAX_NON_ORTHO = 70.0
+MAX_SKEWNESS = 4.0
+MAX_ASPECT_RATIO = 1000.0
+MAX_OPENNESS = 1e-6
+
+# Por debajo de este número de caras no compensa arrancar el pool
+MIN_PARALLEL_FACES = 200000
+
+_ROOTVSMALL = 1e-150
+
+# Datos de la malla en cada proceso del pool (ver _init_worker)
+_WORKER = {}
+
+
+def _chunks(n, size):
+    return [(a, min(a + size, n)) for a in range(0, n, size)]
+
+
+def _init_worker(arrays):
+    _WORKER.clear()
+    _WORKER.update(arrays)
+
+
+def _face_geometry_task(bounds):
+    w = _WORKER
+    sf, cf = face_areas_and_centres(w["points"], w["face_offsets"], w["face_indices"], bounds)
+    return bounds, sf, cf
+
+
+def _face_quality_task(bounds):
+    """Métricas de las caras [a, b): devuelve sólo los extremos y recuentos."""
+    w = _WORKER
+    a, b = bounds
+    n_int = w["n_internal"]
+    sf = w["sf"][a:b]
+    cf = w["cf"][a:b]
+    cc = w["cell_centres"]
+    own_c = cc[np.asarray(w["owner"][a:b], dtype=np.int64)]
+
+    internal = np.arange(a, b) < n_int
+    n_i = int(internal.sum())  # las caras internas van primero
+    nei_c = cc[np.asarray(w["neighbour"][a:a + n_i], dtype=np.int64)]
+
+    # Vector owner -> neighbour; en caras de contorno, proyección sobre la normal
+    cpf = cf - own_c
+    d = np.empty_like(cpf)
+    d[:n_i] = nei_c - own_c[:n_i]
+    mag_sf = np.linalg.norm(sf, axis=1)
+    nhat = sf[n_i:] / (mag_sf[n_i:, None] + _ROOTVSMALL)
+    d[n_i:] = nhat * row_dot(nhat, cpf[n_i:])[:, None]
+    mag_d = np.linalg.norm(d, axis=1)
+
+    # No ortogonalidad (sólo caras internas)
+    cos = row_dot(d[:n_i], sf[:n_i]) / (mag_d[:n_i] * mag_sf[:n_i] + _ROOTVSMALL)
+    non_ortho = np.degrees(np.arccos(np.clip(cos, -1.0, 1.0)))
+
+    # Skewness
+    sv = cpf - (row_dot(sf, cpf) / (row_dot(sf, d) + _ROOTVSMALL))[:, None] * d
+    mag_sv = np.linalg.norm(sv, axis=1)
+    sv_hat = sv / (mag_sv[:, None] + _ROOTVSMALL)
+    offs = np.asarray(w["face_offsets"][a:b + 1], dtype=np.int64)
+    local = offs - offs[0]
+    pts = w["points"][np.asarray(w["face_indices"][offs[0]:offs[-1]])]
+    owner_face = np.repeat(np.arange(b - a), np.diff(local))
+    reach = np.abs(row_dot(sv_hat[owner_face], pts - cf[owner_face]))
+    fd = np.where(internal, 0.2, 0.4) * mag_d + _ROOTVSMALL
+    fd = np.maximum(fd, np.maximum.reduceat(reach, local[:-1]))
+    skew = mag_sv / fd
+
+    # Pirámides cara-centro (deben ser positivas)
+    pyr_own = row_dot(sf, cpf) / 3.0
+    pyr_nei = row_dot(sf[:n_i], nei_c - cf[:n_i]) / 3.0
+    pyr = np.concatenate((pyr_own, pyr_nei))
+
+    return {
+        "nonOrthMax": float(non_ortho.max()) if n_i else 0.0,
+        "nonOrthMaxFace": a + int(non_ortho.argmax()) if n_i else -1,
+        "nonOrthSum": float(non_ortho.sum()),
+        "nonOrthCount": n_i,
+        "nonOrthSevere": int((non_ortho > w["max_non_ortho"]).sum()),
+        "skewMax": float(skew.max()) if len(skew) else 0.0,
+        "skewMaxFace": a + int(skew.argmax()) if len(skew) else -1,
+        "skewSevere": int((skew > w["max_skewness"]).sum()),
+        "pyrMin": float(pyr.min()) if len(pyr) else 0.0,
+        "pyrNegative": int((pyr < 0.0).sum()),
+    }
+
+
+def _map(func, tasks, arrays, processes):
+    """Ejecuta func sobre tasks, en serie o en un pool que hereda 'arrays'."""
+    if processes <= 1 or len(tasks) <= 1:
+        _init_worker(arrays)
+        try:
+            return [func(t) for t in tasks]
+        finally:
+            _WORKER.clear()
+    with multiprocessing.Pool(min(processes, len(tasks)), _init_worker, (arrays,)) as pool:
+        return pool.map(func, tasks)
+
+
+def _solution_directions(sf, boundary):
+    """Direcciones resueltas: se excluyen las normales de los patches 'empty'."""
+    valid = np.ones(3, dtype=bool)
+    for b in boundary or []:
+        if b.get("type") != "empty" or not b.get("nFaces"):
+            continue
+        start = b.get("startFace") or 0
+        mag = np.abs(sf[start:start + b["nFaces"]]).sum(axis=0)
+        valid[int(mag.argmax())] = False
+    return valid
+
+
+def _cell_closedness(sf, owner, neighbour, n_cells, volumes, valid_dirs):
+    """Apertura relativa y aspect ratio de cada celda (primitiveMeshTools::cellClosedness)."""
+    n_int = len(neighbour)
+    sum_closed = np.empty((n_cells, 3))
+    sum_mag = np.empty((n_cells, 3))
+    for d in range(3):
+        sum_closed[:, d] = np.bincount(owner, sf[:, d], n_cells) - np.bincount(neighbour, sf[:n_int, d], n_cells)
+        mag = np.abs(sf[:, d])
+        sum_mag[:, d] = np.bincount(owner, mag, n_cells) + np.bincount(neighbour, mag[:n_int], n_cells)
+
+    openness = np.abs(sum_closed).max(axis=1) / (sum_mag.max(axis=1) + _ROOTVSMALL)
+
+    valid_mag = sum_mag[:, valid_dirs]
+    aspect = valid_mag.max(axis=1) / (valid_mag.min(axis=1) + _ROOTVSMALL)
+    if valid_dirs.all():
+        v = np.maximum(volumes, _ROOTVSMALL)
+        aspect = np.maximum(aspect, sum_mag.sum(axis=1) / (6.0 * v ** (2.0 / 3.0)))
+    return openness, aspect
+
+
+def check_mesh(case_dir, processes=None, chunk_faces=BLOCK_FACES):
+    """
+    Calcula las métricas de calidad de la malla de 'case_dir'.
+
+    Parámetros
+    ----------
+    processes : int o None
+        Procesos del pool; por defecto os.cpu_count(). Con mallas pequeñas
+        (menos de MIN_PARALLEL_FACES caras) se calcula en serie.
+    chunk_faces : int
+        Nº de caras por tarea.
+
+    Retorna
+    -------
+    dict
+        Resumen por métrica, lista 'failedChecks' y 'warnings'.
+    """
+    t0 = time.perf_counter()
+    mesh = read_polymesh(case_dir, mmap=True)
+    n_faces, n_int, n_cells = mesh.n_faces, mesh.n_internal_faces, mesh.n_cells
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if n_faces < MIN_PARALLEL_FACES:
+        processes = 1
+    tasks = _chunks(n_faces, chunk_faces)
+
+    arrays = {
+        "points": mesh.points,
+        "face_offsets": mesh.face_offsets,
+        "face_indices": mesh.face_indices,
+    }
+    sf = np.empty((n_faces, 3))
+    cf = np.empty((n_faces, 3))
+    for (a, b), sf_k, cf_k in _map(_face_geometry_task, tasks, arrays, processes):
+        sf[a:b] = sf_k
+        cf[a:b] = cf_k
+
+    owner = np.asarray(mesh.owner, dtype=np.int64)
+    neighbour = np.asarray(mesh.neighbour, dtype=np.int64)
+    centres, volumes = cell_centres_and_volumes(sf, cf, owner, neighbour, n_cells)
+    valid_dirs = _solution_directions(sf, mesh.boundary)
+    openness, aspect = _cell_closedness(sf, owner, neighbour, n_cells, volumes, valid_dirs)
+
+    arrays.update({
+        "owner": mesh.owner, "neighbour": mesh.neighbour, "n_internal": n_int,
+        "sf": sf, "cf": cf, "cell_centres": centres,
+        "max_non_ortho": MAX_NON_ORTHO, "max_skewness": MAX_SKEWNESS,
+    })
+    parts = _map(_face_quality_task, tasks, arrays, processes)
+
+    n_ortho = sum(p["nonOrthCount"] for p in parts)
+    worst_ortho = max(parts, key=lambda p: p["nonOrthMax"])
+    worst_skew = max(parts, key=lambda p: p["skewMax"])
+    boundary_sum = sf[n_int:].sum(axis=0)
+    boundary_mag = np.abs(sf[n_int:]).sum(axis=0)
+
+    report = {
+        "version": MESH_QUALITY_VERSION,
+        "nCells": n_cells,
+        "nFaces": n_faces,
+        "nonOrthogonality": {
+            "max": worst_ortho["nonOrthMax"],
+            "maxFace": worst_ortho["nonOrthMaxFace"],
+            "average": sum(p["nonOrthSum"] for p in parts) / n_ortho if n_ortho else 0.0,
+            "nSevere": sum(p["nonOrthSevere"] for p in parts),
+            "threshold": MAX_NON_ORTHO,
+        },
+        "skewness": {
+            "max": worst_skew["skewMax"],
+            "maxFace": worst_skew["skewMaxFace"],
+            "nSevere": sum(p["skewSevere"] for p in parts),
+            "threshold": MAX_SKEWNESS,
+        },
+        "aspectRatio": {
+            "max": float(aspect.max()) if n_cells else 0.0,
+            "maxCell": int(aspect.argmax()) if n_cells else -1,
+            "nSevere": int((aspect > MAX_ASPECT_RATIO).sum()),
+            "threshold": MAX_ASPECT_RATIO,
+        },
+        "facePyramids": {
+            "min": min((p["pyrMin"] for p in parts), default=0.0),
+            "nNegative": sum(p["pyrNegative"] for p in parts),
+        },
+        "cellVolumes": {
+            "min": float(volumes.min()) if n_cells else 0.0,
+            "max": float(volumes.max()) if n_cells else 0.0,
+            "total": float(volumes.sum()),
+            "nNegative": int((volumes <= 0.0).sum()),
+        },
+        "openCells": {
+            "maxOpenness": float(openness.max()) if n_cells else 0.0,
+            "nOpen": int((openness > MAX_OPENNESS).sum()),
+            "threshold": MAX_OPENNESS,
+        },
+        "closedBoundary": bool(np.all(np.abs(boundary_sum) <= MAX_OPENNESS * np.maximum(boundary_mag, _ROOTVSMALL))),
+        "solutionDirections": valid_dirs.tolist(),
+        "processes": processes,
+    }
+
+    failed = []
+    if not report["closedBoundary"]:
+        failed.append("closedBoundary")
+    if report["openCells"]["nOpen"]:
+        failed.append("openCells")
+    if report["cellVolumes"]["nNegative"]:
+        failed.append("cellVolumes")
+    if report["facePyramids"]["nNegative"]:
+        failed.append("facePyramids")
+    warnings = [name for name in ("nonOrthogonality", "skewness", "aspectRatio") if report[name]["nSevere"]]
+    report["failedChecks"] = failed
+    report["warnings"] = warnings
+    report["elapsed"] = time.perf_counter() - t0
+    return report
+
+
+def _fingerprint_hashes(fingerprint):
+    return {name: f.get("hash") for name, f in (fingerprint or {}).items()}
+
+
+def load_mesh_quality(case_dir, json_manager=None, rebuild=False, processes=None, compute=True):
+    """
+    Devuelve el informe de calidad de la malla, recalculándolo sólo si la
+    huella de polyMesh (la del índice de malla) ha cambiado.
+
+    Con compute=False sólo se consulta la caché: devuelve None si no hay un
+    informe válido para la malla actual.
+    """
+    jm = json_manager or JSONManager()
+    index = load_mesh_index(case_dir, jm)
+    key = os.path.abspath(case_dir)
+    hashes = _fingerprint_hashes(index["fingerprint"])
+
+    stored = None if rebuild else jm.load_section(MESH_QUALITY_SECTION)
+    if (stored and stored.get("version") == MESH_QUALITY_VERSION
+            and stored.get("caseDir") == key and stored.get("fingerprint") == hashes):
+        return stored
+    if not compute:
+        return None
+
+    logging.info(f"[mesh_quality] Calculando calidad de malla para {key}")
+    report = check_mesh(case_dir, processes)
+    report["caseDir"] = key
+    report["fingerprint"] = hashes
+    jm.save_section(MESH_QUALITY_SECTION, report)
+    return report
@@ -0,0 +1,531 @@
+# core/polymesh_reader.py
+
+"""
+Lectura de la malla de OpenFOAM (constant/polyMesh) en arrays de NumPy.
+
+Complementa a core/boundary_parser.py, que sólo lee el archivo 'boundary':
+aquí se cargan 'points', 'faces', 'owner' y 'neighbour' para poder obtener
+número de celdas, áreas de patches, bounding box, etc.
+
+- Soporta formato ascii y binary (según la cabecera FoamFile) y archivos
+  comprimidos con gzip ('points.gz', 'faces.gz', ...).
+- Las caras se guardan en formato CSR: 'face_offsets' (nFaces + 1) e
+  'face_indices' (índices de puntos concatenados), igual que faceCompactList.
+- La lectura se hace por bloques (chunk_size bytes) sobre arrays reservados de
+  antemano, de modo que el pico de memoria queda cerca del tamaño final.
+- Con mmap=True, las listas de archivos binarios sin comprimir se exponen como
+  vistas numpy.memmap (sólo lectura) sobre el propio archivo, sin copiarlas:
+  abrir la malla es casi instantáneo y sólo se leen las páginas que se usan.
+"""
+
+import os
+import re
+import gzip
+
+import numpy as np
+
+from core.boundary_parser import parse_openfoam_boundary
+
+# Tamaño por defecto de cada bloque leído del disco (bytes)
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# Para el parseo ascii, los paréntesis se tratan como separadores
+_PAREN_TABLE = bytes.maketrans(b"()", b"  ")
+
+# Una línea que empieza por ')' cierra la lista principal del archivo
+_LIST_END_RE = re.compile(rb"(^|\n)[ \t]*\)")
+
+# Lista corta en la misma línea que su tamaño: '3(0 1 2)', '0()'
+_INLINE_LIST_RE = re.compile(rb"^(\d+)[ \t]*\(")
+
+_HEADER_ENTRY_RE = re.compile(r"^\s*(\w+)\s+(.*?)\s*;\s*$")
+
+
+def polymesh_dir(case_dir):
+    """
+    Devuelve la carpeta polyMesh de un caso. Acepta tanto el directorio del
+    caso como la propia carpeta 'constant/polyMesh'.
+    """
+    if os.path.basename(os.path.normpath(case_dir)) == "polyMesh":
+        return case_dir
+    return os.path.join(case_dir, "constant", "polyMesh")
+
+
+def find_polymesh_file(poly_dir, name):
+    """
+    Busca 'name' dentro de poly_dir, probando también la variante '.gz'.
+    Lanza FileNotFoundError si no existe ninguna de las dos.
+    """
+    path = os.path.join(poly_dir, name)
+    if os.path.exists(path):
+        return path
+    if os.path.exists(path + ".gz"):
+        return path + ".gz"
+    raise FileNotFoundError(f"No se encontró '{name}' en {poly_dir}")
+
+
+def open_foam_file(path):
+    """Abre un archivo de OpenFOAM en modo binario, descomprimiendo si es '.gz'."""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def read_foam_header(f):
+    """
+    Lee la cabecera 'FoamFile { ... }' desde el inicio de 'f' (modo binario)
+    y deja el cursor justo después de la llave de cierre.
+
+    Retorna
+    -------
+    dict
+        Entradas de la cabecera (format, class, object, arch, note...) más las
+        claves derivadas 'label_bytes' y 'scalar_bytes'.
+    """
+    header = {}
+    in_header = False
+    while True:
+        raw = f.readline()
+        if not raw:
+            raise ValueError("Fin de archivo antes de encontrar la cabecera FoamFile.")
+        line = raw.decode("latin-1").strip()
+        if not in_header:
+            if line.startswith("FoamFile"):
+                in_header = True
+            continue
+        if line == "{":
+            continue
+        if line == "}":
+            break
+        m = _HEADER_ENTRY_RE.match(line)
+        if m:
+            header[m.group(1)] = m.group(2).strip('"')
+
+    arch = header.get("arch", "")
+    label = re.search(r"label\s*=\s*(\d+)", arch)
+    scalar = re.search(r"scalar\s*=\s*(\d+)", arch)
+    header["label_bytes"] = int(label.group(1)) // 8 if label else 4
+    header["scalar_bytes"] = int(scalar.group(1)) // 8 if scalar else 8
+    header["format"] = header.get("format", "ascii")
+    return header
+
+
+def parse_header_note(header):
+    """
+    Extrae los contadores del campo 'note' que escribe OpenFOAM en owner y
+    neighbour, p.ej. "nPoints:1000 nCells:500 nFaces:2000 nInternalFaces:1400".
+    """
+    return {k: int(v) for k, v in re.findall(r"(\w+)\s*:\s*(\d+)", header.get("note", ""))}
+
+
+def label_dtype(header):
+    return np.dtype("<i8") if header["label_bytes"] == 8 else np.dtype("<i4")
+
+
+def scalar_dtype(header):
+    return np.dtype("<f4") if header["scalar_bytes"] == 4 else np.dtype("<f8")
+
+
+def seek_list_start(f):
+    """
+    Avanza desde el final de la cabecera hasta el '(' de la siguiente lista
+    y devuelve su tamaño. El cursor queda justo después de '('.
+    """
+    return _open_list(f)[0]
+
+
+def _open_list(f):
+    """
+    Como seek_list_start, pero devuelve (tamaño, en_línea): en_línea=True si
+    la lista empieza en la misma línea que su tamaño ('3(0 1 2)', '0()'),
+    de modo que su ')' final no está al principio de una línea.
+    """
+    while True:
+        line_start = f.tell()
+        raw = f.readline()
+        if not raw:
+            raise ValueError("No se encontró el tamaño de la lista.")
+        line = raw.strip()
+        # ')' de una lista anterior (faceCompactList tiene dos seguidas)
+        if not line or line == b")" or line.startswith(b"//"):
+            continue
+        if line.isdigit():
+            count = int(line)
+            break
+        m = _INLINE_LIST_RE.match(line)
+        if m:
+            f.seek(line_start + raw.index(b"(") + 1)
+            return int(m.group(1)), True
+        raise ValueError(f"Se esperaba el tamaño de la lista y se encontró: {line[:40]!r}")
+
+    while True:
+        c = f.read(1)
+        if not c:
+            raise ValueError("Fin de archivo antes de '('.")
+        if c == b"(":
+            return count, False
+        if not c.isspace():
+            raise ValueError(f"Se esperaba '(' tras el tamaño de la lista y se encontró {c!r}")
+
+
+def _read_binary_into(f, out, chunk_size):
+    """Rellena 'out' con los bytes crudos de 'f', por bloques."""
+    view = memoryview(out.reshape(-1)).cast("B")
+    pos = 0
+    total = view.nbytes
+    while pos < total:
+        n = f.readinto(view[pos:pos + min(chunk_size, total - pos)])
+        if not n:
+            raise ValueError("Fin de archivo inesperado en bloque binario.")
+        pos += n
+
+
+def _inline_list_text(f):
+    """
+    Contenido de una lista en línea ya abierta ('3(0 1 2)') hasta el ')'
+    que la cierra, contando los paréntesis anidados ('2(3(0 1 2) 3(1 2 3))').
+    Deja el cursor en ese ')'.
+    """
+    start = f.tell()
+    buf = b""
+    while True:
+        line = f.readline()
+        if not line:
+            raise ValueError("Fin de archivo antes del ')' que cierra la lista.")
+        buf += line
+        b = np.frombuffer(buf, dtype=np.uint8)
+        depth = np.cumsum((b == ord("(")).astype(np.int64) - (b == ord(")")))
+        closed = np.flatnonzero(depth < 0)
+        if closed.size:
+            end = int(closed[0])
+            f.seek(start + end)
+            return buf[:end]
+
+
+def _ascii_chunks(f, chunk_size, inline=False):
+    """
+    Genera bloques de texto de la lista ascii que empieza en la posición
+    actual de 'f'. Cada bloque termina en un salto de línea y el último se
+    corta en el ')' que cierra la lista. Una lista en línea (inline=True) se
+    devuelve en un solo bloque.
+    """
+    if inline:
+        yield _inline_list_text(f)
+        return
+    rest = b""
+    while True:
+        data = f.read(chunk_size)
+        buf = rest + data if rest else data
+        m = _LIST_END_RE.search(buf)
+        if m:
+            yield buf[:m.start() + len(m.group(1))]
+            # Devolver el cursor al ')' por si sigue otra lista en el archivo
+            f.seek(f.tell() - (len(buf) - m.end() + 1))
+            return
+        if not data:
+            raise ValueError("Fin de archivo antes del ')' que cierra la lista.")
+        cut = buf.rfind(b"\n") + 1
+        if cut == 0:
+            rest = buf
+            continue
+        rest = buf[cut:]
+        yield buf[:cut]
+
+
+def skip_ascii_list(f, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Salta el contenido de una lista ascii ya abierta hasta su ')' final."""
+    for _ in _ascii_chunks(f, chunk_size):
+        pass
+
+
+def _read_ascii_values(f, out, chunk_size, inline=False):
+    """Rellena 'out' (1D) con los números de la lista ascii actual."""
+    pos = 0
+    for chunk in _ascii_chunks(f, chunk_size, inline):
+        values = np.fromstring(chunk.translate(_PAREN_TABLE), dtype=out.dtype, sep=" ")
+        if pos + values.size > out.size:
+            raise ValueError("La lista contiene más valores de los indicados en su tamaño.")
+        out[pos:pos + values.size] = values
+        pos += values.size
+    if pos != out.size:
+        raise ValueError(f"Se esperaban {out.size} valores y se leyeron {pos}.")
+
+
+def can_memmap(path, header):
+    """Indica si el contenido de 'path' puede mapearse en memoria sin copia."""
+    return header["format"] == "binary" and not path.endswith(".gz")
+
+
+def _read_list(f, header, dtype, width, chunk_size, mmap_path=None):
+    """
+    Lee la siguiente lista del archivo a partir de la posición actual.
+
+    Si se pasa mmap_path (archivo binario sin comprimir) se devuelve un
+    numpy.memmap sobre el payload y el cursor se sitúa tras él.
+    """
+    count, inline = _open_list(f)
+    shape = (count, width) if width > 1 else (count,)
+    if header["format"] == "binary":
+        if mmap_path is not None and count > 0:
+            offset = f.tell()
+            out = np.memmap(mmap_path, dtype=dtype, mode="r", offset=offset, shape=shape)
+            f.seek(offset + out.nbytes)
+            return out
+        out = np.empty(shape, dtype=dtype)
+        _read_binary_into(f, out, chunk_size)
+    else:
+        out = np.empty(shape, dtype=dtype)
+        _read_ascii_values(f, out.reshape(-1), chunk_size, inline)
+    return out
+
+
+def read_points(path, chunk_size=DEFAULT_CHUNK_SIZE, mmap=False):
+    """
+    Lee 'points' y devuelve un array (nPoints, 3) de floats.
+
+    Con mmap=True y formato binario sin comprimir devuelve un numpy.memmap.
+    """
+    with open_foam_file(path) as f:
+        header = read_foam_header(f)
+        mmap_path = path if mmap and can_memmap(path, header) else None
+        return _read_list(f, header, scalar_dtype(header), 3, chunk_size, mmap_path)
+
+
+def read_labels(path, chunk_size=DEFAULT_CHUNK_SIZE, mmap=False):
+    """
+    Lee una labelList ('owner', 'neighbour', ...).
+
+    Con mmap=True y formato binario sin comprimir el array es un numpy.memmap.
+
+    Retorna
+    -------
+    (numpy.ndarray, dict)
+        El array de labels y la cabecera FoamFile (útil por su 'note').
+    """
+    with open_foam_file(path) as f:
+        header = read_foam_header(f)
+        mmap_path = path if mmap and can_memmap(path, header) else None
+        labels = _read_list(f, header, label_dtype(header), 1, chunk_size, mmap_path)
+    return labels, header
+
+
+def _split_face_chunk(chunk, index_dtype):
+    """
+    Convierte un bloque de líneas 'n(i0 i1 ...)' en (tamaños, índices).
+
+    La vía rápida cuenta los espacios entre cada '(' y su ')' de forma
+    vectorizada; si el texto no sigue el formato estándar de OpenFOAM
+    (un espacio entre índices) se recorre el bloque secuencialmente.
+    """
+    flat = np.fromstring(chunk.translate(_PAREN_TABLE), dtype=np.int64, sep=" ")
+    if flat.size == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=index_dtype)
+
+    buf = np.frombuffer(chunk, dtype=np.uint8)
+    opens = np.flatnonzero(buf == ord("("))
+    closes = np.flatnonzero(buf == ord(")"))
+    if opens.size == closes.size:
+        spaces = np.cumsum(buf == ord(" "), dtype=np.int32)
+        sizes = (spaces[closes] - spaces[opens] + 1).astype(np.int64)
+        heads = np.cumsum(sizes + 1) - (sizes + 1)
+        if heads.size and heads[-1] + sizes[-1] + 1 == flat.size and np.array_equal(flat[heads], sizes):
+            keep = np.ones(flat.size, dtype=bool)
+            keep[heads] = False
+            return sizes, flat[keep].astype(index_dtype, copy=False)
+
+    sizes = []
+    keep = np.ones(flat.size, dtype=bool)
+    i = 0
+    while i < flat.size:
+        n = int(flat[i])
+        sizes.append(n)
+        keep[i] = False
+        i += n + 1
+    if i != flat.size:
+        raise ValueError("Bloque de caras mal formado.")
+    return np.asarray(sizes, dtype=np.int64), flat[keep].astype(index_dtype, copy=False)
+
+
+def _read_ascii_face_list(f, header, chunk_size):
+    """Lee una faceList ascii ('4(0 1 2 3)' por línea) en formato CSR."""
+    count, inline = _open_list(f)
+    idx_dtype = label_dtype(header)
+    offsets = np.empty(count + 1, dtype=np.int64)
+    offsets[0] = 0
+    # Reserva inicial suponiendo caras cuadriláteras; se amplía si hace falta
+    indices = np.empty(max(4 * count, 1), dtype=idx_dtype)
+    n_faces = 0
+    n_idx = 0
+    for chunk in _ascii_chunks(f, chunk_size, inline):
+        sizes, idx = _split_face_chunk(chunk, idx_dtype)
+        if n_faces + sizes.size > count:
+            raise ValueError("El archivo faces contiene más caras de las indicadas.")
+        offsets[n_faces + 1:n_faces + 1 + sizes.size] = n_idx + np.cumsum(sizes)
+        if n_idx + idx.size > indices.size:
+            indices.resize(max(int(indices.size * 1.5), n_idx + idx.size), refcheck=False)
+        indices[n_idx:n_idx + idx.size] = idx
+        n_faces += sizes.size
+        n_idx += idx.size
+    if n_faces != count:
+        raise ValueError(f"Se esperaban {count} caras y se leyeron {n_faces}.")
+    indices.resize(n_idx, refcheck=False)
+    return offsets, indices
+
+
+def read_faces(path, chunk_size=DEFAULT_CHUNK_SIZE, mmap=False):
+    """
+    Lee 'faces' (faceList o faceCompactList, ascii o binario).
+
+    Con mmap=True y faceCompactList binaria sin comprimir, offsets e índices
+    son vistas numpy.memmap sobre el archivo.
+
+    Retorna
+    -------
+    (numpy.ndarray, numpy.ndarray)
+        face_offsets (nFaces + 1) y face_indices: los puntos de la cara i son
+        face_indices[face_offsets[i]:face_offsets[i + 1]].
+    """
+    with open_foam_file(path) as f:
+        header = read_foam_header(f)
+        if header.get("class") == "faceCompactList":
+            mmap_path = path if mmap and can_memmap(path, header) else None
+            offsets = _read_list(f, header, label_dtype(header), 1, chunk_size, mmap_path)
+            indices = _read_list(f, header, label_dtype(header), 1, chunk_size, mmap_path)
+        elif header["format"] == "binary":
+            raise ValueError("Formato binario sólo soportado para faceCompactList.")
+        else:
+            offsets, indices = _read_ascii_face_list(f, header, chunk_size)
+    return offsets, indices
+
+
+def count_cells(owner, neighbour):
+    """Número de celdas a partir de owner/neighbour (máximo label + 1)."""
+    n = int(owner.max()) + 1 if len(owner) else 0
+    if len(neighbour):
+        n = max(n, int(neighbour.max()) + 1)
+    return n
+
+
+class PolyMesh:
+    """
+    Malla polyMesh cargada en memoria.
+
+    Atributos
+    ---------
+    points : (nPoints, 3) float
+    face_offsets, face_indices : caras en formato CSR
+    owner : (nFaces,) label
+    neighbour : (nInternalFaces,) label
+    boundary : list of dict (salida de parse_openfoam_boundary)
+    """
+
+    def __init__(self, points, face_offsets, face_indices, owner, neighbour,
+                 boundary=None, n_cells=None):
+        self.points = points
+        self.face_offsets = face_offsets
+        self.face_indices = face_indices
+        self.owner = owner
+        self.neighbour = neighbour
+        self.boundary = boundary or []
+        self._n_cells = n_cells
+
+    @property
+    def n_points(self):
+        return len(self.points)
+
+    @property
+    def n_faces(self):
+        return len(self.face_offsets) - 1
+
+    @property
+    def n_internal_faces(self):
+        return len(self.neighbour)
+
+    @property
+    def n_cells(self):
+        if self._n_cells is None:
+            self._n_cells = count_cells(self.owner, self.neighbour)
+        return self._n_cells
+
+    def face_sizes(self):
+        """Número de vértices de cada cara."""
+        return np.diff(self.face_offsets)
+
+    def bounding_box(self):
+        """Devuelve (min, max) de las coordenadas de los puntos."""
+        return self.points.min(axis=0), self.points.max(axis=0)
+
+    def patch_face_range(self, name):
+        """Devuelve el rango (startFace, startFace + nFaces) del patch 'name'."""
+        for b in self.boundary:
+            if b.get("name") == name:
+                start = b.get("startFace") or 0
+                return start, start + (b.get("nFaces") or 0)
+        raise KeyError(f"Patch '{name}' no encontrado en boundary.")
+
+
+def read_polymesh(case_dir, chunk_size=DEFAULT_CHUNK_SIZE, mmap=False):
+    """
+    Carga points, faces, owner, neighbour y boundary de un caso.
+
+    Parámetros
+    ----------
+    case_dir : str
+        Directorio del caso o carpeta 'constant/polyMesh'.
+    chunk_size : int
+        Tamaño de los bloques de lectura en bytes.
+    mmap : bool
+        Si es True, los archivos binarios sin comprimir se mapean en memoria
+        (numpy.memmap de sólo lectura) en lugar de copiarse. Los archivos
+        ascii o '.gz' se leen siempre en memoria.
+
+    Retorna
+    -------
+    PolyMesh
+    """
+    poly_dir = polymesh_dir(case_dir)
+
+    points = read_points(find_polymesh_file(poly_dir, "points"), chunk_size, mmap)
+    offsets, indices = read_faces(find_polymesh_file(poly_dir, "faces"), chunk_size, mmap)
+    owner, owner_header = read_labels(find_polymesh_file(poly_dir, "owner"), chunk_size, mmap)
+    neighbour, _ = read_labels(find_polymesh_file(poly_dir, "neighbour"), chunk_size, mmap)
+
+    boundary = []
+    boundary_path = os.path.join(poly_dir, "boundary")
+    if os.path.exists(boundary_path):
+        boundary = parse_openfoam_boundary(boundary_path)
+
+    return PolyMesh(points, offsets, indices, owner, neighbour,
+                    boundary=boundary,
+                    n_cells=parse_header_note(owner_header).get("nCells"))
+
+
+def read_mesh_counts(case_dir):
+    """
+    Devuelve nPoints, nFaces, nInternalFaces y nCells leyendo sólo las
+    cabeceras y los tamaños de las listas (no el contenido), de modo que es
+    inmediato incluso en mallas ascii grandes.
+
+    Si 'owner' no trae el campo 'note', nCells se obtiene del máximo de
+    owner/neighbour (mapeados en memoria si son binarios).
+    """
+    poly_dir = polymesh_dir(case_dir)
+    counts = {}
+    for name, key in (("points", "nPoints"), ("faces", "nFaces"),
+                      ("owner", None), ("neighbour", "nInternalFaces")):
+        path = find_polymesh_file(poly_dir, name)
+        with open_foam_file(path) as f:
+            header = read_foam_header(f)
+            if name == "owner":
+                counts.update(parse_header_note(header))
+                continue
+            size = seek_list_start(f)
+            if name == "faces" and header.get("class") == "faceCompactList":
+                size -= 1
+            counts[key] = size
+
+    if "nCells" not in counts:
+        owner, _ = read_labels(find_polymesh_file(poly_dir, "owner"), mmap=True)
+        neighbour, _ = read_labels(find_polymesh_file(poly_dir, "neighbour"), mmap=True)
+        counts["nCells"] = count_cells(owner, neighbour)
+    return counts
@@ -0,0 +1,181 @@
+# core/project_state.py
+
+"""
+Estado del proyecto en memoria.
+
+Todas las secciones (constant, boundary_conditions, Disperse_fase,
+case_config, ...) se leen de disco una sola vez y se sirven desde memoria a
+las páginas de la GUI, los diálogos y los generadores de ui/conf. El disco
+queda sólo como almacenamiento: cada cambio se persiste en segundo plano con
+el servicio de auto-guardado (core/autosave.py).
+
+Los cambios se publican por clave: subscribe("constant", "especiesActive",
+callback) llama a callback(sección, clave, valor) cada vez que esa clave
+cambia, y con clave None a cada cambio de la sección.
+
+    state = project_state()
+    state.get("constant", "especiesActive", False)
+    state.update("constant", {"especiesActive": True})
+
+El estado puede leer de un origen distinto del disco (attach_source, p.ej.
+un bundle .ofgui de core/bundle.py): las secciones se toman del origen la
+primera vez que se piden y flush() vuelca al disco las que nadie ha
+modificado, junto con los archivos generados del origen.
+"""
+
+import os
+import copy
+import logging
+import threading
+
+from core.json_manager import JSONManager, default_data_dir
+from core.autosave import autosave_service
+
+# {data_dir: ProjectState}
+_states = {}
+_states_lock = threading.Lock()
+
+_MISSING = object()
+
+
+class ProjectState:
+    def __init__(self, data_dir=None, json_manager=None, autosave=None):
+        self.data_dir = os.path.abspath(data_dir or default_data_dir())
+        self.json_manager = json_manager or JSONManager(self.data_dir)
+        self.autosave = autosave or autosave_service(self.data_dir)
+        self._sections = {}
+        # {(sección, clave o None): [callbacks]}
+        self._subscribers = {}
+        self.disk_reads = 0
+        # Origen alternativo de las secciones (Bundle) y secciones ya
+        # modificadas desde que se adjuntó, que no deben tomarse del origen
+        self.source = None
+        self._modified = set()
+
+    # ------------------------------------------------------------------
+    # Lectura
+    # ------------------------------------------------------------------
+    def _section(self, name):
+        data = self._sections.get(name)
+        if data is None:
+            if self.source is not None and name not in self._modified:
+                data = copy.deepcopy(self.source.load_section(name))
+            else:
+                token = self.json_manager.section_token(name)
+                data = self.json_manager.load_section(name) or {}
+                self.disk_reads += 1
+                if data:
+                    # Versión del disco: el auto-guardado podrá escribir sólo la diferencia
+                    self.autosave.remember(name, data, token)
+            self._sections[name] = data
+        return data
+
+    def section(self, name):
+        """Copia de la sección completa (dict vacío si no existe)."""
+        return copy.deepcopy(self._section(name))
+
+    def get(self, name, key, default=None):
+        """Copia del valor 'key' de la sección, o 'default'."""
+        value = self._section(name).get(key, _MISSING)
+        return default if value is _MISSING else copy.deepcopy(value)
+
+    def has_section(self, name):
+        """True si la sección tiene datos (en memoria o en disco)."""
+        return bool(self._section(name))
+
+    # ------------------------------------------------------------------
+    # Escritura
+    # ------------------------------------------------------------------
+    def update(self, name, values, persist=True):
+        """
+        Fusiona 'values' en la sección; notifica y persiste sólo si alguna
+        clave ha cambiado. Devuelve las claves cambiadas.
+        """
+        data = self._section(name)
+        changed = []
+        for key, value in values.items():
+            if data.get(key, _MISSING) != value:
+                data[key] = copy.deepcopy(value)
+                changed.append(key)
+        self._changed(name, changed, persist)
+        return changed
+
+    def replace(self, name, values, persist=True):
+        """Sustituye la sección completa; las claves que desaparecen se notifican con None."""
+        data = self._section(name)
+        removed = [k for k in data if k not in values]
+        for key in removed:
+            del data[key]
+        changed = removed + self.update(name, values, persist=False)
+        self._changed(name, changed, persist)
+        return changed
+
+    def _changed(self, name, keys, persist):
+        if not keys:
+            return
+        self._modified.add(name)
+        if persist:
+            self.autosave.schedule(name, self._sections[name])
+        for key in keys:
+            self._emit(name, key, self._sections[name].get(key))
+
+    def reload(self, name=None):
+        """Descarta la caché (una sección o todas) para releer de disco."""
+        if name is None:
+            self._sections.clear()
+        else:
+            self._sections.pop(name, None)
+
+    def attach_source(self, source):
+        """
+        Lee las secciones de 'source' (objeto con load_section, p.ej. un
+        Bundle) en lugar del disco hasta el próximo flush(). Descarta la caché.
+        """
+        self.autosave.flush()
+        self.source = source
+        self._modified.clear()
+        self._sections.clear()
+
+    def flush(self):
+        """
+        Espera a que todos los cambios estén escritos en disco. Si hay un
+        origen adjunto, vuelca antes al disco todo lo que no se ha modificado
+        en memoria (secciones y archivos generados) y lo desacopla.
+        """
+        source = self.source
+        if source is not None:
+            source.materialize(self.json_manager, skip=self._modified)
+            self.source = None
+            self._modified.clear()
+            source.close()
+        return self.autosave.flush()
+
+    # ------------------------------------------------------------------
+    # Notificaciones
+    # ------------------------------------------------------------------
+    def subscribe(self, name, key, callback):
+        """
+        Llama a callback(sección, clave, valor) cuando 'key' cambia en la
+        sección ('key' None: cualquier clave). Devuelve una función para
+        cancelar la suscripción.
+        """
+        callbacks = self._subscribers.setdefault((name, key), [])
+        callbacks.append(callback)
+        return lambda: callback in callbacks and callbacks.remove(callback)
+
+    def _emit(self, name, key, value):
+        for callback in self._subscribers.get((name, key), []) + self._subscribers.get((name, None), []):
+            try:
+                callback(name, key, value)
+            except Exception:
+                logging.error(f"[project_state] Error notificando {name}.{key}", exc_info=True)
+
+
+def project_state(data_dir=None):
+    """Estado compartido para la carpeta de datos 'data_dir' (por defecto temp/)."""
+    key = os.path.abspath(data_dir or default_data_dir())
+    with _states_lock:
+        state = _states.get(key)
+        if state is None:
+            state = _states[key] = ProjectState(key)
+        return state
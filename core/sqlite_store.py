@@ -0,0 +1,239 @@
+# core/sqlite_store.py
+
+"""
+Almacén SQLite de las secciones del proyecto (backend 'sqlite' de JSONManager).
+
+Todas las secciones viven en un único archivo '<data_dir>/project.db' en modo
+WAL: los lectores (GUI, generadores) no se bloquean mientras el hilo de
+auto-guardado escribe, y un corte a mitad de escritura nunca deja una sección
+a medias.
+
+Tablas:
+- sections(name, revision, data, updated): última versión de cada sección;
+  leer una sección es una consulta por clave primaria.
+- revisions(section, revision, data, created): historial de versiones. Sólo
+  se crea una revisión cuando el contenido cambia, y se conservan las
+  últimas MAX_REVISIONS de cada sección.
+- patches(section, seq, ops): operaciones JSON Patch (core/json_patch.py)
+  pendientes de aplicar sobre sections.data; guardar la sección completa
+  las descarta.
+
+Para pasar un proyecto existente de archivos JSON a SQLite:
+    python -m core.sqlite_store temp
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import threading
+import contextlib
+
+DB_FILE = "project.db"
+MAX_REVISIONS = 100     # revisiones conservadas por sección
+BUSY_TIMEOUT_MS = 10000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sections (
+    name     TEXT PRIMARY KEY,
+    revision INTEGER NOT NULL,
+    data     TEXT NOT NULL,
+    updated  REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS revisions (
+    section  TEXT NOT NULL,
+    revision INTEGER NOT NULL,
+    data     TEXT NOT NULL,
+    created  REAL NOT NULL,
+    PRIMARY KEY (section, revision)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS patches (
+    section  TEXT NOT NULL,
+    seq      INTEGER NOT NULL,
+    ops      TEXT NOT NULL,
+    PRIMARY KEY (section, seq)
+) WITHOUT ROWID;
+"""
+
+
+def encode(data):
+    """Serialización compacta con la que se guardan las filas."""
+    return json.dumps(data, separators=(",", ":"))
+
+
+class SQLiteStore:
+    def __init__(self, path, max_revisions=MAX_REVISIONS):
+        self.path = os.path.abspath(path)
+        self.max_revisions = max_revisions
+        # sqlite3 no permite compartir conexiones entre hilos: una por hilo
+        self._local = threading.local()
+        # executescript confirma por su cuenta: va fuera de transaction()
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            # isolation_level=None: las transacciones se abren explícitamente
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+            self._local.conn = conn
+        return conn
+
+    @contextlib.contextmanager
+    def transaction(self, write=True):
+        """
+        Transacción explícita. Las de escritura toman el bloqueo de escritura
+        al empezar (BEGIN IMMEDIATE); las de lectura ven una instantánea
+        consistente de la base de datos aunque otro hilo escriba.
+        """
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE" if write else "BEGIN")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    # ------------------------------------------------------------------
+    # Lectura
+    # ------------------------------------------------------------------
+    def get(self, name):
+        """Texto JSON de la sección, o None si no existe."""
+        row = self._connection().execute(
+            "SELECT data FROM sections WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def names(self):
+        return [r[0] for r in self._connection().execute("SELECT name FROM sections ORDER BY name")]
+
+    def revision(self, name):
+        """Número de la revisión actual de la sección (0 si no existe)."""
+        row = self._connection().execute(
+            "SELECT revision FROM sections WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else 0
+
+    def iter_sections(self):
+        """
+        Genera (nombre, texto JSON) por orden de nombre, fila a fila desde el
+        cursor y dentro de una única transacción de lectura.
+        """
+        with self.transaction(write=False) as conn:
+            yield from conn.execute("SELECT name, data FROM sections ORDER BY name")
+
+    def token(self, name):
+        """(revisión, último parche) de la sección: cambia con cualquier escritura."""
+        return self._connection().execute(
+            "SELECT revision, (SELECT COALESCE(MAX(seq), 0) FROM patches WHERE section = ?) "
+            "FROM sections WHERE name = ?", (name, name)).fetchone()
+
+    def patches(self, name):
+        """Textos JSON de los parches pendientes de la sección, en orden."""
+        return [r[0] for r in self._connection().execute(
+            "SELECT ops FROM patches WHERE section = ? ORDER BY seq", (name,))]
+
+    def history(self, name):
+        """[(revisión, fecha)] de la sección, de la más reciente a la más antigua."""
+        return self._connection().execute(
+            "SELECT revision, created FROM revisions WHERE section = ? ORDER BY revision DESC",
+            (name,)).fetchall()
+
+    def get_revision(self, name, revision):
+        row = self._connection().execute(
+            "SELECT data FROM revisions WHERE section = ? AND revision = ?",
+            (name, revision)).fetchone()
+        return row[0] if row else None
+
+    # ------------------------------------------------------------------
+    # Escritura
+    # ------------------------------------------------------------------
+    def put_many(self, sections):
+        """
+        Guarda {nombre: texto JSON} en una sola transacción. Las secciones
+        cuyo contenido no cambia no generan revisión. Devuelve los nombres
+        de las secciones que han cambiado.
+        """
+        now = time.time()
+        changed = []
+        with self.transaction() as conn:
+            for name, text in sections.items():
+                cur = conn.execute(
+                    "INSERT INTO sections (name, revision, data, updated) VALUES (?, 1, ?, ?) "
+                    "ON CONFLICT (name) DO UPDATE SET revision = revision + 1, "
+                    "data = excluded.data, updated = excluded.updated "
+                    "WHERE data <> excluded.data",
+                    (name, text, now))
+                # El texto completo sustituye a la base y a sus parches
+                conn.execute("DELETE FROM patches WHERE section = ?", (name,))
+                if cur.rowcount == 0:
+                    continue
+                conn.execute(
+                    "INSERT INTO revisions (section, revision, data, created) "
+                    "SELECT name, revision, data, updated FROM sections WHERE name = ?", (name,))
+                conn.execute(
+                    "DELETE FROM revisions WHERE section = ? AND revision <= "
+                    "(SELECT revision FROM sections WHERE name = ?) - ?",
+                    (name, name, self.max_revisions))
+                changed.append(name)
+        return changed
+
+    def append_patch(self, name, ops_text, expected=None):
+        """
+        Añade un parche a la sección. Devuelve (bytes de parches pendientes,
+        bytes de la base) para decidir cuándo compactar, o None sin añadirlo
+        si 'expected' no es el token() actual de la sección.
+        """
+        with self.transaction() as conn:
+            if expected is not None and self.token(name) != tuple(expected):
+                return None
+            conn.execute(
+                "INSERT INTO patches (section, seq, ops) SELECT ?, COALESCE(MAX(seq), 0) + 1, ? "
+                "FROM patches WHERE section = ?", (name, ops_text, name))
+            return conn.execute(
+                "SELECT (SELECT TOTAL(LENGTH(ops)) FROM patches WHERE section = ?), LENGTH(data) "
+                "FROM sections WHERE name = ?", (name, name)).fetchone()
+
+    def delete(self, name):
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM sections WHERE name = ?", (name,))
+            conn.execute("DELETE FROM patches WHERE section = ?", (name,))
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def migrate_json_dir(data_dir, store=None):
+    """
+    Importa a '<data_dir>/project.db' todos los '<sección>.json' de data_dir
+    (los archivos no se borran). Devuelve las secciones importadas.
+    """
+    store = store or SQLiteStore(os.path.join(data_dir, DB_FILE))
+    sections = {}
+    for fn in sorted(os.listdir(data_dir)):
+        if not fn.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(data_dir, fn), "r") as f:
+                sections[fn[:-5]] = encode(json.load(f))
+        except Exception as e:
+            print(f"[sqlite_store] No se pudo importar {fn}: {e}")
+    store.put_many(sections)
+    return sorted(sections)
+
+
+if __name__ == "__main__":
+    from core.json_manager import JSONManager
+
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else "temp"
+    # Los registros de parches (<sección>.patches) se aplican antes de importar
+    JSONManager(data_dir, backend="json").compact_patch_logs()
+    imported = migrate_json_dir(data_dir)
+    print(f"[sqlite_store] {len(imported)} secciones importadas a {os.path.join(data_dir, DB_FILE)}: "
+          f"{', '.join(imported)}")
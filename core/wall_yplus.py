@@ -0,0 +1,249 @@
+# core/wall_yplus.py
+
+"""
+Altura de la primera celda en las paredes y estimación de y+.
+
+La distancia a la pared de cada cara de un patch 'wall' es la proyección
+sobre la normal de la cara del vector centro de cara -> centro de la celda
+owner, que es donde OpenFOAM evalúa y+. Las distancias se calculan a partir
+de los arrays de la malla (core/mesh_geometry.py) y se guardan en el
+proyecto (temp/wall_distance.json) asociadas a la huella de la malla.
+
+y+ se estima con la correlación de placa plana turbulenta:
+
+    Re = rho U L / mu,  Cf = 0.026 Re^(-1/7),  tau_w = 0.5 Cf rho U^2
+    u_tau = sqrt(tau_w / rho),  y+ = rho u_tau y / mu
+
+con U la mayor velocidad de entrada de los inlets, L la mayor dimensión de
+la bounding box y rho/mu del material. Es una estimación de orden de
+magnitud para elegir el tratamiento de pared, no un sustituto del campo
+yPlus de la solución.
+"""
+
+import os
+import math
+import logging
+
+import numpy as np
+
+from core.json_manager import JSONManager
+from core.polymesh_reader import read_polymesh
+from core.mesh_geometry import face_areas_and_centres, cell_centres_and_volumes, row_dot
+from core.mesh_index import load_mesh_index, patch_lookup
+from core.inlet_flow import convert_flow, inlet_density, FLOW_SPECS
+
+WALL_DISTANCE_SECTION = "wall_distance"
+WALL_DISTANCE_VERSION = 1
+
+DEFAULT_VISCOSITY = 1.8e-5   # Pa·s (aire)
+
+# Límites de y+ de las distintas regiones de la capa límite
+YPLUS_VISCOUS = 5.0
+YPLUS_LOG_MIN = 30.0
+YPLUS_LOG_MAX = 300.0
+
+
+def wall_first_cell_heights(case_dir):
+    """
+    Distancia pared - centro de la primera celda de cada patch de tipo 'wall'.
+
+    Retorna
+    -------
+    dict
+        {patch: {"min": m, "max": m, "mean": m}}; 'mean' ponderada por área.
+    """
+    mesh = read_polymesh(case_dir, mmap=True)
+    walls = [b for b in mesh.boundary or [] if b.get("type") == "wall" and b.get("nFaces")]
+    if not walls:
+        return {}
+
+    sf, cf = face_areas_and_centres(mesh.points, mesh.face_offsets, mesh.face_indices)
+    owner = np.asarray(mesh.owner, dtype=np.int64)
+    neighbour = np.asarray(mesh.neighbour, dtype=np.int64)
+    centres, _ = cell_centres_and_volumes(sf, cf, owner, neighbour, mesh.n_cells)
+
+    heights = {}
+    for b in walls:
+        start = b.get("startFace") or 0
+        end = start + b["nFaces"]
+        sf_p = sf[start:end]
+        mag = np.linalg.norm(sf_p, axis=1)
+        y = np.abs(row_dot(sf_p, centres[owner[start:end]] - cf[start:end])) / np.maximum(mag, 1e-300)
+        heights[b["name"]] = {
+            "min": float(y.min()),
+            "max": float(y.max()),
+            "mean": float((y * mag).sum() / mag.sum()) if mag.sum() > 0 else float(y.mean()),
+        }
+    return heights
+
+
+def load_wall_distances(case_dir, json_manager=None, rebuild=False):
+    """
+    Alturas de primera celda de las paredes, recalculadas sólo si la malla
+    ha cambiado (misma huella que el índice de malla).
+    """
+    jm = json_manager or JSONManager()
+    index = load_mesh_index(case_dir, jm)
+    key = os.path.abspath(case_dir)
+    hashes = {name: f.get("hash") for name, f in index["fingerprint"].items()}
+
+    stored = None if rebuild else jm.load_section(WALL_DISTANCE_SECTION)
+    if (stored and stored.get("version") == WALL_DISTANCE_VERSION
+            and stored.get("caseDir") == key and stored.get("fingerprint") == hashes):
+        return stored["patches"]
+
+    logging.info(f"[wall_yplus] Calculando alturas de primera celda para {key}")
+    patches = wall_first_cell_heights(case_dir)
+    jm.save_section(WALL_DISTANCE_SECTION, {
+        "version": WALL_DISTANCE_VERSION,
+        "caseDir": key,
+        "fingerprint": hashes,
+        "patches": patches,
+    })
+    return patches
+
+
+def fluid_viscosity(case_config):
+    """Viscosidad dinámica (Pa·s) del primer material fluido."""
+    for mat in case_config.get("materials", []):
+        if mat.get("type", "fluid") != "fluid":
+            continue
+        value = mat.get("properties", {}).get("viscosityValue")
+        if value:
+            return float(value)
+    return DEFAULT_VISCOSITY
+
+
+def reference_velocity(case_config, index=None):
+    """
+    Mayor velocidad media de entrada entre los inlets del caso (m/s), usando
+    las áreas del índice de malla para convertir caudales. None si no hay
+    inlets con datos suficientes.
+    """
+    areas = {name: p.get("area") for name, p in patch_lookup(index or {}).items()}
+    velocities = []
+    for name, bc in case_config.get("boundaryConditions", {}).items():
+        if str(bc.get("type", "")).lower() != "inlet":
+            continue
+        spec = bc.get("flowSpec", "volumetricFlowRate")
+        value = bc.get("velocityValue")
+        if value is None or spec not in FLOW_SPECS:
+            continue
+        if spec == "velocity":
+            velocities.append(abs(float(value)))
+            continue
+        rho, _ = inlet_density(bc, case_config)
+        try:
+            velocities.append(abs(convert_flow(value, spec, areas.get(name), rho)["velocity"]))
+        except ValueError:
+            continue
+    return max(velocities) if velocities else None
+
+
+def reference_length(index):
+    """Mayor dimensión de la bounding box de la malla (m), o None."""
+    bbox = (index or {}).get("boundingBox")
+    if not bbox:
+        return None
+    return max(hi - lo for lo, hi in zip(bbox["min"], bbox["max"])) or None
+
+
+def friction_velocity(velocity, length, rho, mu):
+    """u_tau con la correlación de placa plana turbulenta."""
+    re = rho * velocity * length / mu
+    if re <= 0.0:
+        return 0.0
+    cf = 0.026 * re ** (-1.0 / 7.0)
+    return math.sqrt(0.5 * cf) * velocity
+
+
+def estimate_yplus(heights, velocity, length, rho, mu):
+    """
+    y+ mínimo, medio y máximo de un patch a partir de sus alturas de primera
+    celda ({"min", "mean", "max"}).
+    """
+    u_tau = friction_velocity(velocity, length, rho, mu)
+    factor = rho * u_tau / mu
+    return {k: heights[k] * factor for k in ("min", "mean", "max")}
+
+
+def suggest_wall_treatment(yplus, turbulence_model):
+    """
+    Tratamiento de pared recomendado para el rango de y+ y el modelo de
+    turbulencia ('kepsilon' o 'komega').
+
+    Retorna
+    -------
+    dict
+        Claves de la condición de pared (useWallFunctions, kType,
+        epsilonType/omegaType, nutType) más 'regime' y 'message'.
+    """
+    model = (turbulence_model or "laminar").lower()
+    y_mean = yplus["mean"]
+    suggestion = {"kType": "kqRWallFunction", "nutType": "nutkWallFunction", "useWallFunctions": True}
+
+    if y_mean < YPLUS_VISCOUS:
+        suggestion["regime"] = "viscous"
+        if model == "komega":
+            # omegaWallFunction conmuta a la solución de subcapa viscosa con y+ bajo
+            suggestion.update({"kType": "fixedValue", "omegaType": "omegaWallFunction",
+                               "nutType": "nutLowReWallFunction"})
+            message = "Capa límite resuelta: k = 0 en la pared, ω con omegaWallFunction y nutLowReWallFunction."
+        else:
+            suggestion["epsilonType"] = "epsilonWallFunction"
+            message = ("y+ < 5 con k-ε: las funciones de pared no son válidas en la subcapa viscosa; "
+                       "use k-ω o engrose la primera celda (y+ 30-300).")
+    elif y_mean < YPLUS_LOG_MIN:
+        suggestion["regime"] = "buffer"
+        if model == "komega":
+            suggestion["omegaType"] = "omegaWallFunction"
+        else:
+            suggestion["epsilonType"] = "epsilonWallFunction"
+        message = "y+ en la zona de transición (5-30): evítela si es posible; se usan funciones de pared."
+    else:
+        suggestion["regime"] = "log" if y_mean <= YPLUS_LOG_MAX else "coarse"
+        if model == "komega":
+            suggestion["omegaType"] = "omegaWallFunction"
+        else:
+            suggestion["epsilonType"] = "epsilonWallFunction"
+        message = ("Región logarítmica: funciones de pared estándar." if y_mean <= YPLUS_LOG_MAX else
+                   "y+ > 300: la primera celda es demasiado gruesa incluso para funciones de pared.")
+    suggestion["message"] = message
+    return suggestion
+
+
+def wall_yplus_report(patch_name, case_config, working_directory, json_manager=None):
+    """
+    Resume alturas, y+ estimado y tratamiento sugerido para un patch de pared.
+
+    Retorna
+    -------
+    dict o None
+        None si no hay malla o el patch no es una pared. 'yPlus' y
+        'suggestion' son None si no se puede estimar la velocidad de entrada.
+    """
+    jm = json_manager or JSONManager()
+    heights = load_wall_distances(working_directory, jm).get(patch_name)
+    if not heights:
+        return None
+    index = load_mesh_index(working_directory, jm)
+
+    velocity = reference_velocity(case_config, index)
+    length = reference_length(index)
+    mu = fluid_viscosity(case_config)
+    report = {"heights": heights, "velocity": velocity, "length": length,
+              "viscosity": mu, "density": None, "yPlus": None, "suggestion": None}
+    if not velocity or not length:
+        return report
+
+    inlets = [bc for bc in case_config.get("boundaryConditions", {}).values()
+              if str(bc.get("type", "")).lower() == "inlet"]
+    rho, _ = inlet_density(inlets[0] if inlets else {}, case_config)
+    turbulence = case_config.get("turbulenceModel", "laminar")
+    if isinstance(turbulence, dict):
+        turbulence = turbulence.get("model", "laminar")
+
+    report["density"] = rho
+    report["yPlus"] = estimate_yplus(heights, velocity, length, rho, mu)
+    report["suggestion"] = suggest_wall_treatment(report["yPlus"], turbulence)
+    return report
@@ -0,0 +1,162 @@
+# core/workspace.py
+
+"""
+Espacio de trabajo con varios proyectos.
+
+Cada proyecto es un directorio con la misma estructura que la raíz del
+repositorio:
+    <proyecto>/config.json   directorio del caso OpenFOAM, solver, ...
+    <proyecto>/temp/         secciones del proyecto y archivos generados (DP0)
+
+El proyecto activo (activate) determina dónde leen y escriben JSONManager,
+ProjectState, el auto-guardado y los generadores; sin activar ninguno se usa
+el directorio actual, como hasta ahora.
+
+Los proyectos recientes se guardan en un índice único
+(~/.openfoam_gui/recent_projects.json, o $OFGUI_WORKSPACE) con un resumen de
+cada uno (tamaño de malla, solver, estado de la última ejecución), de modo
+que la pantalla de inicio se muestra leyendo un solo archivo pequeño, sin
+abrir ningún proyecto.
+"""
+
+import os
+import json
+import time
+import logging
+
+from core.atomic_io import atomic_write_json, project_lock
+from core.json_manager import set_default_data_dir
+from core.config import DEFAULT_SOLVER, DEFAULT_SIMULATION_TYPE, DEFAULT_CALCULATION_TYPE
+
+WORKSPACE_DIR = os.environ.get("OFGUI_WORKSPACE") or os.path.join(os.path.expanduser("~"), ".openfoam_gui")
+INDEX_FILE = "recent_projects.json"
+INDEX_VERSION = 1
+MAX_RECENT = 20
+
+PROJECT_CONFIG = "config.json"
+PROJECT_DATA_DIR = "temp"
+
+_active_dir = None
+
+
+# ----------------------------------------------------------------------
+# Proyecto activo
+# ----------------------------------------------------------------------
+def project_dir():
+    """Directorio del proyecto activo (por defecto, el directorio actual)."""
+    return _active_dir or os.getcwd()
+
+
+def config_path(root=None):
+    return os.path.join(root or project_dir(), PROJECT_CONFIG)
+
+
+def data_dir(root=None):
+    return os.path.join(root or project_dir(), PROJECT_DATA_DIR)
+
+
+def read_config(root=None):
+    """config.json del proyecto, o {} si no existe o no se puede leer."""
+    try:
+        with open(config_path(root), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def create_project(root, working_directory="", **settings):
+    """
+    Prepara 'root' como proyecto. Un config.json existente no se toca
+    (sólo se crea con los valores por defecto si falta). Devuelve la ruta
+    absoluta del proyecto.
+    """
+    root = os.path.abspath(root)
+    os.makedirs(data_dir(root), exist_ok=True)
+    if not os.path.exists(config_path(root)):
+        config = {
+            "working_directory": working_directory,
+            "solver": DEFAULT_SOLVER,
+            "simulation_type": DEFAULT_SIMULATION_TYPE,
+            "calculation_type": DEFAULT_CALCULATION_TYPE,
+        }
+        config.update(settings)
+        atomic_write_json(config_path(root), config, indent=4)
+        logging.info(f"Proyecto creado en {root}")
+    return root
+
+
+def activate(root):
+    """
+    Hace de 'root' el proyecto activo y lo sube al principio de los
+    recientes. El estado en memoria de los proyectos ya abiertos
+    (project_state) se conserva, así que volver a uno no relee el disco.
+    """
+    global _active_dir
+    root = create_project(root)
+    _active_dir = root
+    set_default_data_dir(data_dir(root))
+    touch(root)
+    logging.info(f"Proyecto activo: {root}")
+    return root
+
+
+# ----------------------------------------------------------------------
+# Índice de proyectos recientes
+# ----------------------------------------------------------------------
+def index_path():
+    return os.path.join(WORKSPACE_DIR, INDEX_FILE)
+
+
+def recent_projects():
+    """[{"path", "name", "last_opened", "summary"}] del más reciente al más antiguo."""
+    try:
+        with open(index_path(), "r") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return []
+    projects = index.get("projects", []) if index.get("version") == INDEX_VERSION else []
+    return sorted(projects, key=lambda p: p.get("last_opened", 0), reverse=True)
+
+
+def _update_index(root, update):
+    """Lee-modifica-escribe la entrada de 'root' en el índice, bajo bloqueo."""
+    root = os.path.abspath(root)
+    os.makedirs(WORKSPACE_DIR, exist_ok=True)
+    with project_lock(WORKSPACE_DIR):
+        projects = recent_projects()
+        entry = next((p for p in projects if p["path"] == root), None)
+        if entry is None:
+            entry = {"path": root, "name": os.path.basename(root) or root, "last_opened": 0, "summary": {}}
+            projects.insert(0, entry)
+        update(entry)
+        projects.sort(key=lambda p: p.get("last_opened", 0), reverse=True)
+        atomic_write_json(index_path(), {"version": INDEX_VERSION, "projects": projects[:MAX_RECENT]}, indent=2)
+    return entry
+
+
+def touch(root):
+    """Marca el proyecto como abierto ahora."""
+    try:
+        return _update_index(root, lambda entry: entry.update(last_opened=time.time()))
+    except OSError as e:
+        logging.warning(f"No se pudo actualizar el índice de proyectos: {e}")
+
+
+def update_summary(root=None, **fields):
+    """
+    Actualiza el resumen guardado del proyecto (p.ej. solver="simpleFoam",
+    mesh={"nCells": ...}, last_run={"status": ..., "time": ...}).
+    """
+    try:
+        return _update_index(root or project_dir(), lambda entry: entry.setdefault("summary", {}).update(fields))
+    except OSError as e:
+        logging.warning(f"No se pudo actualizar el resumen del proyecto: {e}")
+
+
+def forget(root):
+    """Quita el proyecto de los recientes (no borra nada del disco)."""
+    root = os.path.abspath(root)
+    os.makedirs(WORKSPACE_DIR, exist_ok=True)
+    with project_lock(WORKSPACE_DIR):
+        projects = [p for p in recent_projects() if p["path"] != root]
+        atomic_write_json(index_path(), {"version": INDEX_VERSION, "projects": projects}, indent=2)
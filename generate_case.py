@@ -0,0 +1,149 @@
+# generate_case.py
+
+"""
+Generación del caso sin interfaz gráfica (nodos de login de un clúster, CI).
+
+Ejecuta el mismo plan que "Inicializar Caso" (ui/conf/initialization.py):
+carga el proyecto, valida boundary_conditions, genera la carpeta 0,
+constant, la fase discreta y la química en temp/DP0 y prepara chemkin. No
+importa Qt.
+
+Uso (desde la raíz del repositorio):
+    python -m generate_case [proyecto] [--dry-run] [--force] [--json]
+                            [--workers N] [--executor auto|process|thread|serial]
+
+Con --json la salida estándar es una línea JSON por evento (el log va a
+stderr):
+    {"event": "phase", "phase": "load" | "validate" | "render" | "write"}
+    {"event": "invalid", "errors": [...]}
+    {"event": "file", "name": "T", "path": "...", "status": "written", "error": ""}
+    {"event": "diff", "diff": "..."}                      (sólo con --dry-run)
+    {"event": "done", "ok": true, "exit_code": 0, "summary": "...", "counts": {...}}
+
+Códigos de salida:
+    0  caso generado (o vista previa sin errores)
+    1  algún archivo no se pudo generar
+    2  argumentos incorrectos
+    3  proyecto no encontrado o caso no válido
+"""
+
+import os
+import sys
+import json
+import logging
+import argparse
+import contextlib
+from collections import Counter
+
+from core import workspace
+from core.case_context import CaseContext
+from core.generation import EXECUTORS
+from ui.conf.initialization import initialization_errors, render_initialization, update_chemkin_dir
+
+EXIT_OK = 0
+EXIT_GENERATION_ERROR = 1
+EXIT_USAGE = 2
+EXIT_INVALID_CASE = 3
+
+
+class Progress:
+    """Eventos de progreso: líneas JSON (--json) o texto legible."""
+
+    def __init__(self, stream, as_json):
+        self.stream = stream
+        self.as_json = as_json
+
+    def emit(self, event, text=None, **fields):
+        if self.as_json:
+            line = json.dumps({"event": event, **fields}, ensure_ascii=False, default=str)
+        elif text is None:
+            return
+        else:
+            line = text
+        self.stream.write(line + "\n")
+        self.stream.flush()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m generate_case",
+        description="Genera los archivos del caso OpenFOAM de un proyecto sin interfaz gráfica.",
+    )
+    parser.add_argument("project", nargs="?", default=os.getcwd(),
+                        help="directorio del proyecto (por defecto, el actual)")
+    parser.add_argument("--data-dir", help="carpeta de datos del proyecto (por defecto <proyecto>/temp)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="no escribe nada: muestra el diff unificado frente al caso del disco")
+    parser.add_argument("--force", action="store_true", help="regenera todos los archivos")
+    parser.add_argument("--workers", type=int, default=None, help="procesos de renderizado")
+    parser.add_argument("--executor", choices=EXECUTORS, default="auto")
+    parser.add_argument("--json", action="store_true", help="progreso y errores como líneas JSON")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log detallado en stderr")
+    return parser.parse_args(argv)
+
+
+def run(args, progress):
+    """Ejecuta la generación y devuelve el código de salida."""
+    project_dir = os.path.abspath(args.project)
+    data_dir = os.path.abspath(args.data_dir or workspace.data_dir(project_dir))
+    if not os.path.isdir(data_dir):
+        message = f"No se encontró la carpeta de datos del proyecto: {data_dir}"
+        progress.emit("invalid", f"Error: {message}", errors=[message])
+        progress.emit("done", ok=False, exit_code=EXIT_INVALID_CASE)
+        return EXIT_INVALID_CASE
+
+    progress.emit("phase", f"Cargando el proyecto {project_dir}", phase="load")
+    ctx = CaseContext.load(project_dir, data_dir=data_dir)
+
+    progress.emit("phase", "Validando boundary_conditions", phase="validate")
+    errors = initialization_errors(ctx)
+    if errors:
+        progress.emit("invalid", "El caso no es válido:\n" + "\n".join(f"  {e}" for e in errors), errors=errors)
+        progress.emit("done", ok=False, exit_code=EXIT_INVALID_CASE)
+        return EXIT_INVALID_CASE
+
+    progress.emit("phase", "Generando archivos", phase="render")
+    tree = render_initialization(ctx, args.workers, args.executor, args.force)
+    if args.dry_run:
+        report = tree.report()
+        diff = tree.diff()
+        progress.emit("diff", diff.rstrip("\n") or None, diff=diff)
+    else:
+        progress.emit("phase", "Escribiendo archivos", phase="write")
+        report = tree.commit()
+        update_chemkin_dir(ctx)
+
+    for result in report.results:
+        text = f"  {result.name}: {result.status}" + (f" ({result.error})" if result.error else "")
+        progress.emit("file", text, name=result.name, path=result.path, status=result.status, error=result.error)
+
+    exit_code = EXIT_OK if report.ok else EXIT_GENERATION_ERROR
+    summary = ("Vista previa: " if args.dry_run else "") + report.summary()
+    progress.emit("done", summary, ok=report.ok, exit_code=exit_code, dry_run=args.dry_run,
+                  summary=summary, counts=dict(Counter(r.status for r in report.results)))
+    return exit_code
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(asctime)s %(levelname)s: %(message)s",
+        stream=sys.stderr,
+    )
+    progress = Progress(sys.stdout, args.json)
+    # Los mensajes que los módulos escriben con print() van a stderr para no
+    # mezclarse con la salida de progreso
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            return run(args, progress)
+        except Exception as e:
+            logging.debug("Error en la generación del caso", exc_info=True)
+            message = f"{type(e).__name__}: {e}"
+            progress.emit("error", f"Error: {message}", error=message)
+            progress.emit("done", ok=False, exit_code=EXIT_GENERATION_ERROR)
+            return EXIT_GENERATION_ERROR
+
+
+if __name__ == "__main__":
+    sys.exit(main())
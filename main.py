@@ -1,12 +1,13 @@
 #!/usr/bin/env pvpython
 
 import sys
-import json
 import os
 import logging
-from PyQt5.QtWidgets import QApplication
+from PyQt5.QtWidgets import QApplication, QDialog
 from ui.main_window import MainWindow
-from core.config import DEFAULT_SOLVER, DEFAULT_SIMULATION_TYPE, DEFAULT_CALCULATION_TYPE
+from ui.dialogs.project_selector import ProjectSelectorDialog
+from core import workspace
+from core.bundle import open_bundle, bundle_project_dir, BUNDLE_EXT
 
 
 def main():
@@ -18,31 +19,42 @@ def main():
 
     app = QApplication(sys.argv)
 
-    # Ruta temporal del caso de prueba (reemplazar con diálogo de "Abrir proyecto" más adelante)
-    test_case_dir = r"/home/miguel/01_GUI_openFoam/01_Test"
+    # Proyecto: directorio pasado como argumento o elegido en la pantalla de
+    # inicio (proyectos recientes). Su config.json sólo se crea si falta.
+    args = sys.argv[1:]
+    bundle_args = [arg for arg in args if arg.endswith(BUNDLE_EXT)]
+    dir_args = [arg for arg in args if os.path.isdir(arg)]
+    if dir_args:
+        project_dir = dir_args[0]
+    elif bundle_args:
+        # Un bundle sin directorio explícito se abre en un proyecto nuevo junto
+        # a él (proyecto.ofgui -> proyecto/), nunca sobre el directorio actual
+        project_dir = bundle_project_dir(bundle_args[0])
+    else:
+        dialog = ProjectSelectorDialog()
+        if dialog.exec_() != QDialog.Accepted:
+            sys.exit(0)
+        project_dir = dialog.project_dir
 
-    # Crear configuración inicial
-    config = {
-        "working_directory": test_case_dir,
-        "solver": DEFAULT_SOLVER,
-        "simulation_type": DEFAULT_SIMULATION_TYPE,
-        "calculation_type": DEFAULT_CALCULATION_TYPE
-    }
-
-    # Ruta al archivo config.json
-    config_file_path = os.path.join(os.getcwd(), "config.json")
-
-    # Guardar configuración en JSON
     try:
-        with open(config_file_path, 'w') as config_file:
-            json.dump(config, config_file, indent=4)
-        logging.info(f"Configuración guardada en {config_file_path}")
+        workspace.activate(project_dir)
     except Exception as e:
-        logging.error(f"Error al guardar la configuración: {e}")
+        logging.error(f"Error al abrir el proyecto {project_dir}: {e}")
         sys.exit(1)
 
+    # Proyecto .ofgui pasado como argumento: restaura su config.json (salvo
+    # working_directory) y las páginas leen del bundle sólo las secciones
+    # que necesitan
+    if bundle_args:
+        try:
+            open_bundle(bundle_args[0])
+        except Exception as e:
+            logging.error(f"Error al abrir el proyecto {bundle_args[0]}: {e}")
+            sys.exit(1)
+
     # Instanciar y mostrar ventana principal
     window = MainWindow()
+    app.main_window = window
     window.show()
     sys.exit(app.exec_())
 
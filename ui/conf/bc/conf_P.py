@@ -1,54 +1,25 @@
 # ui/conf/bc/conf_p.py
 
 import os
-import json
 import logging
 
-def generate_p_file(temp_dir, p_file_path):
+def render_p(ctx):
     """
-    Genera el archivo 'p' tomando datos desde boundary_conditions.json (en 'temp_dir')
-    y lo escribe en 'p_file_path'.
+    Contenido del archivo 'p' a partir de las condiciones de contorno del
+    contexto del caso (ctx, ver core/case_context.py).
 
     Pasos principales:
-      1) Verifica parámetros (temp_dir y p_file_path).
-      2) Ubica y lee boundary_conditions.json en temp_dir.
-      3) Obtiene ambientPressure (o usa 100000 por defecto).
-      4) Escribe el archivo 'p' con internalField uniform = ambientPressure
+      1) Obtiene ambientPressure (o usa 100000 por defecto).
+      2) Construye el archivo 'p' con internalField uniform = ambientPressure
          y un bloque boundaryField para cada frontera, con:
                type  calculated;
                value $internalField;
          (tal como en tu ejemplo).
     """
 
-    logging.debug("[generate_p_file] Iniciando generación del archivo 'p'.")
-
-    # 1) Verificar parámetros
-    if not isinstance(temp_dir, str):
-        logging.error("[generate_p_file] 'temp_dir' debe ser str. Abortando.")
-        return
-    if not isinstance(p_file_path, str):
-        logging.error("[generate_p_file] 'p_file_path' debe ser str. Abortando.")
-        return
-
-    # 2) Ubicar boundary_conditions.json
-    bc_json_path = os.path.join(temp_dir, "boundary_conditions.json")
-    bc_json_path = os.path.normpath(bc_json_path)
-
-    if not os.path.exists(bc_json_path):
-        logging.error(f"[generate_p_file] No se encontró {bc_json_path}. No se generará 'p'.")
-        return
-
-    # 3) Leer boundary_conditions.json
-    try:
-        with open(bc_json_path, "r", encoding="utf-8") as f:
-            bc_data = json.load(f)
-        logging.info(f"[generate_p_file] Cargado '{bc_json_path}' exitosamente.")
-    except Exception as e:
-        logging.error(f"[generate_p_file] Error al leer '{bc_json_path}': {e}")
-        return
-
-    # 4) Obtener ambientPressure y boundaryConditions
-    boundary_conditions = bc_data.get("boundaryConditions", {})
+    # 1) Obtener ambientPressure y boundaryConditions
+    bc_data = ctx.boundary_conditions
+    boundary_conditions = ctx.boundaries
     ambient_pressure = bc_data.get("ambientPressure", 100000.0)
     logging.debug(f"[generate_p_file] Presión Ambiente (Pa): {ambient_pressure}")
 
@@ -77,7 +48,7 @@ boundaryField
 {{
 """
 
-    # 5) Sección boundaryField para cada frontera
+    # 2) Sección boundaryField para cada frontera
     boundary_entries = []
     for bc_name in boundary_conditions.keys():
         # En tu ejemplo, sin importar si es inlet / outlet / wall / etc.,
@@ -91,7 +62,7 @@ boundaryField
 """
         boundary_entries.append(entry)
 
-    # 6) Pie del archivo
+    # 3) Pie del archivo
     footer = """}
 \n// ************************************************************************* //
 """
@@ -99,6 +70,15 @@ boundaryField
     # Unir todo el contenido
     p_content = header + "".join(boundary_entries) + footer
     logging.debug("[generate_p_file] Contenido construido para 'p':\n" + p_content)
+    return p_content
+
+
+def generate_p_file(ctx, p_file_path):
+    """
+    Escribe el archivo 'p' del contexto 'ctx' en 'p_file_path'.
+    """
+    logging.debug("[generate_p_file] Iniciando generación del archivo 'p'.")
+    p_content = render_p(ctx)
 
     # Asegurar directorio de salida
     try:
@@ -1,55 +1,59 @@
 # ui/conf/bc/conf_U.py
 
 import os
-import json
 import logging
 
-def generate_u_file(root_temp_dir, u_output_path):
+from core.inlet_flow import inlet_density, is_ideal_gas
+
+
+def flow_rate_entries(ctx, name, bc, velocity_value):
+    """
+    Líneas de caudal de un inlet flowRateInletVelocity según 'flowSpec':
+
+      - volumetricFlowRate: se escribe tal cual.
+      - massFlowRate: massFlowRate + rhoInlet si el caso es compresible (gas
+        perfecto); si no, se convierte a caudal volumétrico con la densidad
+        del material.
+      - velocity: caudal volumétrico = U * área real del patch (índice de malla).
+    """
+    case_config = ctx.case_config
+    flow_spec = bc.get("flowSpec", "volumetricFlowRate")
+    value = float(velocity_value)
+
+    if flow_spec == "massFlowRate":
+        rho, rho_source = inlet_density(bc, case_config)
+        logging.info(f"[generate_u_file] Inlet '{name}': rho = {rho:.6g} kg/m3 ({rho_source})")
+        if is_ideal_gas(case_config):
+            return (f"        massFlowRate      {value};\n"
+                    f"        rhoInlet      {rho:.6g};\n")
+        return f"        volumetricFlowRate      {value / rho:.6g};\n"
+
+    if flow_spec == "velocity":
+        area = ctx.patch_area(name)
+        if area:
+            logging.info(f"[generate_u_file] Inlet '{name}': área = {area:.6g} m2")
+            return f"        volumetricFlowRate      {value * area:.6g};\n"
+        raise ValueError(f"Inlet '{name}': sin área de patch en el índice de malla; "
+                         f"no se puede convertir la velocidad {value} m/s a caudal.")
+
+    return f"        volumetricFlowRate      {value};\n"
+
+def render_u(ctx):
     """
-    Genera el archivo 'U' leyendo la información de boundary_conditions.json en 'root_temp_dir'
-    (por ejemplo: "temp") y escribiéndolo en 'u_output_path' (por ejemplo: "temp/DP0/0/U").
+    Contenido del archivo 'U' a partir de las condiciones de contorno del
+    contexto del caso (ctx.boundaries, ver core/case_context.py).
 
     Lógica existente (sin remover funcionalidades):
-      - Se analizan las fronteras definidas en boundary_conditions.json
+      - Se analizan las fronteras definidas en boundary_conditions
       - Se generan secciones 'inlet', 'outlet', 'wall' según sus variables
         (velocityType, velocityValue, velocityInit, kType, etc.)
       - Para btype desconocido => se asigna 'fixedValue' y (0,0,0).
     """
 
-    logging.debug("[generate_u_file] Iniciando generación del archivo 'U'.")
-
-    # 1) Verificar parámetros
-    if not isinstance(root_temp_dir, str):
-        logging.error(f"[generate_u_file] 'root_temp_dir' debe ser str, recibido {type(root_temp_dir)}. Abortando.")
-        return
-    if not isinstance(u_output_path, str):
-        logging.error(f"[generate_u_file] 'u_output_path' debe ser str, recibido {type(u_output_path)}. Abortando.")
-        return
-
-    # 2) Ruta del boundary_conditions.json
-    bc_json_path = os.path.join(root_temp_dir, "boundary_conditions.json")
-    bc_json_path = os.path.normpath(bc_json_path)
-
-    if not os.path.exists(bc_json_path):
-        logging.error(f"[generate_u_file] No se encontró '{bc_json_path}'. No se generará 'U'.")
-        return
+    # 1) Sección boundaryConditions
+    bc_dict = ctx.boundaries
 
-    # 3) Leer el JSON
-    try:
-        with open(bc_json_path, "r", encoding='utf-8') as f:
-            bc_data = json.load(f)
-        logging.info(f"[generate_u_file] Cargado '{bc_json_path}' exitosamente.")
-    except Exception as e:
-        logging.error(f"[generate_u_file] Error al leer '{bc_json_path}': {e}")
-        return
-
-    # 4) Extraer la sección boundaryConditions
-    bc_dict = bc_data.get("boundaryConditions", {})
-    if not isinstance(bc_dict, dict):
-        logging.error("[generate_u_file] 'boundaryConditions' no es un dict. Abortando 'U'.")
-        return
-
-    # 5) Construir el encabezado del archivo 'U'
+    # 2) Construir el encabezado del archivo 'U'
     header = """/*--------------------------------*- C++ -*----------------------------------*\\
 | =========                 |                                                 |
 | \\      /  F ield         | OpenFOAM: The Open Source CFD Toolbox           |
@@ -76,7 +80,7 @@ boundaryField
 
     boundary_entries = []
 
-    # 6) Recorrer fronteras para generar secciones
+    # 3) Recorrer fronteras para generar secciones
     for name, bc in bc_dict.items():
         btype = bc.get("type", "").lower()
         logging.debug(f"[generate_u_file] Procesando frontera '{name}' de tipo '{btype}'")
@@ -94,8 +98,8 @@ boundaryField
             entry += f"        type {velocity_type};\n"
 
             if velocity_type == "flowRateInletVelocity":
-                # volumetricFlowRate => velocityValue
-                entry += f"        volumetricFlowRate      {velocity_value};\n"
+                # velocityValue => caudal según flowSpec (ver flow_rate_entries)
+                entry += flow_rate_entries(ctx, name, bc, velocity_value)
                 entry += f"        value uniform ({velocity_init} {velocity_init} {velocity_init});\n"
             elif velocity_type == "fixedValue":
                 entry += f"        value uniform ({velocity_init} {velocity_init} {velocity_init});\n"
@@ -133,17 +137,27 @@ boundaryField
         entry += f"    }}\n\n"
         boundary_entries.append(entry)
 
-    # 7) Pie del archivo
+    # 4) Pie del archivo
     footer = """} // Fin de boundaryField
 
 // ************************************************************************* //
 """
 
-    # 8) Combinar contenido final
+    # 5) Combinar contenido final
     u_content = header + "".join(boundary_entries) + footer
     logging.debug(f"[generate_u_file] Contenido final 'U':\n{u_content}")
+    return u_content
+
+
+def generate_u_file(ctx, u_output_path):
+    """
+    Escribe el archivo 'U' del contexto 'ctx' en 'u_output_path'
+    (por ejemplo: "temp/DP0/0/U").
+    """
+    logging.debug("[generate_u_file] Iniciando generación del archivo 'U'.")
+    u_content = render_u(ctx)
 
-    # 9) Asegurar carpeta de salida
+    # 1) Asegurar carpeta de salida
     out_dir = os.path.dirname(u_output_path)
     try:
         os.makedirs(out_dir, exist_ok=True)
@@ -151,7 +165,7 @@ boundaryField
         logging.error(f"[generate_u_file] No se pudo crear carpeta de salida '{out_dir}': {e}")
         return
 
-    # 10) Escribir en disco
+    # 2) Escribir en disco
     try:
         with open(u_output_path, "w", encoding='utf-8') as u_file:
             u_file.write(u_content)
@@ -3,18 +3,15 @@
 import os
 import logging
 
-def generate_ydefault_file(boundary_conditions, target_dir):
+def render_ydefault(ctx):
     """
-    Genera el archivo 'Ydefault' en 'target_dir', iterando sobre las fronteras definidas
-    en boundary_conditions. El valor y type se establecen en 0 y uno de:
+    Contenido del archivo 'Ydefault', iterando sobre las fronteras definidas
+    en las condiciones de contorno del contexto. El valor y type se establecen en 0 y uno de:
       - zeroGradient (para 'wall' o contornos desconocidos)
       - fixedValue (para 'inlet')
       - inletOutlet (para 'outlet')
     """
-    logging.info("Iniciando generación del archivo 'Ydefault'.")
-
-    ydefault_file_path = os.path.join(target_dir, "Ydefault")
-    os.makedirs(target_dir, exist_ok=True)
+    boundary_conditions = ctx.boundaries
 
     # Construir el texto de boundaryField según las fronteras
     boundary_entries = ""
@@ -83,6 +80,18 @@ boundaryField
 
 // ************************************************************************* //
 """
+    return ydefault_content
+
+
+def generate_ydefault_file(ctx, target_dir):
+    """
+    Genera el archivo 'Ydefault' del contexto 'ctx' en 'target_dir'.
+    """
+    logging.info("Iniciando generación del archivo 'Ydefault'.")
+
+    ydefault_file_path = os.path.join(target_dir, "Ydefault")
+    os.makedirs(target_dir, exist_ok=True)
+    ydefault_content = render_ydefault(ctx)
 
     # Escribir el archivo
     try:
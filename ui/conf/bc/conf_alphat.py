@@ -3,17 +3,17 @@
 import os
 import logging
 
-def generate_alphat_file(boundary_conditions, alpha_file_path, calculationType):
+def render_alphat(ctx):
     """
-    Genera el archivo 'alphat' basado en las condiciones de contorno y la configuración del solver.
+    Contenido del archivo 'alphat' basado en las condiciones de contorno y la configuración del solver.
 
     Args:
-        boundary_conditions (dict): Diccionario de condiciones de contorno.
-        alpha_file_path (str): Ruta completa al archivo 'alphat' a generar.
-        calculationType (str): Tipo de cálculo ('Compresible' o 'Incompresible').
+        ctx (CaseContext): Contexto del caso; el tipo de cálculo ('Compresible' o
+            'Incompresible') es ctx.calculation_type.
     """
+    boundary_conditions = ctx.boundaries
     # Determinar si el cálculo es compresible
-    compressible = calculationType.lower() == 'compresible'
+    compressible = ctx.calculation_type.lower() == 'compresible'
 
     # Inicializar el contenido del archivo 'alphat'
     alphat_content = """/*--------------------------------*- C++ -*----------------------------------*\\
@@ -77,6 +77,18 @@ boundaryField
 
     # Cerrar el bloque boundaryField
     alphat_content += "}\n\n// ************************************************************************* //\n"
+    return alphat_content
+
+
+def generate_alphat_file(ctx, alpha_file_path):
+    """
+    Genera el archivo 'alphat' del contexto 'ctx'.
+
+    Args:
+        ctx (CaseContext): Contexto del caso.
+        alpha_file_path (str): Ruta completa al archivo 'alphat' a generar.
+    """
+    alphat_content = render_alphat(ctx)
 
     # Asegurar que el directorio existe
     os.makedirs(os.path.dirname(alpha_file_path), exist_ok=True)
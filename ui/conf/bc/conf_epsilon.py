@@ -1,58 +1,28 @@
 # ui/conf/bc/conf_epsilon.py
 
 import os
-import json
 import logging
 
-def generate_epsilon_file(root_temp_dir, epsilon_output_path):
+def render_epsilon(ctx):
     """
-    Genera el archivo 'epsilon' leyendo boundary_conditions.json desde `root_temp_dir`
-    y escribiéndolo en `epsilon_output_path`.
+    Contenido del archivo 'epsilon' a partir de las condiciones de contorno
+    del contexto del caso (ctx, ver core/case_context.py).
 
     Pasos:
-      1) root_temp_dir (str): Carpeta donde se ubica boundary_conditions.json (p.ej. "temp").
-      2) Se localiza el JSON y se extrae "boundaryConditions".
-      3) Se determina un valor de internalField (epsilonInternalValue), por defecto 200.0 si no está definido.
-      4) Para cada frontera con 'epsilonType' no vacío, se genera la sección respectiva:
+      1) Se toma "boundaryConditions" del contexto.
+      2) Se determina un valor de internalField (epsilonInternalValue), por defecto 200.0 si no está definido.
+      3) Para cada frontera con 'epsilonType' no vacío, se genera la sección respectiva:
          - inlet  => type=epsilonType, intensity=epsilonIntensity, value=epsilonValue
          - outlet => type=inletOutlet, inletValue=..., value=...
          - wall   => epsilonWallFunction, value=...
          - resto  => fallback genérico
-      5) Se escribe el archivo 'epsilon' en `epsilon_output_path`.
     """
 
-    logging.debug("[generate_epsilon_file] Iniciando generación de 'epsilon'.")
+    # 1) Extraer boundaryConditions
+    bc_data = ctx.boundary_conditions
+    boundary_dict = ctx.boundaries
 
-    # 1) Validar parámetros
-    if not isinstance(root_temp_dir, str):
-        logging.error(f"[generate_epsilon_file] 'root_temp_dir' debe ser str, recibido {type(root_temp_dir)}. Abortando.")
-        return
-    if not isinstance(epsilon_output_path, str):
-        logging.error(f"[generate_epsilon_file] 'epsilon_output_path' debe ser str, recibido {type(epsilon_output_path)}. Abortando.")
-        return
-
-    bc_json_path = os.path.join(root_temp_dir, "boundary_conditions.json")
-    bc_json_path = os.path.normpath(bc_json_path)
-    if not os.path.exists(bc_json_path):
-        logging.error(f"[generate_epsilon_file] No se encontró '{bc_json_path}'. Abortando 'epsilon'.")
-        return
-
-    # 2) Leer boundary_conditions.json
-    try:
-        with open(bc_json_path, "r", encoding="utf-8") as f:
-            bc_data = json.load(f)
-        logging.info(f"[generate_epsilon_file] Cargado '{bc_json_path}' exitosamente.")
-    except Exception as e:
-        logging.error(f"[generate_epsilon_file] Error al leer '{bc_json_path}': {e}")
-        return
-
-    # 3) Extraer boundaryConditions
-    boundary_dict = bc_data.get("boundaryConditions", {})
-    if not isinstance(boundary_dict, dict):
-        logging.error("[generate_epsilon_file] 'boundaryConditions' no es un dict. No se genera 'epsilon'.")
-        return
-
-    # 4) Determinar el internalField
+    # 2) Determinar el internalField
     epsilon_internal_value = bc_data.get("epsilonInternalValue", 200.0)
     logging.debug(f"[generate_epsilon_file] internalField = {epsilon_internal_value}")
 
@@ -83,7 +53,7 @@ boundaryField
 
     boundary_entries = []
 
-    # 5) Para cada frontera
+    # 3) Para cada frontera
     for name, bc_info in boundary_dict.items():
         raw_epsilon_type = bc_info.get("epsilonType", None)
         if not (isinstance(raw_epsilon_type, str) and raw_epsilon_type.strip()):
@@ -119,15 +89,23 @@ boundaryField
         entry += "    }\n\n"
         boundary_entries.append(entry)
 
-    # 6) Footer
+    # 4) Footer
     footer = """}
 
 // ************************************************************************* //
 """
 
-    epsilon_content = header + "".join(boundary_entries) + footer
+    return header + "".join(boundary_entries) + footer
+
+
+def generate_epsilon_file(ctx, epsilon_output_path):
+    """
+    Escribe el archivo 'epsilon' del contexto 'ctx' en `epsilon_output_path`.
+    """
+    logging.debug("[generate_epsilon_file] Iniciando generación de 'epsilon'.")
+    epsilon_content = render_epsilon(ctx)
 
-    # 7) Asegurar carpeta de salida
+    # 1) Asegurar carpeta de salida
     out_dir = os.path.dirname(epsilon_output_path)
     try:
         os.makedirs(out_dir, exist_ok=True)
@@ -135,7 +113,7 @@ boundaryField
         logging.error(f"[generate_epsilon_file] No se pudo crear carpeta '{out_dir}': {e}")
         return
 
-    # 8) Escribir el archivo
+    # 2) Escribir el archivo
     try:
         with open(epsilon_output_path, "w", encoding="utf-8") as f:
             f.write(epsilon_content)
@@ -4,6 +4,11 @@ import os
 import logging
 from core.species_library import get_species_library
 
+# Archivos estándar y de turbulencia de la carpeta 0 que no son especies
+STANDARD_FIELD_FILES = frozenset({
+    "U", "T", "p", "p_rgh", "alphat", "nut", "k", "omega", "epsilon"
+})
+
 def parse_species_library(species_library_str):
     """
     Parsea la cadena de la biblioteca de especies para extraer los nombres de las especies.
@@ -24,24 +29,17 @@ def parse_species_library(species_library_str):
     return species
 
 
-def generate_species_files(boundary_conditions, chosen_species, target_dir):
+def active_species(ctx):
     """
-    Genera un archivo por cada especie activa (y válida en la librería) en 'target_dir'.
-    Cada archivo contiene la configuración de esa especie para todas las fronteras definidas
-    en boundary_conditions.json (según su 'type': wall, inlet, outlet, etc.).
-    
-    Además, elimina únicamente los archivos de especie que ya no estén activos,
-    sin tocar los archivos estándar de OpenFOAM (U, T, p, p_rgh, alphat, nut, k, omega, epsilon).
+    Especies activas (ctx.chosen_species) que están en la librería, en su orden.
+    Las que no están se descartan con un aviso.
 
     Args:
-        boundary_conditions (dict): Diccionario "boundaryConditions" proveniente de boundary_conditions.json.
-        chosen_species (list): Lista de especies activas definidas en el modelo/química.
-        target_dir (str): Directorio donde se guardarán/actualizarán los archivos de especies.
+        ctx (CaseContext): Contexto del caso.
+    Returns:
+        list: Nombres de las especies válidas.
     """
-    logging.basicConfig(level=logging.INFO, format='[%(asctime)s] [%(levelname)s] %(message)s')
-
-    # Asegurar la existencia del directorio de destino
-    os.makedirs(target_dir, exist_ok=True)
+    chosen_species = ctx.chosen_species
 
     # Obtener la biblioteca de especies y filtrar las activas que estén en la biblioteca
     species_library_str = get_species_library()
@@ -55,38 +53,52 @@ def generate_species_files(boundary_conditions, chosen_species, target_dir):
             f"Las siguientes especies no están en la biblioteca y no serán procesadas: "
             f"{', '.join(invalid_species)}"
         )
+    return valid_species
+
 
-    # Para cada especie válida, se genera un archivo con las fronteras definidas
-    for species in valid_species:
-        # Construir el texto del boundaryField iterando sobre cada frontera
-        boundary_entries_text = ""
-
-        for bc_name, bc_data in boundary_conditions.items():
-            btype = bc_data.get("type", "").lower()
-            # Por defecto: zeroGradient
-            species_boundary_type = "zeroGradient"
-            species_value_here = bc_data.get(f"{species}_chemValue", 0.0)  # Valor por defecto si no se encuentra
-
-            # Decidir el "type" y la "value"
-            if btype == "wall":
-                # walls => zeroGradient sin "value"
-                boundary_entries_text += f"""
+def render_species_file(ctx, species):
+    """
+    Contenido del archivo de la especie 'species'. El archivo contiene la
+    configuración de esa especie para todas las fronteras definidas en
+    boundary_conditions (según su 'type': wall, inlet, outlet, etc.).
+
+    Args:
+        ctx (CaseContext): Contexto del caso.
+        species (str): Nombre de la especie.
+    Returns:
+        str: Contenido del archivo.
+    """
+    boundary_conditions = ctx.boundaries
+
+    # Construir el texto del boundaryField iterando sobre cada frontera
+    boundary_entries_text = ""
+
+    for bc_name, bc_data in boundary_conditions.items():
+        btype = bc_data.get("type", "").lower()
+        # Por defecto: zeroGradient
+        species_boundary_type = "zeroGradient"
+        species_value_here = bc_data.get(f"{species}_chemValue", 0.0)  # Valor por defecto si no se encuentra
+
+        # Decidir el "type" y la "value"
+        if btype == "wall":
+            # walls => zeroGradient sin "value"
+            boundary_entries_text += f"""
     {bc_name}
     {{
         type            zeroGradient;
     }}
 """
-            elif btype == "inlet":
-                boundary_entries_text += f"""
+        elif btype == "inlet":
+            boundary_entries_text += f"""
     {bc_name}
     {{
         type            fixedValue;
         value           uniform {species_value_here};
     }}
 """
-            elif btype == "outlet":
-                # Se usará inletOutlet con valor = species_value_here
-                boundary_entries_text += f"""
+        elif btype == "outlet":
+            # Se usará inletOutlet con valor = species_value_here
+            boundary_entries_text += f"""
     {bc_name}
     {{
         type            inletOutlet;
@@ -94,18 +106,17 @@ def generate_species_files(boundary_conditions, chosen_species, target_dir):
         value           uniform {species_value_here};
     }}
 """
-            else:
-                # Cualquier otro => zeroGradient
-                boundary_entries_text += f"""
+        else:
+            # Cualquier otro => zeroGradient
+            boundary_entries_text += f"""
     {bc_name}
     {{
         type            zeroGradient;
     }}
 """
 
-        # Construir el contenido final del archivo de la especie
-        species_file_path = os.path.join(target_dir, species)
-        species_content = f"""/*--------------------------------*- C++ -*----------------------------------*\\
+    # Construir el contenido final del archivo de la especie
+    return f"""/*--------------------------------*- C++ -*----------------------------------*\\
 | =========                 |                                                 |
 | \\      /  F ield         | OpenFOAM: The Open Source CFD Toolbox           |
 |  \\    /   O peration     | Version:  v2406                                 |
@@ -131,7 +142,40 @@ boundaryField
 
 // ************************************************************************* //
 """
+
+
+def render_species_files(ctx):
+    """
+    Contenido del archivo de cada especie activa (y válida en la librería).
+
+    Args:
+        ctx (CaseContext): Contexto del caso; las especies activas son ctx.chosen_species.
+    Returns:
+        dict: {especie: contenido del archivo}, en el orden de chosen_species.
+    """
+    return {species: render_species_file(ctx, species) for species in active_species(ctx)}
+
+
+def generate_species_files(ctx, target_dir):
+    """
+    Genera un archivo por cada especie activa (y válida en la librería) en 'target_dir'.
+
+    Además, elimina únicamente los archivos de especie que ya no estén activos,
+    sin tocar los archivos estándar de OpenFOAM (U, T, p, p_rgh, alphat, nut, k, omega, epsilon).
+
+    Args:
+        ctx (CaseContext): Contexto del caso (ver core/case_context.py).
+        target_dir (str): Directorio donde se guardarán/actualizarán los archivos de especies.
+    """
+    logging.basicConfig(level=logging.INFO, format='[%(asctime)s] [%(levelname)s] %(message)s')
+
+    # Asegurar la existencia del directorio de destino
+    os.makedirs(target_dir, exist_ok=True)
+
+    contents = render_species_files(ctx)
+    for species, species_content in contents.items():
         # Escribir el archivo de especie
+        species_file_path = os.path.join(target_dir, species)
         try:
             with open(species_file_path, "w", encoding='utf-8') as f:
                 f.write(species_content)
@@ -140,20 +184,15 @@ boundaryField
             logging.error(f"Error al generar el archivo de especie '{species}': {e}")
             raise e
 
-    # Proteger archivos estándar y de turbulencia de OpenFOAM para no eliminarlos
-    standard_non_species_files = {
-        "U", "T", "p", "p_rgh", "alphat", "nut", "k", "omega", "epsilon"
-    }
-
     # Identificar los archivos del directorio
     existing_files = set(os.listdir(target_dir))
-    active_species_files = set(valid_species)
+    active_species_files = set(contents)
 
     # Los archivos de especie a eliminar son los que:
     # - Están en el directorio
     # - NO están en las especies activas
     # - NO son archivos estándar/turbulencia
-    species_files_to_delete = existing_files - active_species_files - standard_non_species_files
+    species_files_to_delete = existing_files - active_species_files - STANDARD_FIELD_FILES
 
     for species_file in species_files_to_delete:
         species_file_path = os.path.join(target_dir, species_file)
@@ -1,15 +1,14 @@
 # ui/conf/bc/conf_k.py
 
 import os
-import json
 import logging
 
-def generate_k_file(root_temp_dir, k_output_path):
+def render_k(ctx):
     """
-    Genera el archivo 'k' tomando datos desde `root_temp_dir`/boundary_conditions.json
-    y escribiéndolo en k_output_path (ej: .../temp/DP0/0/k).
+    Contenido del archivo 'k' a partir de las condiciones de contorno del
+    contexto del caso (ctx, ver core/case_context.py).
 
-    1. Abre boundary_conditions.json en `root_temp_dir`.
+    1. Toma "boundaryConditions" del contexto.
     2. Determina el internalField como la kIntensity de la primera frontera inlet (si existe),
        o un valor por defecto (3.75e-9).
     3. Para cada frontera:
@@ -19,39 +18,13 @@ def generate_k_file(root_temp_dir, k_output_path):
        - Otros =>   se ignoran
     """
 
-    logging.debug("[generate_k_file] Iniciando generación de 'k'...")
-
-    # 1) Verificar root_temp_dir existe
-    if not isinstance(root_temp_dir, str):
-        logging.error(f"[generate_k_file] 'root_temp_dir' debe ser str, no {type(root_temp_dir)}. Cancelado.")
-        return
-
-    bc_json_path = os.path.join(root_temp_dir, "boundary_conditions.json")
-    bc_json_path = os.path.normpath(bc_json_path)
-
-    if not os.path.exists(bc_json_path):
-        logging.error(f"[generate_k_file] No se encontró '{bc_json_path}'. No se genera 'k'.")
-        return
-
-    # 2) Leer boundary_conditions.json
-    try:
-        with open(bc_json_path, "r", encoding="utf-8") as f:
-            bc_data = json.load(f)
-        logging.info(f"[generate_k_file] Cargado '{bc_json_path}' exitosamente.")
-    except Exception as e:
-        logging.error(f"[generate_k_file] Error al leer '{bc_json_path}': {e}")
-        return
-
-    # 3) boundaryConditions
-    boundary_dict = bc_data.get("boundaryConditions", {})
-    if not isinstance(boundary_dict, dict):
-        logging.error("[generate_k_file] 'boundaryConditions' no es un dict. Abortando k.")
-        return
+    # 1) boundaryConditions
+    boundary_dict = ctx.boundaries
 
     default_if_not_found = 3.75e-9
     chosen_internal = default_if_not_found
 
-    # 4) Buscar la primera frontera inlet con kIntensity
+    # 2) Buscar la primera frontera inlet con kIntensity
     for name, info in boundary_dict.items():
         if info.get("type", "").lower() == "inlet":
             if "kIntensity" in info:
@@ -61,7 +34,7 @@ def generate_k_file(root_temp_dir, k_output_path):
     else:
         logging.debug(f"[generate_k_file] No se encontró inlet con kIntensity, usando {default_if_not_found}.")
 
-    # 5) Encabezado
+    # 3) Encabezado
     header = f"""/*--------------------------------*- C++ -*----------------------------------*\\
 | =========                 |                                                 |
 | \\      /  F ield         | OpenFOAM: The Open Source CFD Toolbox           |
@@ -88,7 +61,7 @@ boundaryField
 
     boundary_entries = []
 
-    # 6) Construir boundaryField
+    # 4) Construir boundaryField
     for bc_name, info in boundary_dict.items():
         btype = info.get("type", "").lower()
 
@@ -150,16 +123,24 @@ boundaryField
         else:
             logging.debug(f"[generate_k_file] Se ignora '{bc_name}' de tipo '{btype}' en 'k'.")
 
-    # 7) Pie
+    # 5) Pie
     footer = """
 }
 
 // ************************************************************************* //
 """
 
-    k_content = header + "".join(boundary_entries) + footer
+    return header + "".join(boundary_entries) + footer
+
+
+def generate_k_file(ctx, k_output_path):
+    """
+    Escribe el archivo 'k' del contexto 'ctx' en k_output_path (ej: .../temp/DP0/0/k).
+    """
+    logging.debug("[generate_k_file] Iniciando generación de 'k'...")
+    k_content = render_k(ctx)
 
-    # 8) Asegurar directorio de salida
+    # 1) Asegurar directorio de salida
     out_dir = os.path.dirname(k_output_path)
     try:
         os.makedirs(out_dir, exist_ok=True)
@@ -167,7 +148,7 @@ boundaryField
         logging.error(f"[generate_k_file] Error creando carpeta '{out_dir}': {e}")
         return
 
-    # 9) Escribir el archivo
+    # 2) Escribir el archivo
     try:
         with open(k_output_path, "w", encoding="utf-8") as f:
             f.write(k_content)
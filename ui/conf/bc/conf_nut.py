@@ -3,14 +3,15 @@
 import os
 import logging
 
-def generate_nut_file(boundary_conditions, nut_file_path):
+def render_nut(ctx):
     """
-    Genera el archivo 'nut' basado en las condiciones de contorno.
+    Contenido del archivo 'nut' basado en las condiciones de contorno.
 
     Args:
-        boundary_conditions (dict): Diccionario de condiciones de contorno.
-        nut_file_path (str): Ruta completa al archivo 'nut' a generar.
+        ctx (CaseContext): Contexto del caso (ver core/case_context.py).
     """
+    boundary_conditions = ctx.boundaries
+
     # Inicializar el contenido del archivo 'nut'
     nut_content = """/*--------------------------------*- C++ -*----------------------------------*\\
 | =========                 |                                                 |
@@ -53,8 +54,10 @@ boundaryField
             Cmu = bc.get('Cmu', 0.09)      # Valor por defecto: 0.09
             kappa = bc.get('kappa', 0.41)  # Valor por defecto: 0.41
             E = bc.get('E', 9.8)           # Valor por defecto: 9.8
+            # nutLowReWallFunction si la capa límite está resuelta (ver core/wall_yplus.py)
+            nut_type = bc.get('nutType') or 'nutkWallFunction'
 
-            nut_content += f"        type            nutkWallFunction;\n"
+            nut_content += f"        type            {nut_type};\n"
             nut_content += f"        Cmu             {Cmu};\n"
             nut_content += f"        kappa           {kappa};\n"
             nut_content += f"        E               {E};\n"
@@ -68,6 +71,18 @@ boundaryField
 
     # Cerrar el bloque boundaryField
     nut_content += "}\n\n// ************************************************************************* //\n"
+    return nut_content
+
+
+def generate_nut_file(ctx, nut_file_path):
+    """
+    Genera el archivo 'nut' del contexto 'ctx'.
+
+    Args:
+        ctx (CaseContext): Contexto del caso.
+        nut_file_path (str): Ruta completa al archivo 'nut' a generar.
+    """
+    nut_content = render_nut(ctx)
 
     # Asegurar que el directorio existe
     os.makedirs(os.path.dirname(nut_file_path), exist_ok=True)
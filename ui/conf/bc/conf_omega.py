@@ -1,15 +1,14 @@
 # ui/conf/bc/conf_omega.py
 
 import os
-import json
 import logging
 
-def generate_omega_file(root_temp_dir, omega_output_path):
+def render_omega(ctx):
     """
-    Genera el archivo 'omega' leyendo boundary_conditions.json desde `root_temp_dir`
-    y escribiéndolo en `omega_output_path`.
+    Contenido del archivo 'omega' a partir de las condiciones de contorno
+    del contexto del caso (ctx, ver core/case_context.py).
 
-    1. Abre boundary_conditions.json en `root_temp_dir`.
+    1. Toma "boundaryConditions" del contexto.
     2. Determina un omegaInternalValue (por defecto 4.5e-3).
     3. Para cada frontera que tenga un 'omegaType' válido (str no vacío):
        - Si btype='wall' y omegaType='omegaWallFunction', escribe con Cmu, kappa, E...
@@ -18,42 +17,17 @@ def generate_omega_file(root_temp_dir, omega_output_path):
        - Resto => se ignora/usa valor por defecto.
     """
 
-    logging.debug("[generate_omega_file] Iniciando...")
-
-    # 1) Verificar que root_temp_dir sea una ruta válida
-    if not isinstance(root_temp_dir, str):
-        logging.error(f"[generate_omega_file] 'root_temp_dir' debe ser str, no {type(root_temp_dir)}. Cancelado.")
-        return
-
-    # 2) Localizar boundary_conditions.json
-    bc_json_path = os.path.join(root_temp_dir, "boundary_conditions.json")
-    bc_json_path = os.path.normpath(bc_json_path)
-    if not os.path.exists(bc_json_path):
-        logging.error(f"[generate_omega_file] No se encontró '{bc_json_path}'. Abortando 'omega'.")
-        return
-
-    # 3) Cargar boundary_conditions.json
-    try:
-        with open(bc_json_path, "r", encoding='utf-8') as f:
-            bc_data = json.load(f)
-        logging.info(f"[generate_omega_file] Cargado '{bc_json_path}' exitosamente.")
-    except Exception as e:
-        logging.error(f"[generate_omega_file] Error al leer '{bc_json_path}': {e}")
-        return
-
-    # 4) boundaryConditions
-    boundary_dict = bc_data.get("boundaryConditions", {})
-    if not isinstance(boundary_dict, dict):
-        logging.error("[generate_omega_file] 'boundaryConditions' no es un dict. No se genera 'omega'.")
-        return
+    # 1) boundaryConditions
+    bc_data = ctx.boundary_conditions
+    boundary_dict = ctx.boundaries
 
-    # 5) Determinar el internalField
+    # 2) Determinar el internalField
     #    Por defecto 4.5e-3; si existiera un "omegaInternalValue" en el JSON, tomarlo
     default_omega_val = 4.5e-3
     chosen_internal = bc_data.get("omegaInternalValue", default_omega_val)
     logging.debug(f"[generate_omega_file] Usando internalField={chosen_internal}")
 
-    # 6) Encabezado
+    # 3) Encabezado
     header = f"""/*--------------------------------*- C++ -*----------------------------------*\\
 | =========                 |                                                 |
 | \\      /  F ield         | OpenFOAM: The Open Source CFD Toolbox           |
@@ -80,7 +54,7 @@ boundaryField
 
     boundary_entries = []
 
-    # 7) Recorrer cada frontera
+    # 4) Recorrer cada frontera
     for bc_name, info in boundary_dict.items():
         # Revisar si hay un omegaType (str no vacío)
         raw_omega_type = info.get("omegaType", "")
@@ -134,16 +108,24 @@ boundaryField
         entry += "    }\n\n"
         boundary_entries.append(entry)
 
-    # 8) Footer
+    # 5) Footer
     footer = """}
 
 // ************************************************************************* //
 """
 
-    # 9) Combinar
-    omega_content = header + "".join(boundary_entries) + footer
+    # 6) Combinar
+    return header + "".join(boundary_entries) + footer
+
+
+def generate_omega_file(ctx, omega_output_path):
+    """
+    Escribe el archivo 'omega' del contexto 'ctx' en `omega_output_path`.
+    """
+    logging.debug("[generate_omega_file] Iniciando...")
+    omega_content = render_omega(ctx)
 
-    # 10) Asegurar carpeta
+    # 1) Asegurar carpeta
     out_dir = os.path.dirname(omega_output_path)
     try:
         os.makedirs(out_dir, exist_ok=True)
@@ -151,7 +133,7 @@ boundaryField
         logging.error(f"[generate_omega_file] Error creando carpeta '{out_dir}': {e}")
         return
 
-    # 11) Escribir el archivo
+    # 2) Escribir el archivo
     try:
         with open(omega_output_path, "w", encoding="utf-8") as f:
             f.write(omega_content)
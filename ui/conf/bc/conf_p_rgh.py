@@ -1,13 +1,12 @@
 # ui/conf/bc/conf_p_rgh.py
 
 import os
-import json
 import logging
 
-def generate_p_rgh_file(temp_dir, p_rgh_file_path):
+def render_p_rgh(ctx):
     """
-    Genera el archivo 'p_rgh' tomando datos desde boundary_conditions.json (en 'temp_dir')
-    y lo escribe en 'p_rgh_file_path'.
+    Contenido del archivo 'p_rgh' a partir de las condiciones de contorno del
+    contexto del caso (ctx, ver core/case_context.py).
 
     Lógica:
       1) Leer ambientPressure (o 100000 por defecto).
@@ -15,10 +14,6 @@ def generate_p_rgh_file(temp_dir, p_rgh_file_path):
          - si es 'outlet', type = prghPressure y p = uniform <pressureValue o ambient>
          - si no, type = fixedFluxPressure
 
-    Parametros:
-      - temp_dir (str)        : Ruta a la carpeta con boundary_conditions.json (por ejemplo: 'temp')
-      - p_rgh_file_path (str) : Ruta donde se escribirá p_rgh (por ejemplo: 'temp/DP0/0/p_rgh').
-
     Ejemplo de escritura final:
         p_rgh
         {
@@ -39,39 +34,13 @@ def generate_p_rgh_file(temp_dir, p_rgh_file_path):
         }
     """
 
-    logging.debug("[generate_p_rgh_file] Iniciando generación de 'p_rgh'.")
-
-    # 1) Verificar parámetros
-    if not isinstance(temp_dir, str):
-        logging.error("[generate_p_rgh_file] 'temp_dir' debe ser str. Abortando.")
-        return
-    if not isinstance(p_rgh_file_path, str):
-        logging.error("[generate_p_rgh_file] 'p_rgh_file_path' debe ser str. Abortando.")
-        return
-
-    # 2) Ubicar boundary_conditions.json
-    bc_json_path = os.path.join(temp_dir, "boundary_conditions.json")
-    bc_json_path = os.path.normpath(bc_json_path)
-
-    if not os.path.exists(bc_json_path):
-        logging.error(f"[generate_p_rgh_file] No se encontró {bc_json_path}. No se generará 'p_rgh'.")
-        return
-
-    # 3) Leer boundary_conditions.json
-    try:
-        with open(bc_json_path, "r", encoding="utf-8") as f:
-            bc_data = json.load(f)
-        logging.info(f"[generate_p_rgh_file] Cargado '{bc_json_path}' exitosamente.")
-    except Exception as e:
-        logging.error(f"[generate_p_rgh_file] Error al leer '{bc_json_path}': {e}")
-        return
-
-    # 4) Obtener ambientPressure y boundaryConditions
-    boundary_conditions = bc_data.get("boundaryConditions", {})
+    # 1) Obtener ambientPressure y boundaryConditions
+    bc_data = ctx.boundary_conditions
+    boundary_conditions = ctx.boundaries
     ambient_pressure = bc_data.get("ambientPressure", 100000.0)
     logging.debug(f"[generate_p_rgh_file] Presión Ambiente (Pa): {ambient_pressure}")
 
-    # 5) Construir encabezado
+    # 2) Construir encabezado
     header = f"""/*--------------------------------*- C++ -*----------------------------------*\\
 | =========                 |                                                 |
 | \\\\      /  F ield         | OpenFOAM: The Open Source CFD Toolbox           |
@@ -98,7 +67,7 @@ boundaryField
 
     boundary_entries = []
 
-    # 6) Recorrer cada frontera y armar la sección
+    # 3) Recorrer cada frontera y armar la sección
     for bc_name, bc_info in boundary_conditions.items():
         btype = bc_info.get("type", "").lower()
         logging.debug(f"[generate_p_rgh_file] Procesando '{bc_name}' (tipo '{btype}') para 'p_rgh'.")
@@ -126,25 +95,35 @@ boundaryField
 
         boundary_entries.append(entry)
 
-    # 7) Pie
+    # 4) Pie
     footer = """
 }
 
 // ************************************************************************* //
 """
 
-    # 8) Unir contenido
+    # 5) Unir contenido
     p_rgh_content = header + "".join(boundary_entries) + footer
     logging.debug("[generate_p_rgh_file] Contenido construido para 'p_rgh':\n" + p_rgh_content)
+    return p_rgh_content
+
+
+def generate_p_rgh_file(ctx, p_rgh_file_path):
+    """
+    Escribe el archivo 'p_rgh' del contexto 'ctx' en 'p_rgh_file_path'
+    (por ejemplo: 'temp/DP0/0/p_rgh').
+    """
+    logging.debug("[generate_p_rgh_file] Iniciando generación de 'p_rgh'.")
+    p_rgh_content = render_p_rgh(ctx)
 
-    # 9) Asegurar directorio de salida
+    # 1) Asegurar directorio de salida
     try:
         os.makedirs(os.path.dirname(p_rgh_file_path), exist_ok=True)
     except Exception as e:
         logging.error(f"[generate_p_rgh_file] No se pudo crear directorio de salida: {e}")
         return
 
-    # 10) Escribir el archivo
+    # 2) Escribir el archivo
     try:
         with open(p_rgh_file_path, "w", encoding="utf-8") as p_rgh_file:
             p_rgh_file.write(p_rgh_content)
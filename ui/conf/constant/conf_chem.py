@@ -41,7 +41,9 @@ odeCoeffs
 Si la química no está activa, se escribirá 'chemistry off'.
 """
 
-def generate_chemistryProperties(case_config, output_file):
+def render_chemistryProperties(ctx):
+    """Contenido de chemistryProperties según ctx.case_config (ver core/case_context.py)."""
+    case_config = ctx.case_config
     # Verificar si la química está activa (se asume que 'especiesActive' indica la activación)
     chemistry_active = case_config.get("especiesActive", False)
     if not chemistry_active:
@@ -103,8 +105,11 @@ chemistry       {chemistry_status};
 
 // ************************************************************************* //
 """
+    return content
+
+def generate_chemistryProperties(ctx, output_file):
     with open(output_file, "w") as f:
-        f.write(content)
+        f.write(render_chemistryProperties(ctx))
 
 if __name__ == "__main__":
     # Ejemplo de uso
@@ -120,5 +125,6 @@ if __name__ == "__main__":
         }
     }
     import os
+    from core.case_context import CaseContext
     output = os.path.abspath("chemistryProperties")
-    generate_chemistryProperties(example_config, output)
+    generate_chemistryProperties(CaseContext.from_sections({}, case_config=example_config), output)
@@ -38,13 +38,19 @@ PaSRCoeffs
 -----------------------------------------------
 """
 
-def generate_combustionProperties(case_config, output_file):
+COMBUSTION_MODELS = ["combustionSinPremezcla", "combustionPremezclada"]
+
+def render_combustionProperties(ctx):
+    """
+    Contenido de combustionProperties según ctx.case_config (ver
+    core/case_context.py), o None si el modelo no es de combustión.
+    """
     # Extraer la configuración de combustión de especies_options
-    especies_options = case_config.get("especies_options", {})
+    especies_options = ctx.case_config.get("especies_options", {})
     modelo = especies_options.get("modelo", "None")
     # Sólo se genera el archivo si el modelo es de combustión activo
-    if modelo not in ["combustionSinPremezcla", "combustionPremezclada"]:
-        return  # No se genera el archivo
+    if modelo not in COMBUSTION_MODELS:
+        return None  # No se genera el archivo
     
     # Para este ejemplo, usamos el modelo PaSR para la combustión
     combustion_model = "PaSR"
@@ -83,6 +89,12 @@ PaSRCoeffs
 
 // ************************************************************************* //
 """
+    return content
+
+def generate_combustionProperties(ctx, output_file):
+    content = render_combustionProperties(ctx)
+    if content is None:
+        return  # No se genera el archivo
     with open(output_file, "w") as f:
         f.write(content)
 
@@ -109,5 +121,6 @@ if __name__ == "__main__":
         }
     }
     import os
+    from core.case_context import CaseContext
     output = os.path.abspath("combustionProperties")
-    generate_combustionProperties(example_config, output)
+    generate_combustionProperties(CaseContext.from_sections({}, case_config=example_config), output)
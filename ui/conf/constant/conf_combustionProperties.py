@@ -1,55 +1,16 @@
 # ui/conf/constant/conf_combustionProperties.py
 
 import os
-import json
 import logging
 
 from core.species_library import get_species_library
 
-def generate_combustionProperties(case_config: dict, main_dir: str):
+def render_combustionProperties(ctx):
     """
-    Genera:
-      - temp/DP0/constant/combustionProperties
-      - temp/DP0/constant/chemkin/therm.dat filtrado para las especies activas
-
-    Se basa en boundary_conditions.json para:
-      - chemistryActive (bool)
-      - chosen_species (list of str)
+    Contenido de combustionProperties según case_config["combustion"]["chemistry"]
+    del contexto del caso (ctx, ver core/case_context.py).
     """
-
-    # 1) Leer boundary_conditions.json
-    temp_dir = os.path.join(main_dir, "temp")
-    bc_path = os.path.join(temp_dir, "boundary_conditions.json")
-    try:
-        with open(bc_path, "r", encoding="utf-8") as f:
-            bc = json.load(f)
-    except Exception as e:
-        logging.error(f"No se pudo leer boundary_conditions.json: {e}")
-        return
-
-    chemistry_active = bc.get("chemistryActive", False)
-    chosen = bc.get("chosen_species", [])
-
-    # 2) Directorio DP0/constant
-    dp0_const = os.path.join(temp_dir, "DP0", "constant")
-    os.makedirs(dp0_const, exist_ok=True)
-
-    # Si la química está desactivada, eliminar chemkin y combustionProperties
-    chemkin_dir = os.path.join(dp0_const, "chemkin")
-    comb_prop_path = os.path.join(dp0_const, "combustionProperties")
-    if not chemistry_active or not chosen:
-        # eliminar si existía
-        if os.path.isdir(chemkin_dir):
-            try:    os.rmdir(chemkin_dir)
-            except: pass
-        if os.path.isfile(comb_prop_path):
-            try:    os.remove(comb_prop_path)
-            except: pass
-        logging.info("Química desactivada: no se crea combustionProperties ni chemkin/")
-        return
-
-    # 3) Generar combustionProperties
-    #    (solo plantillas mínimas, ajusta si necesitas más campos)
+    # Plantilla mínima (ajusta si necesitas más campos)
     tpl = """/*--------------------------------*- C++ -*----------------------------------*\\
 | =========                 |                                                 |
 | \\      /  F ield         | OpenFOAM: The Open Source CFD Toolbox           |
@@ -72,18 +33,18 @@ active          yes;
 
 // ************************************************************************* //
 """
-    version = case_config.get("chemistry", {}).get("version", "v2406")
-    model   = case_config.get("chemistry", {}).get("combustionModel", "PaSR")
+    chemistry = ctx.case_config.get("combustion", {}).get("chemistry", {})
+    version = chemistry.get("version", "v2406")
+    model   = chemistry.get("combustionModel", "PaSR")
+    return tpl.format(version=version, model=model)
 
-    try:
-        with open(comb_prop_path, "w", encoding="utf-8") as f:
-            f.write(tpl.format(version=version, model=model))
-        logging.info(f"'combustionProperties' generado en: {comb_prop_path}")
-    except Exception as e:
-        logging.error(f"Error escribiendo combustionProperties: {e}")
 
-    # 4) Crear chemkin_dir y escribir therm.dat
-    os.makedirs(chemkin_dir, exist_ok=True)
+def render_therm_dat(ctx):
+    """
+    Contenido de chemkin/therm.dat filtrado para las especies activas
+    (ctx.chosen_species), o None si la librería no tiene bloque THERMO.
+    """
+    chosen = ctx.chosen_species
     lib_text = get_species_library().splitlines()
 
     # Extraer header (líneas iniciales) y final 'END'
@@ -92,7 +53,7 @@ active          yes;
         end_idx = next(i for i, L in enumerate(lib_text) if L.strip() == "END")
     except StopIteration:
         logging.error("species_library no contiene bloque 'THERMO ... END'")
-        return
+        return None
 
     header = lib_text[hdr_idx : hdr_idx + 2]  # THERMO ALL + rango
     footer = ["END"]
@@ -124,12 +85,60 @@ active          yes;
         else:
             logging.error(f"🔴 Falta datos termo NASA para especie activa: '{sp}'")
     out.extend(footer)
+    return "\n".join(out)
 
-    # Escribir therm.dat
+
+def generate_combustionProperties(ctx):
+    """
+    Genera:
+      - temp/DP0/constant/combustionProperties
+      - temp/DP0/constant/chemkin/therm.dat filtrado para las especies activas
+
+    Se basa en boundary_conditions del contexto para:
+      - chemistryActive (bool)
+      - chosen_species (list of str)
+    """
+
+    # 1) boundary_conditions del contexto
+    if not ctx.has_section("boundary_conditions"):
+        logging.error("No se pudo leer boundary_conditions.json: sección vacía o inexistente")
+        return
+
+    # 2) Directorio DP0/constant
+    dp0_const = ctx.path("constant")
+    os.makedirs(dp0_const, exist_ok=True)
+
+    # Si la química está desactivada, eliminar chemkin y combustionProperties
+    chemkin_dir = os.path.join(dp0_const, "chemkin")
+    comb_prop_path = os.path.join(dp0_const, "combustionProperties")
+    if not ctx.chemistry_active or not ctx.chosen_species:
+        # eliminar si existía
+        if os.path.isdir(chemkin_dir):
+            try:    os.rmdir(chemkin_dir)
+            except: pass
+        if os.path.isfile(comb_prop_path):
+            try:    os.remove(comb_prop_path)
+            except: pass
+        logging.info("Química desactivada: no se crea combustionProperties ni chemkin/")
+        return
+
+    # 3) Generar combustionProperties
+    try:
+        with open(comb_prop_path, "w", encoding="utf-8") as f:
+            f.write(render_combustionProperties(ctx))
+        logging.info(f"'combustionProperties' generado en: {comb_prop_path}")
+    except Exception as e:
+        logging.error(f"Error escribiendo combustionProperties: {e}")
+
+    # 4) Crear chemkin_dir y escribir therm.dat
+    os.makedirs(chemkin_dir, exist_ok=True)
+    therm = render_therm_dat(ctx)
+    if therm is None:
+        return
     therm_path = os.path.join(chemkin_dir, "therm.dat")
     try:
         with open(therm_path, "w", encoding="utf-8") as f:
-            f.write("\n".join(out))
+            f.write(therm)
         logging.info(f"'therm.dat' generado en: {therm_path}")
     except Exception as e:
         logging.error(f"Error escribiendo therm.dat: {e}")
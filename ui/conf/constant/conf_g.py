@@ -10,7 +10,9 @@ Si la gravedad no está activa, se escribe un vector cero.
 import os
 import math
 
-def generate_g_file(case_config, output_file):
+def render_g(ctx):
+    """Contenido del archivo 'g' según ctx.case_config (ver core/case_context.py)."""
+    case_config = ctx.case_config
     # Verificar si la gravedad está activa
     if not case_config.get("gravity_active", False):
         g_vector = [0.0, 0.0, 0.0]
@@ -46,5 +48,8 @@ value           ({g_vector[0]} {g_vector[1]} {g_vector[2]});
 
 // ************************************************************************* //
 """
+    return content
+
+def generate_g_file(ctx, output_file):
     with open(output_file, "w") as f:
-        f.write(content)
+        f.write(render_g(ctx))
@@ -1,10 +1,21 @@
 # ui/conf/constant/conf_particleTrack.py
 import os
 
-def generate_particleTrackProperties(case_config, output_file):
+# Configuración por defecto si la fase discreta no define particleTrackProperties
+DEFAULT_TRACK_CONFIG = {
+    "cloudName": "reactingCloud1",
+    "sampleFrequency": 1,
+    "maxPositions": 1000000,
+    "setFormat": "vtk",
+    "fields": "",
+    "maxTracks": -1
+}
+
+def render_particleTrackProperties(ctx):
     """
-    Genera el archivo particleTrackProperties para OpenFOAM basándose en la configuración
-    almacenada en case_config["particleTrackProperties"].
+    Contenido del archivo particleTrackProperties para OpenFOAM basándose en la configuración
+    de la fase discreta del contexto (Disperse_fase["particleTrackProperties"], o
+    DEFAULT_TRACK_CONFIG si está vacía).
 
     La estructura del archivo es la siguiente:
 
@@ -35,7 +46,7 @@ def generate_particleTrackProperties(case_config, output_file):
     // ************************************************************************* //
     """
     # Extraer la configuración de particle tracking
-    track_config = case_config.get("particleTrackProperties", {})
+    track_config = ctx.disperse_phase.get("particleTrackProperties") or DEFAULT_TRACK_CONFIG
     cloud = track_config.get("cloudName", "reactingCloud1")
     sampleFrequency = track_config.get("sampleFrequency", 1)
     maxPositions = track_config.get("maxPositions", 1000000)
@@ -75,14 +86,19 @@ maxPositions    {int(maxPositions)};
         body += "\n" + "\n".join(extra_lines) + "\n"
     footer = "\n// ************************************************************************* //\n"
     
-    content = header + body + footer
+    return header + body + footer
+
+def generate_particleTrackProperties(ctx, output_file):
+    """Escribe particleTrackProperties del contexto 'ctx' en 'output_file'."""
     with open(output_file, "w") as f:
-        f.write(content)
+        f.write(render_particleTrackProperties(ctx))
 
 if __name__ == "__main__":
     # Ejemplo de uso:
     import os
+    from core.case_context import CaseContext
     example_config = {
+        "discrete_phase_active": True,
         "particleTrackProperties": {
             "cloudName": "genericCloud",
             "sampleFrequency": 1,
@@ -93,4 +109,4 @@ if __name__ == "__main__":
         }
     }
     output_file = os.path.abspath("particleTrackProperties")
-    generate_particleTrackProperties(example_config, output_file)
+    generate_particleTrackProperties(CaseContext.from_sections({"Disperse_fase": example_config}), output_file)
@@ -9,7 +9,9 @@ El archivo se escribe de acuerdo a:
     para viewFactor, fvDOM o P1 según corresponda.
 """
 
-def generate_radiationProperties(case_config, output_file):
+def render_radiationProperties(ctx):
+    """Contenido de radiationProperties según ctx.case_config (ver core/case_context.py)."""
+    case_config = ctx.case_config
     radiation_active = case_config.get("radiation_active", False)
     # Valor por defecto para solverFreq si no se especifica
     solverFreq = 10
@@ -62,5 +64,8 @@ solverFreq      {solverFreq};{extra_params}
 
 // ************************************************************************* //
 """
+    return content
+
+def generate_radiationProperties(ctx, output_file):
     with open(output_file, "w") as f:
-        f.write(content)
+        f.write(render_radiationProperties(ctx))
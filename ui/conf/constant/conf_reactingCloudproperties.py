@@ -125,33 +125,29 @@ cloudFunctions
 // ************************************************************************* //
 """
 
-def generate_reactingCloudProperties(fase_cfg: dict, main_dir: str):
+def cloud_settings(ctx):
     """
-    Genera (o elimina) reactingCloudProperties en temp/DP0/constant.
-    - fase_cfg: dict con la estructura del Disperse_fase.json
-    - main_dir: ruta raíz del caso
+    (activa, cloudName) de la fase discreta del contexto (sección Disperse_fase).
     """
-
-    # 1) ¿Está activa la fase discreta?
+    fase_cfg = ctx.disperse_phase
     active_flag = fase_cfg.get("active", 
                    fase_cfg.get("discrete_phase_active", False))
-    # nombre de la nube
     cloudName = fase_cfg.get("particleTrackProperties", {}) \
                      .get("cloudName", "reactingCloud1")
+    return active_flag, cloudName
 
-    target = os.path.join(main_dir, "temp", "DP0", "constant", f"{cloudName}Properties")
 
-    # Si no está activa, borramos si existe y salimos
-    if not active_flag:
-        if os.path.exists(target):
-            os.remove(target)
-            logging.info(f"{cloudName}Properties eliminado en {target} (fase discreta inactiva).")
-        return
+def render_reactingCloudProperties(ctx):
+    """
+    Contenido de <cloudName>Properties a partir de la sección Disperse_fase
+    del contexto del caso (ctx, ver core/case_context.py).
+    """
+    fase_cfg = ctx.disperse_phase
 
-    # 2) preparamos el directorio
-    os.makedirs(os.path.dirname(target), exist_ok=True)
+    # 1) ¿Está activa la fase discreta? y nombre de la nube
+    active_flag, cloudName = cloud_settings(ctx)
 
-    # 3) sacamos los modelos de fase discreta
+    # 2) sacamos los modelos de fase discreta
     models = fase_cfg.get("discrete_phase_models", {})
 
     dispersionModel       = models.get("dispersionModel", "none")
@@ -169,7 +165,7 @@ def generate_reactingCloudProperties(fase_cfg: dict, main_dir: str):
     surfaceFilmModel      = models.get("surfaceFilmModel", "none")
     radiation             = models.get("radiation", "none")
 
-    # 4) inyecciones
+    # 3) inyecciones
     injections = fase_cfg.get("injections", [])
     inj_lines = []
     for inj in injections:
@@ -185,7 +181,7 @@ def generate_reactingCloudProperties(fase_cfg: dict, main_dir: str):
         inj_lines.append("        }")
     injectionModels = "\n".join(inj_lines)
 
-    # 5) Otros bloques básicos (pueden salir de models o fijarse por defecto)
+    # 4) Otros bloques básicos (pueden salir de models o fijarse por defecto)
     # aquí pongo defaults razonables:
     def fmt_block(entries, indent="        "):
         return "\n".join(f"{indent}{e};" for e in entries)
@@ -240,7 +236,7 @@ def generate_reactingCloudProperties(fase_cfg: dict, main_dir: str):
     maxStoredParcels  = cf.get("maxStoredParcels",100)
     patches           = " ".join(cf.get("patches",[]))
 
-    # 6) ensamblamos el contenido
+    # 5) ensamblamos el contenido
     content = REACTING_CLOUD_TEMPLATE.format(
         version                  = fase_cfg.get("version","v2406"),
         cloudName                = cloudName,
@@ -277,8 +273,29 @@ def generate_reactingCloudProperties(fase_cfg: dict, main_dir: str):
         maxStoredParcels         = maxStoredParcels,
         patches                  = patches
     )
+    return content
+
+
+def generate_reactingCloudProperties(ctx):
+    """
+    Genera (o elimina) reactingCloudProperties en temp/DP0/constant.
+    - ctx: contexto del caso; la fase discreta es su sección Disperse_fase
+    """
+    active_flag, cloudName = cloud_settings(ctx)
+    target = ctx.path("constant", f"{cloudName}Properties")
+
+    # Si no está activa, borramos si existe y salimos
+    if not active_flag:
+        if os.path.exists(target):
+            os.remove(target)
+            logging.info(f"{cloudName}Properties eliminado en {target} (fase discreta inactiva).")
+        return
+
+    # preparamos el directorio
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    content = render_reactingCloudProperties(ctx)
 
-    # 7) escribimos el archivo
+    # escribimos el archivo
     try:
         with open(target, "w", encoding="utf-8") as f:
             f.write(content)
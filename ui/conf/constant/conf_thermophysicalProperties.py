@@ -52,12 +52,12 @@ solids
 """
 
 
-def generate_thermophysicalProperties(settings: dict, target_path: str):
+def render_thermophysicalProperties(ctx):
     """
-    Escribe el archivo thermophysicalProperties en target_path
-    usando los valores de settings, pero nunca falla por clave faltante.
+    Contenido de thermophysicalProperties con los valores de
+    ctx.case_config["thermophysicalProperties"], pero nunca falla por clave faltante.
     """
-    os.makedirs(os.path.dirname(target_path), exist_ok=True)
+    settings = ctx.case_config.get("thermophysicalProperties", {})
 
     # build the liquids/solids blocks (one entry per line, indented)
     liquids_list = settings.get("liquids", [])
@@ -82,6 +82,15 @@ def generate_thermophysicalProperties(settings: dict, target_path: str):
         liquids_block     = liquids_block,
         solids_block      = solids_block
     )
+    return content
+
+
+def generate_thermophysicalProperties(ctx, target_path: str):
+    """
+    Escribe el archivo thermophysicalProperties del contexto 'ctx' en target_path.
+    """
+    os.makedirs(os.path.dirname(target_path), exist_ok=True)
+    content = render_thermophysicalProperties(ctx)
 
     try:
         with open(target_path, 'w') as f:
@@ -4,12 +4,30 @@ Módulo para generar el archivo turbulenceProperties para OpenFOAM
 según la configuración de turbulencia definida en constant.json o case_config.
 """
 
-def generate_turbulenceProperties(turbulence_config, output_file):
+def turbulence_settings(ctx):
     """
-    Genera el archivo turbulenceProperties en 'output_file' a partir de la configuración
-    en 'turbulence_config'.
+    Configuración de turbulencia a partir de case_config["turbulenceModel"]
+    del contexto ({"category", "model"} o un string).
+    """
+    turb = ctx.case_config.get("turbulenceModel", {"category": "Laminar", "model": "Laminar"})
+    if isinstance(turb, dict):
+        cat = turb.get("category", "Laminar")
+        mdl = turb.get("model", "Laminar")
+        final_model = "laminar" if cat.lower() == "laminar" else mdl
+    else:
+        final_model = "laminar" if str(turb).lower() == "laminar" else turb
+    return {
+        "turbulenceModel": final_model,
+        "turbulence": "on" if str(final_model).lower() != "laminar" else "off",
+        "printCoeffs": "on"
+    }
 
-    turbulence_config es un diccionario que debe contener:
+def render_turbulenceProperties(ctx):
+    """
+    Contenido del archivo turbulenceProperties a partir de la configuración
+    de turbulencia del contexto (turbulence_settings).
+
+    La configuración es un diccionario que contiene:
       - 'turbulenceModel': string con el modelo de turbulencia (por ejemplo, "kEpsilon", "kOmega", "laminar")
       - 'turbulence': "on" o "off"
       - 'printCoeffs': "on" o "off"
@@ -38,6 +56,7 @@ FoamFile
 """
 
     # Extraer el modelo final ya procesado (string)
+    turbulence_config = turbulence_settings(ctx)
     model = turbulence_config.get("turbulenceModel", "laminar")
     turbulence_state = turbulence_config.get("turbulence", "off")
     printCoeffs = turbulence_config.get("printCoeffs", "off")
@@ -74,5 +93,9 @@ RAS
 
 // ************************************************************************* //
 """
+    return content
+
+def generate_turbulenceProperties(ctx, output_file):
+    """Genera el archivo turbulenceProperties del contexto 'ctx' en 'output_file'."""
     with open(output_file, "w") as f:
-        f.write(content)
+        f.write(render_turbulenceProperties(ctx))
@@ -0,0 +1,155 @@
+# ui/conf/initialization.py
+
+"""
+Validación e inicialización del caso sin dependencias de Qt.
+
+Lo comparten la página Ejecutar cálculo, conf_bc.py y la generación por
+línea de comandos (generate_case.py): los errores se devuelven como listas
+de mensajes y cada llamador decide cómo mostrarlos (QMessageBox, JSON,
+texto).
+
+    ctx = CaseContext.load(project_dir)
+    errors = initialization_errors(ctx)
+    if not errors:
+        report = render_initialization(ctx).commit()
+        update_chemkin_dir(ctx)
+"""
+
+import os
+import shutil
+import logging
+
+from core.generation import render_tree
+from ui.conf.targets import initialization_targets
+
+
+# ----------------------------------------------------------------------
+# Validación de boundary_conditions
+# ----------------------------------------------------------------------
+def _check_boundary_conditions(bc_data, turbulence_active, epsilon_active, omega_active):
+    """Mensajes de error de boundary_conditions ([] si es válida)."""
+    required_fields = ["ambientPressure", "ambientTemperature", "boundaryConditions"]
+    missing = [f"Campo requerido '{field}' no encontrado en JSON." for field in required_fields
+               if field not in bc_data]
+    if missing:
+        return missing
+
+    errors = []
+    for name, bc in bc_data["boundaryConditions"].items():
+        btype = bc.get("type", "").lower()
+        if not btype:
+            if name.lower() == "walls":
+                btype = "wall"
+                logging.debug(f"Inferido 'wall' para la condición '{name}'.")
+            else:
+                errors.append(f"Campo 'type' no encontrado en la condición '{name}'.")
+                continue
+
+        if btype == "inlet":
+            for f in ["velocityType", "velocityValue", "velocityInit", "temperature"]:
+                if f not in bc:
+                    errors.append(f"Campo '{f}' no encontrado en 'Inlet' '{name}'.")
+        elif btype == "outlet":
+            for f in ["pressureValue", "temperature"]:
+                if f not in bc:
+                    errors.append(f"Campo '{f}' no encontrado en 'Outlet' '{name}'.")
+        elif btype == "wall":
+            # Se acepta slipType O noFriction
+            if "slipType" not in bc and "noFriction" not in bc:
+                errors.append(f"Ni 'slipType' ni 'noFriction' encontrado en 'Wall' '{name}'.")
+            # Temperatura requerida: temperature O wallTemperature
+            if "temperature" not in bc and "wallTemperature" not in bc:
+                errors.append(f"Ni 'temperature' ni 'wallTemperature' encontrado en 'Wall' '{name}'.")
+        else:
+            errors.append(f"Tipo de contorno desconocido '{btype}' para '{name}'.")
+            continue
+
+        # Revisar turbulencia (k, epsilon, omega)
+        if turbulence_active and isinstance(bc.get("kType"), str) and bc["kType"].strip() != "":
+            if "kValue" not in bc:
+                errors.append(f"Campo 'kValue' no encontrado en '{name}' (turbulencia activa).")
+        if epsilon_active and isinstance(bc.get("epsilonType"), str) and bc["epsilonType"].strip() != "":
+            if "epsilonValue" not in bc:
+                errors.append(f"Campo 'epsilonValue' no encontrado en '{name}' (epsilon activa).")
+        if omega_active and isinstance(bc.get("omegaType"), str) and bc["omegaType"].strip() != "":
+            if "omegaValue" not in bc:
+                errors.append(f"Campo 'omegaValue' no encontrado en '{name}' (omega activa).")
+    return errors
+
+
+def validate_boundary_conditions(bc_data, turbulence_active, epsilon_active, omega_active):
+    """True si boundary_conditions es válida; los errores se registran en el log."""
+    logging.debug("Iniciando validación de boundary_conditions.json.")
+    errors = _check_boundary_conditions(bc_data, turbulence_active, epsilon_active, omega_active)
+    for message in errors:
+        logging.error(message)
+    if not errors:
+        logging.debug("Validación de boundary_conditions completada con éxito.")
+    return not errors
+
+
+def boundary_conditions_errors(ctx):
+    """
+    Mensajes de error de la sección boundary_conditions del contexto: los
+    campos que necesitan los generadores de la carpeta 0.
+    """
+    boundary_conditions = ctx.boundaries
+
+    # Detectar si hay turbulencia, epsilon, omega en las definiciones
+    turbulence_active = any(
+        isinstance(bc.get("kType"), str) and bc["kType"].strip() != ""
+        for bc in boundary_conditions.values()
+    )
+    epsilon_active = any(
+        isinstance(bc.get("epsilonType"), str) and bc["epsilonType"].strip() != ""
+        for bc in boundary_conditions.values()
+    )
+    omega_active = any(
+        isinstance(bc.get("omegaType"), str) and bc["omegaType"].strip() != ""
+        for bc in boundary_conditions.values()
+    )
+
+    logging.info(f"Turbulence_model en JSON: {ctx.turbulence_model}")
+    logging.info(f"Turbulencia activa: {'Sí' if turbulence_active else 'No'}")
+    logging.info(f"Epsilon activa: {'Sí' if epsilon_active else 'No'}")
+    logging.info(f"Omega activa: {'Sí' if omega_active else 'No'}")
+
+    return _check_boundary_conditions(ctx.boundary_conditions, turbulence_active, epsilon_active, omega_active)
+
+
+def boundary_conditions_valid(ctx):
+    """True si boundary_conditions tiene todos los campos que necesitan los generadores."""
+    errors = boundary_conditions_errors(ctx)
+    for message in errors:
+        logging.error(message)
+    return not errors
+
+
+# ----------------------------------------------------------------------
+# Inicialización del caso
+# ----------------------------------------------------------------------
+def initialization_errors(ctx):
+    """Mensajes que impiden inicializar el caso ([] si se puede generar)."""
+    if not ctx.has_section("boundary_conditions"):
+        return [f"No se encontró la sección boundary_conditions en {ctx.data_dir}."]
+    return boundary_conditions_errors(ctx)
+
+
+def render_initialization(ctx, workers=None, executor="auto", force=False):
+    """
+    Carpeta 0, constant, <cloudName>Properties, combustionProperties +
+    chemkin/therm.dat y alphat renderizados en memoria (CaseTree, ver
+    core/generation.py). No escribe nada hasta tree.commit().
+    """
+    return render_tree(ctx, initialization_targets(ctx), workers, executor, force)
+
+
+def update_chemkin_dir(ctx):
+    """Crea <proyecto>/chemkin con la química activa y lo elimina si está inactiva."""
+    chemkin_dir = os.path.join(ctx.project_dir, "chemkin")
+    if ctx.case_config.get("combustion", {}).get("active", False):
+        os.makedirs(chemkin_dir, exist_ok=True)
+        logging.info("→ Directorio CHEMKIN preparado en %s", chemkin_dir)
+    elif os.path.isdir(chemkin_dir):
+        shutil.rmtree(chemkin_dir)
+        logging.info("→ carpeta chemkin eliminada (química inactiva).")
@@ -0,0 +1,213 @@
+# ui/conf/targets.py
+
+"""
+Planes de generación de los archivos del caso (ver core/generation.py).
+
+Cada función devuelve la lista de Target (archivo de salida y función
+render) que corresponde al contexto del caso: qué campos de la carpeta 0 se
+generan según el modelo de turbulencia y la química, qué diccionarios de
+constant según los modelos activos, y qué archivos obsoletos se eliminan.
+Los Target son independientes entre sí, así que el ejecutor puede
+renderizarlos en paralelo.
+
+Cada Target declara las claves que lee su generador (deps, ver
+core/generation.py): editar la temperatura de un inlet sólo regenera 0/T.
+Al añadir una clave a un generador hay que declararla aquí; el generador
+sólo ve las claves declaradas.
+"""
+
+import os
+from glob import escape
+
+from core.generation import Target
+
+from ui.conf.bc.conf_U import render_u
+from ui.conf.bc.conf_T import render_t
+from ui.conf.bc.conf_P import render_p
+from ui.conf.bc.conf_p_rgh import render_p_rgh
+from ui.conf.bc.conf_k import render_k
+from ui.conf.bc.conf_epsilon import render_epsilon
+from ui.conf.bc.conf_omega import render_omega
+from ui.conf.bc.conf_nut import render_nut
+from ui.conf.bc.conf_alphat import render_alphat
+from ui.conf.bc.conf_especies import STANDARD_FIELD_FILES, active_species, render_species_file
+from ui.conf.bc.conf_Ydefault import render_ydefault
+
+from ui.conf.constant.conf_turbulenceProperties import render_turbulenceProperties
+from ui.conf.constant.conf_radiation import render_radiationProperties
+from ui.conf.constant.conf_g import render_g
+from ui.conf.constant.conf_thermophysicalProperties import render_thermophysicalProperties
+from ui.conf.constant.conf_chem import render_chemistryProperties
+from ui.conf.constant.conf_combustion import COMBUSTION_MODELS, render_combustionProperties
+from ui.conf.constant.conf_particleTrack import render_particleTrackProperties
+from ui.conf.constant.conf_reactingCloudproperties import cloud_settings, render_reactingCloudProperties
+from ui.conf.constant import conf_combustionProperties
+
+
+def _defined(boundaries, key):
+    """True si alguna frontera define un tipo no vacío para 'key' (kType, epsilonType, ...)."""
+    return any(isinstance(bc.get(key), str) and bc[key].strip() != "" for bc in boundaries.values())
+
+
+def _field(ctx, name, render=None, *args, deps=()):
+    return Target(name, ctx.path("0", name), render, args, deps)
+
+
+def _constant(ctx, name, render=None, deps=()):
+    return Target(f"constant/{name}", ctx.path("constant", name), render, deps=deps)
+
+
+def _bc(*keys):
+    """Dependencias de claves globales de boundary_conditions."""
+    return tuple(f"boundary_conditions:{key}" for key in keys)
+
+
+def _patch(*keys):
+    """Dependencias de claves de cada frontera (boundaryConditions.<patch>.<clave>)."""
+    return tuple(f"boundary_conditions:boundaryConditions.*.{key}" for key in keys)
+
+
+def _case(*keys):
+    """Dependencias de claves de case_config (con constant aplicado)."""
+    return tuple(f"case_config:{key}" for key in keys)
+
+
+def u_deps(ctx):
+    """
+    Dependencias de U. La densidad (temperatura, especies, material) y el
+    área de la malla sólo se leen si algún inlet da el caudal en masa o en
+    velocidad, así que sólo entonces se declaran.
+    """
+    deps = _patch("type", "velocityType", "velocityValue", "velocityInit", "flowSpec", "kType", "noFriction")
+    specs = {bc.get("flowSpec", "volumetricFlowRate") for bc in ctx.boundaries.values()
+             if bc.get("type", "").lower() == "inlet" and bc.get("velocityType") == "flowRateInletVelocity"}
+    if "massFlowRate" in specs:
+        deps += _patch("temperature", "*_chemValue") + _case(
+            "energy_active", "thermophysicalProperties.equationOfState", "ambientTemperature",
+            "ambientPressure", "especiesActive", "especies_options.activeSpecies", "materials")
+    if "velocity" in specs:
+        deps += ("mesh",)
+    return deps
+
+
+# Dependencias de los generadores de la carpeta 0
+T_DEPS = _bc("ambientTemperature") + _patch("type", "temperature")
+P_DEPS = _bc("ambientPressure") + _patch("type")
+P_RGH_DEPS = _bc("ambientPressure") + _patch("type", "pressureValue")
+K_DEPS = _patch("type", "kIntensity", "kType", "kValue", "omegaType", "omegaValue")
+EPSILON_DEPS = _bc("epsilonInternalValue") + _patch("type", "epsilonType", "epsilonValue", "epsilonIntensity")
+OMEGA_DEPS = _bc("omegaInternalValue") + _patch(
+    "type", "omegaType", "omegaValue", "Cmu", "kappa", "E", "omegaValueOption", "omegaMixingLength")
+NUT_DEPS = _patch("type", "Cmu", "kappa", "E", "nutType")
+ALPHAT_DEPS = _patch("type", "alphaType", "alphaValue") + _bc("calculationType") + (
+    "case_config:solverSettings.calculationType", "solver_settings:calculationType")
+YDEFAULT_DEPS = _patch("type")
+
+# Dependencias de los generadores de constant
+TURBULENCE_DEPS = _case("turbulenceModel")
+RADIATION_DEPS = _case("radiation_active", "radiation_options")
+G_DEPS = _case("gravity_active", "gravity_vector")
+THERMO_DEPS = _case("thermophysicalProperties")
+CHEMISTRY_DEPS = _case("especiesActive", "especies_options.chemSolver", "especies_options.chemSolverParams")
+COMBUSTION_DEPS = _case("especies_options.modelo", "especies_options.combustionParams")
+PARTICLE_TRACK_DEPS = ("Disperse_fase:particleTrackProperties",)
+CLOUD_DEPS = ("Disperse_fase",)
+CHEMISTRY_COMBUSTION_DEPS = _case("combustion.chemistry")
+THERM_DAT_DEPS = _bc("chosen_species")
+
+
+def species_deps(species):
+    # Nombre escapado ("OH*" -> "OH[*]", "." -> "[.]"): se busca como clave literal
+    return _patch("type", f"{escape(species).replace('.', '[.]')}_chemValue")
+
+
+def boundary_targets(ctx):
+    """
+    Carpeta 0: U, T, p, p_rgh, k/epsilon/omega según Turbulence_model, nut,
+    y con química activa un archivo por especie, Ydefault y la eliminación
+    de los archivos de especies que ya no están activas.
+    """
+    turbulence_model = ctx.turbulence_model
+    targets = [
+        _field(ctx, "U", render_u, deps=u_deps(ctx)),
+        _field(ctx, "T", render_t, deps=T_DEPS),
+        _field(ctx, "p", render_p, deps=P_DEPS),
+        _field(ctx, "p_rgh", render_p_rgh, deps=P_RGH_DEPS),
+        _field(ctx, "k", render_k if turbulence_model in ("kEpsilon", "kOmega") else None, deps=K_DEPS),
+        _field(ctx, "epsilon", render_epsilon
+               if turbulence_model == "kEpsilon" and _defined(ctx.boundaries, "epsilonType") else None,
+               deps=EPSILON_DEPS),
+        _field(ctx, "omega", render_omega
+               if turbulence_model == "kOmega" and _defined(ctx.boundaries, "omegaType") else None,
+               deps=OMEGA_DEPS),
+        _field(ctx, "nut", render_nut, deps=NUT_DEPS),
+    ]
+
+    if ctx.chemistry_active and ctx.chosen_species:
+        species = active_species(ctx)
+        targets += [_field(ctx, s, render_species_file, s, deps=species_deps(s)) for s in species]
+        targets.append(_field(ctx, "Ydefault", render_ydefault, deps=YDEFAULT_DEPS))
+        # Archivos de especies que ya no están activas
+        target_dir = ctx.path("0")
+        keep = STANDARD_FIELD_FILES | set(species) | {"Ydefault"}
+        if os.path.isdir(target_dir):
+            targets += [_field(ctx, name) for name in sorted(os.listdir(target_dir))
+                        if name not in keep and not name.startswith(".")
+                        and os.path.isfile(os.path.join(target_dir, name))]
+    return targets
+
+
+def constant_targets(ctx):
+    """
+    Directorio constant: turbulenceProperties, radiationProperties, g,
+    thermophysicalProperties, chemistryProperties, combustionProperties y
+    particleTrackProperties según los modelos activos.
+    """
+    case_config = ctx.case_config
+    especies_on = case_config.get("especiesActive", False)
+    modelo_comb = case_config.get("especies_options", {}).get("modelo", "")
+    targets = [
+        _constant(ctx, "turbulenceProperties", render_turbulenceProperties, TURBULENCE_DEPS),
+        _constant(ctx, "radiationProperties", render_radiationProperties, RADIATION_DEPS),
+    ]
+    if case_config.get("gravity_active", False):
+        targets.append(_constant(ctx, "g", render_g, G_DEPS))
+    targets += [
+        _constant(ctx, "thermophysicalProperties", render_thermophysicalProperties, THERMO_DEPS),
+        _constant(ctx, "chemistryProperties", render_chemistryProperties if especies_on else None, CHEMISTRY_DEPS),
+        _constant(ctx, "combustionProperties",
+                  render_combustionProperties if especies_on and modelo_comb in COMBUSTION_MODELS else None,
+                  COMBUSTION_DEPS),
+        _constant(ctx, "particleTrackProperties",
+                  render_particleTrackProperties if ctx.disperse_phase.get("discrete_phase_active", False) else None,
+                  PARTICLE_TRACK_DEPS),
+    ]
+    return targets
+
+
+def initialization_targets(ctx):
+    """
+    Todos los archivos de la inicialización del caso (página Ejecutar
+    cálculo): carpeta 0, constant, <cloudName>Properties de la fase
+    discreta, combustionProperties + chemkin/therm.dat de la química y
+    alphat.
+    """
+    targets = boundary_targets(ctx) + constant_targets(ctx)
+
+    active_flag, cloud_name = cloud_settings(ctx)
+    targets.append(_constant(ctx, f"{cloud_name}Properties",
+                             render_reactingCloudProperties if active_flag else None, CLOUD_DEPS))
+
+    # combustionProperties de la química sustituye al de constant_targets
+    chem_active = ctx.case_config.get("combustion", {}).get("active", False)
+    targets = [t for t in targets if t.name != "constant/combustionProperties"]
+    chemistry_on = chem_active and ctx.chemistry_active and ctx.chosen_species
+    targets.append(_constant(ctx, "combustionProperties",
+                             conf_combustionProperties.render_combustionProperties if chemistry_on else None,
+                             CHEMISTRY_COMBUSTION_DEPS))
+    if chemistry_on:
+        targets.append(Target("constant/chemkin/therm.dat", ctx.path("constant", "chemkin", "therm.dat"),
+                              conf_combustionProperties.render_therm_dat, deps=THERM_DAT_DEPS))
+
+    targets.append(_field(ctx, "alphat", render_alphat, deps=ALPHAT_DEPS))
+    return targets
@@ -0,0 +1,53 @@
+# ui/dialogs/case_diff_dialog.py
+
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QPlainTextEdit
+)
+
+from core.generation import STATUS_WRITTEN, STATUS_REMOVED
+
+
+class CaseDiffDialog(QDialog):
+    """
+    Vista previa de "Inicializar Caso": muestra el diff unificado entre los
+    archivos renderizados en memoria (CaseTree, core/generation.py) y los
+    del disco, sin escribir nada. Tras exec_() == Accepted el llamador
+    escribe el árbol con tree.commit().
+    """
+
+    def __init__(self, tree, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Vista previa de cambios")
+        self.resize(900, 600)
+        self.tree = tree
+
+        report = tree.report()
+        written, removed = report.names(STATUS_WRITTEN), report.names(STATUS_REMOVED)
+
+        layout = QVBoxLayout(self)
+        if written or removed:
+            text = f"{len(written)} archivos a reescribir, {len(removed)} a eliminar."
+        else:
+            text = "No hay cambios: todos los archivos están al día."
+        if report.errors:
+            text += f"\n{len(report.errors)} archivos con error:\n{report.format_errors()}"
+        summary = QLabel(text)
+        summary.setWordWrap(True)
+        layout.addWidget(summary)
+
+        self.diff_view = QPlainTextEdit()
+        self.diff_view.setReadOnly(True)
+        self.diff_view.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.diff_view.setPlainText(tree.diff())
+        layout.addWidget(self.diff_view)
+
+        buttons = QHBoxLayout()
+        self.apply_button = QPushButton("Aplicar cambios")
+        self.apply_button.setEnabled(bool(written or removed) and report.ok)
+        self.apply_button.clicked.connect(self.accept)
+        close_button = QPushButton("Cerrar")
+        close_button.clicked.connect(self.reject)
+        buttons.addStretch()
+        buttons.addWidget(self.apply_button)
+        buttons.addWidget(close_button)
+        layout.addLayout(buttons)
@@ -10,6 +10,7 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import Qt
 from ui.widgets.numeric_line_edit import NumericLineEdit
+from core.project_state import project_state
 # Clase para mostrar números con hasta 10 decimales y notación científica si excede 3 decimales
 class ScientificDoubleSpinBox(QDoubleSpinBox):
     def __init__(self, parent=None):
@@ -449,15 +450,8 @@ class EspeciesConfigDialog(QDialog):
             self.data["especies_options"] = dlg.data
 
     def _read_constant_json(self):
-        constant_path = os.path.join(os.getcwd(), "temp", "constant.json")
-        if os.path.exists(constant_path):
-            try:
-                with open(constant_path, "r") as f:
-                    data = json.load(f)
-                for key, val in data.items():
-                    self.data[key] = val
-            except Exception:
-                pass
+        for key, val in project_state().section("constant").items():
+            self.data[key] = val
 
     def _write_constant_json(self):
         data_to_save = {
@@ -473,12 +467,7 @@ class EspeciesConfigDialog(QDialog):
             "especies_options": self.case_config.get("especies_options", {}),
             "futureExtension": self.case_config.get("futureExtension", None)
         }
-        constant_path = os.path.join(os.getcwd(), "temp", "constant.json")
-        try:
-            with open(constant_path, "w") as f:
-                json.dump(data_to_save, f, indent=4)
-        except Exception as e:
-            print(f"Error al escribir constant.json: {e}")
+        project_state().update("constant", data_to_save)
 
     def hideEvent(self, event):
         self._write_constant_json()
@@ -657,15 +646,8 @@ class EspeciesConfigDialog(QDialog):
             self.data["especies_options"] = dlg.data
 
     def _read_constant_json(self):
-        constant_path = os.path.join(os.getcwd(), "temp", "constant.json")
-        if os.path.exists(constant_path):
-            try:
-                with open(constant_path, "r") as f:
-                    data = json.load(f)
-                for key, val in data.items():
-                    self.data[key] = val
-            except Exception:
-                pass
+        for key, val in project_state().section("constant").items():
+            self.data[key] = val
 
     def hideEvent(self, event):
         # Si se requiere guardar cambios adicionales, se pueden volcar en self.data aquí
@@ -839,15 +821,8 @@ class EspeciesConfigDialog(QDialog):
             self.data["especies_options"] = dlg.data
 
     def _read_constant_json(self):
-        constant_path = os.path.join(os.getcwd(), "temp", "constant.json")
-        if os.path.exists(constant_path):
-            try:
-                with open(constant_path, "r") as f:
-                    data = json.load(f)
-                for key, val in data.items():
-                    self.data[key] = val
-            except Exception:
-                pass
+        for key, val in project_state().section("constant").items():
+            self.data[key] = val
 
     def hideEvent(self, event):
         super().hideEvent(event)
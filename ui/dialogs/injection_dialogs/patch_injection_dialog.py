@@ -9,7 +9,8 @@ from PyQt5.QtGui import QRegularExpressionValidator
 import os
 import json
 
-from core.boundary_parser import parse_openfoam_boundary
+from core.mesh_index import load_mesh_index
+from core import workspace
 from ui.widgets.numeric_line_edit import NumericLineEdit
 
 class PatchInjectionDialog(QDialog):
@@ -41,7 +42,7 @@ class PatchInjectionDialog(QDialog):
         # Patch Selection
         patch_label = QLabel("Patch:")
         self.patch_combo = QComboBox()
-        # Cargar los patches disponibles usando parse_openfoam_boundary
+        # Cargar los patches disponibles desde el índice de malla
         self.patch_combo.addItems(self.list_boundary_patches())
         current_patch = self.injection_data.get("parameters", {}).get("patch", "")
         if current_patch:
@@ -254,8 +255,8 @@ class PatchInjectionDialog(QDialog):
 
     def list_boundary_patches(self):
         """
-        Lista los patches de boundary en el directorio de trabajo actual utilizando parse_openfoam_boundary.
-        Lee la ruta desde config.json.
+        Lista los patches de boundary en el directorio de trabajo actual a partir
+        del índice de malla (core.mesh_index). Lee la ruta desde config.json.
         """
         # Leer la configuración desde config.json
         config = self.read_config()
@@ -267,13 +268,9 @@ class PatchInjectionDialog(QDialog):
             QMessageBox.critical(self, "Error", "La ruta del directorio de trabajo no está definida en config.json.")
             return []
 
-        # Construir la ruta al archivo boundary
-        case_dir = os.path.join(working_directory, "constant", "polyMesh")
-        boundary_file_path = os.path.join(case_dir, "boundary")
-
         patches = []
         try:
-            boundaries_info = parse_openfoam_boundary(boundary_file_path)
+            boundaries_info = load_mesh_index(working_directory).get("patches", [])
             for boundary in boundaries_info:
                 if boundary.get("type", "").lower() == "patch":
                     patch_name = boundary.get("name", "")
@@ -288,9 +285,9 @@ class PatchInjectionDialog(QDialog):
         """
         Lee el archivo config.json y devuelve la configuración como un diccionario.
         """
-        config_file_path = os.path.join(os.getcwd(), "config.json")
+        config_file_path = workspace.config_path()
         if not os.path.exists(config_file_path):
-            QMessageBox.critical(self, "Error", f"No se encontró el archivo de configuración 'config.json' en {os.getcwd()}.")
+            QMessageBox.critical(self, "Error", f"No se encontró el archivo de configuración 'config.json' en {workspace.project_dir()}.")
             return None
 
         try:
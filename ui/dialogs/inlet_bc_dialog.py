@@ -6,9 +6,17 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import Qt
 import copy
-import os
-import json
 from ui.widgets.numeric_line_edit import NumericLineEdit
+from core.project_state import project_state
+from core.inlet_flow import (
+    FLOW_SPECS, FLOW_SPEC_UNITS, convert_flow, inlet_density, patch_area
+)
+
+FLOW_SPEC_LABELS = {
+    "velocity": "Velocidad",
+    "volumetricFlowRate": "Caudal volumétrico",
+    "massFlowRate": "Caudal másico",
+}
 class ScientificDoubleSpinBox(QDoubleSpinBox):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -23,9 +31,13 @@ class ScientificDoubleSpinBox(QDoubleSpinBox):
             return s
 
 class InletBCDialog(QDialog):
-    def __init__(self, parent=None, turbulenceModel="laminar", chemistryActive=False, chosen_species=None, initial_data=None):
+    def __init__(self, parent=None, turbulenceModel="laminar", chemistryActive=False, chosen_species=None, initial_data=None,
+                 patch_name=None, case_config=None):
         super().__init__(parent)
         self.setWindowTitle("Inlet Boundary Conditions")
+        # Área real del patch (índice de malla) y configuración para la densidad
+        self.case_config = case_config if case_config is not None else project_state().section("case_config")
+        self.patch_area = patch_area(patch_name) if patch_name else None
         self.turbulenceModel = turbulenceModel
         # Extraer el modelo efectivo
         if isinstance(self.turbulenceModel, dict):
@@ -33,29 +45,23 @@ class InletBCDialog(QDialog):
         else:
             self.effective_turbulence_model = self.turbulenceModel.lower()
 
-        # Leer constant.json para actualizar la información de química
-        constant_path = os.path.join("temp", "constant.json")
-        if os.path.exists(constant_path):
-            try:
-                with open(constant_path, "r") as f:
-                    constant_data = json.load(f)
-                if constant_data.get("especiesActive", False):
-                    self.chemistryActive = True
-                    especies_options = constant_data.get("especies_options", {})
-                    self.chosen_species = especies_options.get("activeSpecies", [])
-                else:
-                    self.chemistryActive = False
-                    self.chosen_species = []
-            except Exception as e:
-                print(f"Error al leer constant.json: {e}")
-                self.chemistryActive = chemistryActive
-                self.chosen_species = chosen_species if chosen_species is not None else []
+        # Información de química de la sección 'constant' del estado del proyecto
+        constant_data = project_state().section("constant")
+        if constant_data:
+            if constant_data.get("especiesActive", False):
+                self.chemistryActive = True
+                especies_options = constant_data.get("especies_options", {})
+                self.chosen_species = especies_options.get("activeSpecies", [])
+            else:
+                self.chemistryActive = False
+                self.chosen_species = []
         else:
             self.chemistryActive = chemistryActive
             self.chosen_species = chosen_species if chosen_species is not None else []
 
         default_data = {
             "velocityType": "flowRateInletVelocity",
+            "flowSpec": "volumetricFlowRate",
             "velocityValue": 1.0,
             "velocityInit": 0.0,
             "kType": "turbulentIntensityKineticEnergyInlet",
@@ -100,10 +106,23 @@ class InletBCDialog(QDialog):
         self.vel_type_combo.currentTextChanged.connect(lambda text: None)
         v_layout.addRow("Tipo de velocidad:", self.vel_type_combo)
 
+        self.flow_spec_combo = QComboBox()
+        for spec in FLOW_SPECS:
+            self.flow_spec_combo.addItem(f"{FLOW_SPEC_LABELS[spec]} ({FLOW_SPEC_UNITS[spec]})", spec)
+        self.flow_spec_combo.setCurrentIndex(FLOW_SPECS.index(self.data["flowSpec"]) if self.data["flowSpec"] in FLOW_SPECS else 1)
+        self.flow_spec_combo.currentIndexChanged.connect(self.update_flow_conversion)
+        v_layout.addRow("Magnitud especificada:", self.flow_spec_combo)
+
         self.vel_value = ScientificDoubleSpinBox()
         self.vel_value.setRange(0, 1e5)
         self.vel_value.setValue(self.data["velocityValue"])
-        v_layout.addRow("Flujo/Vel. de entrada (kg/s o m/s):", self.vel_value)
+        self.vel_value.valueChanged.connect(self.update_flow_conversion)
+        v_layout.addRow("Flujo/Vel. de entrada:", self.vel_value)
+
+        # Conversión con el área del patch y la densidad de entrada
+        self.flow_info_label = QLabel("")
+        self.flow_info_label.setWordWrap(True)
+        v_layout.addRow("Conversión:", self.flow_info_label)
 
         self.vel_init = ScientificDoubleSpinBox()
         self.vel_init.setRange(-1e5, 1e5)
@@ -187,6 +206,7 @@ class InletBCDialog(QDialog):
         self.temp_spin.setRange(0, 2000)
         self.temp_spin.setValue(self.data["temperature"])
         self.temp_spin.setSuffix(" K")
+        self.temp_spin.valueChanged.connect(self.update_flow_conversion)
         t_layout.addRow("Temperatura (K):", self.temp_spin)
         tabs.addTab(temp_tab, "Temperatura")
 
@@ -206,6 +226,7 @@ class InletBCDialog(QDialog):
                 sp_value_spin.setSingleStep(0.001)
                 sp_value_spin.setValue(self.data.get(f"{sp}_chemValue", 0.0))
                 sp_value_spin.valueChanged.connect(self.update_total_fraction)
+                sp_value_spin.valueChanged.connect(self.update_flow_conversion)
                 h_layout = QHBoxLayout()
                 h_layout.addWidget(sp_type_combo)
                 h_layout.addWidget(sp_value_spin)
@@ -229,6 +250,38 @@ class InletBCDialog(QDialog):
         btn_layout.addWidget(self.btn_cancel)
         layout.addLayout(btn_layout)
 
+        self.update_flow_conversion()
+
+    def current_inlet_state(self):
+        """Temperatura y fracciones actuales del diálogo, para calcular la densidad."""
+        state = {"temperature": self.temp_spin.value() if hasattr(self, "temp_spin") else self.data["temperature"]}
+        for sp, spin_box in getattr(self, "species_widgets", {}).items():
+            state[f"{sp}_chemValue"] = spin_box.value()
+        return state
+
+    def update_flow_conversion(self):
+        """Muestra la magnitud introducida convertida a velocidad, caudal volumétrico y másico."""
+        if not hasattr(self, "flow_info_label"):
+            return
+        spec = self.flow_spec_combo.currentData()
+        rho, rho_source = inlet_density(self.current_inlet_state(), self.case_config)
+        if self.patch_area is None:
+            self.flow_info_label.setText(
+                f"ρ = {rho:.4g} kg/m³ ({rho_source}). Área del patch no disponible: "
+                "cargue la malla en 'Directorio de trabajo'."
+            )
+            return
+        try:
+            flow = convert_flow(self.vel_value.value(), spec, self.patch_area, rho)
+        except ValueError as e:
+            self.flow_info_label.setText(str(e))
+            return
+        self.flow_info_label.setText(
+            f"A = {self.patch_area:.6g} m², ρ = {rho:.4g} kg/m³ ({rho_source})\n"
+            f"U = {flow['velocity']:.6g} m/s · Q = {flow['volumetricFlowRate']:.6g} m³/s · "
+            f"ṁ = {flow['massFlowRate']:.6g} kg/s"
+        )
+
     def update_total_fraction(self):
         total = 0.0
         for sp, spin_box in self.species_widgets.items():
@@ -242,6 +295,7 @@ class InletBCDialog(QDialog):
 
     def accept_changes(self):
         self.data["velocityType"] = self.vel_type_combo.currentText()
+        self.data["flowSpec"] = self.flow_spec_combo.currentData()
         self.data["velocityValue"] = self.vel_value.value()
         self.data["velocityInit"] = self.vel_init.value()
 
@@ -1,7 +1,5 @@
 # ui/dialogs/inletOutlet_bc_dialog.py
 
-import os
-import json
 import copy
 
 from PyQt5.QtWidgets import (
@@ -10,6 +8,7 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import Qt
 from ui.widgets.numeric_line_edit import NumericLineEdit
+from core.project_state import project_state
 class InletOutletBCDialog(QDialog):
     def __init__(self, parent=None, turbulenceModel="laminar",
                  chemistryActive=False, chosen_species=None, initial_data=None):
@@ -26,17 +25,11 @@ class InletOutletBCDialog(QDialog):
         else:
             self.effective_turbulence_model = turbulenceModel.lower()
 
-        # Leer configuración de química si existe
-        constant_path = os.path.join("temp", "constant.json")
-        if os.path.exists(constant_path):
-            try:
-                with open(constant_path, "r") as f:
-                    cd = json.load(f)
-                self.chemistryActive = cd.get("especiesActive", False)
-                self.chosen_species = cd.get("especies_options", {}).get("activeSpecies", [])
-            except Exception:
-                self.chemistryActive = chemistryActive
-                self.chosen_species = chosen_species or []
+        # Configuración de química de la sección 'constant', si existe
+        cd = project_state().section("constant")
+        if cd:
+            self.chemistryActive = cd.get("especiesActive", False)
+            self.chosen_species = cd.get("especies_options", {}).get("activeSpecies", [])
         else:
             self.chemistryActive = chemistryActive
             self.chosen_species = chosen_species or []
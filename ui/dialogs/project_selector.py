@@ -0,0 +1,131 @@
+# ui/dialogs/project_selector.py
+
+import os
+import time
+
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget,
+    QTableWidgetItem, QFileDialog, QMessageBox, QAbstractItemView, QHeaderView
+)
+
+from core import workspace
+
+
+class ProjectSelectorDialog(QDialog):
+    """
+    Pantalla de inicio: lista los proyectos recientes con su resumen guardado
+    (malla, solver, última ejecución). Sólo lee el índice del espacio de
+    trabajo; ningún proyecto se abre hasta elegirlo.
+    Tras exec_() == Accepted, 'project_dir' es el directorio elegido.
+    """
+    COLUMNS = ["Proyecto", "Solver", "Celdas", "Última ejecución", "Abierto", "Ruta"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Proyectos OpenFOAM")
+        self.resize(900, 420)
+        self.project_dir = None
+        self.projects = workspace.recent_projects()
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel("Proyectos recientes:"))
+
+        self.table = QTableWidget(len(self.projects), len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.verticalHeader().setVisible(False)
+        for row, project in enumerate(self.projects):
+            for col, text in enumerate(self.row_texts(project)):
+                self.table.setItem(row, col, QTableWidgetItem(text))
+        if self.projects:
+            self.table.selectRow(0)
+        self.table.doubleClicked.connect(self.open_selected)
+        layout.addWidget(self.table)
+
+        buttons = QHBoxLayout()
+        self.open_button = QPushButton("Abrir")
+        self.open_button.setEnabled(bool(self.projects))
+        self.open_button.clicked.connect(self.open_selected)
+        folder_button = QPushButton("Abrir carpeta…")
+        folder_button.clicked.connect(self.open_folder)
+        new_button = QPushButton("Nuevo proyecto…")
+        new_button.clicked.connect(self.new_project)
+        forget_button = QPushButton("Quitar de la lista")
+        forget_button.clicked.connect(self.forget_selected)
+        cancel_button = QPushButton("Cancelar")
+        cancel_button.clicked.connect(self.reject)
+        for button in (self.open_button, folder_button, new_button, forget_button):
+            buttons.addWidget(button)
+        buttons.addStretch()
+        buttons.addWidget(cancel_button)
+        layout.addLayout(buttons)
+
+    @staticmethod
+    def row_texts(project):
+        summary = project.get("summary", {})
+        cells = summary.get("mesh", {}).get("nCells")
+        last_run = summary.get("last_run") or {}
+        run_text = ""
+        if last_run:
+            run_text = f"{last_run.get('status', '')} ({time.strftime('%d/%m/%Y %H:%M', time.localtime(last_run.get('time', 0)))})"
+        opened = project.get("last_opened")
+        return [
+            project.get("name", ""),
+            summary.get("solver", ""),
+            f"{cells:,}" if cells is not None else "",
+            run_text,
+            time.strftime("%d/%m/%Y %H:%M", time.localtime(opened)) if opened else "",
+            project.get("path", ""),
+        ]
+
+    def selected_project(self):
+        rows = self.table.selectionModel().selectedRows()
+        return self.projects[rows[0].row()] if rows else None
+
+    def choose(self, root):
+        self.project_dir = root
+        self.accept()
+
+    def open_selected(self):
+        project = self.selected_project()
+        if project is None:
+            return
+        if not os.path.isdir(project["path"]):
+            QMessageBox.warning(self, "Proyecto no encontrado",
+                                f"El directorio del proyecto ya no existe:\n{project['path']}")
+            return
+        self.choose(project["path"])
+
+    def open_folder(self):
+        root = QFileDialog.getExistingDirectory(self, "Abrir proyecto", workspace.project_dir())
+        if not root:
+            return
+        if not os.path.exists(workspace.config_path(root)):
+            QMessageBox.warning(self, "Proyecto no válido",
+                                f"No se encontró 'config.json' en:\n{root}\n\nUse 'Nuevo proyecto…' para crearlo.")
+            return
+        self.choose(root)
+
+    def new_project(self):
+        root = QFileDialog.getExistingDirectory(self, "Directorio del nuevo proyecto", workspace.project_dir())
+        if not root:
+            return
+        case_dir = QFileDialog.getExistingDirectory(self, "Directorio del caso OpenFOAM (con constant/polyMesh)", root)
+        if not case_dir:
+            return
+        workspace.create_project(root, working_directory=case_dir)
+        self.choose(root)
+
+    def forget_selected(self):
+        project = self.selected_project()
+        if project is None:
+            return
+        workspace.forget(project["path"])
+        row = self.projects.index(project)
+        self.projects.pop(row)
+        self.table.removeRow(row)
+        self.open_button.setEnabled(bool(self.projects))
@@ -1,15 +1,16 @@
 # ui/dialogs/wall_bc_dialog.py
 
-import os
-import json
 import copy
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QTabWidget, QWidget, QGroupBox,
     QFormLayout, QLabel, QComboBox, QCheckBox,
-    QDialogButtonBox
+    QDialogButtonBox, QPushButton
 )
 from PyQt5.QtCore import Qt
 from ui.widgets.numeric_line_edit import NumericLineEdit
+from core.project_state import project_state
+from core.inlet_flow import read_working_directory
+from core.wall_yplus import wall_yplus_report
 
 
 class WallBCDialog(QDialog):
@@ -20,17 +21,21 @@ class WallBCDialog(QDialog):
       2. Temperatura
       3. Especies (si aplica)
     Sólo aparecen los parámetros del modelo de turbulencia elegido.
-    Al aceptar, guarda en temp/boundary_conditions.json.
+    Al aceptar, guarda en la sección boundary_conditions del estado del proyecto.
     """
 
     def __init__(self, parent=None,
                  turbulenceModel="laminar",
                  chemistryActive=False,
                  chosen_species=None,
-                 initial_data=None):
+                 initial_data=None,
+                 patch_name=None,
+                 case_config=None):
         super().__init__(parent)
         self.setWindowTitle("Wall Boundary Conditions")
         self.resize(500, 450)
+        self.patch_name = patch_name or (initial_data or {}).get("name", "")
+        self.case_config = case_config if case_config is not None else project_state().section("case_config")
 
         # 1) Determinar modelo de turbulencia preferido
         if turbulenceModel:
@@ -40,17 +45,11 @@ class WallBCDialog(QDialog):
                 else turbulenceModel.lower()
             )
         else:
-            const_path = os.path.join("temp", "constant.json")
-            if os.path.exists(const_path):
-                with open(const_path, "r") as f:
-                    const = json.load(f)
-                self.effective_turbulence_model = (
-                    const.get("solverSettings", {})
-                         .get("turbulenceModel", "laminar")
-                         .lower()
-                )
-            else:
-                self.effective_turbulence_model = "laminar"
+            self.effective_turbulence_model = (
+                project_state().get("constant", "solverSettings", {})
+                               .get("turbulenceModel", "laminar")
+                               .lower()
+            )
 
         # 2) Química
         self.chemistryActive = chemistryActive
@@ -74,7 +73,9 @@ class WallBCDialog(QDialog):
             "kappa":                0.41,
             "E":                    9.8,
             "thermalType":          "fixedValue",
-            "wallTemperature":      300.0
+            "wallTemperature":      300.0,
+            "nutType":              "nutkWallFunction",
+            "autoWallTreatment":    True
         }
         if self.chemistryActive:
             for sp in self.chosen_species:
@@ -88,9 +89,26 @@ class WallBCDialog(QDialog):
                 data[k] = v
         self.data = data
 
-        # 5) Construir y cargar UI
+        # 5) Estimación de y+ a partir de la malla
+        self.yplus_report = self._compute_yplus_report()
+
+        # 6) Construir y cargar UI
         self._build_ui()
         self._load_data()
+        if self.turb_g and self.data["autoWallTreatment"]:
+            self._applySuggestion()
+
+    def _compute_yplus_report(self):
+        if self.effective_turbulence_model == "laminar" or not self.patch_name:
+            return None
+        working_directory = read_working_directory()
+        if not working_directory:
+            return None
+        try:
+            return wall_yplus_report(self.patch_name, self.case_config, working_directory)
+        except Exception as e:
+            print(f"WallBCDialog: no se pudo estimar y+: {e}")
+            return None
 
     def _build_ui(self):
         layout = QVBoxLayout(self)
@@ -159,6 +177,23 @@ class WallBCDialog(QDialog):
             turb_g.setLayout(f_t)
             v1.addWidget(turb_g)
             self.turb_g = turb_g
+
+            # Estimación de y+ y tratamiento sugerido
+            yplus_g = QGroupBox("Primera celda e y+ estimado")
+            f_y = QFormLayout()
+            self.yplusLabel = QLabel(self._yplusText())
+            self.yplusLabel.setWordWrap(True)
+            f_y.addRow(self.yplusLabel)
+            self.autoWT = QCheckBox("Seleccionar automáticamente según y+")
+            f_y.addRow(self.autoWT)
+            self.applyWT = QPushButton("Aplicar sugerencia")
+            self.applyWT.clicked.connect(self._applySuggestion)
+            f_y.addRow(self.applyWT)
+            has_suggestion = bool(self.yplus_report and self.yplus_report["suggestion"])
+            self.autoWT.setEnabled(has_suggestion)
+            self.applyWT.setEnabled(has_suggestion)
+            yplus_g.setLayout(f_y)
+            v1.addWidget(yplus_g)
         else:
             self.turb_g = None
 
@@ -228,6 +263,38 @@ class WallBCDialog(QDialog):
         if self.chemistryActive:
             for sp, w in self.specEdits.items():
                 w.setText(str(d.get(f"{sp}_chemValue", "")))
+        if self.turb_g:
+            self.autoWT.setChecked(bool(d["autoWallTreatment"]))
+
+    def _yplusText(self):
+        r = self.yplus_report
+        if not r:
+            return "Sin datos de malla para este patch (cargue la malla en 'Directorio de trabajo')."
+        h = r["heights"]
+        text = f"Altura primera celda: mín. {h['min']:.3g} m · media {h['mean']:.3g} m · máx. {h['max']:.3g} m"
+        if not r["yPlus"]:
+            return text + "\nNo se puede estimar y+: defina la velocidad o el caudal de algún inlet."
+        y = r["yPlus"]
+        text += (f"\nU = {r['velocity']:.3g} m/s, L = {r['length']:.3g} m, ρ = {r['density']:.3g} kg/m³, "
+                 f"μ = {r['viscosity']:.3g} Pa·s")
+        text += f"\ny+ estimado: mín. {y['min']:.3g} · medio {y['mean']:.3g} · máx. {y['max']:.3g}"
+        text += f"\n{r['suggestion']['message']}"
+        return text
+
+    def _applySuggestion(self):
+        """Selecciona el tratamiento de pared sugerido para el y+ estimado."""
+        if not self.turb_g or not self.yplus_report or not self.yplus_report["suggestion"]:
+            return
+        s = self.yplus_report["suggestion"]
+        self.useWF.setChecked(s["useWallFunctions"])
+        self.kType.setCurrentText(s["kType"])
+        if s["kType"] == "fixedValue" and s["regime"] == "viscous":
+            self.kValue.setText("0")
+        if self.effective_turbulence_model == "kepsilon" and "epsilonType" in s:
+            self.epsType.setCurrentText(s["epsilonType"])
+        if self.effective_turbulence_model == "komega" and "omegaType" in s:
+            self.omegaType.setCurrentText(s["omegaType"])
+        self.data["nutType"] = s["nutType"]
 
     def _onSlipChanged(self, text):
         self.slipVel.setEnabled(text == "movingWallVelocity")
@@ -283,24 +350,18 @@ class WallBCDialog(QDialog):
                                      if (self.effective_turbulence_model=="komega"
                                          and self.omegaType.currentText()=="omegaWallFunction") else None,
             "thermalType":          self.thermalType.currentText(),
-            "wallTemperature":      float(self.tempEdit.text())
+            "wallTemperature":      float(self.tempEdit.text()),
+            "autoWallTreatment":    bool(self.turb_g and self.autoWT.isChecked())
         })
         if self.chemistryActive:
             for sp, w in self.specEdits.items():
                 d[f"{sp}_chemType"]  = "fixedValue"
                 d[f"{sp}_chemValue"] = float(w.text())
 
-        # Guardar en temp/boundary_conditions.json
-        bc_path = os.path.join("temp", "boundary_conditions.json")
-        all_bc = {}
-        if os.path.exists(bc_path):
-            with open(bc_path, "r") as f:
-                all_bc = json.load(f)
+        # Guardar en la sección boundary_conditions (se persiste en segundo plano)
         name = d.get("name")
         if name:
-            all_bc[name] = d
-            with open(bc_path, "w") as f:
-                json.dump(all_bc, f, indent=2)
+            project_state().update("boundary_conditions", {name: d})
 
         super().accept()
 
@@ -4,9 +4,10 @@ import os
 import logging
 from PyQt5.QtWidgets import (
     QWidget, QHBoxLayout, QTreeWidget, QStackedWidget, QMessageBox,
-    QSplitter
+    QSplitter, QShortcut, QFileDialog, QDialog, QApplication
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QObject, pyqtSignal
+from PyQt5.QtGui import QKeySequence
 
 from ui.tree_builder import TreeBuilder
 from ui.sections.directorio_trabajo import DirectorioTrabajo
@@ -23,12 +24,23 @@ from ui.sections.console_panel    import ConsolePanel, QtHandler
 from ui.sections.visualizer_panel import VisualizerPanel
 
 from core.json_manager import JSONManager
+from core.autosave import autosave_service
+from core.project_state import project_state
+from core.history import CaseHistory
+from core.bundle import save_bundle, BUNDLE_EXT
+from core import workspace
+from ui.dialogs.project_selector import ProjectSelectorDialog
+
+
+class AutosaveNotifier(QObject):
+    """Lleva los errores del hilo de auto-guardado al hilo de la GUI."""
+    save_failed = pyqtSignal(str, str)
 
 
 class MainWindow(QWidget):
     def __init__(self):
         super().__init__()
-        self.setWindowTitle("OpenFOAM Setup Interface")
+        self.setWindowTitle(f"OpenFOAM Setup Interface — {os.path.basename(workspace.project_dir())}")
         self.resize(1200, 800)
 
         # Aplicar un stylesheet más elegante
@@ -87,7 +99,7 @@ class MainWindow(QWidget):
         self.page_discrete_phase = FaseDiscreta(self.case_config)
         self.page_methods        = Methods(self.case_config)
         self.page_controls       = Controls(self.case_config)
-        self.page_inicializacion = Inicializacion(os.path.join(os.getcwd(), "temp"))
+        self.page_inicializacion = Inicializacion(workspace.data_dir())
         self.page_run_calc       = RunCalculation(self.case_config)
 
         for pg in [
@@ -140,18 +152,34 @@ class MainWindow(QWidget):
         if first:
             self.tree.setCurrentItem(first)
 
-        # Auto-guardado
+        # Auto-guardado (fvSchemes, fvSolution y controlDict los guardan las
+        # propias páginas a través del servicio de auto-guardado)
         self.page_bc.data_changed.connect(self.auto_save_boundary_conditions)
         self.page_materiales.data_changed.connect(self.auto_save_materiales)
-        self.page_methods.data_changed.connect(self.auto_save_methods)
-        self.page_controls.data_changed.connect(self.auto_save_controls)
-        self.page_run_calc.data_changed.connect(self.auto_save_run_calc)
+        self.autosave_notifier = AutosaveNotifier(self)
+        self.autosave_notifier.save_failed.connect(self.on_autosave_failed)
+        autosave_service().on_error = self.autosave_notifier.save_failed.emit
         self.page_directorio.boundaries_loaded.connect(self.sync_boundary_conditions)
 
+        # Historial deshacer/rehacer de case_config. La versión inicial es la
+        # ya cargada por las páginas; cada página registra sus propias claves
+        # al cambiar y el resto se registra al cambiar de página.
+        self.history = CaseHistory(self.case_config)
+        self.page_bc.data_changed.connect(
+            lambda: self.record_history("Condiciones de contorno", BoundaryConditions.HISTORY_KEYS))
+        self.page_materiales.data_changed.connect(
+            lambda: self.record_history("Materiales", Materiales.HISTORY_KEYS))
+        self.page_discrete_phase.data_changed.connect(
+            lambda: self.record_history("Fase discreta", FaseDiscreta.HISTORY_KEYS))
+        QShortcut(QKeySequence.Undo, self, activated=self.undo)
+        QShortcut(QKeySequence.Redo, self, activated=self.redo)
+        QShortcut(QKeySequence.Save, self, activated=self.save_project_bundle)
+        QShortcut(QKeySequence.Open, self, activated=self.switch_project)
+
         # Logging → consola
-        handler = QtHandler(self.console.log_widget)
-        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s: %(message)s"))
-        logging.getLogger().addHandler(handler)
+        self.log_handler = QtHandler(self.console.log_widget)
+        self.log_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s: %(message)s"))
+        logging.getLogger().addHandler(self.log_handler)
         logging.getLogger().setLevel(logging.INFO)
 
     def load_case_config(self):
@@ -171,15 +199,16 @@ class MainWindow(QWidget):
             },
             "fvSchemes": {}, "fvSolution": {}
         }
-        path = self.json_manager.get_file_path("case_config")
-        if os.path.exists(path):
-            loaded = self.json_manager.load_section("case_config") or {}
+        loaded = project_state().section("case_config")
+        if loaded:
             defaults.update(loaded)
         else:
-            self.json_manager.save_section("case_config", defaults)
+            project_state().replace("case_config", defaults)
         return defaults
 
     def on_tree_item_changed(self, current, previous):
+        if previous is not None:
+            self.record_history(previous.text(0))
         for key, item in self.tree_items.items():
             if item is current:
                 page = self.page_map.get(key)
@@ -208,20 +237,92 @@ class MainWindow(QWidget):
     def auto_save_materiales(self):
         self.page_materiales.save_materiales()
 
-    def auto_save_methods(self):
-        schemes = self.case_config.get("fvSchemes", {})
-        success, msg = self.json_manager.save_section("fvSchemes", schemes)
-        if not success:
-            QMessageBox.critical(self, "Error guardando fvSchemes", msg)
-
-    def auto_save_controls(self):
-        sol = self.case_config.get("fvSolution", {})
-        success, msg = self.json_manager.save_section("fvSolution", sol)
-        if not success:
-            QMessageBox.critical(self, "Error guardando fvSolution", msg)
-
-    def auto_save_run_calc(self):
-        cd = self.case_config.get("controlDict", {})
-        success, msg = self.json_manager.save_section("controlDict", cd)
-        if not success:
-            QMessageBox.critical(self, "Error guardando controlDict", msg)
+    def record_history(self, label="", keys=None):
+        """
+        Registra en el historial los cambios de case_config. Con 'keys' sólo
+        se comparan esas claves de primer nivel; sin ellas, todo case_config.
+        """
+        paths = None if keys is None else [(key,) for key in keys]
+        return self.history.commit(self.case_config, label, paths=paths)
+
+    def undo(self):
+        # Lo editado y aún sin registrar forma su propio paso, que es el que se deshace
+        self.record_history("Cambios sin registrar")
+        step = self.history.undo(self.case_config)
+        if step is None:
+            logging.info("[historial] Nada que deshacer.")
+            return
+        logging.info(f"[historial] Deshecho: {step.label}")
+        self.refresh_after_history(step)
+
+    def redo(self):
+        if self.record_history("Cambios sin registrar"):
+            # Una edición nueva invalida lo que quedaba por rehacer
+            logging.info("[historial] Nada que rehacer.")
+            return
+        step = self.history.redo(self.case_config)
+        if step is None:
+            logging.info("[historial] Nada que rehacer.")
+            return
+        logging.info(f"[historial] Rehecho: {step.label}")
+        self.refresh_after_history(step)
+
+    def refresh_after_history(self, step):
+        """Tras deshacer/rehacer: las páginas refrescan sus widgets y se persiste."""
+        paths = CaseHistory.changed_paths(step)
+        for page in self.page_map.values():
+            if hasattr(page, "refresh_from_case_config"):
+                page.refresh_from_case_config(paths)
+        project_state().replace("case_config", self.case_config)
+
+    def save_project_bundle(self):
+        """Guarda el proyecto completo (secciones, config.json y DP0) en un archivo .ofgui."""
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Guardar proyecto", workspace.project_dir(), f"Proyecto OpenFOAM GUI (*{BUNDLE_EXT})")
+        if not path:
+            return
+        if not path.endswith(BUNDLE_EXT):
+            path += BUNDLE_EXT
+        try:
+            project_state().flush()
+            save_bundle(path)
+        except Exception as e:
+            logging.error(f"Error al guardar el proyecto en {path}: {e}")
+            QMessageBox.critical(self, "Error", f"No se pudo guardar el proyecto:\n{e}")
+            return
+        QMessageBox.information(self, "Proyecto guardado", f"Proyecto guardado en:\n{path}")
+
+    def switch_project(self):
+        """
+        Cambia de proyecto: se cierra esta ventana (guardando lo pendiente) y
+        se abre otra sobre el proyecto elegido. El estado en memoria de cada
+        proyecto se conserva, así que volver a uno ya abierto no relee el disco.
+        """
+        dialog = ProjectSelectorDialog(self)
+        if dialog.exec_() != QDialog.Accepted:
+            return
+        self.close()
+        workspace.activate(dialog.project_dir)
+        window = MainWindow()
+        QApplication.instance().main_window = window
+        window.show()
+
+    def update_project_summary(self):
+        """Guarda en el índice de proyectos recientes el resumen que muestra la pantalla de inicio."""
+        summary = {"solver": self.case_config.get("solverSettings", {}).get("solver", "")}
+        counts = self.page_directorio.mesh_counts
+        if counts:
+            summary["mesh"] = {"nCells": counts.get("nCells", 0),
+                               "nPatches": len(self.page_directorio.boundaries_info)}
+        workspace.update_summary(**summary)
+
+    def on_autosave_failed(self, section_name, msg):
+        logging.error(f"[autosave] {msg}")
+        QMessageBox.critical(self, f"Error guardando {section_name}", msg)
+
+    def closeEvent(self, event):
+        # Vuelca también lo que quede por leer de un bundle abierto
+        project_state().flush()
+        self.update_project_summary()
+        logging.getLogger().removeHandler(self.log_handler)
+        super().closeEvent(event)
@@ -1,6 +1,5 @@
 # ui/sections/boundary_conditions.py
 
-import os
 import json
 import logging
 
@@ -14,7 +13,7 @@ from PyQt5.QtCore import Qt, pyqtSignal
 from ui.dialogs.wall_bc_dialog import WallBCDialog
 from ui.dialogs.inlet_bc_dialog import InletBCDialog
 from ui.dialogs.inlet_outlet_bc_dialog import InletOutletBCDialog
-from core.json_manager import JSONManager  # Manejo de JSON
+from core.project_state import project_state
 
 
 class ComboBoxDelegate(QStyledItemDelegate):
@@ -62,24 +61,33 @@ class BoundaryConditions(QWidget):
     (opciones: Inlet, Outlet, Wall, Symmetry y Periodicity). Además, se configuran variables ambientales como la
     presión y la temperatura. Doble clic sobre una frontera abrirá su ventana de configuración específica.
     
-    La configuración del modelo se carga desde 'temp/constant.json'. Por ejemplo, si en constant.json se establece
-    "especiesActive": true, se asignarán las especies activas al parámetro chosen_species.
+    La configuración del modelo se toma de la sección 'constant' del estado del proyecto (core/project_state.py).
+    Por ejemplo, si en constant se establece "especiesActive": true, se asignarán las especies activas al
+    parámetro chosen_species. La página se suscribe a los cambios de esas claves, de modo que lo que se
+    modifique en Modelos se refleja aquí sin releer constant.json.
     
     Además, si la opción de química no está activada, se eliminará toda la información relacionada con las especies
     al guardar boundary_conditions.json (el archivo se sobrescribe por completo con la última información de la interfaz).
     """
     data_changed = pyqtSignal()
 
+    # Claves de case_config que edita esta página (historial deshacer/rehacer)
+    HISTORY_KEYS = ("boundaryConditions", "ambientPressure", "ambientTemperature")
+
     def __init__(self, case_config):
         super().__init__()
         self.case_config = case_config
-        self.json_manager = JSONManager()
         self.section_name = "boundary_conditions"
 
         self.init_ui()
         self.load_model_config()
         self.load_data()
 
+        # Reaccionar a los cambios de modelo hechos en otras páginas
+        state = project_state()
+        for key in ("turbulenceModel", "especiesActive", "especies_options"):
+            state.subscribe("constant", key, lambda *_: self.load_model_config())
+
     def init_ui(self):
         layout = QVBoxLayout(self)
 
@@ -138,11 +146,9 @@ class BoundaryConditions(QWidget):
         self.update_bc_tree()
 
     def load_model_config(self):
-        constant_path = os.path.join("temp", "constant.json")
-        if os.path.exists(constant_path):
+        model_config = project_state().section("constant")
+        if model_config:
             try:
-                with open(constant_path, "r") as f:
-                    model_config = json.load(f)
                 self.case_config["turbulenceModel"] = model_config.get("turbulenceModel", "laminar")
                 if isinstance(self.case_config["turbulenceModel"], dict):
                     tm = self.case_config["turbulenceModel"].get("model", "laminar")
@@ -155,9 +161,9 @@ class BoundaryConditions(QWidget):
                     self.case_config["chosen_species"] = especies_options.get("activeSpecies", [])
                 else:
                     self.case_config["chosen_species"] = []
-                logging.info("Configuración del modelo cargada desde constant.json")
+                logging.info("Configuración del modelo cargada desde constant")
             except Exception as e:
-                logging.error(f"Error al leer constant.json: {e}")
+                logging.error(f"Error al interpretar constant: {e}")
         else:
             logging.info("No se encontró constant.json. Se usarán valores por defecto.")
 
@@ -201,7 +207,9 @@ class BoundaryConditions(QWidget):
                 turbulenceModel=turbulence_model,
                 chemistryActive=chemistryActive,
                 chosen_species=chosen_species,
-                initial_data=bc_data
+                initial_data=bc_data,
+                patch_name=bname,
+                case_config=self.case_config
             )
         elif btype == "outlet":
             dlg = InletOutletBCDialog(
@@ -217,7 +225,9 @@ class BoundaryConditions(QWidget):
                 turbulenceModel=turbulence_model,
                 chemistryActive=chemistryActive,
                 chosen_species=chosen_species,
-                initial_data=bc_data
+                initial_data=bc_data,
+                patch_name=bname,
+                case_config=self.case_config
             )
         elif btype in ("symmetry", "periodicity"):
             QMessageBox.information(
@@ -306,19 +316,11 @@ class BoundaryConditions(QWidget):
 
     def save_boundary_conditions(self):
         data = self.collect_data()
-        success, msg = self.json_manager.save_section(self.section_name, data)
-        if success:
+        if project_state().replace(self.section_name, data):
             logging.info("Boundary Conditions guardadas automáticamente.")
-        else:
-            logging.error(f"Error al guardar Boundary Conditions: {msg}")
 
     def load_data(self):
-        temp_dir = "temp"
-        json_path = os.path.join(temp_dir, "boundary_conditions.json")
-        if os.path.exists(json_path):
-            data = self.json_manager.load_section(self.section_name)
-        else:
-            data = None
+        data = project_state().section(self.section_name)
 
         if data:
             self.case_config["ambientPressure"] = data.get("ambientPressure", 101325)
@@ -335,6 +337,15 @@ class BoundaryConditions(QWidget):
             logging.info("No se encontró boundary_conditions.json. Usando valores por defecto.")
             self.update_bc_tree()
 
+    def refresh_from_case_config(self, paths):
+        """Tras deshacer/rehacer: vuelve a mostrar case_config y guarda boundary_conditions."""
+        if not any(path[0] in self.HISTORY_KEYS for path in paths if path):
+            return
+        self.pressure_input.setText(str(self.case_config.get("ambientPressure", 101325)))
+        self.temperature_input.setText(str(self.case_config.get("ambientTemperature", 300.0)))
+        self.update_bc_tree()
+        self.save_boundary_conditions()
+
     def hideEvent(self, event):
         self.save_boundary_conditions()
         super().hideEvent(event)
@@ -355,12 +366,5 @@ class BoundaryConditions(QWidget):
             self.case_config["especies_options"] = dlg.data
 
     def _read_constant_json(self):
-        constant_path = os.path.join(os.getcwd(), "temp", "constant.json")
-        if os.path.exists(constant_path):
-            try:
-                with open(constant_path, "r") as f:
-                    data = json.load(f)
-                for key, val in data.items():
-                    self.case_config[key] = val
-            except Exception:
-                pass
+        for key, val in project_state().section("constant").items():
+            self.case_config[key] = val
@@ -6,7 +6,7 @@ from PyQt5.QtWidgets import (
     QScrollArea
 )
 from PyQt5.QtCore import Qt, pyqtSignal
-from core.json_manager import JSONManager
+from core.project_state import project_state
 from ui.widgets.numeric_line_edit import NumericLineEdit
 
 class Controls(QWidget):
@@ -20,10 +20,10 @@ class Controls(QWidget):
     def __init__(self, case_config):
         super().__init__()
         self.case_config = case_config
-        self.json = JSONManager()
+        self.state = project_state()
 
         # Cargar o inicializar fvSolution
-        stored = self.json.load_section("fvSolution") or {}
+        stored = self.state.section("fvSolution")
         self.case_config.setdefault("fvSolution", {})
         self.case_config["fvSolution"].update(stored)
 
@@ -270,5 +270,5 @@ class Controls(QWidget):
             }
         }
         self.case_config["fvSolution"] = fvSol
-        self.json.save_section("fvSolution", fvSol)
+        self.state.replace("fvSolution", fvSol)
         self.data_changed.emit()
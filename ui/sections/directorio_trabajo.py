@@ -1,13 +1,16 @@
 # ui/sections/directorio_trabajo.py
 
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QPushButton, QTableWidget, QTableWidgetItem, QMessageBox
+    QWidget, QVBoxLayout, QPushButton, QTableWidget, QTableWidgetItem, QMessageBox,
+    QLabel, QApplication
 )
 from PyQt5.QtCore import Qt, pyqtSignal
 import os
 import json
 
-from core.boundary_parser import parse_openfoam_boundary
+from core.mesh_index import load_mesh_index
+from core.mesh_quality import load_mesh_quality
+from core import workspace
 
 
 class DirectorioTrabajo(QWidget):
@@ -17,6 +20,10 @@ class DirectorioTrabajo(QWidget):
         super().__init__()
         self.case_config = case_config
         self.boundaries_info = []
+        self.mesh_counts = {}
+        self.mesh_index = None
+        self.mesh_quality = None
+        self.working_directory = None
 
         self.init_ui()
 
@@ -27,11 +34,23 @@ class DirectorioTrabajo(QWidget):
         self.load_button.clicked.connect(self.load_boundaries)
         layout.addWidget(self.load_button)
 
+        self.mesh_label = QLabel("")
+        layout.addWidget(self.mesh_label)
+
         self.table = QTableWidget()
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels(["Name", "Type", "nFaces", "startFace"])
+        self.table.setColumnCount(5)
+        self.table.setHorizontalHeaderLabels(["Name", "Type", "nFaces", "startFace", "Área (m²)"])
         layout.addWidget(self.table)
 
+        self.quality_button = QPushButton("Comprobar calidad de malla")
+        self.quality_button.setEnabled(False)
+        self.quality_button.clicked.connect(self.run_mesh_quality)
+        layout.addWidget(self.quality_button)
+
+        self.quality_label = QLabel("")
+        self.quality_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        layout.addWidget(self.quality_label)
+
         self.setLayout(layout)
 
     def load_boundaries(self):
@@ -57,11 +76,13 @@ class DirectorioTrabajo(QWidget):
             QMessageBox.critical(self, "Error", f"No se encontró el archivo boundary en la ruta:\n{boundary_file_path}")
             return
 
+        # El índice de malla sólo se reconstruye si polyMesh ha cambiado
         try:
-            self.boundaries_info = parse_openfoam_boundary(boundary_file_path)
+            self.mesh_index = load_mesh_index(working_directory)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"No se pudo parsear el archivo boundary:\n{str(e)}")
             return
+        self.boundaries_info = self.mesh_index.get("patches", [])
 
         # Actualizar la tabla con la información de las boundaries
         self.table.setRowCount(len(self.boundaries_info))
@@ -70,17 +91,100 @@ class DirectorioTrabajo(QWidget):
             self.table.setItem(row, 1, QTableWidgetItem(boundary.get("type", "")))
             self.table.setItem(row, 2, QTableWidgetItem(str(boundary.get("nFaces", ""))))
             self.table.setItem(row, 3, QTableWidgetItem(str(boundary.get("startFace", ""))))
+            area = boundary.get("area")
+            self.table.setItem(row, 4, QTableWidgetItem(f"{area:.6g}" if area is not None else ""))
+
+        self.update_mesh_counts()
+
+        # Calidad de malla: sólo se muestra si ya está calculada para esta malla
+        self.working_directory = working_directory
+        self.quality_button.setEnabled(bool(self.mesh_counts))
+        try:
+            self.mesh_quality = load_mesh_quality(working_directory, compute=False)
+        except Exception:
+            self.mesh_quality = None
+        self.update_mesh_quality()
 
         # Emitir señal para sincronizar boundaryConditions
         self.boundaries_loaded.emit()
 
+    def update_mesh_counts(self):
+        """
+        Muestra el tamaño y la bounding box de la malla a partir del índice.
+        """
+        self.mesh_counts = (self.mesh_index or {}).get("counts", {})
+        if not self.mesh_counts:
+            self.mesh_label.setText("Malla incompleta: sólo se ha encontrado el archivo boundary.")
+            return
+
+        text = (
+            f"Celdas: {self.mesh_counts.get('nCells', 0):,} · "
+            f"Caras: {self.mesh_counts.get('nFaces', 0):,} "
+            f"({self.mesh_counts.get('nInternalFaces', 0):,} internas) · "
+            f"Puntos: {self.mesh_counts.get('nPoints', 0):,}"
+        )
+        bbox = self.mesh_index.get("boundingBox")
+        if bbox:
+            lo = ", ".join(f"{v:.4g}" for v in bbox["min"])
+            hi = ", ".join(f"{v:.4g}" for v in bbox["max"])
+            text += f"\nBounding box: ({lo}) – ({hi})"
+        self.mesh_label.setText(text)
+
+    def run_mesh_quality(self):
+        """
+        Calcula (o recupera de la caché del proyecto) la calidad de la malla.
+        """
+        if not self.working_directory:
+            return
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            self.mesh_quality = load_mesh_quality(self.working_directory)
+        except Exception as e:
+            QApplication.restoreOverrideCursor()
+            QMessageBox.critical(self, "Error", f"No se pudo calcular la calidad de la malla:\n{str(e)}")
+            return
+        QApplication.restoreOverrideCursor()
+        self.update_mesh_quality()
+
+    def update_mesh_quality(self):
+        """
+        Muestra el resumen del informe de calidad (equivalente a checkMesh).
+        """
+        q = self.mesh_quality
+        if not q:
+            self.quality_label.setText("")
+            return
+
+        non_ortho = q["nonOrthogonality"]
+        lines = [
+            f"No ortogonalidad: máx. {non_ortho['max']:.2f}° · media {non_ortho['average']:.2f}° · "
+            f"{non_ortho['nSevere']} caras > {non_ortho['threshold']:g}°",
+            f"Skewness: máx. {q['skewness']['max']:.3g} · {q['skewness']['nSevere']} caras > {q['skewness']['threshold']:g}",
+            f"Aspect ratio: máx. {q['aspectRatio']['max']:.3g} · {q['aspectRatio']['nSevere']} celdas > {q['aspectRatio']['threshold']:g}",
+            f"Pirámides cara-celda: mín. {q['facePyramids']['min']:.3g} · {q['facePyramids']['nNegative']} negativas",
+            f"Volumen de celda: mín. {q['cellVolumes']['min']:.3g} · máx. {q['cellVolumes']['max']:.3g} · "
+            f"total {q['cellVolumes']['total']:.6g}",
+            f"Celdas abiertas: {q['openCells']['nOpen']} · contorno cerrado: {'sí' if q['closedBoundary'] else 'no'}",
+        ]
+        if q["failedChecks"]:
+            status = f"Malla NO válida ({', '.join(q['failedChecks'])})"
+            color = "red"
+        elif q["warnings"]:
+            status = f"Malla válida con avisos ({', '.join(q['warnings'])})"
+            color = "darkorange"
+        else:
+            status = "Malla OK"
+            color = "green"
+        self.quality_label.setStyleSheet(f"color: {color};")
+        self.quality_label.setText(status + "\n" + "\n".join(lines))
+
     def read_config(self):
         """
         Lee el archivo config.json y devuelve la configuración como un diccionario.
         """
-        config_file_path = os.path.join(os.getcwd(), "config.json")
+        config_file_path = workspace.config_path()
         if not os.path.exists(config_file_path):
-            QMessageBox.critical(self, "Error", f"No se encontró el archivo de configuración 'config.json' en {os.getcwd()}.")
+            QMessageBox.critical(self, "Error", f"No se encontró el archivo de configuración 'config.json' en {workspace.project_dir()}.")
             return None
 
         try:
@@ -11,6 +11,9 @@ from PyQt5.QtWidgets import (
 )
 from ui.widgets.numeric_line_edit import NumericLineEdit
 from PyQt5.QtCore import Qt, pyqtSignal
+from core.atomic_io import atomic_write_json
+from core.project_state import project_state
+from core import workspace
 
 from ui.dialogs.injection_dialogs.patch_injection_dialog import PatchInjectionDialog
 from ui.dialogs.injection_dialogs.cone_nozzle_injection_dialog import ConeNozzleInjectionDialog
@@ -22,6 +25,11 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 
 
 class FaseDiscreta(QWidget):
+    data_changed = pyqtSignal()
+
+    # Claves de case_config que edita esta página (historial deshacer/rehacer)
+    HISTORY_KEYS = ("discrete_phase_active", "discrete_phase_models", "injections", "particleTrackProperties")
+
     def __init__(self, case_config):
         super().__init__()
         self.case_config = case_config
@@ -32,8 +40,10 @@ class FaseDiscreta(QWidget):
         # Inicializar estructuras en case_config si no existen
         self.initialize_case_config()
 
-        # Leer constant.json para actualizar las especies activas
+        # Especies activas según la sección 'constant' del estado del proyecto
         self.load_constant_species()
+        for key in ("especiesActive", "especies_options"):
+            project_state().subscribe("constant", key, lambda *_: self.load_constant_species())
 
         # Establecer el directorio TEMP relativo a main.py (se asume que main.py está en la raíz del proyecto)
         self.CONFIG_DIR = self.read_config()
@@ -76,37 +86,28 @@ class FaseDiscreta(QWidget):
 
     def load_constant_species(self):
         """
-        Lee constant.json y, si las especies están activas, actualiza la lista de especies
-        activas en case_config["chosen_species"].
+        Si las especies están activas en la sección 'constant', actualiza la lista de
+        especies activas en case_config["chosen_species"].
         """
-        constant_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "temp", "constant.json")
-        if os.path.exists(constant_path):
-            try:
-                with open(constant_path, "r") as f:
-                    constant_data = json.load(f)
-                if constant_data.get("especiesActive", False):
-                    self.case_config["chosen_species"] = constant_data.get("especies_options", {}).get("activeSpecies", [])
-                else:
-                    self.case_config["chosen_species"] = []
-            except Exception as e:
-                QMessageBox.warning(self, "Error", f"Error al leer constant.json:\n{e}")
-                self.case_config["chosen_species"] = []
+        state = project_state()
+        if state.get("constant", "especiesActive", False):
+            self.case_config["chosen_species"] = state.get("constant", "especies_options", {}).get("activeSpecies", [])
         else:
             self.case_config["chosen_species"] = []
 
     def read_config(self):
         """
-        Lee config.json y devuelve la ruta del directorio temp, asumiendo que main.py se encuentra en la raíz del proyecto.
+        Lee config.json y devuelve la ruta del directorio temp del proyecto activo (core/workspace.py).
         """
-        main_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
-        config_file_path = os.path.join(main_dir, "config.json")
+        main_dir = workspace.project_dir()
+        config_file_path = workspace.config_path()
         if not os.path.exists(config_file_path):
             QMessageBox.critical(self, "Error", f"No se encontró 'config.json' en {main_dir}.")
             return None
         try:
             with open(config_file_path, "r") as config_file:
                 config = json.load(config_file)
-            temp_dir = os.path.join(main_dir, "temp")
+            temp_dir = workspace.data_dir()
             if not os.path.exists(temp_dir):
                 os.makedirs(temp_dir)
             return temp_dir
@@ -116,46 +117,37 @@ class FaseDiscreta(QWidget):
 
     def load_disperse_phase_config(self):
         """
-        Lee el archivo Disperse_fase.json (si existe) y actualiza la configuración de fase discreta,
-        incluyendo discrete_phase_models, injections, discrete_phase_active y particleTrackProperties.
+        Toma la sección Disperse_fase del estado del proyecto (si existe) y actualiza la configuración
+        de fase discreta, incluyendo discrete_phase_models, injections, discrete_phase_active y
+        particleTrackProperties.
         """
-        filename = os.path.join(self.CONFIG_DIR, "Disperse_fase.json")
-        if os.path.exists(filename):
-            try:
-                with open(filename, "r") as f:
-                    data = json.load(f)
-                if "discrete_phase_models" in data:
-                    self.case_config["discrete_phase_models"] = data["discrete_phase_models"]
-                if "injections" in data:
-                    self.case_config["injections"] = data["injections"]
-                if "discrete_phase_active" in data:
-                    self.case_config["discrete_phase_active"] = data["discrete_phase_active"]
-                if "particleTrackProperties" in data:
-                    self.case_config["particleTrackProperties"] = data["particleTrackProperties"]
-                logging.info("Disperse_fase.json cargado correctamente.")
-            except Exception as e:
-                QMessageBox.warning(self, "Error", f"Error al leer Disperse_fase.json:\n{e}")
+        data = project_state(self.CONFIG_DIR).section("Disperse_fase")
+        if data:
+            if "discrete_phase_models" in data:
+                self.case_config["discrete_phase_models"] = data["discrete_phase_models"]
+            if "injections" in data:
+                self.case_config["injections"] = data["injections"]
+            if "discrete_phase_active" in data:
+                self.case_config["discrete_phase_active"] = data["discrete_phase_active"]
+            if "particleTrackProperties" in data:
+                self.case_config["particleTrackProperties"] = data["particleTrackProperties"]
+            logging.info("Disperse_fase.json cargado correctamente.")
 
     def save_disperse_phase_config(self):
         """
         Guarda la configuración de fase discreta en Disperse_fase.json, incluyendo discrete_phase_models,
         injections, particleTrackProperties y el flag discrete_phase_active.
-        Se sobrescribe completamente el archivo.
+        El auto-guardado escribe sólo lo que cambia respecto a la versión
+        guardada (parche JSON), no el archivo completo.
         """
-        filename = os.path.join(self.CONFIG_DIR, "Disperse_fase.json")
-        try:
-            data_to_save = {
-                "discrete_phase_active": self.case_config.get("discrete_phase_active", False),
-                "discrete_phase_models": self.case_config.get("discrete_phase_models", {}),
-                "injections": self.case_config.get("injections", []),
-                "particleTrackProperties": self.case_config.get("particleTrackProperties", {})
-            }
-            with open(filename, "w") as f:
-                json.dump(data_to_save, f, indent=4)
-            logging.info(f"Disperse_fase.json guardado correctamente en: {filename}")
-            print(f"Disperse_fase.json guardado correctamente en: {filename}")
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Error al guardar Disperse_fase.json:\n{e}")
+        data_to_save = {
+            "discrete_phase_active": self.case_config.get("discrete_phase_active", False),
+            "discrete_phase_models": self.case_config.get("discrete_phase_models", {}),
+            "injections": self.case_config.get("injections", []),
+            "particleTrackProperties": self.case_config.get("particleTrackProperties", {})
+        }
+        if project_state(self.CONFIG_DIR).replace("Disperse_fase", data_to_save):
+            logging.info("Disperse_fase actualizado en el estado del proyecto.")
 
     def init_ui(self):
         layout = QVBoxLayout(self)
@@ -568,6 +560,7 @@ class FaseDiscreta(QWidget):
                 self.update_injectors_table()
                 self.save_injector_config(new_injector)
                 self.save_disperse_phase_config()
+                self.data_changed.emit()
 
     def remove_injector(self):
         selected_items = self.injectors_table.selectedItems()
@@ -586,6 +579,7 @@ class FaseDiscreta(QWidget):
             self.update_injectors_table()
             self.delete_injector_config(injector)
             self.save_disperse_phase_config()
+            self.data_changed.emit()
 
     def edit_injector(self, index):
         from PyQt5.QtWidgets import QDialog
@@ -608,16 +602,17 @@ class FaseDiscreta(QWidget):
             self.update_injectors_table()
             self.save_injector_config(updated_injector, overwrite=True)
             self.save_disperse_phase_config()
+            self.data_changed.emit()
 
     def save_injector_config(self, injector, overwrite=False):
         if not self.CONFIG_DIR:
             QMessageBox.warning(self, "Error", "El directorio de configuración no está definido.")
             return
         filename = os.path.join(self.CONFIG_DIR, f"{injector['name']}.json")
-        mode = 'w' if overwrite else 'x'
         try:
-            with open(filename, mode, encoding='utf-8') as f:
-                json.dump(injector, f, indent=4, ensure_ascii=False)
+            if not overwrite and os.path.exists(filename):
+                raise FileExistsError(filename)
+            atomic_write_json(filename, injector, indent=4, ensure_ascii=False)
         except FileExistsError:
             QMessageBox.warning(self, "Error", f"El archivo para el inyector '{injector['name']}' ya existe.")
         except Exception as e:
@@ -675,26 +670,81 @@ class FaseDiscreta(QWidget):
             self.case_config["discrete_phase_models"]["phaseChangeModel"]["enthalpyTransfer"] = "enthalpyDifference"
             self.case_config["discrete_phase_models"]["phaseChangeModel"]["activeLiquids"] = []
 
+    def refresh_from_case_config(self, paths):
+        """
+        Tras deshacer/rehacer: vuelve a mostrar case_config (con las señales
+        bloqueadas, porque los handlers modificarían case_config), actualiza
+        los archivos de los inyectores afectados y guarda Disperse_fase.
+        """
+        paths = [path for path in paths if path and path[0] in self.HISTORY_KEYS]
+        if not paths:
+            return
+        injection_paths = [path for path in paths if path[0] == "injections"]
+        if injection_paths:
+            self._sync_injector_configs(injection_paths)
+
+        models = self.case_config.get("discrete_phase_models", {})
+        active = self.case_config.get("discrete_phase_active", False)
+        combos = {
+            self.dispersion_combo: models.get("dispersionModel"),
+            self.patch_interaction_combo: models.get("patchInteractionModel", {}).get("model"),
+            self.heat_transfer_combo: models.get("heatTransferModel", {}).get("model"),
+            self.composition_combo: models.get("compositionModel", {}).get("model"),
+            self.phase_change_combo: models.get("phaseChangeModel", {}).get("model"),
+        }
+        widgets = [self.toggle_discrete_phase, self.bird_correction_checkbox, *combos]
+        for widget in widgets:
+            widget.blockSignals(True)
+        self.toggle_discrete_phase.setChecked(active)
+        for combo, text in combos.items():
+            if text is not None:
+                combo.setCurrentText(text)
+        self.bird_correction_checkbox.setChecked(bool(models.get("heatTransferModel", {}).get("BirdCorrection", False)))
+        for widget in widgets:
+            widget.blockSignals(False)
+
+        self.update_discrete_phase_visibility(active)
+        self.bird_correction_checkbox.setVisible(self.heat_transfer_combo.currentText() != "none")
+        self.composition_options_widget.setVisible(self.composition_combo.currentText() == "singleMixtureFractionCoeffs")
+        self.phase_change_options_widget.setVisible(self.phase_change_combo.currentText() == "liquidEvaporationCoeffs")
+        self.rho0_input.setText(str(models.get("rho0", "1000")))
+        self.T0_input.setText(str(models.get("T0", "300")))
+        self.Cp0_input.setText(str(models.get("Cp0", "4186")))
+        self.update_injectors_table()
+        self.save_disperse_phase_config()
+
+    def _sync_injector_configs(self, paths):
+        """
+        Archivos <inyector>.json tras deshacer/rehacer: se borran los de
+        inyectores que ya no existen y se reescriben los añadidos o cambiados.
+        La tabla aún muestra los inyectores anteriores.
+        """
+        old_names = {self.injectors_table.item(row, 0).text()
+                     for row in range(self.injectors_table.rowCount())
+                     if self.injectors_table.item(row, 0)}
+        injections = self.case_config.get("injections", [])
+        new_names = {injector.get("name") for injector in injections}
+        for name in old_names - new_names:
+            self.delete_injector_config({"name": name})
+        rows = {path[1] for path in paths if len(path) > 1}
+        for row, injector in enumerate(injections):
+            if row in rows or injector.get("name") not in old_names:
+                self.save_injector_config(injector, overwrite=True)
+
     def hideEvent(self, event):
         # Al abandonar la sección, guardar la configuración completa en Disperse_fase.json
         self.save_disperse_phase_config()
         super().hideEvent(event)
 
     def save_disperse_phase_config(self):
-        filename = os.path.join(self.CONFIG_DIR, "Disperse_fase.json")
-        try:
-            data_to_save = {
-                "discrete_phase_active": self.case_config.get("discrete_phase_active", False),
-                "discrete_phase_models": self.case_config.get("discrete_phase_models", {}),
-                "injections": self.case_config.get("injections", []),
-                "particleTrackProperties": self.case_config.get("particleTrackProperties", {})
-            }
-            with open(filename, "w") as f:
-                json.dump(data_to_save, f, indent=4)
-            logging.info(f"Disperse_fase.json guardado correctamente en: {filename}")
-            print(f"Disperse_fase.json guardado correctamente en: {filename}")
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Error al guardar Disperse_fase.json:\n{e}")
+        data_to_save = {
+            "discrete_phase_active": self.case_config.get("discrete_phase_active", False),
+            "discrete_phase_models": self.case_config.get("discrete_phase_models", {}),
+            "injections": self.case_config.get("injections", []),
+            "particleTrackProperties": self.case_config.get("particleTrackProperties", {})
+        }
+        if project_state(self.CONFIG_DIR).replace("Disperse_fase", data_to_save):
+            logging.info("Disperse_fase actualizado en el estado del proyecto.")
 
     def open_particle_tracking_options(self):
         from PyQt5.QtWidgets import QDialog
@@ -725,14 +775,7 @@ class FaseDiscreta(QWidget):
             self.case_config["especies_options"] = dlg.data
 
     def _read_constant_json(self):
-        constant_path = os.path.join(os.getcwd(), "temp", "constant.json")
-        if os.path.exists(constant_path):
-            try:
-                with open(constant_path, "r") as f:
-                    data = json.load(f)
-                self.case_config.update(data)
-            except Exception as e:
-                print(f"Error al leer constant.json: {e}")
+        self.case_config.update(project_state().section("constant"))
 
     def _write_constant_json(self):
         data_to_save = {
@@ -749,12 +792,7 @@ class FaseDiscreta(QWidget):
             "futureExtension": self.case_config.get("futureExtension", None),
             "particleTrackProperties": self.case_config.get("particleTrackProperties", {})
         }
-        constant_path = os.path.join(os.getcwd(), "temp", "constant.json")
-        try:
-            with open(constant_path, "w") as f:
-                json.dump(data_to_save, f, indent=4)
-        except Exception as e:
-            print(f"Error al escribir constant.json: {e}")
+        project_state().update("constant", data_to_save)
 
     def _show_turbulence_description(self):
         turbulence_info = self.case_config.get("turbulenceModel", "Laminar")
@@ -1,7 +1,6 @@
 # ui/sections/inicializacion.py
 
 import os
-import json
 import logging
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QMessageBox
 
@@ -11,6 +10,8 @@ from ui.conf.conf_bc import generate_boundary_conditions
 from ui.conf.bc.conf_alphat import generate_alphat_file
 # Importar el módulo conf_constant.py para generar archivos del directorio constant
 from ui.conf.conf_constant import generate_constant_files
+from core.case_context import CaseContext
+from core import workspace
 
 logging.basicConfig(
     level=logging.DEBUG,
@@ -32,12 +33,8 @@ class Inicializacion(QWidget):
         super().__init__()
 
         if temp_dir is None:
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            logging.debug(f"Directorio actual del script: {current_dir}")
-
-            # Asumir que 'temp' está dos niveles arriba
-            temp_dir = os.path.join(current_dir, "..", "..", "temp")
-            temp_dir = os.path.normpath(temp_dir)
+            # Carpeta temp del proyecto activo
+            temp_dir = workspace.data_dir()
             logging.debug(f"Ruta calculada para 'temp': {temp_dir}")
         else:
             temp_dir = os.path.normpath(temp_dir)
@@ -88,9 +85,14 @@ class Inicializacion(QWidget):
     def generate_initial_conditions(self):
         logging.info("Iniciando la generación de condiciones iniciales y de contorno.")
         try:
-            generate_boundary_conditions(self.temp_dir, parent=self)
+            # Contexto del caso: las secciones se leen una vez para todos los generadores
+            ctx = self.load_context()
+            report = generate_boundary_conditions(ctx, parent=self)
+            if report is None or not report.ok:
+                # generate_boundary_conditions ya ha mostrado los errores
+                return
             logging.info("Archivos de contorno generados correctamente.")
-            self.generate_alphat_file()
+            self.generate_alphat_file(ctx)
             QMessageBox.information(
                 self, "Éxito",
                 "Se han generado correctamente los archivos de contorno y 'alphat'."
@@ -100,20 +102,18 @@ class Inicializacion(QWidget):
             QMessageBox.critical(self, "Error", error_msg)
             logging.error(error_msg)
 
-    def generate_alphat_file(self):
+    def load_context(self):
+        """Contexto del caso de la carpeta temp (core/case_context.py)."""
+        return CaseContext.load(data_dir=self.temp_dir, case_config=self.case_config or None)
+
+    def generate_alphat_file(self, ctx=None):
         try:
-            bc_file_path = os.path.join(self.temp_dir, "boundary_conditions.json")
-            bc_file_path = os.path.normpath(bc_file_path)
-            if not os.path.exists(bc_file_path):
-                logging.warning(f"No se encontró el archivo {bc_file_path} para generar 'alphat'.")
+            ctx = ctx or self.load_context()
+            if not ctx.has_section("boundary_conditions"):
+                logging.warning(f"No se encontró la sección boundary_conditions en {self.temp_dir} para generar 'alphat'.")
                 return
-            with open(bc_file_path, 'r', encoding='utf-8') as f:
-                bc_data = json.load(f)
-            boundary_conds = bc_data.get("boundaryConditions", {})
-            calculationType = bc_data.get("solverSettings", {}).get("calculationType", "Compresible")
-            alpha_file_path = os.path.join(self.temp_dir, "DP0", "0", "alphat")
-            alpha_file_path = os.path.normpath(alpha_file_path)
-            generate_alphat_file(boundary_conds, alpha_file_path, calculationType)
+            alpha_file_path = os.path.normpath(ctx.path("0", "alphat"))
+            generate_alphat_file(ctx, alpha_file_path)
             logging.info(f"Archivo 'alphat' generado exitosamente en {alpha_file_path}.")
         except Exception as e:
             logging.error(f"Error al generar 'alphat': {e}")
@@ -124,12 +124,14 @@ class Inicializacion(QWidget):
         Llama a conf_constant.py para generar los archivos del directorio constant.
         """
         try:
-            # Se asume que case_config contiene la información necesaria.
-            from ui.conf.conf_constant import generate_constant_files
-            # El directorio raíz se toma como el directorio en el que se encuentra main.py.
-            main_dir = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
-            generate_constant_files(self.case_config, main_dir)
-            QMessageBox.information(self, "Éxito", "Archivos del directorio constant generados correctamente.")
+            # case_config (o la sección case_config) + constant.json del proyecto
+            report = generate_constant_files(self.load_context())
+            if not report.ok:
+                QMessageBox.critical(self, "Error", "Error al generar archivos del directorio constant:\n"
+                                     + report.format_errors())
+                return
+            QMessageBox.information(self, "Éxito", "Archivos del directorio constant generados correctamente.\n\n"
+                                    + report.summary())
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error al generar archivos del directorio constant:\n{e}")
             logging.error(f"Error en generate_constant_config: {e}")
@@ -1,8 +1,5 @@
 # ui/sections/materiales.py
 
-import os
-import json
-
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem,
     QHBoxLayout, QPushButton, QMessageBox, QInputDialog,
@@ -10,18 +7,21 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import Qt, pyqtSignal
 
-from core.json_manager import JSONManager
+from core.project_state import project_state
 from ui.dialogs.config_material_dialog import ConfigMaterialDialog
 
 
 class Materiales(QWidget):
     data_changed = pyqtSignal()
 
+    # Claves de case_config que edita esta página (historial deshacer/rehacer)
+    HISTORY_KEYS = ("materials", "thermophysicalProperties")
+
     def __init__(self, case_config):
         super().__init__()
         self.case_config = case_config
         self.section_name = "materials"
-        self.json_manager = JSONManager()
+        self.state = project_state()
 
         # Asegurar secciones en case_config
         self.case_config.setdefault("materials", [])
@@ -143,26 +143,19 @@ class Materiales(QWidget):
         super().hideEvent(event)
 
     def load_materials(self):
-        data = self.json_manager.load_section(self.section_name)
+        data = self.state.section(self.section_name)
         if "materials" in data:
             self.case_config["materials"] = data["materials"]
 
     def load_thermophysical(self):
-        path = os.path.join(os.getcwd(), "temp", "constant.json")
-        try:
-            with open(path, "r") as f:
-                cd = json.load(f)
-            tp = cd.get("thermophysicalProperties", {})
+        tp = self.state.get("constant", "thermophysicalProperties")
+        if tp:
             self.case_config["thermophysicalProperties"] = tp
-        except Exception:
-            pass
 
     def _save_materials(self):
         data = {"materials": self.case_config["materials"]}
-        ok, msg = self.json_manager.save_section(self.section_name, data)
-        if not ok:
-            QMessageBox.critical(self, "Error guardando materiales", msg)
-        else:
+        # Los errores de escritura los notifica el auto-guardado (MainWindow)
+        if self.state.replace(self.section_name, data):
             print("materials.json actualizado")
 
     def _save_thermophysical(self):
@@ -177,12 +170,21 @@ class Materiales(QWidget):
             "newFormat": self.new_format.isChecked()
         }
         self.case_config["thermophysicalProperties"] = tp
-        ok, msg = self.json_manager.save_section("case_config", self.case_config)
-        if not ok:
-            QMessageBox.critical(self, "Error guardando thermophysical", msg)
-        else:
+        self.state.replace("case_config", self.case_config)
+        if self.state.update("constant", {"thermophysicalProperties": tp}):
             print("constant.json actualizado con thermophysicalProperties")
 
+    def refresh_from_case_config(self, paths):
+        """Tras deshacer/rehacer: vuelve a mostrar case_config y guarda materiales y constant."""
+        if not any(path[0] in self.HISTORY_KEYS for path in paths if path):
+            return
+        self.update_material_list()
+        self.populate_thermo_fields()
+        self._save_materials()
+        tp = self.case_config.get("thermophysicalProperties")
+        if tp:
+            self.state.update("constant", {"thermophysicalProperties": tp})
+
     # Alias que el main_window espera para el autoguardado
     def save_materiales(self):
         # No hace nada de más: el verdadero guardado está en hideEvent
@@ -5,7 +5,7 @@ from PyQt5.QtWidgets import (
     QComboBox, QGroupBox
 )
 from PyQt5.QtCore import Qt, pyqtSignal
-from core.json_manager import JSONManager
+from core.project_state import project_state
 
 class Methods(QWidget):
     """
@@ -19,7 +19,7 @@ class Methods(QWidget):
     def __init__(self, case_config):
         super().__init__()
         self.case_config = case_config
-        self.json = JSONManager()
+        self.state = project_state()
 
         # Opciones de esquemas según guía OpenFOAM
         self.ddt_schemes   = ["Euler", "backward", "CrankNicolson"]
@@ -31,7 +31,7 @@ class Methods(QWidget):
         self.wall_dist_methods = ["meshWave", "distanceToBoundary", "inverseDistance"]
 
         # Cargar persistencia previa
-        stored = self.json.load_section("fvSchemes") or {}
+        stored = self.state.section("fvSchemes")
         self.case_config.setdefault("fvSchemes", {})
         self.case_config["fvSchemes"].update(stored)
 
@@ -130,5 +130,5 @@ class Methods(QWidget):
             "wallDist": self.wall_combo.currentText()
         }
         self.case_config["fvSchemes"].update(schemes)
-        self.json.save_section("fvSchemes", schemes)
+        self.state.replace("fvSchemes", self.case_config["fvSchemes"])
         self.data_changed.emit()
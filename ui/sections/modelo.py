@@ -17,19 +17,18 @@ aparecerá un grupo de configuración donde se podrá elegir entre tres modelos
 
 Finalmente, se conserva la sección de Especies (Combustión) para configurar las opciones de química.
 
-Al abandonar la sección (hideEvent), se actualiza automáticamente el archivo constant.json
-con la información actual de case_config.
+Al abandonar la sección (hideEvent), se actualiza la sección 'constant' del estado del
+proyecto (core/project_state.py) con la información actual de case_config; el estado la
+persiste en constant.json en segundo plano.
 """
 
-import os
-import json
-
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPushButton,
     QMessageBox, QGroupBox, QLineEdit, QTabWidget, QFormLayout, QCheckBox, QDialog
 )
 from ui.widgets.numeric_line_edit import NumericLineEdit
 from PyQt5.QtCore import Qt
+from core.project_state import project_state
 
 # Diálogos importados
 from ui.dialogs.radiation_options_dialog import RadiationOptionsDialog
@@ -40,7 +39,7 @@ class Modelo(QWidget):
     def __init__(self, case_config):
         super().__init__()
         self.case_config = case_config
-        # Al iniciar, se lee constant.json desde el directorio temp (usando os.getcwd())
+        # Al iniciar, se toma la sección 'constant' del estado del proyecto
         self._read_constant_json()
         self.init_ui()
 
@@ -366,16 +365,8 @@ class Modelo(QWidget):
             self.case_config["especies_options"] = dlg.data
 
     def _read_constant_json(self):
-        # Se utiliza os.getcwd() para obtener la ruta del directorio de trabajo (donde se ejecuta main.py)
-        constant_path = os.path.join(os.getcwd(), "temp", "constant.json")
-        if os.path.exists(constant_path):
-            try:
-                with open(constant_path, "r") as f:
-                    data = json.load(f)
-                # Actualizar case_config con lo leído
-                self.case_config.update(data)
-            except Exception as e:
-                print(f"Error al leer constant.json: {e}")
+        # Actualizar case_config con la sección 'constant' (en memoria)
+        self.case_config.update(project_state().section("constant"))
 
     def _write_constant_json(self):
         data_to_save = {
@@ -391,12 +382,7 @@ class Modelo(QWidget):
             "especies_options": self.case_config.get("especies_options", {}),
             "futureExtension": self.case_config.get("futureExtension", None)
         }
-        constant_path = os.path.join(os.getcwd(), "temp", "constant.json")
-        try:
-            with open(constant_path, "w") as f:
-                json.dump(data_to_save, f, indent=4)
-        except Exception as e:
-            print(f"Error al escribir constant.json: {e}")
+        project_state().update("constant", data_to_save)
 
     def hideEvent(self, event):
         self._write_constant_json()
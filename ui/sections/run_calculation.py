@@ -1,8 +1,7 @@
 # ui/sections/run_calculation.py
 
 import os
-import json
-import shutil
+import time
 import subprocess
 import logging
 
@@ -13,12 +12,16 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import Qt, pyqtSignal, QLocale
 
-from core.json_manager import JSONManager
-from ui.conf.conf_bc import generate_boundary_conditions
-from ui.conf.bc.conf_alphat import generate_alphat_file
-from ui.conf.conf_constant import generate_constant_files
-from ui.conf.constant.conf_reactingCloudproperties import generate_reactingCloudProperties
-from ui.conf.constant.conf_combustionProperties import generate_combustionProperties
+from core.project_state import project_state
+from core.case_context import CaseContext
+from core import workspace
+from core.inlet_flow import read_working_directory
+from core.decomposition import PLANNED_METHODS, plan_decomposition, decompose_par_dict
+from core.graph_partition import MANUAL_DATA_FILE, plan_manual_decomposition, write_manual_decomposition
+from core.generation import stale_targets
+from ui.conf.initialization import initialization_errors, render_initialization, update_chemkin_dir
+from ui.conf.targets import initialization_targets
+from ui.dialogs.case_diff_dialog import CaseDiffDialog
 
 
 class RunCalculation(QWidget):
@@ -34,12 +37,11 @@ class RunCalculation(QWidget):
     def __init__(self, case_config):
         super().__init__()
         self.case_config = case_config
-        self.root_dir = os.getcwd()
+        self.root_dir = workspace.project_dir()
         self.setLocale(QLocale(QLocale.C))
 
         # Cargar controlDict previo
-        jm = JSONManager()
-        persisted = jm.load_section("controlDict") or {}
+        persisted = project_state().section("controlDict")
         self.case_config.setdefault("solverSettings", {})
         self.case_config.setdefault("controlDict", {})
         for k, v in persisted.items():
@@ -175,6 +177,15 @@ class RunCalculation(QWidget):
         init_btn.clicked.connect(self._on_initialize)
         layout.addWidget(init_btn)
 
+        preview_btn = QPushButton("Vista previa de cambios")
+        preview_btn.clicked.connect(self._on_preview)
+        layout.addWidget(preview_btn)
+
+        # Archivos que "Inicializar Caso" regeneraría (se actualiza al mostrar la página)
+        self.stale_label = QLabel()
+        self.stale_label.setWordWrap(True)
+        layout.addWidget(self.stale_label)
+
         # --- Sección Paralelización ---
         par_group = QGroupBox("Cálculo en Paralelo")
         parform = QFormLayout(par_group)
@@ -192,11 +203,23 @@ class RunCalculation(QWidget):
         self.decomp_desc.setWordWrap(True)
         parform.addRow("Descripción:", self.decomp_desc)
 
+        # Planificador: coeficientes n de simple/hierarchical según la malla
+        self.decomp_plan = None
+        self.plan_btn = QPushButton("Planificar descomposición")
+        self.plan_btn.clicked.connect(self._on_plan_decomposition)
+        parform.addRow(self.plan_btn)
+
+        self.decomp_preview = QLabel()
+        self.decomp_preview.setWordWrap(True)
+        parform.addRow("Vista previa:", self.decomp_preview)
+
         layout.addWidget(par_group)
 
         self.decomp_combo.currentTextChanged.connect(
             lambda m: self._update_decomp_desc(m)
         )
+        self.decomp_combo.currentTextChanged.connect(self._invalidate_decomp_plan)
+        self.nproc_spin.valueChanged.connect(self._invalidate_decomp_plan)
         self._update_decomp_desc(self.decomp_combo.currentText())
 
         run_btn = QPushButton("Ejecutar en Paralelo")
@@ -207,8 +230,27 @@ class RunCalculation(QWidget):
         self.setLayout(layout)
 
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._refresh_stale()
+
     # — Métodos auxiliares — #
 
+    def _refresh_stale(self):
+        """Muestra qué archivos del caso están desactualizados respecto a sus datos."""
+        try:
+            ctx = CaseContext.load(self.root_dir, data_dir=workspace.data_dir(self.root_dir),
+                                   case_config=self.case_config, validate=False)
+            stale = stale_targets(ctx, initialization_targets(ctx))
+        except Exception as e:
+            logging.warning(f"No se pudo comprobar el estado de los archivos del caso: {e}")
+            self.stale_label.setText("")
+            return
+        if stale:
+            self.stale_label.setText("Archivos desactualizados: " + ", ".join(stale))
+        else:
+            self.stale_label.setText("Todos los archivos están al día.")
+
     def _config_spin(self, widget, minimum, maximum, decimals, key, default):
         widget.setRange(minimum, maximum)
         widget.setDecimals(decimals)
@@ -270,7 +312,7 @@ class RunCalculation(QWidget):
             "writeCompression": self.write_compression.isChecked()
         }
         self.case_config["controlDict"].update(cd)
-        JSONManager().save_section("controlDict", cd)
+        project_state().replace("controlDict", self.case_config["controlDict"])
         self.data_changed.emit()
 
     def _update_visibility(self, sim):
@@ -294,96 +336,145 @@ class RunCalculation(QWidget):
             "hierarchical": "Jerárquica (subdivisiones en cascada).",
             "scotch":       "Optimiza con Scotch.",
             "metis":        "Equilibra con METIS.",
-            "manual":       "Manual: edición de decompositionManualDict."
+            "manual":       "Manual: reparto por bisección inercial + refinamiento (decompositionManualDict)."
         }
         self.decomp_desc.setText(descs.get(method, ""))
+        self.plan_btn.setEnabled(method in PLANNED_METHODS or method == "manual")
+
+    def _invalidate_decomp_plan(self, *_):
+        self.decomp_plan = None
+        self.decomp_preview.setText("")
+
+    def _plan_decomposition(self):
+        """Calcula el plan para el nº de procesadores y método actuales."""
+        case_dir = read_working_directory()
+        if not case_dir:
+            raise ValueError("La ruta del directorio de trabajo no está definida en config.json.")
+        method = self.decomp_combo.currentText()
+        if method == "manual":
+            self.decomp_plan = plan_manual_decomposition(case_dir, self.nproc_spin.value())
+            p = self.decomp_plan
+            self.decomp_preview.setText(
+                f"partición {p['partitioner']} · celdas/proc. "
+                f"{p['cellsPerRank']['min']:,}–{p['cellsPerRank']['max']:,} · "
+                f"desequilibrio {p['imbalance']:.3f} · caras de procesador {p['processorFaces']:,}"
+            )
+            return self.decomp_plan
+
+        self.decomp_plan = plan_decomposition(case_dir, self.nproc_spin.value(), method)
+        p = self.decomp_plan
+        rows = [
+            f"n ({p['n'][0]} {p['n'][1]} {p['n'][2]}) · celdas/proc. "
+            f"{p['cellsPerRank']['min']:,}–{p['cellsPerRank']['max']:,} · "
+            f"desequilibrio {p['imbalance']:.3f} · caras de procesador {p['processorFaces']:,}"
+        ]
+        for c in p["candidates"][1:4]:
+            rows.append(
+                f"  alternativa n ({c['n'][0]} {c['n'][1]} {c['n'][2]}): "
+                f"desequilibrio {c['imbalance']:.3f}, {c['processorFaces']:,} caras"
+            )
+        self.decomp_preview.setText("\n".join(rows))
+        return self.decomp_plan
 
-    def _on_initialize(self):
-        temp_dir = os.path.join(self.root_dir, "temp")
-        dp0      = os.path.join(temp_dir, "DP0")
+    def _on_plan_decomposition(self):
+        try:
+            self._plan_decomposition()
+        except Exception as e:
+            logging.error("Error planificando la descomposición", exc_info=True)
+            QMessageBox.critical(self, "Error Descomposición", str(e))
+
+    def _render_case(self):
+        """Contexto validado y plan de inicialización renderizado en memoria (CaseTree)."""
+        temp_dir = workspace.data_dir(self.root_dir)
+
+        # 0) volcar a disco los cambios pendientes del auto-guardado y
+        #    cargar (una sola vez) el contexto que comparten los generadores
+        project_state(temp_dir).flush()
+        ctx = CaseContext.load(self.root_dir, data_dir=temp_dir, case_config=self.case_config)
 
+        # 1) validar boundary_conditions antes de generar nada
+        errors = initialization_errors(ctx)
+        if errors:
+            raise ValueError("boundary_conditions.json está incompleto o mal formateado:\n" + "\n".join(errors))
+
+        # 2) carpeta 0, constant, reactingCloudProperties, combustionProperties
+        #    + chemkin/therm.dat y alphat en un único plan: los archivos se
+        #    renderizan en paralelo y los errores se muestran todos juntos
+        return render_initialization(ctx)
+
+    def _on_preview(self):
         try:
-            # 1) condiciones de contorno y carpeta 0
-            generate_boundary_conditions(temp_dir, parent=self)
-            logging.info("→ Condiciones de contorno generadas.")
-
-            # 2) archivos del directorio constant
-            generate_constant_files(self.case_config, self.root_dir)
-            logging.info("→ Archivos de constant generados.")
-
-            # 3) reactingCloudProperties (fase discreta)
-            discrete_cfg = JSONManager().load_section("Disperse_fase") or {}
-            generate_reactingCloudProperties(discrete_cfg, self.root_dir)
-            logging.info("→ reactingCloudProperties procesado.")
-
-            # 4) combustionProperties + CHEMKIN
-            chem_cfg    = self.case_config.get("combustion", {})
-            chem_active = chem_cfg.get("active", False)
-            chemkin_dir = os.path.join(self.root_dir, "chemkin")
-            comb_prop   = os.path.join(dp0, "constant", "combustionProperties")
-
-            if chem_active:
-                # generar combustionProperties en temp/DP0/constant
-                generate_combustionProperties(chem_cfg, self.root_dir)
-                logging.info("→ combustionProperties generado en %s", comb_prop)
-
-                # Asegurar directorio CHEMKIN en <case>/chemkin
-                os.makedirs(chemkin_dir, exist_ok=True)
-                logging.info("→ Directorio CHEMKIN preparado en %s", chemkin_dir)
-            else:
-                # eliminar combustionProperties si existe
-                if os.path.isfile(comb_prop):
-                    os.remove(comb_prop)
-                    logging.info("→ combustionProperties eliminado (química inactiva).")
-                # eliminar carpeta CHEMKIN si existe
-                if os.path.isdir(chemkin_dir):
-                    shutil.rmtree(chemkin_dir)
-                    logging.info("→ carpeta chemkin eliminada (química inactiva).")
-
-            # 5) alphat en DP0/0/
-            ap = os.path.join(dp0, "0", "alphat")
-            os.makedirs(os.path.dirname(ap), exist_ok=True)
-            with open(os.path.join(temp_dir, "boundary_conditions.json"), "r", encoding="utf-8") as f:
-                bc_data = json.load(f)
-            boundary_conditions = bc_data.get("boundaryConditions", {})
-            calcType            = bc_data.get(
-                "calculationType",
-                self.case_config.get("solverSettings", {}).get("calculationType", "Compresible")
-            )
-            generate_alphat_file(boundary_conditions, ap, calcType)
-            logging.info("→ alphat generado.")
+            tree = self._render_case()
+        except Exception as e:
+            logging.error("Error en la vista previa", exc_info=True)
+            QMessageBox.critical(self, "Error Vista previa", str(e))
+            return
+        if CaseDiffDialog(tree, self).exec_() == CaseDiffDialog.Accepted:
+            self._initialize(tree)
+
+    def _on_initialize(self):
+        self._initialize()
 
+    def _initialize(self, tree=None):
+        """Escribe el árbol del caso (el de la vista previa o uno nuevo) en un solo lote."""
+        try:
+            if tree is None:
+                tree = self._render_case()
+            report = tree.commit()
+
+            # 3) librería CHEMKIN del caso en <case>/chemkin
+            update_chemkin_dir(tree.ctx)
+
+            if not report.ok:
+                workspace.update_summary(self.root_dir, last_run={"status": "error de inicialización", "time": time.time()})
+                QMessageBox.critical(
+                    self, "Error Inicialización",
+                    "No se pudieron generar algunos archivos:\n" + report.format_errors()
+                )
+                self.data_changed.emit()
+                return
+
+            workspace.update_summary(self.root_dir, last_run={"status": "inicializado", "time": time.time()})
             QMessageBox.information(
                 self, "Inicialización",
-                "Todos los archivos iniciales han sido generados."
+                "Todos los archivos iniciales han sido generados.\n\n" + report.summary()
             )
             self.data_changed.emit()
 
         except Exception as e:
             logging.error("Error en Inicialización", exc_info=True)
+            workspace.update_summary(self.root_dir, last_run={"status": "error de inicialización", "time": time.time()})
             QMessageBox.critical(self, "Error Inicialización", str(e))
+        finally:
+            self._refresh_stale()
 
     def _on_run_parallel(self):
-        temp_dp0 = os.path.join(self.root_dir, "temp", "DP0")
+        temp_dp0 = os.path.join(workspace.data_dir(self.root_dir), "DP0")
         sysd     = os.path.join(temp_dp0, "system")
         os.makedirs(sysd, exist_ok=True)
 
-        # escribir decomposeParDict
+        # escribir decomposeParDict (coeficientes n del planificador)
         dpp = os.path.join(sysd, "decomposeParDict")
-        lines = [
-            "FoamFile", "{", "  version 2.0;", "  format ascii;",
-            "  class dictionary;", "  object decomposeParDict;", "}",
-            f"numberOfSubdomains {self.nproc_spin.value()};",
-            f"method          {self.decomp_combo.currentText()};"
-        ]
         m = self.decomp_combo.currentText()
-        if m == "hierarchical":
-            lines += ["hierarchicalCoeffs", "{", "  n (2 2 1);", "  order xyz;", "}"]
-        elif m == "manual":
-            lines += ["manualCoeffs", "{", "  dataFile \"decompositionManualDict\";", "}"]
+        if m in PLANNED_METHODS and self.decomp_plan is None:
+            try:
+                self._plan_decomposition()
+            except Exception as e:
+                logging.warning(f"No se pudo planificar la descomposición, se usa un reparto cúbico: {e}")
+        if m == "manual":
+            # El dataFile de manualCoeffs se genera con el particionador propio
+            try:
+                plan = self.decomp_plan or self._plan_decomposition()
+                write_manual_decomposition(
+                    os.path.join(temp_dp0, "constant", MANUAL_DATA_FILE), plan["cellToProc"]
+                )
+            except Exception as e:
+                logging.error("Error generando decompositionManualDict", exc_info=True)
+                QMessageBox.critical(self, "Error Descomposición", str(e))
+                return
 
         with open(dpp, "w") as f:
-            f.write("\n".join(lines))
+            f.write(decompose_par_dict(self.nproc_spin.value(), m, self.decomp_plan))
         logging.info("→ decomposeParDict escrito.")
 
         try:
@@ -396,7 +487,9 @@ class RunCalculation(QWidget):
                 solver, "-parallel", "-case", temp_dp0
             ], check=True)
             logging.info("→ Solver en paralelo finalizado.")
+            workspace.update_summary(self.root_dir, last_run={"status": "completado", "time": time.time()})
             QMessageBox.information(self, "Ejecución", "Cálculo en paralelo completado.")
         except subprocess.CalledProcessError as e:
             logging.error("Error en ejecución paralela", exc_info=True)
+            workspace.update_summary(self.root_dir, last_run={"status": "fallido", "time": time.time()})
             QMessageBox.critical(self, "Error Ejecución", str(e))
@@ -7,6 +7,8 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt, pyqtSignal
 
 from core.json_manager import JSONManager
+from core.project_state import project_state
+from core.case_context import CaseContext
 from ui.conf.bc.conf_alphat import generate_alphat_file  # Importar la función para generar alphat
 
 import json
@@ -115,6 +117,8 @@ class SeleccionSolver(QWidget):
         }
         success, msg = self.json_manager.save_section(self.section_name, data)
         if success:
+            # Ya está en disco: sólo se actualiza el estado en memoria
+            project_state().replace(self.section_name, data, persist=False)
             QMessageBox.information(self, "Guardado", msg)
             print("Solver Settings guardados exitosamente.")  # Línea de depuración
 
@@ -128,13 +132,9 @@ class SeleccionSolver(QWidget):
         """
         Carga las configuraciones del solver desde el archivo JSON.
         """
-        # Verificar si el archivo solver_settings.json existe en el directorio temp
-        temp_dir = "temp"
-        json_path = os.path.join(temp_dir, "solver_settings.json")
-        if os.path.exists(json_path):
-            data = self.json_manager.load_section(self.section_name)
-        else:
-            data = None
+        # Verificar si la sección solver_settings existe (en disco o en el bundle abierto)
+        state = project_state()
+        data = state.section(self.section_name) if state.has_section(self.section_name) else None
 
         if data:
             simulationType = data.get("simulationType", "Transitorio")
@@ -161,10 +161,9 @@ class SeleccionSolver(QWidget):
         """
         Genera el archivo 'alphat' basado en las condiciones de contorno y la configuración del solver.
         """
-        boundary_conditions = self.case_config.get("boundaryConditions", {})
-        # Obtener el tipo de cálculo desde las configuraciones del solver
-        calculationType = self.case_config["solverSettings"].get("calculationType", "Compresible")
+        # Contexto del caso; el tipo de cálculo sale de solverSettings de case_config
+        ctx = CaseContext.load(case_config=self.case_config)
         # Definir la ruta del archivo 'alphat'
-        alpha_file_path = os.path.join("temp", "DP0", "0", "alphat")
+        alpha_file_path = ctx.path("0", "alphat")
         # Generar el archivo 'alphat'
-        generate_alphat_file(boundary_conditions, alpha_file_path, calculationType)
+        generate_alphat_file(ctx, alpha_file_path)